@@ -11,13 +11,31 @@ Usage:
   python memory-system-mcp-server.py          # stdio mode (local)
   python memory-system-mcp-server.py --http   # HTTP/SSE mode (network)
   python memory-system-mcp-server.py --http --port 8200  # HTTP on specific port
+  python memory-system-mcp-server.py --http --workers 4  # 4 processes, streamable HTTP at /mcp
+
+With --workers N (or MCP_MEMORY_WORKERS) the HTTP server forks N processes
+sharing the listening socket, so CPU-bound tool calls scale past one core.
+SSE sessions live in the process that opened them, so multiple workers use
+the stateless streamable-http transport. Metrics are per worker.
+
+Startup: the memory system (and its ChromaDB connection) is initialized in a
+background thread while the client handshake runs, unless --no-warmup or
+MCP_MEMORY_WARMUP=0; tool calls wait for it without blocking the event loop.
+Phase timings are logged and compared to MCP_MEMORY_STARTUP_BUDGET_MS.
+See scripts/benchmarks/mcp-cold-start-benchmark.py for an end-to-end profile.
 """
 
+import time
+
+_process_started = time.perf_counter()
+
 import json
 import sys
 import os
 import argparse
+import asyncio
 import logging
+import threading
 from typing import Any, Dict, List, Optional
 
 # Add the project root to the Python path
@@ -34,12 +52,40 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Startup phase -> milliseconds since the script started
+_startup_phases: Dict[str, float] = {}
+DEFAULT_STARTUP_BUDGET_MS = 2000
+
+
+def _mark_startup(phase: str):
+    _startup_phases[phase] = (time.perf_counter() - _process_started) * 1000
+
+
+def log_startup_profile():
+    """Log the startup phase timings and warn when the memory system missed the budget"""
+    budget = float(os.environ.get("MCP_MEMORY_STARTUP_BUDGET_MS", DEFAULT_STARTUP_BUDGET_MS))
+    profile = ", ".join(f"{phase} {ms:.0f} ms" for phase, ms in _startup_phases.items())
+    ready = _startup_phases.get("memory_system_ready")
+    if ready is not None and ready > budget:
+        logger.warning(f"Startup over budget ({ready:.0f} > {budget:.0f} ms): {profile}")
+    else:
+        logger.info(f"Startup profile: {profile}")
+
+
 # Import the MCP SDK
 from mcp.server.fastmcp import FastMCP
 from mcp.server.transport_security import TransportSecuritySettings
 
-# Import memory system
-from src.memory.multi_domain_memory_system import MemoryManager, MCPMemoryInterface
+_mark_startup("mcp_sdk_imported")
+
+# The memory system is imported on first use (see get_memory_interface)
+from src.memory.admission import READ, WRITE, AdmissionController
+from src.memory.metrics import metrics
+
+# Tool calls go through separate read/write lanes with bounded queues
+# (MCP_MEMORY_READ_CONCURRENCY/_QUEUE, MCP_MEMORY_WRITE_CONCURRENCY/_QUEUE,
+# MCP_MEMORY_TOOL_LIMITS); saturated calls are rejected with retry_after
+admission = AdmissionController()
 
 # Configure transport security to allow network access
 transport_security = TransportSecuritySettings(
@@ -57,32 +103,67 @@ Available tools:
 - retrieve_memories: Search stored memories (USE FIRST for any information lookup)
 - search_memories_advanced: Advanced search with filters
 - store_memory: Save important information for later retrieval
+- store_memories_batch: Save many memories in one call (e.g. a whole session)
+- retrieve_by_ids: Fetch known memories by id
 - get_memory_statistics: Check system status
+- get_performance_metrics: Latency percentiles per tool and backend operation
 - expand_keywords: Get related search terms
+- expand_and_search: Search a query plus its related terms in one call (fused results)
 
 Domains: bmad_code, website_info, religious_discussions, electronics_maker
 
-WORKFLOW: Always call retrieve_memories first, only use external search if memory has no results.""",
+WORKFLOW: Always call retrieve_memories first, only use external search if memory has no results.
+For broad questions, call expand_and_search once instead of expand_keywords followed by
+one retrieve_memories call per keyword.""",
     transport_security=transport_security,
 )
 
 # Initialize memory system (lazy initialization for flexibility)
 _memory_manager = None
 _memory_interface = None
+_memory_lock = threading.Lock()
 
 
 def get_memory_interface():
-    """Get or create memory interface (lazy initialization)"""
+    """Get or create memory interface (lazy, thread-safe initialization)"""
     global _memory_manager, _memory_interface
     if _memory_interface is None:
-        _memory_manager = MemoryManager()
-        _memory_interface = MCPMemoryInterface(_memory_manager)
-        logger.info("Memory system initialized successfully")
+        with _memory_lock:
+            if _memory_interface is None:
+                from src.memory.multi_domain_memory_system import MemoryManager, MCPMemoryInterface
+
+                _mark_startup("memory_module_imported")
+                _memory_manager = MemoryManager()
+                _memory_interface = MCPMemoryInterface(_memory_manager)
+                _mark_startup("memory_system_ready")
+                logger.info("Memory system initialized successfully")
+                log_startup_profile()
     return _memory_interface
 
 
+async def memory_interface():
+    """get_memory_interface for tool handlers; initialization runs off the event loop"""
+    if _memory_interface is not None:
+        return _memory_interface
+    return await asyncio.to_thread(get_memory_interface)
+
+
+def start_warmup():
+    """Initialize the memory system in the background while the client handshake runs"""
+
+    def warmup():
+        try:
+            get_memory_interface()
+        except Exception as e:
+            # The first tool call retries and reports the error to the client
+            logger.warning(f"Memory system warm-up failed: {e}")
+
+    threading.Thread(target=warmup, name="memory-warmup", daemon=True).start()
+
+
 @mcp.tool()
-def store_memory(
+@admission.tool(WRITE)
+async def store_memory(
     domain: str,
     content_data: dict,
     source: str,
@@ -106,7 +187,8 @@ def store_memory(
     Returns:
         Dictionary with status and memory_id
     """
-    return get_memory_interface().mcp_store_memory(
+    interface = await memory_interface()
+    return await interface.amcp_store_memory(
         domain=domain,
         content_data=content_data,
         source=source,
@@ -118,7 +200,61 @@ def store_memory(
 
 
 @mcp.tool()
-def retrieve_memories(
+@admission.tool(WRITE)
+async def store_memories_batch(memories: List[dict]) -> dict:
+    """
+    Store several memory entries with one bulk write.
+
+    Args:
+        memories: List of memories, each with the store_memory arguments
+                  (domain, content_data, source, and optionally content_type,
+                  subdomain, tags, confidence). At most MCP_MEMORY_MAX_BATCH_SIZE
+                  (default 100) per call.
+
+    Returns:
+        Dictionary with overall status, per-item results (index, status,
+        memory_id or error) and stored/duplicates/failed counts
+    """
+    interface = await memory_interface()
+    return await interface.amcp_store_memories_batch(memories=memories)
+
+
+@mcp.tool()
+@admission.tool(READ)
+async def retrieve_by_ids(
+    memory_ids: List[str],
+    fields: Optional[List[str]] = None,
+    summary: bool = False,
+    max_bytes: Optional[int] = None,
+    max_chars_per_field: Optional[int] = None,
+) -> dict:
+    """
+    Fetch several memories by id.
+
+    Args:
+        memory_ids: Memory ids (at most MCP_MEMORY_MAX_BATCH_SIZE, default 100)
+        fields: Memory fields to return, e.g. ["id", "tags", "timestamp"] (default: all)
+        summary: Return only metadata fields (no content), cheapest to fetch
+        max_bytes: Cap on the serialized memories; memories past it are omitted
+        max_chars_per_field: Truncate longer strings (marked "...[truncated N chars]")
+
+    Returns:
+        Dictionary with the found memories, the list of missing ids and
+        truncation counts
+    """
+    interface = await memory_interface()
+    return await interface.amcp_retrieve_by_ids(
+        memory_ids=memory_ids,
+        fields=fields,
+        summary=summary,
+        max_bytes=max_bytes,
+        max_chars_per_field=max_chars_per_field,
+    )
+
+
+@mcp.tool()
+@admission.tool(READ)
+async def retrieve_memories(
     domain: Optional[str] = None,
     content_type: Optional[str] = None,
     tags: Optional[List[str]] = None,
@@ -126,6 +262,10 @@ def retrieve_memories(
     keyword: Optional[str] = None,
     limit: int = 100,
     offset: int = 0,
+    fields: Optional[List[str]] = None,
+    summary: bool = False,
+    max_bytes: Optional[int] = None,
+    max_chars_per_field: Optional[int] = None,
 ) -> dict:
     """
     Retrieve memories with filtering options.
@@ -138,11 +278,17 @@ def retrieve_memories(
         keyword: Search by keyword
         limit: Maximum results (default: 100)
         offset: Offset for pagination (default: 0)
+        fields: Memory fields to return, e.g. ["id", "tags", "timestamp"] (default: all)
+        summary: Return only metadata fields (no content), cheapest to fetch
+        max_bytes: Cap on the serialized memories; memories past it are omitted
+        max_chars_per_field: Truncate longer strings (marked "...[truncated N chars]")
 
     Returns:
-        Dictionary with list of memories
+        Dictionary with list of memories ("truncated"/"omitted" report what
+        max_chars_per_field and max_bytes cut or left out)
     """
-    memories = get_memory_interface().mcp_retrieve_memories(
+    interface = await memory_interface()
+    return await interface.amcp_retrieve_memories(
         domain=domain,
         content_type=content_type,
         tags=tags,
@@ -150,12 +296,16 @@ def retrieve_memories(
         keyword=keyword,
         limit=limit,
         offset=offset,
+        fields=fields,
+        summary=summary,
+        max_bytes=max_bytes,
+        max_chars_per_field=max_chars_per_field,
     )
-    return {"memories": memories}
 
 
 @mcp.tool()
-def search_memories_advanced(
+@admission.tool(READ)
+async def search_memories_advanced(
     domain: Optional[str] = None,
     content_type: Optional[str] = None,
     tags: Optional[List[str]] = None,
@@ -165,6 +315,10 @@ def search_memories_advanced(
     min_confidence: float = 0.0,
     max_confidence: float = 1.0,
     limit: int = 100,
+    fields: Optional[List[str]] = None,
+    summary: bool = False,
+    max_bytes: Optional[int] = None,
+    max_chars_per_field: Optional[int] = None,
 ) -> dict:
     """
     Advanced search with multiple filters and keywords.
@@ -179,11 +333,16 @@ def search_memories_advanced(
         min_confidence: Minimum confidence score (default: 0.0)
         max_confidence: Maximum confidence score (default: 1.0)
         limit: Maximum results (default: 100)
+        fields: Memory fields to return, e.g. ["id", "tags", "timestamp"] (default: all)
+        summary: Return only metadata fields (no content), cheapest to fetch
+        max_bytes: Cap on the serialized memories; memories past it are omitted
+        max_chars_per_field: Truncate longer strings (marked "...[truncated N chars]")
 
     Returns:
         Dictionary with search results and metadata
     """
-    return get_memory_interface().mcp_search_memories_advanced(
+    interface = await memory_interface()
+    return await interface.amcp_search_memories_advanced(
         domain=domain,
         content_type=content_type,
         tags=tags,
@@ -193,11 +352,16 @@ def search_memories_advanced(
         min_confidence=min_confidence,
         max_confidence=max_confidence,
         limit=limit,
+        fields=fields,
+        summary=summary,
+        max_bytes=max_bytes,
+        max_chars_per_field=max_chars_per_field,
     )
 
 
 @mcp.tool()
-def expand_keywords(domain: str, user_query: str, max_keywords: int = 15) -> dict:
+@admission.tool(READ)
+async def expand_keywords(domain: str, user_query: str, max_keywords: int = 15) -> dict:
     """
     Expand user query with domain-specific keywords.
 
@@ -209,25 +373,112 @@ def expand_keywords(domain: str, user_query: str, max_keywords: int = 15) -> dic
     Returns:
         Dictionary with expanded keywords
     """
-    return get_memory_interface().mcp_expand_keywords(
+    interface = await memory_interface()
+    return await interface.amcp_expand_keywords(
         domain=domain, user_query=user_query, max_keywords=max_keywords
     )
 
 
 @mcp.tool()
-def get_memory_statistics() -> dict:
+@admission.tool(READ)
+async def expand_and_search(
+    domain: str,
+    query: str,
+    max_keywords: int = 5,
+    limit: int = 20,
+    content_type: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+    fields: Optional[List[str]] = None,
+    summary: bool = False,
+    max_bytes: Optional[int] = None,
+    max_chars_per_field: Optional[int] = None,
+) -> dict:
+    """
+    Expand a query with related keywords and search the query and every
+    keyword at once. Use this instead of expand_keywords followed by one
+    retrieve_memories call per keyword.
+
+    Args:
+        domain: Domain to search (bmad_code, website_info, religious_discussions, electronics_maker)
+        query: Search query to expand
+        max_keywords: Expanded keywords searched besides the query (default: 5)
+        limit: Maximum results (default: 20)
+        content_type: Filter by content type
+        tags: Filter by tags
+        fields: Memory fields to return, e.g. ["id", "tags", "timestamp"] (default: all)
+        summary: Return only metadata fields (no content), cheapest to fetch
+        max_bytes: Cap on the serialized memories; memories past it are omitted
+        max_chars_per_field: Truncate longer strings (marked "...[truncated N chars]")
+
+    Returns:
+        Dictionary with the fused, de-duplicated memories (best first,
+        relevance_score is the fused rank score), the expanded keywords and
+        the hit count of each sub-query
+    """
+    interface = await memory_interface()
+    return await interface.amcp_expand_and_search(
+        domain=domain,
+        query=query,
+        max_keywords=max_keywords,
+        limit=limit,
+        content_type=content_type,
+        tags=tags,
+        fields=fields,
+        summary=summary,
+        max_bytes=max_bytes,
+        max_chars_per_field=max_chars_per_field,
+    )
+
+
+@mcp.tool()
+@admission.tool(READ)
+async def get_memory_statistics() -> dict:
     """
     Get memory system statistics.
 
     Returns:
         Dictionary with memory system statistics including total memories,
-        domain distribution, and content type distribution.
+        domain distribution, content type distribution, and tool admission
+        (lane occupancy, rejections, queue wait and execution times).
+    """
+    interface = await memory_interface()
+    response = await interface.amcp_get_memory_statistics()
+    if response.get("status") == "success":
+        response["statistics"]["admission"] = admission.get_statistics()
+    return response
+
+
+@mcp.tool()
+async def get_performance_metrics() -> dict:
+    """
+    Get in-process performance metrics (not subject to admission limits).
+
+    Returns:
+        Dictionary with latency histograms (count, mean, p50/p90/p99/p99.9,
+        max in ms) per MCP tool and per backend operation (sqlite, chromadb,
+        local_vector, embedding, serialization), error and cache counters,
+        and tool admission state. With several HTTP workers the figures
+        are those of the worker (pid) that answered.
     """
-    return get_memory_interface().mcp_get_memory_statistics()
+    return {
+        "status": "success",
+        "pid": os.getpid(),
+        "metrics": metrics.snapshot(),
+        "admission": admission.get_statistics(),
+    }
+
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def prometheus_metrics(request):
+    """Prometheus scrape endpoint (HTTP mode)"""
+    from starlette.responses import PlainTextResponse
+
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
 
 
 @mcp.tool()
-def get_similar_memories(memory_id: str, limit: int = 10) -> dict:
+@admission.tool(READ)
+async def get_similar_memories(memory_id: str, limit: int = 10) -> dict:
     """
     Find memories similar to a given memory ID.
 
@@ -238,13 +489,15 @@ def get_similar_memories(memory_id: str, limit: int = 10) -> dict:
     Returns:
         Dictionary with similar memories
     """
-    return get_memory_interface().mcp_get_similar_memories(
+    interface = await memory_interface()
+    return await interface.amcp_get_similar_memories(
         memory_id=memory_id, limit=limit
     )
 
 
 @mcp.tool()
-def get_keyword_trends(domain: str, days: int = 30) -> dict:
+@admission.tool(READ)
+async def get_keyword_trends(domain: str, days: int = 30) -> dict:
     """
     Analyze keyword trends in a domain.
 
@@ -255,26 +508,53 @@ def get_keyword_trends(domain: str, days: int = 30) -> dict:
     Returns:
         Dictionary with keyword trends analysis
     """
-    return get_memory_interface().mcp_get_keyword_trends(domain=domain, days=days)
+    interface = await memory_interface()
+    return await interface.amcp_get_keyword_trends(domain=domain, days=days)
+
+
+def run_http_server(
+    host: str = "0.0.0.0",
+    port: int = 8200,
+    transport: str = "sse",
+    workers: int = 1,
+    warmup: bool = True,
+):
+    """Run the MCP server over HTTP (SSE or streamable HTTP) in one or more worker processes"""
+    import uvicorn
 
+    if transport == "streamable-http":
+        # Any worker may receive any request, so no session state is kept between
+        # requests (the tools never message the client outside a call anyway)
+        mcp.settings.stateless_http = True
+        mcp.settings.json_response = True
+        app = mcp.streamable_http_app()
+        endpoint = mcp.settings.streamable_http_path
+    else:
+        app = mcp.sse_app()
+        endpoint = mcp.settings.sse_path
 
-def run_http_server(host: str = "0.0.0.0", port: int = 8200):
-    """Run the MCP server in HTTP/SSE mode for network access"""
-    import uvicorn
+    logger.info(f"Starting Memory System MCP Server on http://{host}:{port} ({workers} worker(s))")
+    logger.info(f"MCP endpoint: http://{host}:{port}{endpoint}")
+    logger.info(f"Prometheus metrics: http://{host}:{port}/metrics")
 
-    logger.info(f"Starting Memory System MCP Server on http://{host}:{port}")
-    logger.info(f"MCP endpoint: http://{host}:{port}/sse")
+    config = uvicorn.Config(app, host=host, port=port, log_level="info")
+    if workers == 1:
+        if warmup:
+            start_warmup()
+        uvicorn.Server(config).run()
+        return
 
-    # Get the ASGI app for SSE transport (transport_security already configured above)
-    app = mcp.sse_app()
+    from src.memory.workers import bind_tcp_socket, run_workers
 
-    # Run with uvicorn
-    uvicorn.run(
-        app,
-        host=host,
-        port=port,
-        log_level="info",
-    )
+    sock = bind_tcp_socket(host, port, backlog=config.backlog)
+
+    def serve(index: int):
+        # Threads do not survive fork, so each worker warms up after it starts
+        if warmup:
+            start_warmup()
+        uvicorn.Server(config).run(sockets=[sock])
+
+    run_workers(workers, serve)
 
 
 def run_stdio_server():
@@ -283,6 +563,12 @@ def run_stdio_server():
     mcp.run()
 
 
+def warmup_enabled(no_warmup: bool) -> bool:
+    if no_warmup:
+        return False
+    return os.environ.get("MCP_MEMORY_WARMUP", "1").lower() not in ("0", "false", "no")
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Multi-Domain Memory System MCP Server"
@@ -303,10 +589,46 @@ if __name__ == "__main__":
         default=8200,
         help="Port to listen on in HTTP mode (default: 8200)",
     )
+    parser.add_argument(
+        "--transport",
+        choices=["sse", "streamable-http"],
+        default=os.environ.get("MCP_MEMORY_TRANSPORT"),
+        help="HTTP transport (default: sse with one worker, streamable-http with several)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("MCP_MEMORY_WORKERS", "1")),
+        help="Worker processes in HTTP mode (default: env MCP_MEMORY_WORKERS or 1)",
+    )
+    parser.add_argument(
+        "--no-warmup",
+        action="store_true",
+        help="Initialize the memory system on the first tool call instead of at startup",
+    )
 
     args = parser.parse_args()
 
+    transport = args.transport or ("sse" if args.workers == 1 else "streamable-http")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > 1:
+        if not args.http:
+            parser.error("--workers requires --http")
+        if transport == "sse":
+            parser.error("SSE sessions cannot be shared between workers, use --transport streamable-http")
+        if os.environ.get("MEMORY_VECTOR_BACKEND") == "local":
+            # Each process would hold its own copy of the index and miss the others' writes
+            parser.error("The local vector backend is single-process, run it with one worker")
+
+    _mark_startup("server_starting")
+    warmup = warmup_enabled(args.no_warmup)
+
     if args.http:
-        run_http_server(host=args.host, port=args.port)
+        run_http_server(
+            host=args.host, port=args.port, transport=transport, workers=args.workers, warmup=warmup
+        )
     else:
+        if warmup:
+            start_warmup()
         run_stdio_server()
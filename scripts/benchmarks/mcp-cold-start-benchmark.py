@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark for the stdio MCP server
+Spawns .opencode/mcp/memory-system-mcp-server.py the way an editor does and
+measures, from process spawn, the time to the initialize response and to the
+first successful tool response (get_memory_statistics), with and without the
+background warm-up. With --importtime it also prints an import-time breakdown
+by top-level package (python -X importtime).
+
+The server runs against the local vector backend in a temporary cache
+directory, so no ChromaDB server is needed; set --backend chromadb to measure
+against the configured CHROMADB_HOST/CHROMADB_PORT instead.
+
+Usage: python scripts/benchmarks/mcp-cold-start-benchmark.py [--runs N] [--importtime]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+SERVER = os.path.join(PROJECT_ROOT, ".opencode", "mcp", "memory-system-mcp-server.py")
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def rpc(process, message):
+    process.stdin.write(json.dumps(message) + "\n")
+    process.stdin.flush()
+
+
+def read_response(process, request_id):
+    while True:
+        line = process.stdout.readline()
+        if not line:
+            raise RuntimeError("server exited before responding")
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            return message
+
+
+def run_once(env, python_flags=()):
+    """Spawn the server; returns (ms to initialize response, ms to first tool response, stderr)"""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, *python_flags, SERVER],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        env=env,
+        cwd=PROJECT_ROOT,
+    )
+    try:
+        rpc(process, {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "initialize",
+            "params": {
+                "protocolVersion": "2025-06-18",
+                "capabilities": {},
+                "clientInfo": {"name": "cold-start-benchmark", "version": "1.0"},
+            },
+        })
+        read_response(process, 1)
+        initialized = time.perf_counter()
+
+        rpc(process, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        rpc(process, {
+            "jsonrpc": "2.0",
+            "id": 2,
+            "method": "tools/call",
+            "params": {"name": "get_memory_statistics", "arguments": {}},
+        })
+        response = read_response(process, 2)
+        first_tool = time.perf_counter()
+        if "error" in response or response["result"].get("isError"):
+            raise RuntimeError(f"tool call failed: {response}")
+    finally:
+        process.stdin.close()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        stderr = process.stderr.read()
+        process.stdout.close()
+        process.stderr.close()
+
+    return (initialized - started) * 1000, (first_tool - started) * 1000, stderr
+
+
+def import_breakdown(stderr, top=12):
+    """Cumulative import time (ms) of each top-level package imported by the script"""
+    totals = defaultdict(float)
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        # Unindented lines are imports made directly by the script (or site)
+        if match and not match.group(3):
+            totals[match.group(4).split(".")[0]] += int(match.group(2)) / 1000
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--backend", default="local", choices=("local", "chromadb"))
+    parser.add_argument("--importtime", action="store_true", help="Print an import-time breakdown")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, MEMORY_VECTOR_BACKEND=args.backend, MEMORY_CACHE_DIR=cache_dir)
+
+        print(f"{args.runs} runs per mode, median (min) ms from spawn")
+        print(f"{'mode':<10} {'initialize':>16} {'first tool':>16}")
+        for mode, warmup in (("warm-up", "1"), ("no warm-up", "0")):
+            runs = [run_once(dict(env, MCP_MEMORY_WARMUP=warmup))[:2] for _ in range(args.runs)]
+            init_ms, tool_ms = zip(*runs)
+            print(
+                f"{mode:<10} {statistics.median(init_ms):>9.0f} ({min(init_ms):>4.0f}) "
+                f"{statistics.median(tool_ms):>9.0f} ({min(tool_ms):>4.0f})"
+            )
+
+        _, _, stderr = run_once(env)
+        profile = [line for line in stderr.splitlines() if "Startup profile" in line or "over budget" in line]
+        if profile:
+            print(profile[-1].split(" - ")[-1])
+
+        if args.importtime:
+            _, _, stderr = run_once(env, python_flags=("-X", "importtime"))
+            print(f"\n{'top-level import':<32} {'cumulative ms':>14}")
+            for name, ms in import_breakdown(stderr):
+                print(f"{name:<32} {ms:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Read throughput benchmark for the multi-process HTTP MCP server
+Starts .opencode/mcp/memory-system-mcp-server.py with --http --workers N for
+each requested N and drives it with client processes that POST JSON-RPC
+tools/call requests (retrieve_memories listings) to the streamable-HTTP
+endpoint in a closed loop, reporting calls/s and latency percentiles.
+
+ChromaDB is replaced by the in-memory stub from the unit tests, seeded with
+memories, and the servers share a read replica, so listings are served
+locally and the work measured is the server's own CPU time (filtering,
+shaping, JSON serialization). Throughput can only scale up to the number of
+cores; run with --clients at least 2x the largest worker count.
+
+Usage: python scripts/benchmarks/mcp-multiprocess-benchmark.py [--workers 1,2,4] [--duration 10]
+"""
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+SERVER = os.path.join(PROJECT_ROOT, ".opencode", "mcp", "memory-system-mcp-server.py")
+sys.path.insert(0, PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "tests", "unit"))
+
+from chromadb_stub import ChromaDBStub  # noqa: E402
+
+DOMAIN = "bmad_code"
+HEADERS = {"Content-Type": "application/json", "Accept": "application/json, text/event-stream"}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def tool_call(name, arguments, request_id=1) -> bytes:
+    return json.dumps({
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": name, "arguments": arguments},
+    }).encode()
+
+
+def post(conn, body: bytes) -> dict:
+    conn.request("POST", "/mcp", body=body, headers=HEADERS)
+    response = conn.getresponse()
+    payload = response.read()
+    if response.status != 200:
+        raise RuntimeError(f"HTTP {response.status}: {payload[:200]!r}")
+    return json.loads(payload)
+
+
+def seed(env, memories: int):
+    """Store the benchmark memories through the server process' own code path"""
+    from src.memory.multi_domain_memory_system import MemoryManager
+
+    saved = dict(os.environ)
+    os.environ.update(env)
+    try:
+        manager = MemoryManager()
+        for start in range(0, memories, manager.max_batch_size):
+            manager.store_conversations([
+                {
+                    "domain": DOMAIN,
+                    "conversation_data": {
+                        "code_type": "python",
+                        "code_snippet": f"def handler_{i}(request):\n    return process(request, {i})\n" * 4,
+                        "description": f"Request handler number {i} for the benchmark service",
+                        "conversation_context": "benchmark seed data",
+                    },
+                    "source": "benchmark",
+                    "tags": ["benchmark", f"group-{i % 10}"],
+                }
+                for i in range(start, min(start + manager.max_batch_size, memories))
+            ])
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+
+
+def wait_ready(port, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    body = tool_call("get_memory_statistics", {})
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            reply = post(conn, body)
+            conn.close()
+            if "result" in reply:
+                return
+        except (OSError, RuntimeError, http.client.HTTPException):
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} not ready after {timeout:.0f}s")
+
+
+def client(port, duration, limit, results):
+    """Closed-loop client: one keep-alive connection, one call in flight"""
+    body = tool_call("retrieve_memories", {"domain": DOMAIN, "limit": limit})
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            reply = post(conn, body)
+            if reply.get("result", {}).get("isError") or "error" in reply:
+                errors += 1
+        except (OSError, RuntimeError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+            continue
+        latencies.append(time.perf_counter() - started)
+    conn.close()
+    results.put((latencies, errors))
+
+
+def worker_pids(port, probes=50):
+    """Distinct worker pids answering get_performance_metrics over fresh connections"""
+    pids = set()
+    for _ in range(probes):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        reply = post(conn, tool_call("get_performance_metrics", {}))
+        conn.close()
+        content = reply["result"].get("structuredContent") or json.loads(reply["result"]["content"][0]["text"])
+        pids.add(content["pid"])
+    return pids
+
+
+def run(workers, env, args):
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, SERVER, "--http", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--transport", "streamable-http"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env=env,
+        cwd=PROJECT_ROOT,
+    )
+    try:
+        wait_ready(port)
+        # Warm every worker (replica sync, memory system init) before measuring
+        warm = [multiprocessing.Process(target=client, args=(port, 2.0, args.limit, multiprocessing.Queue()))
+                for _ in range(args.clients)]
+        for p in warm:
+            p.start()
+        for p in warm:
+            p.join()
+
+        results = multiprocessing.Queue()
+        clients = [
+            multiprocessing.Process(target=client, args=(port, args.duration, args.limit, results))
+            for _ in range(args.clients)
+        ]
+        for p in clients:
+            p.start()
+        collected = [results.get() for _ in clients]
+        for p in clients:
+            p.join()
+        pids = worker_pids(port)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    latencies = sorted(l for ls, _ in collected for l in ls)
+    errors = sum(e for _, e in collected)
+    pct = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0.0
+    return {
+        "workers": workers,
+        "answering_workers": len(pids),
+        "calls": len(latencies),
+        "errors": errors,
+        "calls_per_s": len(latencies) / args.duration,
+        "p50_ms": pct(0.50),
+        "p99_ms": pct(0.99),
+        "mean_ms": statistics.mean(latencies) * 1000 if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts (default: 1,2,4)")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent client processes (default: 16)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per measurement (default: 10)")
+    parser.add_argument("--memories", type=int, default=2000, help="Memories seeded (default: 2000)")
+    parser.add_argument("--limit", type=int, default=50, help="Memories per listing (default: 50)")
+    args = parser.parse_args()
+
+    stub = ChromaDBStub().start()
+    with tempfile.TemporaryDirectory(prefix="mcp-multiprocess-") as cache_dir:
+        env = dict(
+            os.environ,
+            PYTHONPATH=PROJECT_ROOT,
+            MEMORY_VECTOR_BACKEND="chromadb",
+            CHROMADB_HOST="127.0.0.1",
+            CHROMADB_PORT=str(stub.port),
+            MEMORY_CACHE_DIR=cache_dir,
+            CHROMADB_REPLICA_PATH=os.path.join(cache_dir, "replica.db"),
+        )
+        seed(env, args.memories)
+
+        print(f"{os.cpu_count()} CPUs, {args.clients} clients, {args.memories} memories, "
+              f"limit {args.limit}, {args.duration:.0f}s per run")
+        print(f"{'workers':>7} {'answering':>9} {'calls/s':>9} {'speedup':>7} {'p50 ms':>8} {'p99 ms':>8} {'errors':>6}")
+        baseline = None
+        for workers in (int(w) for w in args.workers.split(",")):
+            result = run(workers, env, args)
+            baseline = baseline or result["calls_per_s"]
+            print(
+                f"{result['workers']:>7} {result['answering_workers']:>9} {result['calls_per_s']:>9.1f} "
+                f"{result['calls_per_s'] / baseline:>6.2f}x {result['p50_ms']:>8.1f} "
+                f"{result['p99_ms']:>8.1f} {result['errors']:>6}"
+            )
+    stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+MemoryEntry representation benchmark
+Compares the slotted, interned MemoryEntry and its sharing to_dict() against
+the previous plain dataclass with dataclasses.asdict(): per-entry memory,
+construction time and serialization time (to_dict and to_dict + json.dumps)
+over a result set shaped like ChromaDB search results.
+
+Usage: python scripts/benchmarks/memory-entry-benchmark.py [--entries N] [--repeat R]
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.memory.multi_domain_memory_system import MemoryEntry
+
+
+@dataclass
+class LegacyMemoryEntry:
+    """MemoryEntry as it was before slots/interning (to_dict via asdict)"""
+
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    domain: str = ""
+    subdomain: Optional[str] = None
+    content_type: str = "conversation"
+    content_data: Dict[str, Any] = field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    tags: List[str] = field(default_factory=list)
+    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    source: str = ""
+    confidence: float = 1.0
+    context: Dict[str, Any] = field(default_factory=dict)
+    relevance_score: float = field(default=0.0, repr=False)
+    similarity_score: float = field(default=0.0, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+DOMAINS = ("bmad_code", "website_info", "religious_discussions", "electronics_maker")
+
+
+def make_results(count: int) -> List[Dict[str, Any]]:
+    """Result dicts as produced by parsing a backend response (fresh strings per row)"""
+    results = []
+    for i in range(count):
+        results.append({
+            "id": str(uuid.uuid4()),
+            # json.loads creates a new string object per row, as parsing does
+            "domain": json.loads(json.dumps(DOMAINS[i % len(DOMAINS)])),
+            "content_type": json.loads('"conversation"'),
+            "source": json.loads(json.dumps(f"session_{i % 20}")),
+            "subdomain": None,
+            "content_data": {
+                "code_snippet": f"def handler_{i}(request):\n    return process(request, {i})\n" * 4,
+                "conversation_context": f"Discussion {i} about request handlers",
+                "project_id": f"proj_{i % 50}",
+            },
+            "metadata": {"created_at": datetime.utcnow().isoformat(), "version": "1.0"},
+            "tags": ["python", "handlers", f"batch_{i % 10}"],
+            "timestamp": datetime.utcnow().isoformat(),
+            "confidence": 0.9,
+            "context": {},
+            "similarity_score": 0.5,
+        })
+    return results
+
+
+def build(cls, results):
+    return [cls(**r) for r in results]
+
+
+def measure_memory(cls, count: int) -> float:
+    """Bytes per entry retained once the parsed rows are dropped (payloads included)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    results = make_results(count)
+    entries = build(cls, results)
+    del results
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del entries
+    return (after - before) / count
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run(args):
+    results = make_results(args.entries)
+    print(f"{args.entries} entries, best of {args.repeat}")
+    print(f"{'representation':<16} {'bytes/entry':>12} {'build ms':>10} {'to_dict ms':>11} {'+json ms':>10}")
+
+    for name, cls in (("dataclass+asdict", LegacyMemoryEntry), ("slotted", MemoryEntry)):
+        per_entry = measure_memory(cls, args.entries)
+        entries = build(cls, results)
+        build_s = best_of(args.repeat, lambda: build(cls, results))
+        to_dict_s = best_of(args.repeat, lambda: [e.to_dict() for e in entries])
+        json_s = best_of(args.repeat, lambda: json.dumps([e.to_dict() for e in entries]))
+        print(
+            f"{name:<16} {per_entry:>12.0f} {build_s * 1000:>10.1f} "
+            f"{to_dict_s * 1000:>11.1f} {json_s * 1000:>10.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Admission Control for MCP Tool Calls
+Tool calls are admitted through two lanes, reads and writes, each with its
+own concurrency limit and bounded wait queue, plus optional per-tool limits.
+A call that finds its lane busy and the queue full is rejected at once with
+a retry-after hint instead of piling up, and slow ingest can only ever take
+the write lane's slots, so lookups keep flowing under bursty load.
+"""
+
+import asyncio
+import functools
+import logging
+import math
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+try:
+    from .metrics import TOOL_DURATION, TOOL_ERRORS, TOOL_QUEUE_WAIT, TOOL_REJECTED, metrics
+except ImportError:
+    from metrics import TOOL_DURATION, TOOL_ERRORS, TOOL_QUEUE_WAIT, TOOL_REJECTED, metrics
+
+logger = logging.getLogger(__name__)
+
+READ = "read"
+WRITE = "write"
+LANES = (READ, WRITE)
+
+# lane -> (concurrent calls, calls allowed to wait for a slot)
+DEFAULT_LANE_LIMITS = {READ: (8, 64), WRITE: (2, 16)}
+
+# Tools that are expensive enough to be limited below their lane
+# (expand_and_search fans out into one search per expanded keyword)
+DEFAULT_TOOL_LIMITS = {"store_memories_batch": 1, "get_keyword_trends": 2, "expand_and_search": 4}
+
+MIN_RETRY_AFTER = 1
+MAX_RETRY_AFTER = 60
+
+
+class Overloaded(Exception):
+    """A lane is saturated and its wait queue is full"""
+
+    def __init__(self, tool: str, lane: str, retry_after: int):
+        super().__init__(f"{lane} lane is saturated, retry {tool} after {retry_after}s")
+        self.tool = tool
+        self.lane = lane
+        self.retry_after = retry_after
+
+
+def parse_tool_limits(spec: Optional[str]) -> Dict[str, int]:
+    """Parse "tool=limit,tool=limit" (env MCP_MEMORY_TOOL_LIMITS)"""
+    limits = {}
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        name, _, value = item.partition("=")
+        if not value.strip():
+            raise ValueError(f"Invalid tool limit {item!r}, expected tool=limit")
+        limits[name.strip()] = int(value)
+    return limits
+
+
+class _Lane:
+    __slots__ = ("name", "concurrency", "max_queue", "semaphore", "active", "waiting", "rejected")
+
+    def __init__(self, name: str, concurrency: int, max_queue: int):
+        if concurrency < 1 or max_queue < 0:
+            raise ValueError(f"Invalid {name} lane limits: concurrency={concurrency}, queue={max_queue}")
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+
+
+class _ToolStats:
+    __slots__ = ("calls", "errors", "rejected", "wait_total", "wait_max", "exec_total", "exec_max")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rejected = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.exec_total = 0.0
+        self.exec_max = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        calls = self.calls
+        return {
+            "calls": calls,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "queue_wait_ms": {
+                "mean": self.wait_total / calls * 1000 if calls else 0.0,
+                "max": self.wait_max * 1000,
+            },
+            "execution_ms": {
+                "mean": self.exec_total / calls * 1000 if calls else 0.0,
+                "max": self.exec_max * 1000,
+            },
+        }
+
+
+class AdmissionController:
+    """
+    Bounded, lane-separated admission of async tool calls.
+
+    All bookkeeping happens on the event loop thread, so one controller
+    serves one event loop (the MCP server's). Queue wait (time until both
+    the tool and lane slots are held) and execution time are recorded per
+    tool, here and as histograms in the metrics registry.
+    """
+
+    def __init__(
+        self,
+        read_concurrency: Optional[int] = None,
+        write_concurrency: Optional[int] = None,
+        read_queue: Optional[int] = None,
+        write_queue: Optional[int] = None,
+        tool_limits: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Args:
+            read_concurrency: Concurrent read tool calls
+                              (default: from env MCP_MEMORY_READ_CONCURRENCY or 8)
+            write_concurrency: Concurrent write tool calls
+                               (default: from env MCP_MEMORY_WRITE_CONCURRENCY or 2)
+            read_queue: Read calls allowed to wait for a slot before new ones are
+                        rejected (default: from env MCP_MEMORY_READ_QUEUE or 64)
+            write_queue: Same for writes (default: from env MCP_MEMORY_WRITE_QUEUE or 16)
+            tool_limits: Per-tool concurrency limits, on top of DEFAULT_TOOL_LIMITS
+                         (default: from env MCP_MEMORY_TOOL_LIMITS, "tool=n,tool=n")
+        """
+        settings = {
+            READ: (read_concurrency, read_queue),
+            WRITE: (write_concurrency, write_queue),
+        }
+        self._lanes: Dict[str, _Lane] = {}
+        for lane, (concurrency, queue) in settings.items():
+            default_concurrency, default_queue = DEFAULT_LANE_LIMITS[lane]
+            prefix = f"MCP_MEMORY_{lane.upper()}"
+            self._lanes[lane] = _Lane(
+                lane,
+                int(concurrency or os.environ.get(f"{prefix}_CONCURRENCY", default_concurrency)),
+                int(queue if queue is not None else os.environ.get(f"{prefix}_QUEUE", default_queue)),
+            )
+
+        limits = dict(DEFAULT_TOOL_LIMITS)
+        limits.update(
+            tool_limits if tool_limits is not None
+            else parse_tool_limits(os.environ.get("MCP_MEMORY_TOOL_LIMITS"))
+        )
+        self.tool_limits = limits
+        self._tool_semaphores: Dict[str, asyncio.Semaphore] = {
+            name: asyncio.Semaphore(limit) for name, limit in limits.items() if limit > 0
+        }
+        self._stats: Dict[str, _ToolStats] = {}
+
+    def _retry_after(self, lane: _Lane) -> int:
+        """Seconds until the calls ahead are likely to have drained"""
+        durations = [s.exec_total / s.calls for s in self._stats.values() if s.calls]
+        mean = sum(durations) / len(durations) if durations else 0.0
+        estimate = math.ceil((lane.waiting + lane.active) / lane.concurrency * mean)
+        return max(MIN_RETRY_AFTER, min(MAX_RETRY_AFTER, estimate))
+
+    async def run(self, tool: str, lane: str, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Await func(*args, **kwargs) once admitted.
+
+        Raises Overloaded without waiting when the lane has no free slot and
+        its queue is full.
+        """
+        lane_state = self._lanes[lane]
+        stats = self._stats.get(tool)
+        if stats is None:
+            stats = self._stats[tool] = _ToolStats()
+
+        tool_semaphore = self._tool_semaphores.get(tool)
+        busy = lane_state.semaphore.locked() or (tool_semaphore is not None and tool_semaphore.locked())
+        if busy and lane_state.waiting >= lane_state.max_queue:
+            lane_state.rejected += 1
+            stats.rejected += 1
+            metrics.increment(TOOL_REJECTED, tool=tool, lane=lane)
+            raise Overloaded(tool, lane, self._retry_after(lane_state))
+
+        # Tool slot first: a call held back by its tool limit must not occupy a lane slot
+        semaphores = [s for s in (tool_semaphore, lane_state.semaphore) if s is not None]
+        acquired: List[asyncio.Semaphore] = []
+        queued = time.perf_counter()
+        lane_state.waiting += 1
+        try:
+            for semaphore in semaphores:
+                await semaphore.acquire()
+                acquired.append(semaphore)
+        except BaseException:
+            for semaphore in acquired:
+                semaphore.release()
+            raise
+        finally:
+            lane_state.waiting -= 1
+
+        started = time.perf_counter()
+        wait = started - queued
+        lane_state.active += 1
+        try:
+            return await func(*args, **kwargs)
+        except Exception:
+            stats.errors += 1
+            metrics.increment(TOOL_ERRORS, tool=tool)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            lane_state.active -= 1
+            for semaphore in acquired:
+                semaphore.release()
+            stats.calls += 1
+            stats.wait_total += wait
+            stats.wait_max = max(stats.wait_max, wait)
+            stats.exec_total += elapsed
+            stats.exec_max = max(stats.exec_max, elapsed)
+            metrics.observe(TOOL_QUEUE_WAIT, wait, tool=tool)
+            metrics.observe(TOOL_DURATION, elapsed, tool=tool)
+
+    def tool(self, lane: str):
+        """
+        Decorator admitting an async MCP tool through a lane.
+
+        A rejected call returns an error response with "retry_after"
+        (seconds) instead of raising, so the client can back off.
+        """
+        if lane not in LANES:
+            raise ValueError(f"Unknown lane: {lane}")
+
+        def decorator(func):
+            name = func.__name__
+
+            @functools.wraps(func)
+            async def admitted(*args, **kwargs):
+                try:
+                    return await self.run(name, lane, func, *args, **kwargs)
+                except Overloaded as e:
+                    logger.warning(f"Rejected {name}: {e}")
+                    return {
+                        "status": "error",
+                        "error": "overloaded",
+                        "message": str(e),
+                        "retry_after": e.retry_after,
+                    }
+
+            return admitted
+
+        return decorator
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            "lanes": {
+                name: {
+                    "concurrency": lane.concurrency,
+                    "max_queue": lane.max_queue,
+                    "active": lane.active,
+                    "waiting": lane.waiting,
+                    "rejected": lane.rejected,
+                }
+                for name, lane in self._lanes.items()
+            },
+            "tool_limits": dict(self.tool_limits),
+            "tools": {name: stats.snapshot() for name, stats in self._stats.items()},
+        }
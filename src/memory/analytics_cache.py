@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Analytics Result Cache
+expand_keywords (which scans stored memories) and get_keyword_trends are
+recomputed from the same data every time an agent repeats them. Results are
+cached per (analytic, domain, normalized query, parameters) for a TTL and
+tagged with the domain's write generation: any store or update in the
+domain, by any process sharing the change counter, makes them stale at once.
+Concurrent misses for one key share a single computation.
+"""
+
+import copy
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from .metrics import metrics
+    from .singleflight import SingleFlight, make_key
+except ImportError:
+    from metrics import metrics
+    from singleflight import SingleFlight, make_key
+
+DEFAULT_TTL = 300.0
+DEFAULT_MAX_ENTRIES = 256
+
+# Trend windows (days) kept warm by the background precompute
+TREND_WINDOWS = (7, 30, 90)
+
+
+def normalize_query(query: str) -> str:
+    """Lowercased, de-duplicated, sorted words: the only part of a query expand_keywords uses"""
+    return " ".join(sorted(set(re.findall(r"\b\w+\b", query.lower()))))
+
+
+class _Entry:
+    __slots__ = ("value", "generation", "expires_at")
+
+    def __init__(self, value: Any, generation: int, expires_at: float):
+        self.value = value
+        self.generation = generation
+        self.expires_at = expires_at
+
+
+class AnalyticsCache:
+    """LRU of analytic results, invalidated by TTL and domain write generation"""
+
+    def __init__(
+        self,
+        generation: Callable[[str], int],
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        clone: Callable[[Any], Any] = copy.deepcopy,
+    ):
+        """
+        Args:
+            generation: Current write generation of a domain
+                        (MemoryManager.write_generation)
+            ttl: Seconds a result is served (default: env MCP_MEMORY_ANALYTICS_TTL
+                 or 300; 0 disables caching)
+            max_entries: Results kept, least recently used evicted first
+                         (default: env MCP_MEMORY_ANALYTICS_CACHE_SIZE or 256)
+            clone: Copy handed to each caller, so callers may mutate results
+        """
+        self.generation = generation
+        self.ttl = float(ttl if ttl is not None else os.environ.get("MCP_MEMORY_ANALYTICS_TTL", DEFAULT_TTL))
+        self.max_entries = int(
+            max_entries or os.environ.get("MCP_MEMORY_ANALYTICS_CACHE_SIZE", DEFAULT_MAX_ENTRIES)
+        )
+        self.clone = clone
+        self.lock = threading.RLock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._flight = SingleFlight("analytics", clone=lambda value: value)
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "invalidated": 0, "evicted": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get_or_compute(
+        self,
+        analytic: str,
+        domain: str,
+        compute: Callable[[], Any],
+        refresh_ahead: float = 0.0,
+        **params,
+    ) -> Any:
+        """
+        Cached result of compute() for (analytic, domain, params).
+
+        refresh_ahead treats results expiring within that many seconds as
+        stale, which lets a background refresh replace them before callers
+        see a miss.
+        """
+        if not self.enabled:
+            return compute()
+
+        key = make_key(analytic, domain=domain, **params)
+        generation = self.generation(domain)
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.generation != generation:
+                    self.stats["invalidated"] += 1
+                    del self._entries[key]
+                elif entry.expires_at - refresh_ahead <= time.monotonic():
+                    self.stats["expired"] += 1
+                    del self._entries[key]
+                else:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    metrics.cache_lookup(f"analytics:{analytic}", hits=1)
+                    return self.clone(entry.value)
+            self.stats["misses"] += 1
+        metrics.cache_lookup(f"analytics:{analytic}", misses=1)
+
+        # Tagged with the generation read before computing: a write during the
+        # computation makes the result stale straight away
+        value = self._flight.do(key, lambda: self._compute(key, generation, compute))
+        return self.clone(value)
+
+    def _compute(self, key: str, generation: int, compute: Callable[[], Any]) -> Any:
+        value = compute()
+        with self.lock:
+            self._entries[key] = _Entry(value, generation, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evicted"] += 1
+        return value
+
+    def clear(self):
+        with self.lock:
+            self._entries.clear()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self.lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        stats["ttl"] = self.ttl
+        return stats
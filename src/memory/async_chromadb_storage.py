@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+Asyncio ChromaDB Storage Backend for Multi-Domain Memory System
+Non-blocking counterpart of ChromaDBStorage for the HTTP MCP server: many
+concurrent tool calls share one event loop and one pooled HTTP client.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    from .chromadb_storage import HEDGE_MIN_DELAY, HEDGE_MIN_SAMPLES, HEDGED_ACTIONS, ChromaDBStorage
+    from .filters import build_where_filter
+    from .metrics import metrics
+    from .resilience import CircuitOpenError, Deadline
+    from .singleflight import make_key
+except ImportError:
+    from chromadb_storage import HEDGE_MIN_DELAY, HEDGE_MIN_SAMPLES, HEDGED_ACTIONS, ChromaDBStorage
+    from filters import build_where_filter
+    from metrics import metrics
+    from resilience import CircuitOpenError, Deadline
+    from singleflight import make_key
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncChromaDBStorage:
+    """
+    Asyncio front end over a ChromaDBStorage instance.
+
+    Payload building, result parsing, collection ids, circuit breakers,
+    latency windows, the id index and the read replica are all shared with
+    the wrapped sync storage; only the HTTP transport differs. Local SQLite
+    bookkeeping (id index, replica) and CPU-bound work (embeddings,
+    compression, document decoding) run in an executor so they never block
+    the event loop.
+    """
+
+    def __init__(
+        self,
+        storage: ChromaDBStorage,
+        max_connections: Optional[int] = None,
+        executor=None,
+    ):
+        """
+        Args:
+            storage: Sync storage whose configuration and local state are shared
+            max_connections: HTTP connection pool size
+                             (default: from env CHROMADB_MAX_CONNECTIONS or 100)
+            executor: Executor for local and CPU-bound work (default: the loop's default)
+        """
+        if httpx is None:
+            raise ImportError("httpx is required for AsyncChromaDBStorage")
+        if storage.transport != "http":
+            raise ValueError(f"AsyncChromaDBStorage needs an HTTP storage, got {storage.transport}")
+
+        self.storage = storage
+        self.domains = storage.domains
+        self.max_connections = int(
+            max_connections or os.environ.get("CHROMADB_MAX_CONNECTIONS", "100")
+        )
+        self._executor = executor
+        self._client = None
+        self._client_loop = None
+
+    def _get_client(self) -> "httpx.AsyncClient":
+        """Pooled client, created on (and bound to) the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.storage.base_url,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=min(self.max_connections, 20),
+                ),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _run_local(self, func: Callable, *args, **kwargs) -> Any:
+        """Run blocking local work (SQLite, embeddings, decoding) off the event loop"""
+        if kwargs:
+            func = functools.partial(func, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    # -- transport ---------------------------------------------------------
+
+    async def _request_json(
+        self,
+        method: str,
+        path: str,
+        payload: Optional[Dict[str, Any]] = None,
+        timeout: float = 30,
+    ) -> Any:
+        """Issue a request against the ChromaDB HTTP API and decode the JSON reply"""
+        response = await self._get_client().request(method, path, json=payload, timeout=timeout)
+        response.raise_for_status()
+        return response.json() if response.content else None
+
+    async def _collection_request(
+        self,
+        domain: str,
+        action: str,
+        payload: Optional[Dict[str, Any]] = None,
+        method: str = "POST",
+        timeout: float = 30,
+        deadline: Optional[Deadline] = None,
+    ) -> Any:
+        """Call a collection endpoint, re-resolving the collection once if its cached id is stale"""
+        for attempt in range(2):
+            info = self.storage._collections.get(domain)
+            collection_id = info["id"] if info else await self._run_local(
+                self.storage._get_collection_id, domain
+            )
+            if not collection_id:
+                raise ValueError(f"Collection not found for domain: {domain}")
+
+            capped = deadline.cap(timeout) if deadline else timeout
+            try:
+                return await self._guarded_request(
+                    action,
+                    method,
+                    f"/api/v1/collections/{collection_id}/{action}",
+                    payload,
+                    capped,
+                    deadline_capped=capped < timeout,
+                )
+            except httpx.HTTPStatusError as e:
+                response = e.response
+                if attempt or not (response.status_code == 404 or b"does not exist" in response.content):
+                    raise
+                logger.warning(f"Collection id for {domain} is stale, re-resolving")
+                await self._run_local(self.storage._invalidate_collection, domain)
+
+    async def _guarded_request(
+        self,
+        action: str,
+        method: str,
+        path: str,
+        payload: Optional[Dict[str, Any]],
+        timeout: float,
+        deadline_capped: bool = False,
+    ) -> Any:
+        """Issue a request under the action's circuit breaker (shared with the sync storage)"""
+        breaker = self.storage._breaker(action)
+        if not breaker.allow():
+            raise CircuitOpenError(f"ChromaDB {action} circuit is open")
+
+        started = time.perf_counter()
+        try:
+            with metrics.timer("chromadb", action):
+                if action in HEDGED_ACTIONS:
+                    result = await self._hedged_request(action, method, path, payload, timeout)
+                else:
+                    result = await self._request_json(method, path, payload, timeout)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        except httpx.TimeoutException:
+            if deadline_capped:
+                breaker.record_neutral()
+            else:
+                breaker.record_failure()
+            raise
+        except asyncio.CancelledError:
+            # Cancelled by the caller's deadline: not the server's fault, but free a half-open probe
+            breaker.record_neutral()
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+
+        breaker.record_success()
+        self.storage._latency_tracker(action).record(time.perf_counter() - started)
+        return result
+
+    async def _hedged_request(
+        self,
+        action: str,
+        method: str,
+        path: str,
+        payload: Optional[Dict[str, Any]],
+        timeout: float,
+    ) -> Any:
+        """Hedge a slow idempotent read with a duplicate; the loser is cancelled"""
+        storage = self.storage
+        tracker = storage._latency_tracker(action)
+        delay = None
+        if storage.hedge_percentile and len(tracker) >= HEDGE_MIN_SAMPLES:
+            delay = max(tracker.percentile(storage.hedge_percentile), HEDGE_MIN_DELAY)
+        if delay is None or delay >= timeout:
+            return await self._request_json(method, path, payload, timeout)
+
+        primary = asyncio.ensure_future(self._request_json(method, path, payload, timeout))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        storage._count_resilience("hedged")
+        hedge = asyncio.ensure_future(
+            self._request_json(method, path, payload, max(timeout - delay, HEDGE_MIN_DELAY))
+        )
+        pending = {primary, hedge}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            storage._count_resilience("hedge_wins")
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    # -- memory operations -------------------------------------------------
+
+    async def store_memory(
+        self,
+        domain: str,
+        memory_id: str,
+        content_data: Dict[str, Any],
+        metadata: Dict[str, Any],
+        tags: List[str],
+        timestamp: str,
+        source: str,
+        confidence: float,
+        context: Dict[str, Any],
+        subdomain: Optional[str] = None,
+        content_type: str = "conversation",
+    ) -> str:
+        """Store a memory entry in ChromaDB"""
+        embedding, document, chroma_metadata = await self._run_local(
+            self.storage._prepare_memory,
+            domain=domain,
+            content_data=content_data,
+            metadata=metadata,
+            tags=tags,
+            timestamp=timestamp,
+            source=source,
+            confidence=confidence,
+            context=context,
+            subdomain=subdomain,
+            content_type=content_type,
+        )
+
+        try:
+            await self._collection_request(domain, "add", {
+                "ids": [memory_id],
+                "embeddings": [embedding],
+                "documents": [document],
+                "metadatas": [chroma_metadata],
+            })
+            await self._run_local(self.storage._record_stored, domain, memory_id, document, chroma_metadata)
+
+            logger.info(f"Stored memory {memory_id} in {domain}")
+            return memory_id
+
+        except Exception as e:
+            logger.error(f"Failed to store memory: {e}")
+            raise
+
+    async def search_memories(
+        self,
+        query: str = None,
+        domain: Optional[str] = None,
+        content_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        source: Optional[str] = None,
+        limit: int = 100,
+        min_confidence: float = 0.0,
+        include: Optional[List[str]] = None,
+        max_confidence: float = 1.0,
+        date_range: Optional[tuple] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Search memories; same arguments, partial-result and coalescing semantics as ChromaDBStorage"""
+        params = dict(
+            query=query,
+            domain=domain,
+            content_type=content_type,
+            tags=tags,
+            source=source,
+            limit=limit,
+            min_confidence=min_confidence,
+            include=include,
+            max_confidence=max_confidence,
+            date_range=date_range,
+            timeout=timeout,
+        )
+        flight = self.storage._search_flight
+        if flight is None:
+            return await self._search_memories(**params)
+        return await flight.ado(
+            make_key("search_memories", **params), lambda: self._search_memories(**params)
+        )
+
+    async def _search_memories(
+        self,
+        query: Optional[str],
+        domain: Optional[str],
+        content_type: Optional[str],
+        tags: Optional[List[str]],
+        source: Optional[str],
+        limit: int,
+        min_confidence: float,
+        include: Optional[List[str]],
+        max_confidence: float,
+        date_range: Optional[tuple],
+        timeout: Optional[float],
+    ) -> List[Dict[str, Any]]:
+        domains_to_search = [domain] if domain else self.domains
+        deadline = Deadline(timeout if timeout is not None else self.storage.search_deadline)
+        where_filter = build_where_filter(
+            content_type=content_type,
+            source=source,
+            tags=tags,
+            min_confidence=min_confidence,
+            max_confidence=max_confidence,
+            date_range=date_range,
+        )
+
+        tasks = {
+            d: asyncio.ensure_future(self._search_domain(d, query, where_filter, limit, include, deadline))
+            for d in domains_to_search
+        }
+        done, pending = await asyncio.wait(tasks.values(), timeout=deadline.remaining())
+        for task in pending:
+            task.cancel()
+
+        results = []
+        missing = []
+        for d, task in tasks.items():
+            if task not in done:
+                logger.warning(f"Search of domain {d} missed the deadline")
+                missing.append(d)
+            elif task.exception() is not None:
+                logger.warning(f"Failed to search domain {d}: {task.exception()!r}")
+                missing.append(d)
+            else:
+                results.extend(task.result())
+
+        if missing:
+            self.storage._count_resilience("partial_results")
+        return await self._run_local(self.storage._finish_search, results, limit)
+
+    async def _search_domain(
+        self,
+        domain: str,
+        query: Optional[str],
+        where_filter: Optional[Dict[str, Any]],
+        limit: int,
+        include: Optional[List[str]],
+        deadline: Deadline,
+    ) -> List[Dict[str, Any]]:
+        """Search one domain (documents are left undecoded)"""
+        storage = self.storage
+        if not query and storage._replica and await self._run_local(
+            storage._replica_listing_ready, domain, include
+        ):
+            result = await self._run_local(storage._replica.list_domain, domain, where_filter, limit)
+            return await self._run_local(
+                storage._parse_chroma_results, storage._project(result, include), domain, decode_documents=False
+            )
+
+        # Building a query payload embeds the query text
+        action, payload = await self._run_local(storage._search_payload, query, where_filter, limit, include)
+        result = await self._collection_request(domain, action, payload, deadline=deadline)
+        if not query and storage._replica:
+            await self._run_local(storage._replica_put, domain, result)
+        return await self._run_local(storage._parse_chroma_results, result, domain, decode_documents=False)
+
+    async def get_memory(
+        self, domain: str, memory_id: str, include: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get a specific memory by ID"""
+        storage = self.storage
+        payload = {"ids": [memory_id]}
+        if include is not None:
+            payload["include"] = storage._validate_include(include, query=False)
+
+        try:
+            if storage._replica:
+                cached = await self._run_local(storage._replica_get, [memory_id], include, domain)
+                if memory_id in cached:
+                    return cached[memory_id]
+
+            result = await self._collection_request(domain, "get", payload)
+            if storage._replica:
+                await self._run_local(storage._replica_put, domain, result)
+            memories = await self._run_local(storage._parse_chroma_results, result, domain)
+            return memories[0] if memories else None
+
+        except Exception as e:
+            logger.error(f"Failed to get memory {memory_id}: {e}")
+            return None
+
+    async def existing_ids(self, domain: str, memory_ids: List[str]) -> Set[str]:
+        """Ids of memory_ids present in a domain's collection (one id-only /get)"""
+        if not memory_ids:
+            return set()
+        result = await self._collection_request(domain, "get", {"ids": list(memory_ids), "include": []})
+        return set(result.get("ids") or [])
+
+    async def delete_memory(self, domain: str, memory_id: str) -> bool:
+        """Delete a memory entry"""
+        try:
+            await self._collection_request(domain, "delete", {"ids": [memory_id]})
+            await self._run_local(self.storage._record_deleted, domain, [memory_id])
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete memory {memory_id}: {e}")
+            return False
+
+    async def get_statistics(self) -> Dict[str, Any]:
+        """Get memory system statistics, counting all domains concurrently"""
+        stats = await self._run_local(self.storage._base_statistics)
+
+        counts = await asyncio.gather(
+            *(self._collection_request(d, "count", method="GET", timeout=10) for d in self.domains),
+            return_exceptions=True,
+        )
+        for domain, count in zip(self.domains, counts):
+            if isinstance(count, Exception):
+                logger.warning(f"Failed to get count for {domain}: {count}")
+                count = 0
+            stats["domain_distribution"][domain] = int(count)
+            stats["total_memories"] += int(count)
+        return stats
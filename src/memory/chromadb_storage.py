@@ -8,34 +8,98 @@ import json
 import uuid
 import logging
 import os
-from typing import Dict, List, Any, Optional
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Any, Optional, Set
 from datetime import datetime
 import hashlib
 
 try:
-    import chromadb
-    from chromadb.config import Settings
+    import ijson
 except ImportError:
-    chromadb = None
-    Settings = None
+    ijson = None
 
 try:
-    import httpx
+    from .id_index import MemoryIdIndex, default_cache_dir
+    from .invalidation import ChangeCounter
+    from .replica import MemoryReplica
+    from .resilience import CircuitBreaker, CircuitOpenError, Deadline, LatencyTracker
+    from .singleflight import SingleFlight, coalescing_enabled, make_key
+    from .compression import PayloadCompressor
+    from .metrics import metrics
+    from .filters import (
+        METADATA_SCHEMA_VERSION,
+        REVISION_KEY,
+        build_where_filter,
+        new_revision,
+        tag_metadata,
+        timestamp_to_epoch,
+        upgrade_metadata,
+    )
 except ImportError:
-    httpx = None
+    from id_index import MemoryIdIndex, default_cache_dir
+    from invalidation import ChangeCounter
+    from replica import MemoryReplica
+    from resilience import CircuitBreaker, CircuitOpenError, Deadline, LatencyTracker
+    from singleflight import SingleFlight, coalescing_enabled, make_key
+    from compression import PayloadCompressor
+    from metrics import metrics
+    from filters import (
+        METADATA_SCHEMA_VERSION,
+        REVISION_KEY,
+        build_where_filter,
+        new_revision,
+        tag_metadata,
+        timestamp_to_epoch,
+        upgrade_metadata,
+    )
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bump when the on-disk collection cache format changes
+COLLECTION_CACHE_VERSION = 1
+
+# Responses larger than this are decoded incrementally instead of buffered whole
+STREAM_DECODE_THRESHOLD = 256 * 1024
+
+# Fields ChromaDB can return; "include" projections are validated against these
+INCLUDE_FIELDS = ("documents", "metadatas", "distances", "embeddings")
+
+# Domains larger than this are not mirrored whole into the read replica
+REPLICA_SYNC_MAX_ROWS = 20000
+REPLICA_SYNC_PAGE_SIZE = 500
+
+# Rows per multi-id /add request in store_memories
+ADD_BATCH_SIZE = 256
+
+# Idempotent collection reads that may be hedged with a duplicate request
+HEDGED_ACTIONS = ("query", "get", "count")
+
+# Hedging starts once an action has this many latency samples
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MIN_DELAY = 0.02
+
 
 class ChromaDBStorage:
     """ChromaDB-based storage for multi-domain memory system"""
 
+    # Collection calls go over HTTP (AsyncChromaDBStorage can share this instance)
+    transport = "http"
+
     def __init__(
         self,
         host: str = None,
         port: int = None,
         collection_prefix: str = "memory_",
+        id_index_path: str = None,
+        collection_cache_path: str = None,
+        background_heartbeat: Optional[bool] = None,
+        replica_path: str = None,
+        search_deadline: Optional[float] = None,
+        hedge_percentile: Optional[float] = None,
+        coalesce_searches: Optional[bool] = None,
+        compressor: Optional[PayloadCompressor] = None,
     ):
         """
         Initialize ChromaDB connection.
@@ -44,7 +108,28 @@ class ChromaDBStorage:
             host: ChromaDB server host (default: from env or 192.168.68.69)
             port: ChromaDB server port (default: from env or 8001)
             collection_prefix: Prefix for collection names
+            id_index_path: SQLite file for the id -> domain routing index
+                           (default: from env CHROMADB_ID_INDEX_PATH or the local cache dir)
+            collection_cache_path: JSON file caching collection ids between runs
+                                   (default: from env CHROMADB_COLLECTION_CACHE or the local cache dir)
+            background_heartbeat: Run the startup heartbeat in a background thread instead
+                                  of blocking (default: from env CHROMADB_BACKGROUND_HEARTBEAT)
+            replica_path: SQLite read replica serving id lookups and filter-only listings
+                          locally (default: from env CHROMADB_REPLICA_PATH, unset disables it;
+                          TTLs from CHROMADB_REPLICA_TTL / CHROMADB_REPLICA_SYNC_TTL)
+            search_deadline: Seconds a search_memories call may take across all domains before
+                             returning partial results (default: from env
+                             CHROMADB_SEARCH_DEADLINE or 15)
+            hedge_percentile: Latency percentile after which an idempotent read is duplicated
+                              (default: from env CHROMADB_HEDGE_PERCENTILE or 95; 0 disables).
+                              Circuit breakers are tuned by CHROMADB_BREAKER_FAILURES and
+                              CHROMADB_BREAKER_RESET.
+            coalesce_searches: Let concurrent identical search_memories calls share one
+                               backend call (default: from env MCP_MEMORY_COALESCE, on)
+            compressor: Compression of large documents (default: PayloadCompressor
+                        configured from env MCP_MEMORY_COMPRESSION*)
         """
+        started = time.perf_counter()
         self.host = host or os.environ.get("CHROMADB_HOST", "192.168.68.69")
         self.port = int(port or os.environ.get("CHROMADB_PORT", "8001"))
         self.collection_prefix = collection_prefix
@@ -60,32 +145,369 @@ class ChromaDBStorage:
 
         self._client = None
         self._collections = {}
+        self._collections_lock = threading.RLock()
+        self._collections_listed = False
+        self._collection_cache_path = collection_cache_path or os.environ.get(
+            "CHROMADB_COLLECTION_CACHE",
+            os.path.join(default_cache_dir(), "chromadb_collections.json"),
+        )
+        if background_heartbeat is None:
+            background_heartbeat = os.environ.get(
+                "CHROMADB_BACKGROUND_HEARTBEAT", ""
+            ).lower() in ("1", "true", "yes")
+        self.background_heartbeat = background_heartbeat
+        self.heartbeat_status = {"ok": None, "error": None, "checked_at": None}
+        self._compressor = compressor or PayloadCompressor()
+        self._id_index = self._open_id_index(id_index_path)
+        self._replica = self._open_replica(replica_path)
+        # Content-hash dedup index and hybrid-search FTS mirror told about deletions (set by MemoryManager)
+        self.content_index = None
+        self.lexical_index = None
+        # Kept in the replica file so syncs also notice writes from other server processes
+        self._replica_changes = ChangeCounter(self._replica.db_path) if self._replica else None
+
+        # Resilience: per-endpoint breakers, latency windows for hedging, search deadline
+        self.search_deadline = float(
+            search_deadline if search_deadline is not None
+            else os.environ.get("CHROMADB_SEARCH_DEADLINE", "15")
+        )
+        self.hedge_percentile = float(
+            hedge_percentile if hedge_percentile is not None
+            else os.environ.get("CHROMADB_HEDGE_PERCENTILE", "95")
+        )
+        self._breaker_failures = int(os.environ.get("CHROMADB_BREAKER_FAILURES", "5"))
+        self._breaker_reset = float(os.environ.get("CHROMADB_BREAKER_RESET", "30"))
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latency: Dict[str, LatencyTracker] = {}
+        self._resilience_lock = threading.Lock()
+        self._hedge_executor = None
+        self._search_executor = None
+        self.resilience_stats = {"hedged": 0, "hedge_wins": 0, "partial_results": 0}
+        self._search_flight = (
+            SingleFlight("chromadb.search_memories") if coalescing_enabled(coalesce_searches) else None
+        )
         self._initialize()
+        self.startup_time_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"ChromaDB storage ready in {self.startup_time_ms:.1f} ms")
+
+    def _open_id_index(self, id_index_path: Optional[str]) -> Optional[MemoryIdIndex]:
+        """Open the id -> domain routing index (lookups still work without it, just slower)"""
+        path = id_index_path or os.environ.get(
+            "CHROMADB_ID_INDEX_PATH",
+            os.path.join(default_cache_dir(), "chromadb_id_index.db"),
+        )
+        try:
+            return MemoryIdIndex(path)
+        except Exception as e:
+            logger.warning(f"ID routing index unavailable at {path}: {e}")
+            return None
+
+    def _open_replica(self, replica_path: Optional[str]) -> Optional[MemoryReplica]:
+        """Open the local read replica if one is configured"""
+        path = replica_path or os.environ.get("CHROMADB_REPLICA_PATH")
+        if not path:
+            return None
+        try:
+            return MemoryReplica(
+                path,
+                row_ttl=float(os.environ.get("CHROMADB_REPLICA_TTL", "300")),
+                sync_ttl=float(os.environ.get("CHROMADB_REPLICA_SYNC_TTL", "300")),
+            )
+        except Exception as e:
+            logger.warning(f"Read replica unavailable at {path}: {e}")
+            return None
+
+    def _request_json(
+        self,
+        method: str,
+        path: str,
+        payload: Optional[Dict[str, Any]] = None,
+        timeout: float = 30,
+    ) -> Any:
+        """Issue a request against the ChromaDB HTTP API and decode the JSON reply"""
+        import urllib.request
+
+        data = json.dumps(payload).encode() if payload is not None else None
+        req = urllib.request.Request(f"{self.base_url}{path}", data=data, method=method)
+        if data is not None:
+            req.add_header("Content-Type", "application/json")
+
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            return self._read_json(response)
+
+    @staticmethod
+    def _read_json(response) -> Any:
+        """
+        Decode a JSON response body.
+
+        Bodies above STREAM_DECODE_THRESHOLD are decoded incrementally from the
+        socket with ijson when it is installed, so the raw body is never held
+        in memory next to the decoded objects.
+        """
+        length = int(response.headers.get("Content-Length") or 0)
+        if ijson is not None and length > STREAM_DECODE_THRESHOLD:
+            return {key: value for key, value in ijson.kvitems(response, "", use_float=True)}
+
+        body = response.read()
+        return json.loads(body) if body else None
 
     def _initialize(self):
-        """Initialize ChromaDB client and collections"""
+        """Initialize ChromaDB client; collections are resolved lazily on first use"""
         try:
             # Always use direct HTTP API for maximum compatibility
             # The chromadb Python client has version compatibility issues
             logger.info(f"Using HTTP API for ChromaDB at {self.base_url}")
             self._client = None
 
+            self._load_collection_cache()
+
             # Test connection
-            import urllib.request
-            url = f"{self.base_url}/api/v1/heartbeat"
-            req = urllib.request.Request(url, method="GET")
-            with urllib.request.urlopen(req, timeout=5) as response:
-                result = response.read().decode()
-                logger.info(f"ChromaDB heartbeat: {result}")
-
-            # Ensure collections exist for each domain
-            for domain in self.domains:
-                self._ensure_collection(domain)
+            if self.background_heartbeat:
+                threading.Thread(
+                    target=self._heartbeat_worker, name="chromadb-heartbeat", daemon=True
+                ).start()
+            else:
+                self._heartbeat()
 
         except Exception as e:
             logger.error(f"Failed to initialize ChromaDB: {e}")
             raise
 
+    def _heartbeat(self):
+        """Check that the ChromaDB server is reachable"""
+        try:
+            result = self._request_json("GET", "/api/v1/heartbeat", timeout=5)
+            self.heartbeat_status = {"ok": True, "error": None, "checked_at": time.time()}
+            logger.info(f"ChromaDB heartbeat: {result}")
+        except Exception as e:
+            self.heartbeat_status = {"ok": False, "error": str(e), "checked_at": time.time()}
+            raise
+
+    def _heartbeat_worker(self):
+        """Background heartbeat used when startup must not block on the network"""
+        try:
+            self._heartbeat()
+        except Exception as e:
+            logger.error(f"ChromaDB heartbeat failed: {e}")
+
+    def _load_collection_cache(self):
+        """Load collection ids cached by a previous run, discarding anything that doesn't match"""
+        if not self._collection_cache_path:
+            return
+        try:
+            with open(self._collection_cache_path) as f:
+                cached = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable collection cache: {e}")
+            return
+
+        if (
+            not isinstance(cached, dict)
+            or cached.get("version") != COLLECTION_CACHE_VERSION
+            or cached.get("base_url") != self.base_url
+            or cached.get("collection_prefix") != self.collection_prefix
+        ):
+            return
+
+        for domain, info in (cached.get("collections") or {}).items():
+            if (
+                domain in self.domains
+                and isinstance(info, dict)
+                and isinstance(info.get("id"), str)
+                and info.get("name") == f"{self.collection_prefix}{domain}"
+            ):
+                self._collections[domain] = {"id": info["id"], "name": info["name"]}
+
+    def _save_collection_cache(self):
+        """Persist resolved collection ids (atomic replace)"""
+        if not self._collection_cache_path:
+            return
+        payload = {
+            "version": COLLECTION_CACHE_VERSION,
+            "base_url": self.base_url,
+            "collection_prefix": self.collection_prefix,
+            "collections": dict(self._collections),
+        }
+        tmp_path = f"{self._collection_cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self._collection_cache_path)), exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self._collection_cache_path)
+        except OSError as e:
+            logger.warning(f"Failed to write collection cache: {e}")
+
+    def _get_collection_id(self, domain: str) -> Optional[str]:
+        """Resolve the collection id of a domain, listing/creating collections on first use"""
+        info = self._collections.get(domain)
+        if info:
+            metrics.cache_lookup("collection_id", hits=1)
+            return info["id"]
+        if domain not in self.domains:
+            return None
+
+        metrics.cache_lookup("collection_id", misses=1)
+        with self._collections_lock:
+            if domain not in self._collections:
+                self._ensure_collection(domain)
+            info = self._collections.get(domain)
+        return info["id"] if info else None
+
+    def _invalidate_collection(self, domain: str):
+        """Drop a cached collection id that the server no longer recognises"""
+        with self._collections_lock:
+            self._collections.pop(domain, None)
+            self._collections_listed = False
+            self._save_collection_cache()
+
+    def _collection_request(
+        self,
+        domain: str,
+        action: str,
+        payload: Optional[Dict[str, Any]] = None,
+        method: str = "POST",
+        timeout: float = 30,
+        deadline: Optional[Deadline] = None,
+    ) -> Any:
+        """Call a collection endpoint, re-resolving the collection once if its cached id is stale"""
+        import urllib.error
+
+        for attempt in range(2):
+            collection_id = self._get_collection_id(domain)
+            if not collection_id:
+                raise ValueError(f"Collection not found for domain: {domain}")
+
+            capped = deadline.cap(timeout) if deadline else timeout
+            try:
+                return self._guarded_request(
+                    action,
+                    method,
+                    f"/api/v1/collections/{collection_id}/{action}",
+                    payload,
+                    capped,
+                    deadline_capped=capped < timeout,
+                )
+            except urllib.error.HTTPError as e:
+                body = e.read() or b""
+                if attempt or not (e.code == 404 or b"does not exist" in body):
+                    raise
+                logger.warning(f"Collection id for {domain} is stale, re-resolving")
+                self._invalidate_collection(domain)
+
+    def _breaker(self, action: str) -> CircuitBreaker:
+        with self._resilience_lock:
+            breaker = self._breakers.get(action)
+            if breaker is None:
+                breaker = CircuitBreaker(action, self._breaker_failures, self._breaker_reset)
+                self._breakers[action] = breaker
+            return breaker
+
+    def _count_resilience(self, stat: str):
+        """Increment a resilience_stats counter (called from hedge and search threads)"""
+        with self._resilience_lock:
+            self.resilience_stats[stat] += 1
+
+    def _latency_tracker(self, action: str) -> LatencyTracker:
+        with self._resilience_lock:
+            return self._latency.setdefault(action, LatencyTracker())
+
+    def _guarded_request(
+        self,
+        action: str,
+        method: str,
+        path: str,
+        payload: Optional[Dict[str, Any]],
+        timeout: float,
+        deadline_capped: bool = False,
+    ) -> Any:
+        """
+        Issue a collection request under the action's circuit breaker.
+
+        Connection errors, timeouts and 5xx replies count as failures; 4xx
+        replies mean the server is healthy. A timeout shortened by the caller's
+        deadline (deadline_capped) counts as neither. Idempotent reads are hedged.
+        """
+        import socket
+        import urllib.error
+
+        breaker = self._breaker(action)
+        if not breaker.allow():
+            raise CircuitOpenError(f"ChromaDB {action} circuit is open")
+
+        started = time.perf_counter()
+        try:
+            with metrics.timer("chromadb", action):
+                if action in HEDGED_ACTIONS:
+                    result = self._hedged_request(action, method, path, payload, timeout)
+                else:
+                    result = self._request_json(method, path, payload, timeout)
+        except urllib.error.HTTPError as e:
+            if e.code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        except Exception as e:
+            timed_out = isinstance(e, socket.timeout) or isinstance(getattr(e, "reason", None), socket.timeout)
+            if deadline_capped and timed_out:
+                breaker.record_neutral()
+            else:
+                breaker.record_failure()
+            raise
+
+        breaker.record_success()
+        self._latency_tracker(action).record(time.perf_counter() - started)
+        return result
+
+    def _hedged_request(
+        self,
+        action: str,
+        method: str,
+        path: str,
+        payload: Optional[Dict[str, Any]],
+        timeout: float,
+    ) -> Any:
+        """
+        Send a read and, if it is slower than the action's hedge percentile,
+        a duplicate; the first successful reply wins.
+        """
+        tracker = self._latency_tracker(action)
+        delay = None
+        if self.hedge_percentile and len(tracker) >= HEDGE_MIN_SAMPLES:
+            delay = max(tracker.percentile(self.hedge_percentile), HEDGE_MIN_DELAY)
+        if delay is None or delay >= timeout:
+            return self._request_json(method, path, payload, timeout)
+
+        if self._hedge_executor is None:
+            with self._resilience_lock:
+                if self._hedge_executor is None:
+                    self._hedge_executor = ThreadPoolExecutor(
+                        max_workers=8, thread_name_prefix="chromadb-hedge"
+                    )
+
+        primary = self._hedge_executor.submit(self._request_json, method, path, payload, timeout)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        self._count_resilience("hedged")
+        hedge = self._hedge_executor.submit(
+            self._request_json, method, path, payload, max(timeout - delay, HEDGE_MIN_DELAY)
+        )
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self._count_resilience("hedge_wins")
+                    return future.result()
+                error = future.exception()
+        raise error
+
     def _ensure_collection(self, domain: str):
         """Ensure a collection exists for the domain"""
         collection_name = f"{self.collection_prefix}{domain}"
@@ -93,6 +515,7 @@ class ChromaDBStorage:
         try:
             # Use HTTP API for maximum compatibility
             self._ensure_collection_http(collection_name, domain)
+            self._save_collection_cache()
 
         except Exception as e:
             logger.error(f"Failed to ensure collection {collection_name}: {e}")
@@ -100,42 +523,44 @@ class ChromaDBStorage:
 
     def _ensure_collection_http(self, collection_name: str, domain: str):
         """Ensure collection exists via HTTP API"""
-        import urllib.request
         import urllib.error
 
-        # Check if collection exists
-        try:
-            url = f"{self.base_url}/api/v1/collections"
-            req = urllib.request.Request(url, method="GET")
-            with urllib.request.urlopen(req, timeout=10) as response:
-                collections = json.loads(response.read().decode())
+        # A single list call resolves every domain; later misses go straight to create
+        if not self._collections_listed:
+            try:
+                collections = self._request_json("GET", "/api/v1/collections", timeout=10)
+                names = {f"{self.collection_prefix}{d}": d for d in self.domains}
+                for col in collections:
+                    listed_domain = names.get(col.get("name"))
+                    if listed_domain:
+                        self._collections[listed_domain] = {"id": col["id"], "name": col["name"]}
+                self._collections_listed = True
 
-            for col in collections:
-                if col.get("name") == collection_name:
-                    self._collections[domain] = {"id": col["id"], "name": collection_name}
-                    return
+            except urllib.error.URLError as e:
+                logger.warning(f"Failed to list collections: {e}")
 
-        except urllib.error.URLError as e:
-            logger.warning(f"Failed to list collections: {e}")
+            if domain in self._collections:
+                return
 
         # Create collection if it doesn't exist
         try:
-            url = f"{self.base_url}/api/v1/collections"
-            data = json.dumps({
-                "name": collection_name,
-                "metadata": {"domain": domain, "description": f"Memory system for {domain}"}
-            }).encode()
-            req = urllib.request.Request(url, data=data, method="POST")
-            req.add_header("Content-Type", "application/json")
-
-            with urllib.request.urlopen(req, timeout=10) as response:
-                result = json.loads(response.read().decode())
-                self._collections[domain] = {"id": result.get("id"), "name": collection_name}
-                logger.info(f"Created collection: {collection_name}")
+            result = self._request_json(
+                "POST",
+                "/api/v1/collections",
+                {
+                    "name": collection_name,
+                    "metadata": {"domain": domain, "description": f"Memory system for {domain}"},
+                    "get_or_create": True,
+                },
+                timeout=10,
+            )
+            self._collections[domain] = {"id": result.get("id"), "name": collection_name}
+            logger.info(f"Created collection: {collection_name}")
 
         except urllib.error.URLError as e:
             logger.error(f"Failed to create collection {collection_name}: {e}")
 
+    @metrics.timed("embedding", "embed")
     def _generate_embedding_placeholder(self, text: str) -> List[float]:
         """
         Generate a simple hash-based embedding placeholder.
@@ -194,19 +619,132 @@ class ChromaDBStorage:
         content_type: str = "conversation",
     ) -> str:
         """Store a memory entry in ChromaDB"""
+        embedding, document, chroma_metadata = self._prepare_memory(
+            domain=domain,
+            content_data=content_data,
+            metadata=metadata,
+            tags=tags,
+            timestamp=timestamp,
+            source=source,
+            confidence=confidence,
+            context=context,
+            subdomain=subdomain,
+            content_type=content_type,
+        )
+
+        try:
+            # Always use HTTP API for compatibility
+            self._store_memory_http(domain, memory_id, embedding, document, chroma_metadata)
+            self._record_stored(domain, memory_id, document, chroma_metadata)
+
+            logger.info(f"Stored memory {memory_id} in {domain}")
+            return memory_id
+
+        except Exception as e:
+            logger.error(f"Failed to store memory: {e}")
+            raise
+
+    def _prepare_memory(
+        self,
+        domain: str,
+        content_data: Dict[str, Any],
+        metadata: Dict[str, Any],
+        tags: List[str],
+        timestamp: str,
+        source: str,
+        confidence: float,
+        context: Dict[str, Any],
+        subdomain: Optional[str] = None,
+        content_type: str = "conversation",
+    ) -> tuple:
+        """Build the (embedding, document, metadata) written to ChromaDB for a memory"""
+        text, document, chroma_metadata = self._prepare_record(
+            domain=domain,
+            content_data=content_data,
+            metadata=metadata,
+            tags=tags,
+            timestamp=timestamp,
+            source=source,
+            confidence=confidence,
+            context=context,
+            subdomain=subdomain,
+            content_type=content_type,
+        )
+        return self._generate_embedding_placeholder(text), document, chroma_metadata
+
+    def _prepare_record(
+        self,
+        domain: str,
+        content_data: Dict[str, Any],
+        metadata: Dict[str, Any],
+        tags: List[str],
+        timestamp: str,
+        source: str,
+        confidence: float,
+        context: Dict[str, Any],
+        subdomain: Optional[str] = None,
+        content_type: str = "conversation",
+    ) -> tuple:
+        """Build the (embedding text, document, metadata) of a memory"""
         if domain not in self.domains:
             raise ValueError(f"Invalid domain: {domain}")
 
-        # Generate embedding text
         text = self._text_for_embedding(content_data, metadata, context)
-        embedding = self._generate_embedding_placeholder(text)
 
-        # Prepare document and metadata for ChromaDB
-        document = json.dumps({
-            "content_data": content_data,
-            "context": context,
-        })
+        # Prepare document and metadata for ChromaDB (large documents are stored compressed)
+        document = self._compressor.compress(
+            json.dumps({
+                "content_data": content_data,
+                "context": context,
+            }),
+            domain,
+        )
+
+        chroma_metadata = self._build_chroma_metadata(
+            domain=domain,
+            metadata=metadata,
+            tags=tags,
+            timestamp=timestamp,
+            source=source,
+            confidence=confidence,
+            subdomain=subdomain,
+            content_type=content_type,
+        )
+        return text, document, chroma_metadata
+
+    def _generate_embeddings(self, texts: List[str]) -> List[Any]:
+        """Embed several texts at once (batch hook for bulk writes)"""
+        return [self._generate_embedding_placeholder(text) for text in texts]
+
+    def _record_stored(self, domain: str, memory_id: str, document: str, metadata: Dict[str, Any]):
+        """Update the local id index and read replica after a successful write"""
+        self._record_stored_many(domain, [memory_id], [document], [metadata])
+
+    def _record_stored_many(
+        self,
+        domain: str,
+        memory_ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+    ):
+        if self._id_index:
+            self._id_index.record_many((memory_id, domain) for memory_id in memory_ids)
+        if self._replica:
+            self._replica_written(domain)
+            self._replica.put_many(domain, memory_ids, documents, metadatas)
 
+    def _build_chroma_metadata(
+        self,
+        domain: str,
+        metadata: Dict[str, Any],
+        tags: List[str],
+        timestamp: str,
+        source: str,
+        confidence: float,
+        subdomain: Optional[str] = None,
+        content_type: str = "conversation",
+    ) -> Dict[str, Any]:
+        """Flatten a memory's filterable fields into ChromaDB metadata (see filters.py)"""
         chroma_metadata = {
             "domain": domain,
             "subdomain": subdomain or "",
@@ -216,18 +754,60 @@ class ChromaDBStorage:
             "source": source,
             "confidence": confidence,
             "metadata_json": json.dumps(metadata),
+            "schema_version": METADATA_SCHEMA_VERSION,
+            REVISION_KEY: new_revision(),
         }
+        epoch = timestamp_to_epoch(timestamp)
+        if epoch is not None:
+            chroma_metadata["timestamp_epoch"] = epoch
+        chroma_metadata.update(tag_metadata(tags))
+        return chroma_metadata
 
-        try:
-            # Always use HTTP API for compatibility
-            self._store_memory_http(domain, memory_id, embedding, document, chroma_metadata)
-
-            logger.info(f"Stored memory {memory_id} in {domain}")
-            return memory_id
-
-        except Exception as e:
-            logger.error(f"Failed to store memory: {e}")
-            raise
+    def store_memories(
+        self,
+        memories: List[Dict[str, Any]],
+        batch_size: int = ADD_BATCH_SIZE,
+        upsert: bool = False,
+    ) -> List[str]:
+        """
+        Store several memories with chunked multi-id writes.
+
+        Each memory is a dict of store_memory arguments (memory_id, domain,
+        content_data, ...). Memories are grouped by domain, each chunk of
+        batch_size is embedded in one _generate_embeddings call and written
+        with a single /add (or /upsert). /add leaves ids that already exist
+        untouched, so re-running a partially applied batch is safe. Raises on
+        the first failed chunk; returns the stored ids in input order.
+        """
+        by_domain: Dict[str, List[Dict[str, Any]]] = {}
+        for memory in memories:
+            if memory["domain"] not in self.domains:
+                raise ValueError(f"Invalid domain: {memory['domain']}")
+            by_domain.setdefault(memory["domain"], []).append(memory)
+
+        action = "upsert" if upsert else "add"
+        for domain, domain_memories in by_domain.items():
+            for start in range(0, len(domain_memories), batch_size):
+                chunk = domain_memories[start:start + batch_size]
+                ids, texts, documents, metadatas = [], [], [], []
+                for memory in chunk:
+                    fields = {k: v for k, v in memory.items() if k != "memory_id"}
+                    text, document, chroma_metadata = self._prepare_record(**fields)
+                    ids.append(memory["memory_id"])
+                    texts.append(text)
+                    documents.append(document)
+                    metadatas.append(chroma_metadata)
+
+                self._collection_request(domain, action, {
+                    "ids": ids,
+                    "embeddings": self._generate_embeddings(texts),
+                    "documents": documents,
+                    "metadatas": metadatas,
+                })
+                self._record_stored_many(domain, ids, documents, metadatas)
+
+            logger.info(f"Stored {len(domain_memories)} memories in {domain}")
+        return [memory["memory_id"] for memory in memories]
 
     def _store_memory_http(
         self,
@@ -238,27 +818,12 @@ class ChromaDBStorage:
         metadata: Dict[str, Any],
     ):
         """Store memory via HTTP API"""
-        import urllib.request
-
-        collection_info = self._collections.get(domain, {})
-        collection_id = collection_info.get("id")
-
-        if not collection_id:
-            raise ValueError(f"Collection not found for domain: {domain}")
-
-        url = f"{self.base_url}/api/v1/collections/{collection_id}/add"
-        data = json.dumps({
+        self._collection_request(domain, "add", {
             "ids": [memory_id],
             "embeddings": [embedding],
             "documents": [document],
             "metadatas": [metadata],
-        }).encode()
-
-        req = urllib.request.Request(url, data=data, method="POST")
-        req.add_header("Content-Type", "application/json")
-
-        with urllib.request.urlopen(req, timeout=30) as response:
-            response.read()
+        })
 
     def search_memories(
         self,
@@ -269,31 +834,121 @@ class ChromaDBStorage:
         source: Optional[str] = None,
         limit: int = 100,
         min_confidence: float = 0.0,
+        include: Optional[List[str]] = None,
+        max_confidence: float = 1.0,
+        date_range: Optional[tuple] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search memories with optional semantic search.
+
+        All filters (tags, confidence bounds, date_range as an ISO (start, end)
+        pair) are compiled into the ChromaDB where clause.
+
+        include optionally projects the ChromaDB fields to fetch (see
+        INCLUDE_FIELDS); leaving out "documents" skips content_data/context,
+        leaving out "metadatas" returns ids (and scores) only.
+
+        Domains are searched in parallel under one deadline (timeout seconds,
+        default search_deadline). Domains that fail or miss the deadline are
+        left out, so callers get partial results rather than waiting.
+
+        Concurrent calls with identical arguments share one backend search.
+        """
+        params = dict(
+            query=query,
+            domain=domain,
+            content_type=content_type,
+            tags=tags,
+            source=source,
+            limit=limit,
+            min_confidence=min_confidence,
+            include=include,
+            max_confidence=max_confidence,
+            date_range=date_range,
+            timeout=timeout,
+        )
+        if self._search_flight is None:
+            return self._search_memories(**params)
+        return self._search_flight.do(
+            make_key("search_memories", **params), lambda: self._search_memories(**params)
+        )
+
+    def _search_memories(
+        self,
+        query: Optional[str],
+        domain: Optional[str],
+        content_type: Optional[str],
+        tags: Optional[List[str]],
+        source: Optional[str],
+        limit: int,
+        min_confidence: float,
+        include: Optional[List[str]],
+        max_confidence: float,
+        date_range: Optional[tuple],
+        timeout: Optional[float],
     ) -> List[Dict[str, Any]]:
-        """Search memories with optional semantic search"""
         results = []
 
         # Determine which domains to search
         domains_to_search = [domain] if domain else self.domains
-
-        for d in domains_to_search:
+        deadline = Deadline(timeout if timeout is not None else self.search_deadline)
+        search_kwargs = dict(
+            query=query,
+            content_type=content_type,
+            tags=tags,
+            source=source,
+            limit=limit,
+            min_confidence=min_confidence,
+            include=include,
+            max_confidence=max_confidence,
+            date_range=date_range,
+            deadline=deadline,
+        )
+
+        missing = []
+        if len(domains_to_search) == 1:
             try:
-                domain_results = self._search_domain(
-                    domain=d,
-                    query=query,
-                    content_type=content_type,
-                    tags=tags,
-                    source=source,
-                    limit=limit,
-                    min_confidence=min_confidence,
-                )
-                results.extend(domain_results)
+                results.extend(self._search_domain(domain=domains_to_search[0], **search_kwargs))
             except Exception as e:
-                logger.warning(f"Failed to search domain {d}: {e}")
-
+                logger.warning(f"Failed to search domain {domains_to_search[0]}: {e}")
+                missing.append(domains_to_search[0])
+        else:
+            if self._search_executor is None:
+                with self._resilience_lock:
+                    if self._search_executor is None:
+                        self._search_executor = ThreadPoolExecutor(
+                            max_workers=len(self.domains), thread_name_prefix="chromadb-search"
+                        )
+            futures = {
+                d: self._search_executor.submit(self._search_domain, domain=d, **search_kwargs)
+                for d in domains_to_search
+            }
+            done, _ = wait(futures.values(), timeout=deadline.remaining())
+            for d, future in futures.items():
+                if future not in done:
+                    logger.warning(f"Search of domain {d} missed the deadline")
+                    missing.append(d)
+                elif future.exception() is not None:
+                    logger.warning(f"Failed to search domain {d}: {future.exception()}")
+                    missing.append(d)
+                else:
+                    results.extend(future.result())
+
+        if missing:
+            self._count_resilience("partial_results")
+        return self._finish_search(results, limit)
+
+    def _finish_search(self, results: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+        """Merge per-domain results: newest first, cut to limit, then decode survivors"""
         # Sort by relevance/timestamp and limit
         results.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-        return results[:limit]
+        results = results[:limit]
+
+        # Only documents that survive the cut are ever decoded
+        for memory in results:
+            self._decode_document(memory)
+        return results
 
     def _search_domain(
         self,
@@ -304,36 +959,30 @@ class ChromaDBStorage:
         source: Optional[str] = None,
         limit: int = 100,
         min_confidence: float = 0.0,
+        include: Optional[List[str]] = None,
+        max_confidence: float = 1.0,
+        date_range: Optional[tuple] = None,
+        deadline: Optional[Deadline] = None,
     ) -> List[Dict[str, Any]]:
-        """Search a specific domain"""
-        results = []
-
-        # Build where filter
-        where_filter = {}
-        if content_type:
-            where_filter["content_type"] = content_type
-        if source:
-            where_filter["source"] = source
-        if min_confidence > 0:
-            where_filter["confidence"] = {"$gte": min_confidence}
-
-        try:
-            # Always use HTTP API for compatibility
-            results = self._search_domain_http(
-                domain, query, where_filter, limit
-            )
-
-        except Exception as e:
-            logger.error(f"Search failed for domain {domain}: {e}")
-
-        # Filter by tags if specified
-        if tags:
-            results = [
-                r for r in results
-                if any(tag in r.get("tags", []) for tag in tags)
-            ]
+        """
+        Search a specific domain (documents are left undecoded, see _decode_document).
 
-        return results
+        Errors propagate so that search_memories can report partial results.
+        """
+        # Every filter, tags included, is evaluated by ChromaDB
+        where_filter = build_where_filter(
+            content_type=content_type,
+            source=source,
+            tags=tags,
+            min_confidence=min_confidence,
+            max_confidence=max_confidence,
+            date_range=date_range,
+        )
+
+        # Always use HTTP API for compatibility
+        return self._search_domain_http(
+            domain, query, where_filter, limit, include=include, deadline=deadline
+        )
 
     def _search_domain_http(
         self,
@@ -341,84 +990,122 @@ class ChromaDBStorage:
         query: str = None,
         where_filter: Dict = None,
         limit: int = 100,
+        include: Optional[List[str]] = None,
+        deadline: Optional[Deadline] = None,
     ) -> List[Dict[str, Any]]:
         """Search domain via HTTP API"""
-        import urllib.request
+        action, payload = self._search_payload(query, where_filter, limit, include)
 
-        collection_info = self._collections.get(domain, {})
-        collection_id = collection_info.get("id")
+        # Filter-only listings never need vectors, so a complete replica can answer them
+        if not query and self._replica_listing_ready(domain, include):
+            result = self._replica.list_domain(domain, where_filter, limit)
+            return self._parse_chroma_results(
+                self._project(result, include), domain, decode_documents=False
+            )
 
-        if not collection_id:
-            return []
+        result = self._collection_request(domain, action, payload, deadline=deadline)
+        if not query:
+            self._replica_put(domain, result)
+        return self._parse_chroma_results(result, domain, decode_documents=False)
 
+    def _search_payload(
+        self,
+        query: Optional[str],
+        where_filter: Optional[Dict],
+        limit: int,
+        include: Optional[List[str]],
+    ) -> tuple:
+        """Build the (action, payload) of a domain search: /query with a query, else /get"""
         if query:
             # Query with embedding
-            url = f"{self.base_url}/api/v1/collections/{collection_id}/query"
+            action = "query"
             query_embedding = self._generate_embedding_placeholder(query)
-            data = json.dumps({
+            payload = {
                 "query_embeddings": [query_embedding],
                 "n_results": limit,
                 "where": where_filter if where_filter else None,
-            }).encode()
+            }
         else:
             # Get all
-            url = f"{self.base_url}/api/v1/collections/{collection_id}/get"
-            data = json.dumps({
+            action = "get"
+            payload = {
                 "limit": limit,
                 "where": where_filter if where_filter else None,
-            }).encode()
-
-        try:
-            req = urllib.request.Request(url, data=data, method="POST")
-            req.add_header("Content-Type", "application/json")
-
-            with urllib.request.urlopen(req, timeout=30) as response:
-                result = json.loads(response.read().decode())
-                return self._parse_chroma_results(result, domain)
-
-        except Exception as e:
-            logger.error(f"HTTP search failed: {e}")
-            return []
+            }
+        if include is not None:
+            payload["include"] = self._validate_include(include, query=bool(query))
+        return action, payload
+
+    @staticmethod
+    def _project(result: Dict[str, Any], include: Optional[List[str]]) -> Dict[str, Any]:
+        """Drop the columns of a /get-shaped result that include does not ask for"""
+        if include is None:
+            return result
+        return {key: value for key, value in result.items() if key == "ids" or key in include}
+
+    @staticmethod
+    def _validate_include(include: List[str], query: bool) -> List[str]:
+        """Validate an include projection; distances only exist for queries"""
+        unknown = [field for field in include if field not in INCLUDE_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown include fields: {unknown}")
+        if not query:
+            return [field for field in include if field != "distances"]
+        return list(include)
+
+    @staticmethod
+    def _unwrap(results: Dict[str, Any], key: str) -> Optional[List[Any]]:
+        """Return a result column, unwrapping the per-query nesting of /query replies"""
+        column = results.get(key)
+        ids = results.get("ids")
+        if column is not None and ids and isinstance(ids[0], list):
+            return column[0] if column else []
+        return column
 
     def _parse_chroma_results(
         self,
         results: Dict[str, Any],
         domain: str,
+        decode_documents: bool = True,
     ) -> List[Dict[str, Any]]:
-        """Parse ChromaDB results into memory entries"""
+        """
+        Parse ChromaDB results into memory entries.
+
+        With decode_documents=False the raw document string is kept under
+        "_document" and only decoded by _decode_document when the caller
+        actually returns that memory.
+        """
         memories = []
 
         # Handle both query and get result formats
-        ids = results.get("ids", [[]])[0] if isinstance(results.get("ids", []), list) and results.get("ids") and isinstance(results["ids"][0], list) else results.get("ids", [])
-        documents = results.get("documents", [[]])[0] if isinstance(results.get("documents", []), list) and results.get("documents") and isinstance(results["documents"][0], list) else results.get("documents", [])
-        metadatas = results.get("metadatas", [[]])[0] if isinstance(results.get("metadatas", []), list) and results.get("metadatas") and isinstance(results["metadatas"][0], list) else results.get("metadatas", [])
-        distances = results.get("distances", [[]])[0] if results.get("distances") else None
+        ids = self._unwrap(results, "ids") or []
+        documents = self._unwrap(results, "documents")
+        metadatas = self._unwrap(results, "metadatas")
+        distances = self._unwrap(results, "distances")
 
         for i, memory_id in enumerate(ids):
             try:
-                document = documents[i] if i < len(documents) else "{}"
-                metadata = metadatas[i] if i < len(metadatas) else {}
-
-                # Parse document JSON
-                doc_data = json.loads(document) if isinstance(document, str) else document
-
-                # Parse metadata JSON fields
-                tags = json.loads(metadata.get("tags", "[]"))
-                stored_metadata = json.loads(metadata.get("metadata_json", "{}"))
-
-                memory = {
-                    "id": memory_id,
-                    "domain": metadata.get("domain", domain),
-                    "subdomain": metadata.get("subdomain", ""),
-                    "content_type": metadata.get("content_type", "conversation"),
-                    "content_data": doc_data.get("content_data", {}),
-                    "metadata": stored_metadata,
-                    "tags": tags,
-                    "timestamp": metadata.get("timestamp", ""),
-                    "source": metadata.get("source", ""),
-                    "confidence": float(metadata.get("confidence", 1.0)),
-                    "context": doc_data.get("context", {}),
-                }
+                memory = {"id": memory_id, "domain": domain}
+
+                if metadatas is not None:
+                    metadata = metadatas[i] if i < len(metadatas) else None
+                    metadata = metadata or {}
+                    memory.update({
+                        "domain": metadata.get("domain", domain),
+                        "subdomain": metadata.get("subdomain", ""),
+                        "content_type": metadata.get("content_type", "conversation"),
+                        "metadata": json.loads(metadata.get("metadata_json", "{}")),
+                        "tags": json.loads(metadata.get("tags", "[]")),
+                        "timestamp": metadata.get("timestamp", ""),
+                        "source": metadata.get("source", ""),
+                        "confidence": float(metadata.get("confidence", 1.0)),
+                    })
+
+                if documents is not None:
+                    document = documents[i] if i < len(documents) else None
+                    memory["_document"] = document if document is not None else "{}"
+                    if decode_documents:
+                        self._decode_document(memory)
 
                 # Add distance/similarity score if available
                 if distances and i < len(distances):
@@ -431,36 +1118,52 @@ class ChromaDBStorage:
 
         return memories
 
-    def get_memory(self, domain: str, memory_id: str) -> Optional[Dict[str, Any]]:
+    def _decode_document(self, memory: Dict[str, Any]) -> Dict[str, Any]:
+        """Decode a memory's deferred document into content_data/context (idempotent)"""
+        if "_document" not in memory:
+            return memory
+
+        document = memory.pop("_document")
+        try:
+            if isinstance(document, str):
+                doc_data = json.loads(self._compressor.decompress(document, memory.get("domain")))
+            else:
+                doc_data = document
+        except ValueError as e:
+            logger.warning(f"Failed to parse document of memory {memory.get('id')}: {e}")
+            doc_data = {}
+        memory["content_data"] = doc_data.get("content_data", {})
+        memory["context"] = doc_data.get("context", {})
+        return memory
+
+    def get_memory(
+        self, domain: str, memory_id: str, include: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
         """Get a specific memory by ID"""
         try:
             # Always use HTTP API for compatibility
-            return self._get_memory_http(domain, memory_id)
+            return self._get_memory_http(domain, memory_id, include=include)
         except Exception as e:
             logger.error(f"Failed to get memory {memory_id}: {e}")
             return None
 
-    def _get_memory_http(self, domain: str, memory_id: str) -> Optional[Dict[str, Any]]:
+    def _get_memory_http(
+        self, domain: str, memory_id: str, include: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
         """Get memory via HTTP API"""
-        import urllib.request
-
-        collection_info = self._collections.get(domain, {})
-        collection_id = collection_info.get("id")
-
-        if not collection_id:
-            return None
-
-        url = f"{self.base_url}/api/v1/collections/{collection_id}/get"
-        data = json.dumps({"ids": [memory_id]}).encode()
+        payload = {"ids": [memory_id]}
+        if include is not None:
+            payload["include"] = self._validate_include(include, query=False)
 
         try:
-            req = urllib.request.Request(url, data=data, method="POST")
-            req.add_header("Content-Type", "application/json")
+            cached = self._replica_get([memory_id], include, domain=domain)
+            if memory_id in cached:
+                return cached[memory_id]
 
-            with urllib.request.urlopen(req, timeout=30) as response:
-                result = json.loads(response.read().decode())
-                memories = self._parse_chroma_results(result, domain)
-                return memories[0] if memories else None
+            result = self._collection_request(domain, "get", payload)
+            self._replica_put(domain, result)
+            memories = self._parse_chroma_results(result, domain)
+            return memories[0] if memories else None
 
         except Exception as e:
             logger.error(f"HTTP get failed: {e}")
@@ -477,38 +1180,400 @@ class ChromaDBStorage:
 
     def _delete_memory_http(self, domain: str, memory_id: str) -> bool:
         """Delete memory via HTTP API"""
-        import urllib.request
-
-        collection_info = self._collections.get(domain, {})
-        collection_id = collection_info.get("id")
+        try:
+            self._collection_request(domain, "delete", {"ids": [memory_id]})
+            self._record_deleted(domain, [memory_id])
+            return True
 
-        if not collection_id:
+        except Exception as e:
+            logger.error(f"HTTP delete failed: {e}")
             return False
 
-        url = f"{self.base_url}/api/v1/collections/{collection_id}/delete"
-        data = json.dumps({"ids": [memory_id]}).encode()
+    def update_memory(
+        self,
+        domain: str,
+        memory_id: str,
+        tags: Optional[List[str]] = None,
+        confidence: Optional[float] = None,
+    ) -> bool:
+        """
+        Update the tags and/or confidence of a stored memory in place.
 
+        Only metadata changes, so nothing is re-embedded. New tags are added
+        (tag keys are never removed by ChromaDB's metadata merge, so tags
+        should only grow through this call).
+        """
+        metadata: Dict[str, Any] = {REVISION_KEY: new_revision()}
+        if tags is not None:
+            metadata["tags"] = json.dumps(tags)
+            metadata.update(tag_metadata(tags))
+        if confidence is not None:
+            metadata["confidence"] = confidence
         try:
-            req = urllib.request.Request(url, data=data, method="POST")
-            req.add_header("Content-Type", "application/json")
+            self._collection_request(domain, "update", {"ids": [memory_id], "metadatas": [metadata]})
+        except Exception as e:
+            logger.error(f"Failed to update memory {memory_id}: {e}")
+            return False
+        if self._replica:
+            self._replica_stale(domain, [memory_id])
+        return True
 
-            with urllib.request.urlopen(req, timeout=30) as response:
-                response.read()
-                return True
+    def is_known(self, memory_id: str) -> Optional[bool]:
+        """Whether the local id index has the memory (None without an index)"""
+        if not self._id_index:
+            return None
+        return bool(self._id_index.lookup([memory_id]))
+
+    def existing_ids(self, domain: str, memory_ids: List[str]) -> Set[str]:
+        """Ids of memory_ids present in a domain's collection (one id-only /get)"""
+        if not memory_ids:
+            return set()
+        result = self._collection_request(domain, "get", {"ids": list(memory_ids), "include": []})
+        return set(result.get("ids") or [])
+
+    def count_memories(self, domain: str) -> int:
+        """Number of memories in a domain's collection (0 if it cannot be counted)"""
+        return self._get_count_http(domain)
+
+    def _record_deleted(self, domain: str, memory_ids: List[str]):
+        """Forget deleted memories in the local id index, dedup index, lexical index and read replica"""
+        if self._id_index:
+            self._id_index.remove(memory_ids)
+        if self.content_index is not None:
+            self.content_index.remove_memories(memory_ids)
+        if self.lexical_index is not None:
+            try:
+                self.lexical_index.delete_memories(memory_ids)
+            except Exception as e:
+                logger.warning(f"Failed to remove {len(memory_ids)} deleted memories from the lexical index: {e}")
+        if self._replica:
+            self._replica_written(domain)
+            self._replica.remove(memory_ids)
+
+    def _group_by_domain(self, memory_ids: List[str]) -> Dict[str, List[str]]:
+        """Group ids by their indexed domain; unknown ids are returned under None"""
+        routes = self._id_index.lookup(memory_ids) if self._id_index else {}
+        groups: Dict[Optional[str], List[str]] = {}
+        for memory_id in memory_ids:
+            domain = routes.get(memory_id)
+            if domain not in self.domains:
+                domain = None
+            groups.setdefault(domain, []).append(memory_id)
+        return groups
+
+    def get_memories(
+        self, memory_ids: List[str], include: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get several memories by ID without knowing their domains.
 
-        except Exception as e:
-            logger.error(f"HTTP delete failed: {e}")
+        Ids are routed through the local id -> domain index and fetched with one
+        multi-id /get per collection. Ids missing from the index are added to
+        every domain's request, so a lookup never costs more than one round
+        trip per domain. Results follow the order of memory_ids; unknown ids
+        are omitted. include projects the fetched fields as in search_memories.
+        """
+        memory_ids = list(dict.fromkeys(memory_ids))
+        if not memory_ids:
+            return []
+        if include is not None:
+            include = self._validate_include(include, query=False)
+
+        found: Dict[str, Dict[str, Any]] = self._replica_get(memory_ids, include)
+        groups = self._group_by_domain([i for i in memory_ids if i not in found])
+        unresolved = set(groups.pop(None, []))
+
+        learned = []
+        for domain in self.domains:
+            domain_ids = groups.get(domain, []) + [
+                i for i in memory_ids if i in unresolved and i not in found
+            ]
+            if not domain_ids:
+                continue
+            payload = {"ids": domain_ids}
+            if include is not None:
+                payload["include"] = include
+            try:
+                result = self._collection_request(domain, "get", payload)
+            except Exception as e:
+                logger.error(f"HTTP batch get failed for {domain}: {e}")
+                continue
+
+            self._replica_put(domain, result)
+            for memory in self._parse_chroma_results(result, domain):
+                found[memory["id"]] = memory
+                if memory["id"] in unresolved:
+                    learned.append((memory["id"], domain))
+
+        if learned and self._id_index:
+            self._id_index.record_many(learned)
+
+        return [found[memory_id] for memory_id in memory_ids if memory_id in found]
+
+    def delete_memories(self, memory_ids: List[str]) -> Dict[str, bool]:
+        """
+        Delete several memories by ID without knowing their domains.
+
+        Ids are confirmed with an id-only /get in the domain the routing
+        index names; ids missing from the index, or not found where it
+        points, are probed in every domain. Each collection then receives a
+        single multi-id /delete. Returns a map of id -> whether it was found
+        and deleted.
+        """
+        memory_ids = list(dict.fromkeys(memory_ids))
+        status = {memory_id: False for memory_id in memory_ids}
+        if not memory_ids:
+            return status
+
+        groups = self._group_by_domain(memory_ids)
+        unresolved = groups.pop(None, [])
+        stale = []
+        located: Dict[str, List[str]] = {}
+        for domain, domain_ids in groups.items():
+            try:
+                present = self.existing_ids(domain, domain_ids)
+            except Exception as e:
+                logger.error(f"HTTP id probe failed for {domain}: {e}")
+                continue
+            located[domain] = [i for i in domain_ids if i in present]
+            stale.extend(i for i in domain_ids if i not in present)
+        unresolved.extend(stale)
+
+        for domain in self.domains:
+            if not unresolved:
+                break
+            try:
+                present = self.existing_ids(domain, unresolved)
+            except Exception as e:
+                logger.error(f"HTTP id probe failed for {domain}: {e}")
+                continue
+
+            if present:
+                located.setdefault(domain, []).extend(i for i in unresolved if i in present)
+                unresolved = [i for i in unresolved if i not in present]
+
+        # Index entries pointing at memories that exist nowhere
+        gone = [i for i in stale if i in unresolved]
+        if gone and self._id_index:
+            self._id_index.remove(gone)
+
+        for domain, domain_ids in located.items():
+            if not domain_ids:
+                continue
+            try:
+                self._collection_request(domain, "delete", {"ids": domain_ids})
+            except Exception as e:
+                logger.error(f"HTTP batch delete failed for {domain}: {e}")
+                continue
+
+            for memory_id in domain_ids:
+                status[memory_id] = True
+            self._record_deleted(domain, domain_ids)
+
+        return status
+
+    def migrate_metadata(
+        self, batch_size: int = 200, domains: Optional[List[str]] = None
+    ) -> Dict[str, int]:
+        """
+        Rewrite existing memories to the current metadata layout.
+
+        Pages through each collection fetching metadata only, and sends the
+        rows whose schema_version is out of date back in one /update per
+        batch. Safe to re-run; returns the number of rewritten rows per domain.
+        """
+        migrated = {}
+        for domain in domains or self.domains:
+            migrated[domain] = 0
+            offset = 0
+            while True:
+                result = self._collection_request(
+                    domain,
+                    "get",
+                    {"limit": batch_size, "offset": offset, "include": ["metadatas"]},
+                )
+                ids = result.get("ids") or []
+                if not ids:
+                    break
+
+                updates = [
+                    (memory_id, upgraded)
+                    for memory_id, metadata in zip(ids, result.get("metadatas") or [])
+                    for upgraded in [upgrade_metadata(metadata or {})]
+                    if upgraded is not None
+                ]
+                if updates:
+                    self._collection_request(domain, "update", {
+                        "ids": [memory_id for memory_id, _ in updates],
+                        "metadatas": [metadata for _, metadata in updates],
+                    })
+                    migrated[domain] += len(updates)
+                    if self._replica:
+                        self._replica_stale(domain, [memory_id for memory_id, _ in updates])
+
+                offset += len(ids)
+
+            logger.info(f"Migrated metadata of {migrated[domain]} memories in {domain}")
+        return migrated
+
+    def _replica_written(self, domain: str):
+        """Note a write so that a sync running concurrently is not trusted as complete"""
+        if self._replica_changes is not None:
+            self._replica_changes.bump(f"replica:{domain}")
+
+    def _replica_stale(self, domain: str, memory_ids: List[str]):
+        """
+        Drop rows changed in place. The memories still exist, so the domain's
+        listing is no longer complete until the next sync.
+        """
+        self._replica_written(domain)
+        self._replica.remove(memory_ids)
+        self._replica.invalidate_domain(domain)
+
+    def _replica_put(self, domain: str, result: Optional[Dict[str, Any]]):
+        """Copy full rows (document and metadata) of a /get reply into the replica"""
+        if not self._replica or not result:
+            return
+        ids = result.get("ids") or []
+        documents = result.get("documents")
+        metadatas = result.get("metadatas")
+        if ids and documents is not None and metadatas is not None and not isinstance(ids[0], list):
+            self._replica.put_many(domain, ids, documents, metadatas)
+
+    def _replica_get(
+        self,
+        memory_ids: List[str],
+        include: Optional[List[str]] = None,
+        domain: Optional[str] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Serve ids from the read replica.
+
+        Rows past their TTL are revalidated with one metadata-only /get per
+        domain: rows whose revision is unchanged are served, changed or
+        deleted ones are dropped so the caller fetches them from ChromaDB.
+        """
+        if not self._replica or (include is not None and "embeddings" in include):
+            return {}
+
+        rows = self._replica.lookup(memory_ids)
+        if domain is not None:
+            rows = {i: row for i, row in rows.items() if row[0] == domain}
+
+        stale: Dict[str, List[str]] = {}
+        for memory_id, (row_domain, _, _, fresh) in rows.items():
+            if not fresh:
+                stale.setdefault(row_domain, []).append(memory_id)
+
+        for row_domain, ids in stale.items():
+            try:
+                result = self._collection_request(
+                    row_domain, "get", {"ids": ids, "include": ["metadatas"]}
+                )
+            except Exception as e:
+                logger.warning(f"Replica revalidation failed for {row_domain}: {e}")
+                for memory_id in ids:
+                    rows.pop(memory_id)
+                continue
+
+            current = {
+                memory_id: (metadata or {}).get(REVISION_KEY)
+                for memory_id, metadata in zip(result.get("ids") or [], result.get("metadatas") or [])
+            }
+            valid = [
+                i for i in ids
+                if current.get(i) is not None and current[i] == rows[i][2].get(REVISION_KEY)
+            ]
+            self._replica.touch(valid)
+            self._replica.remove([i for i in ids if i not in current])
+            self._replica.stats["revalidated"] += len(valid)
+            self._replica.stats["refreshed"] += len(ids) - len(valid)
+            for memory_id in set(ids) - set(valid):
+                rows.pop(memory_id)
+
+        memories = {}
+        for memory_id, (row_domain, document, metadata, _) in rows.items():
+            result = self._project(
+                {"ids": [memory_id], "documents": [document], "metadatas": [metadata]}, include
+            )
+            memories[memory_id] = self._parse_chroma_results(result, row_domain)[0]
+
+        misses = len(set(memory_ids) - set(memories))
+        self._replica.stats["hits"] += len(memories)
+        self._replica.stats["misses"] += misses
+        metrics.cache_lookup("replica", hits=len(memories), misses=misses)
+        return memories
+
+    def _replica_listing_ready(self, domain: str, include: Optional[List[str]]) -> bool:
+        """Whether the replica can answer a filter-only listing, syncing the domain when due"""
+        if not self._replica or (include is not None and "embeddings" in include):
             return False
+        if self._replica.is_complete(domain):
+            return True
+        if self._replica.needs_sync(domain):
+            return self.sync_replica(domain)
+        return False
 
-    def get_statistics(self) -> Dict[str, Any]:
-        """Get memory system statistics"""
+    def sync_replica(self, domain: str, max_rows: int = REPLICA_SYNC_MAX_ROWS) -> bool:
+        """
+        Copy every row of a domain into the read replica so listings can be served locally.
+
+        Domains with more than max_rows rows, and syncs that overlap a write
+        from any process sharing the replica, are recorded as incomplete until the sync TTL
+        expires. Returns whether the domain is now complete.
+        """
+        if not self._replica:
+            return False
+
+        generation = self._replica_changes.generation(f"replica:{domain}")
+        ids, documents, metadatas = [], [], []
+        complete = True
+        while True:
+            result = self._collection_request(domain, "get", {
+                "limit": REPLICA_SYNC_PAGE_SIZE,
+                "offset": len(ids),
+                "include": ["documents", "metadatas"],
+            })
+            page = result.get("ids") or []
+            if not page:
+                break
+            ids.extend(page)
+            documents.extend(result.get("documents") or [None] * len(page))
+            metadatas.extend(result.get("metadatas") or [{}] * len(page))
+            if len(ids) > max_rows:
+                complete = False
+                break
+
+        if complete and self._replica_changes.generation(f"replica:{domain}") == generation:
+            self._replica.replace_domain(domain, ids, documents, metadatas)
+            logger.info(f"Replica synced {len(ids)} memories of {domain}")
+            return True
+
+        self._replica.mark_synced(domain, complete=False)
+        return False
+
+    def _base_statistics(self) -> Dict[str, Any]:
+        """Statistics that need no ChromaDB request (shared with AsyncChromaDBStorage)"""
         stats = {
             "total_memories": 0,
             "domain_distribution": {},
             "content_type_distribution": {},
             "chromadb_host": self.host,
             "chromadb_port": self.port,
+            "startup_time_ms": self.startup_time_ms,
+            "heartbeat": dict(self.heartbeat_status),
         }
+        if self._replica:
+            stats["replica"] = self._replica.get_statistics()
+        stats["resilience"] = self.get_resilience_status()
+        stats["compression"] = self._compressor.get_statistics()
+        if self._search_flight:
+            stats["search_coalescing"] = self._search_flight.snapshot()
+        return stats
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get memory system statistics"""
+        stats = self._base_statistics()
 
         for domain in self.domains:
             try:
@@ -523,22 +1588,28 @@ class ChromaDBStorage:
 
         return stats
 
+    def get_resilience_status(self) -> Dict[str, Any]:
+        """Circuit breaker states, read latency percentiles and hedging counters"""
+        with self._resilience_lock:
+            breakers = dict(self._breakers)
+            latency = dict(self._latency)
+            counters = dict(self.resilience_stats)
+        return {
+            "breakers": {action: breaker.snapshot() for action, breaker in breakers.items()},
+            "latency_ms": {
+                action: {
+                    "p50": (tracker.percentile(50) or 0.0) * 1000,
+                    "p95": (tracker.percentile(95) or 0.0) * 1000,
+                }
+                for action, tracker in latency.items()
+            },
+            **counters,
+        }
+
     def _get_count_http(self, domain: str) -> int:
         """Get collection count via HTTP API"""
-        import urllib.request
-
-        collection_info = self._collections.get(domain, {})
-        collection_id = collection_info.get("id")
-
-        if not collection_id:
-            return 0
-
-        url = f"{self.base_url}/api/v1/collections/{collection_id}/count"
-
         try:
-            req = urllib.request.Request(url, method="GET")
-            with urllib.request.urlopen(req, timeout=10) as response:
-                return int(response.read().decode())
+            return int(self._collection_request(domain, "count", method="GET", timeout=10))
         except Exception as e:
             logger.warning(f"Failed to get count: {e}")
             return 0
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Transparent Compression of Large Memory Payloads
+Large JSON payloads (code snippets run up to 50,000 characters) are stored
+compressed in the SQLite content columns and in ChromaDB documents, and are
+only decompressed when the field is actually read.
+
+Compressed values are text so they fit the existing TEXT columns and
+ChromaDB document strings:
+
+    @cz1:<codec>:<base64 of the compressed UTF-8 payload>
+
+JSON payloads never start with "@", so values written before compression
+was enabled (or below the threshold) are read back unchanged.
+"""
+
+import base64
+import os
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Optional
+
+HEADER_PREFIX = "@cz1:"
+
+# Payloads smaller than this (UTF-8 bytes) are stored raw
+DEFAULT_THRESHOLD = 2048
+
+DEFAULT_CODEC = "zlib"
+
+
+class Codec:
+    """A named pair of bytes -> bytes compress/decompress functions"""
+
+    def __init__(
+        self,
+        name: str,
+        compress: Callable[[bytes], bytes],
+        decompress: Callable[[bytes], bytes],
+    ):
+        if ":" in name:
+            raise ValueError(f"Codec name may not contain ':': {name}")
+        self.name = name
+        self.compress = compress
+        self.decompress = decompress
+
+
+_codecs: Dict[str, Codec] = {}
+
+
+def register_codec(name: str, compress: Callable[[bytes], bytes], decompress: Callable[[bytes], bytes]):
+    """Register a codec; its name is written into every header it produces"""
+    _codecs[name] = Codec(name, compress, decompress)
+
+
+def get_codec(name: str) -> Codec:
+    codec = _codecs.get(name)
+    if codec is None:
+        raise ValueError(f"Unknown compression codec: {name}")
+    return codec
+
+
+_zlib_level = int(os.environ.get("MCP_MEMORY_COMPRESSION_LEVEL", "6"))
+register_codec("zlib", lambda data: zlib.compress(data, _zlib_level), zlib.decompress)
+
+
+def is_compressed(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith(HEADER_PREFIX)
+
+
+class PayloadCompressor:
+    """
+    Compresses payload text above a size threshold and tracks, per domain,
+    how many bytes were saved and how much CPU time it cost.
+
+    A payload is kept raw when it is below the threshold or when compressing
+    it (plus header and base64) would not make it smaller.
+    """
+
+    def __init__(self, codec: Optional[str] = None, threshold: Optional[int] = None):
+        """
+        Args:
+            codec: Registered codec name, or "none" to store everything raw
+                   (default: from env MCP_MEMORY_COMPRESSION or "zlib")
+            threshold: Minimum payload size in bytes worth compressing
+                       (default: from env MCP_MEMORY_COMPRESSION_THRESHOLD or 2048)
+        """
+        self.codec_name = codec or os.environ.get("MCP_MEMORY_COMPRESSION", DEFAULT_CODEC)
+        self.codec = None if self.codec_name == "none" else get_codec(self.codec_name)
+        self.threshold = int(
+            threshold if threshold is not None
+            else os.environ.get("MCP_MEMORY_COMPRESSION_THRESHOLD", DEFAULT_THRESHOLD)
+        )
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _domain_stats(self, domain: Optional[str]) -> Dict[str, float]:
+        stats = self._stats.get(domain or "unknown")
+        if stats is None:
+            stats = self._stats[domain or "unknown"] = {
+                "compressed": 0,
+                "stored_raw": 0,
+                "raw_bytes": 0,
+                "stored_bytes": 0,
+                "compress_seconds": 0.0,
+                "decompressed": 0,
+                "decompress_seconds": 0.0,
+            }
+        return stats
+
+    def compress(self, text: str, domain: Optional[str] = None) -> str:
+        """Return text, or its compressed form when that is worthwhile"""
+        data = text.encode("utf-8")
+        if self.codec is None or len(data) < self.threshold:
+            with self._lock:
+                stats = self._domain_stats(domain)
+                stats["stored_raw"] += 1
+                stats["raw_bytes"] += len(data)
+                stats["stored_bytes"] += len(data)
+            return text
+
+        started = time.perf_counter()
+        encoded = (
+            f"{HEADER_PREFIX}{self.codec.name}:"
+            + base64.b64encode(self.codec.compress(data)).decode("ascii")
+        )
+        elapsed = time.perf_counter() - started
+        compressed = len(encoded) < len(data)
+
+        with self._lock:
+            stats = self._domain_stats(domain)
+            stats["compressed" if compressed else "stored_raw"] += 1
+            stats["raw_bytes"] += len(data)
+            stats["stored_bytes"] += len(encoded) if compressed else len(data)
+            stats["compress_seconds"] += elapsed
+        return encoded if compressed else text
+
+    def decompress(self, value: Optional[str], domain: Optional[str] = None) -> Optional[str]:
+        """Return the original text of a value written by compress (raw values pass through)"""
+        if not is_compressed(value):
+            return value
+
+        started = time.perf_counter()
+        codec_name, _, payload = value[len(HEADER_PREFIX):].partition(":")
+        codec = get_codec(codec_name)
+        try:
+            text = codec.decompress(base64.b64decode(payload)).decode("utf-8")
+        except Exception as e:
+            raise ValueError(f"Corrupt {codec_name} payload: {e}") from e
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            stats = self._domain_stats(domain)
+            stats["decompressed"] += 1
+            stats["decompress_seconds"] += elapsed
+        return text
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Per-domain compression ratio and CPU cost"""
+        with self._lock:
+            domains = {domain: dict(stats) for domain, stats in self._stats.items()}
+        for stats in domains.values():
+            stats["ratio"] = stats["raw_bytes"] / stats["stored_bytes"] if stats["stored_bytes"] else 1.0
+            stats["compress_ms"] = stats.pop("compress_seconds") * 1000
+            stats["decompress_ms"] = stats.pop("decompress_seconds") * 1000
+        return {"codec": self.codec_name, "threshold": self.threshold, "domains": domains}
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Content-Hash Deduplication on Ingest
+A canonical hash of each stored memory's content is kept per domain so that
+re-storing the same conversation or page is detected before validation,
+embedding or any network write, and handled by a duplicate policy.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+try:
+    from .sqlite_config import connect
+except ImportError:
+    from sqlite_config import connect
+
+logger = logging.getLogger(__name__)
+
+# What store_conversation does with a duplicate:
+#   skip             return the existing memory id, change nothing
+#   merge_tags       add the new tags to the existing memory
+#   bump_confidence  raise the existing memory's confidence
+#   off              no deduplication
+DEDUP_POLICIES = ("skip", "merge_tags", "bump_confidence", "off")
+
+# Confidence added by bump_confidence on each re-observation (capped at 1.0)
+CONFIDENCE_STEP = 0.05
+
+DEFAULT_BLOOM_CAPACITY = 1_000_000
+DEFAULT_BLOOM_ERROR_RATE = 0.01
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, str):
+        # Trailing whitespace and line-ending differences do not make new content
+        return "\n".join(line.rstrip() for line in value.strip().splitlines())
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def content_hash(
+    domain: str,
+    content_data: Dict[str, Any],
+    content_type: str = "conversation",
+    subdomain: Optional[str] = None,
+) -> str:
+    """
+    Canonical SHA-256 of a memory's content.
+
+    Key order, surrounding/trailing whitespace and line endings are ignored;
+    source, tags, confidence and timestamps are not part of the content.
+    """
+    canonical = json.dumps(
+        [domain, content_type, subdomain or "", _canonical(content_data)],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over hex digests (no false negatives)"""
+
+    def __init__(self, capacity: int = DEFAULT_BLOOM_CAPACITY, error_rate: float = DEFAULT_BLOOM_ERROR_RATE):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        # Double hashing over two 64-bit halves of a digest of the key
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def memory_bytes(self) -> int:
+        return len(self._bits)
+
+
+class ContentHashIndex:
+    """
+    SQLite table of (domain, content hash) -> memory id, with an optional
+    in-memory Bloom filter in front.
+
+    claim() is atomic (INSERT OR IGNORE), so two concurrent stores of the
+    same content cannot both win. The Bloom filter lets most new content be
+    claimed with a single insert and duplicates be answered with a read,
+    without taking a write transaction.
+    """
+
+    def __init__(self, db_path: str, bloom: Optional[bool] = None, bloom_capacity: Optional[int] = None):
+        """
+        Args:
+            db_path: SQLite file holding the content_hashes table (may be shared
+                     with other local indexes)
+            bloom: Keep a Bloom filter in front of the table
+                   (default: from env MCP_MEMORY_DEDUP_BLOOM, on)
+            bloom_capacity: Expected number of hashes
+                            (default: from env MCP_MEMORY_DEDUP_BLOOM_CAPACITY or 1,000,000)
+        """
+        self.db_path = db_path
+        self.lock = threading.RLock()
+        self.stats = {"lookups": 0, "bloom_negatives": 0, "duplicates": 0, "claimed": 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = connect(db_path, check_same_thread=False, wal=True)
+        with self.lock:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS content_hashes (
+                    domain TEXT NOT NULL,
+                    hash TEXT NOT NULL,
+                    memory_id TEXT NOT NULL,
+                    PRIMARY KEY (domain, hash)
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_content_hashes_memory ON content_hashes(memory_id)"
+            )
+            self._conn.commit()
+
+        if bloom is None:
+            bloom = os.environ.get("MCP_MEMORY_DEDUP_BLOOM", "1").lower() not in ("0", "false", "no")
+        self._bloom = None
+        if bloom:
+            self._bloom = BloomFilter(
+                int(bloom_capacity or os.environ.get("MCP_MEMORY_DEDUP_BLOOM_CAPACITY", DEFAULT_BLOOM_CAPACITY))
+            )
+            with self.lock:
+                for domain, digest in self._conn.execute("SELECT domain, hash FROM content_hashes"):
+                    self._bloom.add(f"{domain}:{digest}")
+
+    def lookup(self, domain: str, digest: str) -> Optional[str]:
+        """Memory id stored for this content, if any"""
+        with self.lock:
+            self.stats["lookups"] += 1
+            if self._bloom is not None and f"{domain}:{digest}" not in self._bloom:
+                self.stats["bloom_negatives"] += 1
+                return None
+            row = self._conn.execute(
+                "SELECT memory_id FROM content_hashes WHERE domain = ? AND hash = ?", (domain, digest)
+            ).fetchone()
+        return row[0] if row else None
+
+    def claim(self, domain: str, digest: str, memory_id: str) -> Optional[str]:
+        """
+        Register memory_id for this content unless another memory already has it.
+
+        Returns None when the claim succeeded, otherwise the existing memory id.
+        """
+        with self.lock:
+            existing = self.lookup(domain, digest)
+            if existing is None:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO content_hashes (domain, hash, memory_id) VALUES (?, ?, ?)",
+                    (domain, digest, memory_id),
+                )
+                self._conn.commit()
+                if self._bloom is not None:
+                    self._bloom.add(f"{domain}:{digest}")
+                if cursor.rowcount:
+                    self.stats["claimed"] += 1
+                    return None
+                # Another process stored the same content first
+                existing = self._conn.execute(
+                    "SELECT memory_id FROM content_hashes WHERE domain = ? AND hash = ?", (domain, digest)
+                ).fetchone()[0]
+            self.stats["duplicates"] += 1
+            return existing
+
+    def replace(self, domain: str, digest: str, memory_id: str, stale_id: str) -> bool:
+        """
+        Point the content at a new memory if it still belongs to stale_id (now deleted).
+
+        Returns False when another store replaced the stale claim first.
+        """
+        with self.lock:
+            cursor = self._conn.execute(
+                "UPDATE content_hashes SET memory_id = ? WHERE domain = ? AND hash = ? AND memory_id = ?",
+                (memory_id, domain, digest, stale_id),
+            )
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def release(self, domain: str, digest: str, memory_id: str):
+        """Drop a claim whose write failed"""
+        with self.lock:
+            self._conn.execute(
+                "DELETE FROM content_hashes WHERE domain = ? AND hash = ? AND memory_id = ?",
+                (domain, digest, memory_id),
+            )
+            self._conn.commit()
+
+    def remove_memories(self, memory_ids: Iterable[str]):
+        memory_ids = list(memory_ids)
+        with self.lock:
+            for start in range(0, len(memory_ids), 900):
+                chunk = memory_ids[start:start + 900]
+                self._conn.execute(
+                    f"DELETE FROM content_hashes WHERE memory_id IN ({','.join('?' for _ in chunk)})",
+                    chunk,
+                )
+            self._conn.commit()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self.lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM content_hashes").fetchone()[0]
+            stats = {"entries": entries, **self.stats}
+        if self._bloom is not None:
+            stats["bloom_bytes"] = self._bloom.memory_bytes()
+        return stats
+
+    def close(self):
+        with self.lock:
+            self._conn.close()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+ChromaDB Metadata Layout and Where-Filter Compilation
+Keeps the metadata written for each memory and the where clauses used to
+query it in one place, so filters can be evaluated server-side.
+"""
+
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Version of the per-memory metadata layout written by ChromaDBStorage.
+#   1: tags stored only as a JSON string
+#   2: one boolean "tag:<name>" key per tag
+#   3: numeric "timestamp_epoch" for server-side date range filters
+#   4: "revision" token, replaced on every write, for replica revalidation
+METADATA_SCHEMA_VERSION = 4
+
+TAG_KEY_PREFIX = "tag:"
+
+REVISION_KEY = "revision"
+
+
+def new_revision() -> str:
+    """Fresh revision token for a metadata write"""
+    return uuid.uuid4().hex
+
+
+def tag_key(tag: str) -> str:
+    """Metadata key marking that a memory carries the given tag"""
+    return f"{TAG_KEY_PREFIX}{tag}"
+
+
+def tag_metadata(tags: List[str]) -> Dict[str, bool]:
+    """Per-tag boolean metadata keys for a list of tags"""
+    return {tag_key(tag): True for tag in tags if tag}
+
+
+def timestamp_to_epoch(timestamp: Union[str, datetime, None]) -> Optional[float]:
+    """Convert an ISO timestamp (naive values are UTC, as written by the system) to epoch seconds"""
+    if timestamp is None or timestamp == "":
+        return None
+    try:
+        moment = timestamp if isinstance(timestamp, datetime) else datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def combine_where(clauses: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Combine clauses with $and (ChromaDB rejects implicit AND across keys)"""
+    clauses = [clause for clause in clauses if clause]
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses}
+
+
+def tags_clause(tags: List[str]) -> Optional[Dict[str, Any]]:
+    """Where clause matching memories that carry any of the tags"""
+    clauses = [{tag_key(tag): True} for tag in dict.fromkeys(tags) if tag]
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$or": clauses}
+
+
+def build_where_filter(
+    content_type: Optional[str] = None,
+    source: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+    min_confidence: float = 0.0,
+    max_confidence: float = 1.0,
+    date_range: Optional[Tuple[Any, Any]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Compile search filters into a ChromaDB where clause.
+
+    date_range is a (start, end) pair of ISO strings or datetimes, either of
+    which may be None; bounds are inclusive and compared on timestamp_epoch.
+    """
+    clauses = []
+    if content_type:
+        clauses.append({"content_type": content_type})
+    if source:
+        clauses.append({"source": source})
+    # ChromaDB allows a single operator per clause, so bounds are separate clauses
+    if min_confidence > 0:
+        clauses.append({"confidence": {"$gte": min_confidence}})
+    if max_confidence < 1.0:
+        clauses.append({"confidence": {"$lte": max_confidence}})
+    if date_range:
+        start, end = date_range
+        start_epoch = timestamp_to_epoch(start)
+        end_epoch = timestamp_to_epoch(end)
+        if start_epoch is not None:
+            clauses.append({"timestamp_epoch": {"$gte": start_epoch}})
+        if end_epoch is not None:
+            clauses.append({"timestamp_epoch": {"$lte": end_epoch}})
+    if tags:
+        clauses.append(tags_clause(tags))
+    return combine_where(clauses)
+
+
+def in_date_range(timestamp: Union[str, datetime, None], date_range: Tuple[Any, Any]) -> bool:
+    """Python-side equivalent of the date_range clause of build_where_filter (None bounds are open)"""
+    start, end = date_range
+    epoch = timestamp_to_epoch(timestamp)
+    start_epoch = timestamp_to_epoch(start)
+    end_epoch = timestamp_to_epoch(end)
+    if epoch is None:
+        return start_epoch is None and end_epoch is None
+    if start_epoch is not None and epoch < start_epoch:
+        return False
+    if end_epoch is not None and epoch > end_epoch:
+        return False
+    return True
+
+
+def upgrade_metadata(metadata: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return metadata rewritten to the current layout, or None if it is already current"""
+    if int(metadata.get("schema_version", 1)) >= METADATA_SCHEMA_VERSION:
+        return None
+
+    upgraded = dict(metadata)
+    try:
+        tags = json.loads(metadata.get("tags", "[]"))
+    except (TypeError, ValueError):
+        tags = []
+    upgraded.update(tag_metadata(tags))
+    epoch = timestamp_to_epoch(metadata.get("timestamp"))
+    if epoch is not None:
+        upgraded["timestamp_epoch"] = epoch
+    upgraded[REVISION_KEY] = new_revision()
+    upgraded["schema_version"] = METADATA_SCHEMA_VERSION
+    return upgraded
+
+
+def _match_condition(value: Any, condition: Any) -> bool:
+    """Evaluate one metadata condition (a literal or a single-operator dict)"""
+    if not isinstance(condition, dict):
+        return value == condition
+
+    for op, operand in condition.items():
+        if op == "$eq":
+            ok = value == operand
+        elif op == "$ne":
+            ok = value != operand
+        elif op == "$in":
+            ok = value in operand
+        elif op == "$nin":
+            ok = value not in operand
+        elif op in ("$gt", "$gte", "$lt", "$lte"):
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                return False
+            ok = {
+                "$gt": value > operand,
+                "$gte": value >= operand,
+                "$lt": value < operand,
+                "$lte": value <= operand,
+            }[op]
+        else:
+            raise ValueError(f"Unsupported where operator: {op}")
+        if not ok:
+            return False
+    return True
+
+
+def match_where(metadata: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    """Evaluate a ChromaDB-style where clause against a metadata dict locally"""
+    if not where:
+        return True
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(match_where(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(match_where(metadata, clause) for clause in condition):
+                return False
+        elif key not in metadata or not _match_condition(metadata[key], condition):
+            return False
+    return True
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Rank Fusion for Multi-Source Memory Retrieval
+Combines ranked result lists (lexical, vector, sub-queries) into one ranking.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Standard RRF damping constant (Cormack et al.); larger values flatten rank differences
+DEFAULT_RRF_K = 60
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]],
+    weights: Optional[Sequence[float]] = None,
+    k: int = DEFAULT_RRF_K,
+) -> List[Tuple[str, float]]:
+    """
+    Fuse ranked id lists with weighted reciprocal-rank fusion.
+
+    Each id scores sum(weight_i / (k + rank_i)) over the lists it appears in
+    (ranks start at 1). Returns (id, score) pairs, best first; ties keep the
+    order in which ids were first seen.
+    """
+    if weights is None:
+        weights = [1.0] * len(rankings)
+    if len(weights) != len(rankings):
+        raise ValueError("weights must match the number of rankings")
+
+    scores: Dict[str, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        if not weight:
+            continue
+        seen = set()
+        for rank, item_id in enumerate(ranking, start=1):
+            if item_id in seen:
+                continue
+            seen.add(item_id)
+            scores[item_id] = scores.get(item_id, 0.0) + weight / (k + rank)
+
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
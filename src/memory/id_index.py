@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Memory ID Routing Index
+Persistent id -> domain map so that id-only lookups can be routed to the
+right ChromaDB collection without probing every domain.
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+try:
+    from .sqlite_config import connect
+except ImportError:
+    from sqlite_config import connect
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of bound parameters per statement
+_MAX_SQL_PARAMS = 900
+
+
+def default_cache_dir() -> str:
+    """Directory for local memory system caches (overridable via MEMORY_CACHE_DIR)"""
+    return os.environ.get(
+        "MEMORY_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "memory-system"),
+    )
+
+
+class MemoryIdIndex:
+    """SQLite-backed id -> domain routing index"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.lock = threading.RLock()
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._conn = connect(db_path, check_same_thread=False, wal=True)
+        with self.lock:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS memory_routes (
+                    id TEXT PRIMARY KEY,
+                    domain TEXT NOT NULL
+                )
+            """)
+            self._conn.commit()
+
+    def record(self, memory_id: str, domain: str):
+        """Record the domain of a single memory"""
+        self.record_many([(memory_id, domain)])
+
+    def record_many(self, routes: Iterable[Tuple[str, str]]):
+        """Record the domains of several memories"""
+        routes = list(routes)
+        if not routes:
+            return
+        with self.lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO memory_routes (id, domain) VALUES (?, ?)",
+                routes,
+            )
+            self._conn.commit()
+
+    def lookup(self, memory_ids: List[str]) -> Dict[str, str]:
+        """Return the known domain for each id that is present in the index"""
+        routes = {}
+        with self.lock:
+            for start in range(0, len(memory_ids), _MAX_SQL_PARAMS):
+                chunk = memory_ids[start:start + _MAX_SQL_PARAMS]
+                placeholders = ",".join("?" for _ in chunk)
+                cursor = self._conn.execute(
+                    f"SELECT id, domain FROM memory_routes WHERE id IN ({placeholders})",
+                    chunk,
+                )
+                routes.update(cursor.fetchall())
+        return routes
+
+    def remove(self, memory_ids: List[str]):
+        """Forget the routes of deleted memories"""
+        with self.lock:
+            for start in range(0, len(memory_ids), _MAX_SQL_PARAMS):
+                chunk = memory_ids[start:start + _MAX_SQL_PARAMS]
+                placeholders = ",".join("?" for _ in chunk)
+                self._conn.execute(
+                    f"DELETE FROM memory_routes WHERE id IN ({placeholders})", chunk
+                )
+            self._conn.commit()
+
+    def close(self):
+        with self.lock:
+            self._conn.close()
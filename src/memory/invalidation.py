@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Cross-Process Cache Invalidation
+Per-process caches stay coherent across MCP server workers through write
+generations kept in a shared SQLite file: a writer bumps the generation of
+the scope it changed (e.g. a domain), a cache remembers the generation its
+entry was built at and drops the entry once it moves on. Checking is cheap:
+PRAGMA data_version only changes when another connection committed, so the
+table is re-read only after some process actually wrote.
+"""
+
+import os
+import threading
+from typing import Dict
+
+try:
+    from .sqlite_config import connect
+except ImportError:
+    from sqlite_config import connect
+
+
+class ChangeCounter:
+    """Monotonic write generation per scope, shared by every process using the file"""
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: SQLite file holding the change_counters table (may be shared
+                     with other local indexes)
+        """
+        self.db_path = db_path
+        self.lock = threading.RLock()
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = connect(db_path, check_same_thread=False, wal=True)
+        with self.lock:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS change_counters (
+                    scope TEXT PRIMARY KEY,
+                    generation INTEGER NOT NULL
+                )
+            """)
+            self._conn.commit()
+            self._generations: Dict[str, int] = {}
+            self._data_version = None
+            self._refresh()
+
+    def _refresh(self):
+        self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        self._generations = dict(self._conn.execute("SELECT scope, generation FROM change_counters"))
+
+    def bump(self, scope: str) -> int:
+        """Record a write to scope; returns its new generation"""
+        with self.lock:
+            self._conn.execute(
+                """
+                INSERT INTO change_counters (scope, generation) VALUES (?, 1)
+                ON CONFLICT(scope) DO UPDATE SET generation = generation + 1
+                """,
+                (scope,),
+            )
+            generation = self._conn.execute(
+                "SELECT generation FROM change_counters WHERE scope = ?", (scope,)
+            ).fetchone()[0]
+            self._conn.commit()
+            # data_version ignores this connection's own commits
+            self._generations[scope] = generation
+            return generation
+
+    def generation(self, scope: str) -> int:
+        """Current generation of scope (0 before its first write)"""
+        with self.lock:
+            if self._conn.execute("PRAGMA data_version").fetchone()[0] != self._data_version:
+                self._refresh()
+            return self._generations.get(scope, 0)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self.lock:
+            self._refresh()
+            return dict(self._generations)
+
+    def close(self):
+        with self.lock:
+            self._conn.close()
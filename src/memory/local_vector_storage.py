@@ -0,0 +1,719 @@
+#!/usr/bin/env python3
+"""
+Local Vector Storage Backend for Multi-Domain Memory System
+In-process alternative to ChromaDBStorage for single-box deployments and
+hermetic tests: per-domain IVF-flat indexes over memory-mapped float32
+arrays, with metadata and documents persisted in SQLite.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from .chromadb_storage import ChromaDBStorage
+    from .filters import match_where
+    from .id_index import default_cache_dir
+    from .metrics import metrics
+except ImportError:
+    from chromadb_storage import ChromaDBStorage
+    from filters import match_where
+    from id_index import default_cache_dir
+    from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk index layout changes
+LOCAL_INDEX_VERSION = 1
+
+# Rows allocated when a domain's vector file is created; capacity doubles from there
+INITIAL_CAPACITY = 1024
+
+# Below this many live vectors every query is an exact scan
+DEFAULT_TRAIN_THRESHOLD = 4096
+
+# Inverted lists probed per query once an index is trained
+DEFAULT_NPROBE = 8
+
+# k-means is trained on at most this many sampled vectors
+MAX_TRAINING_SAMPLE = 32768
+KMEANS_ITERATIONS = 12
+
+# Rows per block when computing distances, bounds temporary memory
+DISTANCE_BLOCK_ROWS = 8192
+
+# In-memory vector codes for the approximate first pass; "none" scans the float32 file
+QUANTIZATION_MODES = ("none", "float16", "int8")
+
+# With quantization, n_results * rerank_factor candidates are re-ranked exactly
+DEFAULT_RERANK_FACTOR = 4
+
+
+class LocalVectorIndex:
+    """
+    One domain's vectors, documents and metadata.
+
+    Vectors live in a memory-mapped float32 file (row = slot); documents and
+    metadata live in SQLite with metadata mirrored in memory for where-clause
+    evaluation. Once the domain holds train_threshold vectors, k-means
+    centroids partition it into inverted lists (IVF-flat) and queries only
+    scan the nprobe lists nearest to the query. Slots of deleted rows are
+    reused by later inserts.
+
+    With quantization enabled, a contiguous float16 or int8 copy of every
+    vector is kept in memory (int8 codes use a per-vector scale). Queries
+    rank candidates on the codes first and re-rank the best
+    n_results * rerank_factor exactly against the float32 file, so only those
+    rows are ever paged in.
+
+    Methods mirror the ChromaDB collection endpoints (add, get, query,
+    update, delete, count) and take and return the same payload shapes.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        nprobe: int = DEFAULT_NPROBE,
+        train_threshold: int = DEFAULT_TRAIN_THRESHOLD,
+        quantization: str = "none",
+        rerank_factor: int = DEFAULT_RERANK_FACTOR,
+    ):
+        if np is None:
+            raise ImportError("numpy is required for the local vector backend")
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Invalid quantization: {quantization}")
+
+        self.directory = directory
+        self.nprobe = nprobe
+        self.train_threshold = train_threshold
+        self.quantization = quantization
+        self.rerank_factor = max(1, rerank_factor)
+        self.lock = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+
+        self._info_path = os.path.join(directory, "index.json")
+        self._vectors_path = os.path.join(directory, "vectors.f32")
+        self._centroids_path = os.path.join(directory, "centroids.npy")
+
+        self._conn = sqlite3.connect(os.path.join(directory, "rows.db"), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS rows (
+                row INTEGER PRIMARY KEY,
+                id TEXT UNIQUE NOT NULL,
+                document TEXT,
+                metadata TEXT NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+        self.dim: Optional[int] = None
+        self.trained_size = 0
+        self._vectors = None
+        self._centroids = None
+        self._assign = None
+        self._alive = None
+        self._codes = None
+        self._scales = None
+        self._sq_norms = None
+        self._row_of: Dict[str, int] = {}
+        self._id_of: Dict[int, str] = {}
+        self._metadata: Dict[int, Dict[str, Any]] = {}
+        self._free: List[int] = []
+        self._next_row = 0
+        self._load()
+
+    # -- persistence -------------------------------------------------------
+
+    def _load(self):
+        """Load index state from disk, rebuilding derived arrays"""
+        try:
+            with open(self._info_path) as f:
+                info = json.load(f)
+        except FileNotFoundError:
+            info = None
+        if info and info.get("version") == LOCAL_INDEX_VERSION:
+            self.dim = int(info["dim"])
+            self.trained_size = int(info.get("trained_size", 0))
+
+        for row, memory_id, metadata in self._conn.execute("SELECT row, id, metadata FROM rows"):
+            self._row_of[memory_id] = row
+            self._id_of[row] = memory_id
+            self._metadata[row] = json.loads(metadata)
+        self._next_row = max(self._id_of, default=-1) + 1
+        self._free = sorted(set(range(self._next_row)) - set(self._id_of), reverse=True)
+
+        if self.dim is None:
+            return
+        self._open_vectors()
+        self._alive = np.zeros(self.capacity, dtype=bool)
+        self._alive[list(self._id_of)] = True
+        self._assign = np.full(self.capacity, -1, dtype=np.int32)
+        self._allocate_codes()
+        live = self._live_rows()
+        for start in range(0, len(live), DISTANCE_BLOCK_ROWS):
+            rows = live[start:start + DISTANCE_BLOCK_ROWS]
+            self._encode(rows, np.asarray(self._vectors[rows]))
+        if self.trained_size and os.path.exists(self._centroids_path):
+            self._centroids = np.load(self._centroids_path)
+            live = self._live_rows()
+            self._assign[live] = self._nearest_centroids(self._vectors[live])
+
+    def _save_info(self):
+        tmp_path = f"{self._info_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {"version": LOCAL_INDEX_VERSION, "dim": self.dim, "trained_size": self.trained_size},
+                f,
+            )
+        os.replace(tmp_path, self._info_path)
+
+    @property
+    def capacity(self) -> int:
+        return 0 if self._vectors is None else self._vectors.shape[0]
+
+    def _open_vectors(self, min_rows: int = INITIAL_CAPACITY):
+        """Map the vector file, extending it to hold at least min_rows rows"""
+        row_bytes = self.dim * 4
+        size = os.path.getsize(self._vectors_path) if os.path.exists(self._vectors_path) else 0
+        rows = max(size // row_bytes, min_rows)
+        if rows * row_bytes != size:
+            with open(self._vectors_path, "ab") as f:
+                f.truncate(rows * row_bytes)
+        if self._vectors is not None:
+            self._vectors.flush()
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(rows, self.dim))
+
+    def _grow(self, min_rows: int):
+        """Double capacity until min_rows slots fit"""
+        capacity = self.capacity
+        while capacity < min_rows:
+            capacity *= 2
+        old = self.capacity
+        self._open_vectors(capacity)
+        self._alive = np.concatenate([self._alive, np.zeros(self.capacity - old, dtype=bool)])
+        self._assign = np.concatenate([self._assign, np.full(self.capacity - old, -1, dtype=np.int32)])
+        if self._codes is not None:
+            extra = self.capacity - old
+            self._codes = np.concatenate([self._codes, np.zeros((extra, self.dim), dtype=self._codes.dtype)])
+            self._sq_norms = np.concatenate([self._sq_norms, np.zeros(extra, dtype=np.float32)])
+            if self._scales is not None:
+                self._scales = np.concatenate([self._scales, np.zeros(extra, dtype=np.float32)])
+
+    def close(self):
+        with self.lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+            self._conn.close()
+
+    # -- quantization ------------------------------------------------------
+
+    def _allocate_codes(self):
+        """Allocate the quantized copy of the vectors (a no-op without quantization)"""
+        if self.quantization == "none":
+            return
+        dtype = np.float16 if self.quantization == "float16" else np.int8
+        self._codes = np.zeros((self.capacity, self.dim), dtype=dtype)
+        self._sq_norms = np.zeros(self.capacity, dtype=np.float32)
+        if self.quantization == "int8":
+            self._scales = np.zeros(self.capacity, dtype=np.float32)
+
+    def _encode(self, rows, vectors):
+        """Quantize vectors into the code buffer at rows"""
+        if self._codes is None:
+            return
+        self._sq_norms[rows] = (vectors * vectors).sum(axis=1)
+        if self.quantization == "float16":
+            self._codes[rows] = vectors.astype(np.float16)
+            return
+        # Symmetric per-vector int8: code = round(v * 127 / max|v|)
+        scales = np.abs(vectors).max(axis=1)
+        scales[scales == 0] = 1.0
+        self._codes[rows] = np.rint(vectors * (127.0 / scales[:, None])).astype(np.int8)
+        self._scales[rows] = scales / 127.0
+
+    def _approx_squared_distances(self, rows, query) -> "np.ndarray":
+        """Squared L2 distances of rows to one query computed from the quantized codes"""
+        out = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), DISTANCE_BLOCK_ROWS):
+            block_rows = rows[start:start + DISTANCE_BLOCK_ROWS]
+            dots = self._codes[block_rows].astype(np.float32) @ query
+            if self._scales is not None:
+                dots *= self._scales[block_rows]
+            out[start:start + len(block_rows)] = self._sq_norms[block_rows] - 2.0 * dots
+        return out + float(query @ query)
+
+    def memory_bytes(self) -> int:
+        """Bytes of vector data held in memory (excludes the page-cached float32 file)"""
+        return sum(
+            array.nbytes for array in (self._codes, self._scales, self._sq_norms) if array is not None
+        )
+
+    # -- IVF ---------------------------------------------------------------
+
+    def _live_rows(self):
+        return np.flatnonzero(self._alive)
+
+    def _squared_distances(self, rows, queries) -> "np.ndarray":
+        """Squared L2 distances (ChromaDB's default space) of rows to each query"""
+        out = np.empty((len(queries), len(rows)), dtype=np.float32)
+        for start in range(0, len(rows), DISTANCE_BLOCK_ROWS):
+            block = np.asarray(self._vectors[rows[start:start + DISTANCE_BLOCK_ROWS]])
+            out[:, start:start + len(block)] = (
+                (block * block).sum(axis=1)[None, :]
+                - 2.0 * queries @ block.T
+                + (queries * queries).sum(axis=1)[:, None]
+            )
+        return np.maximum(out, 0.0, out=out)
+
+    def _nearest_centroids(self, vectors, count: int = 1):
+        """Index of the nearest centroid (or the count nearest) for each vector"""
+        centroids = self._centroids
+        scores = (centroids * centroids).sum(axis=1)[None, :] - 2.0 * np.asarray(vectors) @ centroids.T
+        if count == 1:
+            return scores.argmin(axis=1).astype(np.int32)
+        count = min(count, len(centroids))
+        return np.argpartition(scores, count - 1, axis=1)[:, :count]
+
+    def _maybe_train(self):
+        """(Re)train the coarse quantizer when the domain has doubled since the last training"""
+        live = self._live_rows()
+        if len(live) < self.train_threshold or len(live) < 2 * self.trained_size:
+            return
+
+        nlist = max(1, int(np.sqrt(len(live))))
+        rng = np.random.default_rng(0)
+        sample_rows = np.sort(rng.choice(live, size=min(len(live), MAX_TRAINING_SAMPLE), replace=False))
+        sample = np.asarray(self._vectors[sample_rows])
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+
+        for _ in range(KMEANS_ITERATIONS):
+            self._centroids = centroids
+            labels = self._nearest_centroids(sample)
+            counts = np.bincount(labels, minlength=nlist)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            nonempty = counts > 0
+            centroids[nonempty] = sums[nonempty] / counts[nonempty, None]
+
+        self._centroids = centroids
+        self._assign[:] = -1
+        self._assign[live] = self._nearest_centroids(self._vectors[live])
+        self.trained_size = len(live)
+        np.save(self._centroids_path, centroids)
+        self._save_info()
+        logger.info(f"Trained IVF index for {self.directory}: {nlist} lists over {len(live)} vectors")
+
+    # -- collection endpoints ----------------------------------------------
+
+    def add(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: Optional[List[str]] = None,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+    ) -> bool:
+        """Insert rows; ids that already exist are left untouched (ChromaDB /add semantics)"""
+        return self._write(ids, embeddings, documents, metadatas, overwrite=False)
+
+    def upsert(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: Optional[List[str]] = None,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+    ) -> bool:
+        """Insert rows; existing ids are overwritten"""
+        return self._write(ids, embeddings, documents, metadatas, overwrite=True)
+
+    def _write(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: Optional[List[str]],
+        metadatas: Optional[List[Dict[str, Any]]],
+        overwrite: bool,
+    ) -> bool:
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(ids):
+            raise ValueError("embeddings must be one vector per id")
+
+        with self.lock:
+            # One row per id: add keeps live ids and the first copy, upsert the last copy
+            if overwrite:
+                keep = sorted({memory_id: i for i, memory_id in enumerate(ids)}.values())
+            else:
+                keep, seen = [], set()
+                for i, memory_id in enumerate(ids):
+                    if memory_id not in self._row_of and memory_id not in seen:
+                        keep.append(i)
+                        seen.add(memory_id)
+            if not keep:
+                return True
+            if len(keep) < len(ids):
+                ids = [ids[i] for i in keep]
+                vectors = vectors[keep]
+                documents = [documents[i] for i in keep] if documents else documents
+                metadatas = [metadatas[i] for i in keep] if metadatas else metadatas
+
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+                self._save_info()
+                self._open_vectors()
+                self._alive = np.zeros(self.capacity, dtype=bool)
+                self._assign = np.full(self.capacity, -1, dtype=np.int32)
+                self._allocate_codes()
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match index dimension {self.dim}")
+
+            rows = []
+            for memory_id in ids:
+                row = self._row_of.get(memory_id)
+                if row is None:
+                    row = self._free.pop() if self._free else self._next_row
+                    self._next_row = max(self._next_row, row + 1)
+                rows.append(row)
+            if self._next_row > self.capacity:
+                self._grow(self._next_row)
+
+            records = []
+            for i, (memory_id, row) in enumerate(zip(ids, rows)):
+                metadata = (metadatas[i] if metadatas else None) or {}
+                document = documents[i] if documents else None
+                records.append((row, memory_id, document, json.dumps(metadata)))
+                self._row_of[memory_id] = row
+                self._id_of[row] = memory_id
+                self._metadata[row] = metadata
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO rows (row, id, document, metadata) VALUES (?, ?, ?, ?)", records
+            )
+            self._conn.commit()
+
+            rows = np.asarray(rows)
+            self._vectors[rows] = vectors
+            self._vectors.flush()
+            self._encode(rows, vectors)
+            self._alive[rows] = True
+            if self._centroids is not None:
+                self._assign[rows] = self._nearest_centroids(vectors)
+            self._maybe_train()
+        return True
+
+    def update(
+        self,
+        ids: List[str],
+        embeddings: Optional[List[List[float]]] = None,
+        documents: Optional[List[str]] = None,
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+    ) -> bool:
+        """Update existing rows in place; metadata is merged like ChromaDB does"""
+        with self.lock:
+            for i, memory_id in enumerate(ids):
+                row = self._row_of.get(memory_id)
+                if row is None:
+                    continue
+                if metadatas and metadatas[i] is not None:
+                    self._metadata[row] = {**self._metadata[row], **metadatas[i]}
+                    self._conn.execute(
+                        "UPDATE rows SET metadata = ? WHERE row = ?", (json.dumps(self._metadata[row]), row)
+                    )
+                if documents and documents[i] is not None:
+                    self._conn.execute("UPDATE rows SET document = ? WHERE row = ?", (documents[i], row))
+                if embeddings and embeddings[i] is not None:
+                    vector = np.asarray(embeddings[i], dtype=np.float32)
+                    self._vectors[row] = vector
+                    self._encode([row], vector[None, :])
+                    if self._centroids is not None:
+                        self._assign[row] = self._nearest_centroids(vector[None, :])[0]
+            self._conn.commit()
+            if self._vectors is not None:
+                self._vectors.flush()
+        return True
+
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Delete rows by id and/or where clause, freeing their slots"""
+        with self.lock:
+            rows = self._select_rows(ids, where)
+            if not rows:
+                return []
+            deleted = [self._id_of[row] for row in rows]
+            self._conn.executemany("DELETE FROM rows WHERE row = ?", [(row,) for row in rows])
+            self._conn.commit()
+            for row, memory_id in zip(rows, deleted):
+                del self._row_of[memory_id]
+                del self._id_of[row]
+                del self._metadata[row]
+                self._free.append(row)
+            self._alive[rows] = False
+            self._assign[rows] = -1
+            self._free.sort(reverse=True)
+        return deleted
+
+    def count(self) -> int:
+        return len(self._row_of)
+
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        include: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Fetch rows by id and/or where clause (insertion order when scanning)"""
+        with self.lock:
+            rows = self._select_rows(ids, where)
+            rows = rows[offset or 0:]
+            if limit is not None:
+                rows = rows[:limit]
+            return self._columns(rows, include or ["documents", "metadatas"])
+
+    def query(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        include: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Nearest-neighbour search, returning per-query nested columns like ChromaDB"""
+        include = include if include is not None else ["documents", "metadatas", "distances"]
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        nested = {"ids": [], "documents": [], "metadatas": [], "distances": [], "embeddings": []}
+
+        with self.lock:
+            if self.dim is None:
+                candidates = np.empty(0, dtype=np.int64)
+            elif where:
+                candidates = np.asarray(self._select_rows(None, where), dtype=np.int64)
+            else:
+                candidates = self._live_rows()
+
+            for query in queries:
+                rows, distances = self._nearest(query, candidates, n_results)
+                columns = self._columns(rows, include)
+                columns["distances"] = [float(d) for d in distances]
+                for key in nested:
+                    nested[key].append(columns.get(key))
+
+        return {key: (value if key == "ids" or key in include else None) for key, value in nested.items()}
+
+    # -- helpers -----------------------------------------------------------
+
+    def _nearest(self, query, candidates, n_results: int):
+        """Top n_results candidate rows for one query, probing IVF lists when trained"""
+        if not len(candidates) or n_results <= 0:
+            return [], []
+
+        if self._centroids is not None and len(candidates) > n_results:
+            probe = self._nearest_centroids(query[None, :], self.nprobe)[0]
+            probed = candidates[np.isin(self._assign[candidates], probe)]
+            # Too few rows in the probed lists (e.g. a narrow filter): fall back to exact
+            if len(probed) >= n_results:
+                candidates = probed
+
+        shortlist = n_results * self.rerank_factor
+        if self._codes is not None and len(candidates) > shortlist:
+            approx = self._approx_squared_distances(candidates, query)
+            candidates = candidates[np.argpartition(approx, shortlist - 1)[:shortlist]]
+
+        distances = self._squared_distances(candidates, query[None, :])[0]
+        if len(candidates) > n_results:
+            top = np.argpartition(distances, n_results - 1)[:n_results]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(distances[top], kind="stable")]
+        return candidates[top].tolist(), distances[top].tolist()
+
+    def _select_rows(self, ids: Optional[List[str]], where: Optional[Dict[str, Any]]) -> List[int]:
+        """Rows matching the requested ids (in request order) and the where clause"""
+        if ids is not None:
+            rows = [self._row_of[i] for i in dict.fromkeys(ids) if i in self._row_of]
+        else:
+            rows = sorted(self._id_of)
+        if where:
+            rows = [row for row in rows if match_where(self._metadata[row], where)]
+        return rows
+
+    def _columns(self, rows: List[int], include: List[str]) -> Dict[str, Any]:
+        """Build ChromaDB-style result columns for rows"""
+        result = {"ids": [self._id_of[row] for row in rows]}
+        if "metadatas" in include:
+            result["metadatas"] = [dict(self._metadata[row]) for row in rows]
+        if "documents" in include:
+            documents = {}
+            for start in range(0, len(rows), 900):
+                chunk = rows[start:start + 900]
+                placeholders = ",".join("?" for _ in chunk)
+                documents.update(self._conn.execute(
+                    f"SELECT row, document FROM rows WHERE row IN ({placeholders})", chunk
+                ))
+            result["documents"] = [documents.get(row) for row in rows]
+        if "embeddings" in include:
+            result["embeddings"] = [self._vectors[row].tolist() for row in rows]
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "vectors": self.count(),
+            "capacity": self.capacity,
+            "dimension": self.dim,
+            "ivf_lists": 0 if self._centroids is None else len(self._centroids),
+            "trained_size": self.trained_size,
+            "quantization": self.quantization,
+            "memory_bytes": self.memory_bytes(),
+        }
+
+
+class LocalVectorStorage(ChromaDBStorage):
+    """
+    Drop-in replacement for ChromaDBStorage that keeps every domain in a
+    local LocalVectorIndex instead of a remote collection.
+
+    Only the collection transport is replaced, so searching, filtering,
+    projections, batched id operations and metadata migration behave exactly
+    as they do against ChromaDB.
+    """
+
+    transport = "local"
+
+    def __init__(
+        self,
+        storage_path: str = None,
+        collection_prefix: str = "memory_",
+        id_index_path: str = None,
+        nprobe: int = None,
+        train_threshold: int = None,
+        quantization: str = None,
+        rerank_factor: int = None,
+    ):
+        """
+        Initialize the local vector store.
+
+        Args:
+            storage_path: Directory holding one sub-directory per domain
+                          (default: from env LOCAL_VECTOR_PATH or the local cache dir)
+            collection_prefix: Prefix for per-domain directory names
+            id_index_path: SQLite file for the id -> domain routing index
+                           (default: id_index.db inside storage_path)
+            nprobe: IVF lists scanned per query (default: from env LOCAL_VECTOR_NPROBE or 8)
+            train_threshold: Vectors per domain before IVF partitioning kicks in
+                             (default: from env LOCAL_VECTOR_TRAIN_THRESHOLD or 4096)
+            quantization: "none", "float16" or "int8" in-memory codes for the first search
+                          pass (default: from env LOCAL_VECTOR_QUANTIZATION or "none")
+            rerank_factor: Candidates per requested result re-ranked at full precision
+                           (default: from env LOCAL_VECTOR_RERANK_FACTOR or 4)
+        """
+        if np is None:
+            raise ImportError("numpy is required for the local vector backend")
+
+        self.storage_path = storage_path or os.environ.get(
+            "LOCAL_VECTOR_PATH", os.path.join(default_cache_dir(), "vectors")
+        )
+        self.nprobe = int(nprobe or os.environ.get("LOCAL_VECTOR_NPROBE", DEFAULT_NPROBE))
+        self.train_threshold = int(
+            train_threshold or os.environ.get("LOCAL_VECTOR_TRAIN_THRESHOLD", DEFAULT_TRAIN_THRESHOLD)
+        )
+        self.quantization = quantization or os.environ.get("LOCAL_VECTOR_QUANTIZATION", "none")
+        self.rerank_factor = int(
+            rerank_factor or os.environ.get("LOCAL_VECTOR_RERANK_FACTOR", DEFAULT_RERANK_FACTOR)
+        )
+        self._indexes: Dict[str, LocalVectorIndex] = {}
+        super().__init__(
+            host="local",
+            collection_prefix=collection_prefix,
+            id_index_path=id_index_path or os.path.join(self.storage_path, "id_index.db"),
+        )
+
+    def _initialize(self):
+        """Open the per-domain indexes; there is no server to check"""
+        os.makedirs(self.storage_path, exist_ok=True)
+        with self._collections_lock:
+            for domain in self.domains:
+                self._index(domain)
+        self.heartbeat_status = {"ok": True, "error": None, "checked_at": None}
+        logger.info(f"Using local vector storage at {self.storage_path}")
+
+    def _open_replica(self, replica_path: Optional[str]) -> None:
+        """Rows are already local; a read replica would only duplicate them"""
+        return None
+
+    def _index(self, domain: str) -> LocalVectorIndex:
+        index = self._indexes.get(domain)
+        if index is None:
+            index = LocalVectorIndex(
+                os.path.join(self.storage_path, f"{self.collection_prefix}{domain}"),
+                nprobe=self.nprobe,
+                train_threshold=self.train_threshold,
+                quantization=self.quantization,
+                rerank_factor=self.rerank_factor,
+            )
+            self._indexes[domain] = index
+        return index
+
+    @metrics.timed("embedding", "embed")
+    def _generate_embedding_placeholder(self, text: str) -> "np.ndarray":
+        """Same embedding as ChromaDBStorage, built directly as a float32 array"""
+        digests = b"".join(
+            hashlib.sha256(f"{text}:{seed}".encode()).digest() for seed in range(12)
+        )
+        return (np.frombuffer(digests, dtype=np.uint8) / 255.0 - 0.5).astype(np.float32)
+
+    def _get_collection_id(self, domain: str) -> Optional[str]:
+        return domain if domain in self.domains else None
+
+    def _invalidate_collection(self, domain: str):
+        pass
+
+    def _collection_request(
+        self,
+        domain: str,
+        action: str,
+        payload: Optional[Dict[str, Any]] = None,
+        method: str = "POST",
+        timeout: float = 30,
+        deadline=None,
+    ) -> Any:
+        """Dispatch a ChromaDB collection call to the domain's local index"""
+        if domain not in self.domains:
+            raise ValueError(f"Collection not found for domain: {domain}")
+        handler = getattr(self._index(domain), action, None)
+        if handler is None or action.startswith("_"):
+            raise ValueError(f"Unsupported collection action: {action}")
+        with metrics.timer("local_vector", action):
+            return handler(**(payload or {}))
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get memory system statistics"""
+        stats = super().get_statistics()
+        stats.pop("chromadb_host", None)
+        stats.pop("chromadb_port", None)
+        stats["storage_path"] = self.storage_path
+        stats["indexes"] = {domain: self._index(domain).stats() for domain in self.domains}
+        return stats
+
+    def close(self):
+        for index in self._indexes.values():
+            index.close()
+        if self._id_index:
+            self._id_index.close()
+
+
+# Singleton instance
+_storage_instance = None
+
+
+def get_local_vector_storage() -> LocalVectorStorage:
+    """Get or create local vector storage instance"""
+    global _storage_instance
+    if _storage_instance is None:
+        _storage_instance = LocalVectorStorage()
+    return _storage_instance
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+In-Process Performance Metrics
+Latency histograms and counters for MCP tools and the backend operations
+behind them (SQLite queries, ChromaDB HTTP calls, embedding, response
+serialization). Histograms are HDR-style: log-linear buckets with a bounded
+relative error, so percentiles stay accurate from microseconds to minutes
+in a few hundred integers. Exposed as a dict (get_performance_metrics tool)
+and in the Prometheus text format (/metrics in HTTP mode).
+"""
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Bits of linear resolution per power of two: 2**-(SUB_BUCKET_BITS - 1) relative error
+SUB_BUCKET_BITS = 6
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_HALF_SUB_BUCKETS = _SUB_BUCKETS >> 1
+
+# Bucket boundaries (seconds) of the Prometheus histograms
+PROMETHEUS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REPORTED_PERCENTILES = (50, 90, 99, 99.9)
+
+TOOL_DURATION = "mcp_tool_duration_seconds"
+TOOL_QUEUE_WAIT = "mcp_tool_queue_wait_seconds"
+TOOL_ERRORS = "mcp_tool_errors_total"
+TOOL_REJECTED = "mcp_tool_rejected_total"
+OPERATION_DURATION = "memory_operation_duration_seconds"
+OPERATION_ERRORS = "memory_operation_errors_total"
+CACHE_REQUESTS = "memory_cache_requests_total"
+
+_HELP = {
+    TOOL_DURATION: "MCP tool execution time",
+    TOOL_QUEUE_WAIT: "Time MCP tool calls waited for admission",
+    TOOL_ERRORS: "MCP tool calls that raised",
+    TOOL_REJECTED: "MCP tool calls rejected because their lane was saturated",
+    OPERATION_DURATION: "Backend operation time by component (sqlite, chromadb, embedding, serialization)",
+    OPERATION_ERRORS: "Backend operations that raised",
+    CACHE_REQUESTS: "Cache lookups by cache and result (hit, miss)",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _bucket_index(value: int) -> int:
+    if value < _SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return shift * _HALF_SUB_BUCKETS + (value >> shift)
+
+
+def _bucket_upper(index: int) -> int:
+    """Largest value (microseconds) recorded in a bucket"""
+    if index < _SUB_BUCKETS:
+        return index
+    shift, top = divmod(index - _HALF_SUB_BUCKETS, _HALF_SUB_BUCKETS)
+    return ((top + _HALF_SUB_BUCKETS + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """HDR-style latency histogram with microsecond resolution at the low end"""
+
+    def __init__(self):
+        self._counts: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        index = _bucket_index(max(0, int(seconds * 1_000_000)))
+        with self._lock:
+            self._counts[index] = self._counts.get(index, 0) + 1
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, pct: float) -> float:
+        """Latency (seconds) at the given percentile (0-100); 0.0 without samples"""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = max(1, -(-self.count * pct // 100))
+            seen = 0
+            for index in sorted(self._counts):
+                seen += self._counts[index]
+                if seen >= rank:
+                    return min(_bucket_upper(index) / 1_000_000, self.max)
+            return self.max
+
+    def cumulative(self, bounds) -> list:
+        """Samples at or below each bound (seconds), for Prometheus buckets"""
+        with self._lock:
+            counts = sorted(self._counts.items())
+        result = []
+        position = 0
+        below = 0
+        for bound in bounds:
+            limit = bound * 1_000_000
+            while position < len(counts) and _bucket_upper(counts[position][0]) <= limit:
+                below += counts[position][1]
+                position += 1
+            result.append(below)
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        snapshot = {
+            "count": self.count,
+            "mean_ms": self.sum / self.count * 1000 if self.count else 0.0,
+            "max_ms": self.max * 1000,
+        }
+        for pct in REPORTED_PERCENTILES:
+            snapshot[f"p{pct:g}_ms"] = self.percentile(pct) * 1000
+        return snapshot
+
+
+class MetricsRegistry:
+    """Named, labelled histograms and counters"""
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, Labels], LatencyHistogram] = {}
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, Any]) -> Tuple[str, Labels]:
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def histogram(self, name: str, **labels) -> LatencyHistogram:
+        key = self._key(name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def observe(self, name: str, seconds: float, **labels):
+        self.histogram(name, **labels).record(seconds)
+
+    def increment(self, name: str, value: float = 1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def counter(self, name: str, **labels) -> float:
+        return self._counters.get(self._key(name, labels), 0)
+
+    @contextmanager
+    def timer(self, component: str, operation: str) -> Iterator[None]:
+        """Time a backend operation; errors are counted and re-raised"""
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.increment(OPERATION_ERRORS, component=component, operation=operation)
+            raise
+        finally:
+            self.observe(OPERATION_DURATION, time.perf_counter() - started, component=component, operation=operation)
+
+    def timed(self, component: str, operation: Optional[str] = None):
+        """Decorator timing every call of a function as a backend operation"""
+
+        def decorator(func):
+            name = operation or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(component, name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def cache_lookup(self, cache: str, hits: int = 0, misses: int = 0):
+        if hits:
+            self.increment(CACHE_REQUESTS, hits, cache=cache, result="hit")
+        if misses:
+            self.increment(CACHE_REQUESTS, misses, cache=cache, result="miss")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Percentiles of every histogram and the value of every counter"""
+        with self._lock:
+            histograms = list(self._histograms.items())
+            counters = list(self._counters.items())
+        result: Dict[str, Any] = {"histograms": {}, "counters": {}}
+        for (name, labels), histogram in sorted(histograms):
+            result["histograms"].setdefault(name, []).append({"labels": dict(labels), **histogram.snapshot()})
+        for (name, labels), value in sorted(counters):
+            result["counters"].setdefault(name, []).append({"labels": dict(labels), "value": value})
+        return result
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)"""
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+
+        lines = []
+        described = set()
+
+        def describe(name: str, kind: str):
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {name} {_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), histogram in histograms:
+            describe(name, "histogram")
+            for bound, below in zip(PROMETHEUS_BUCKETS, histogram.cumulative(PROMETHEUS_BUCKETS)):
+                lines.append(f"{name}_bucket{_format_labels(labels, le=f'{bound:g}')} {below}")
+            lines.append(f"{name}_bucket{_format_labels(labels, le='+Inf')} {histogram.count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum:.6f}")
+            lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+        for (name, labels), value in counters:
+            describe(name, "counter")
+            lines.append(f"{name}{_format_labels(labels)} {value:g}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, **extra: str) -> str:
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+# Process-wide registry used by the storage backends and the MCP server
+metrics = MetricsRegistry()
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+SQLite -> ChromaDB Memory Migration
+Moves memories from a fallback-era memory_system.db into ChromaDB (or the
+local vector backend). Rows are streamed in rowid order, handed to worker
+threads through a bounded queue, embedded and written in chunked multi-id
+/add calls, and progress is checkpointed so an interrupted run resumes
+where it stopped. Counts are verified at the end.
+
+--upgrade-metadata instead rewrites the memories already in the target to
+the current metadata layout (tag keys, timestamp_epoch); run it once on
+collections written before those keys existed, or server-side tag and date
+filters will not match their memories.
+
+Usage:
+  python -m src.memory.migration --source memory_system.db
+  python -m src.memory.migration --source memory_system.db --workers 8 --verify-ids
+  python -m src.memory.migration --upgrade-metadata
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+    from .chromadb_storage import ADD_BATCH_SIZE, ChromaDBStorage, get_chromadb_storage
+    from .multi_domain_memory_system import MemoryEntry, MemoryStorage
+except ImportError:
+    from chromadb_storage import ADD_BATCH_SIZE, ChromaDBStorage, get_chromadb_storage
+    from multi_domain_memory_system import MemoryEntry, MemoryStorage
+
+logger = logging.getLogger(__name__)
+
+# Bump when the checkpoint file format changes
+CHECKPOINT_VERSION = 2
+
+# Seconds between progress log lines
+PROGRESS_INTERVAL = 5.0
+
+
+class MigrationError(RuntimeError):
+    """Raised when a batch still fails after all retries"""
+
+
+class MigrationCheckpoint:
+    """JSON file recording the rowid below which every row of the migrated domains has been written"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+        if state.get("version") != CHECKPOINT_VERSION:
+            logger.warning(f"Ignoring checkpoint {self.path} with version {state.get('version')}")
+            return None
+        return state
+
+    def save(self, state: Dict[str, Any]):
+        """Write atomically so a crash never leaves a torn checkpoint"""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({**state, "version": CHECKPOINT_VERSION, "updated_at": time.time()}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class SQLiteToChromaMigration:
+    """
+    Resumable, multi-threaded copy of a MemoryStorage database into a
+    ChromaDBStorage.
+
+    The reader thread (the caller of run) pages through the source with
+    keyset pagination and blocks on a bounded queue when the writers fall
+    behind, so memory use stays at roughly queue_depth batches. Batches
+    complete out of order; the checkpoint only advances over the contiguous
+    prefix of finished batches, so on resume nothing is skipped and at most
+    the in-flight batches are written again (/add ignores existing ids).
+    """
+
+    def __init__(
+        self,
+        source: MemoryStorage,
+        target: ChromaDBStorage,
+        checkpoint_path: str,
+        batch_size: int = ADD_BATCH_SIZE,
+        workers: int = 4,
+        queue_depth: Optional[int] = None,
+        domains: Optional[List[str]] = None,
+        upsert: bool = False,
+        max_retries: int = 3,
+    ):
+        self.source = source
+        self.target = target
+        self.checkpoint = MigrationCheckpoint(checkpoint_path)
+        self.batch_size = batch_size
+        self.workers = workers
+        self.queue_depth = queue_depth or workers * 2
+        self.domains = [d for d in (domains or target.domains) if d in target.domains]
+        self.upsert = upsert
+        self.max_retries = max_retries
+
+        self._lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+        self._finished: Dict[int, tuple] = {}
+        self._next_seq = 0
+        self._state: Dict[str, Any] = {}
+        self._last_progress = 0.0
+        self.stats = {"read": 0, "migrated": 0, "skipped": 0, "retries": 0, "batches": 0}
+
+    # -- run ---------------------------------------------------------------
+
+    def run(self, restart: bool = False, check_ids: bool = False) -> Dict[str, Any]:
+        """Migrate all remaining rows; returns a report including the verification"""
+        source_path = os.path.abspath(self.source.db_path)
+        if restart:
+            self.checkpoint.clear()
+        state = self.checkpoint.load()
+        domains = sorted(self.domains)
+        if state and state.get("source") != source_path:
+            raise ValueError(
+                f"Checkpoint {self.checkpoint.path} belongs to {state.get('source')}, not {source_path}"
+            )
+        # Rows of other domains were passed over as skipped: resuming with a
+        # different domain set would never migrate them
+        if state and state.get("domains") != domains:
+            raise ValueError(
+                f"Checkpoint {self.checkpoint.path} was written for domains {state.get('domains')}, "
+                f"not {domains}; use restart to start over"
+            )
+        self._state = state or {
+            "source": source_path, "domains": domains, "after_rowid": 0, "migrated": 0, "skipped": 0,
+        }
+        if state:
+            logger.info(f"Resuming migration after rowid {state['after_rowid']}")
+
+        self._error = None
+        self._finished = {}
+        self._next_seq = 0
+        started = time.perf_counter()
+        self._last_progress = started
+        work: "queue.Queue" = queue.Queue(maxsize=self.queue_depth)
+        threads = [
+            threading.Thread(target=self._worker, args=(work,), name=f"migration-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            batches = self.source.iter_memory_batches(
+                self.batch_size, after_rowid=self._state["after_rowid"]
+            )
+            for seq, (last_rowid, entries) in enumerate(batches):
+                self.stats["read"] += len(entries)
+                if not self._put(work, (seq, last_rowid, entries)):
+                    break
+        finally:
+            for _ in threads:
+                work.put(None)
+            for thread in threads:
+                thread.join()
+
+        elapsed = time.perf_counter() - started
+        report = {
+            **self.stats,
+            "after_rowid": self._state["after_rowid"],
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(self.stats["migrated"] / elapsed, 1) if elapsed else 0.0,
+        }
+        if self._error is not None:
+            report["status"] = "failed"
+            report["error"] = str(self._error)
+            logger.error(f"Migration stopped at rowid {self._state['after_rowid']}: {self._error}")
+            return report
+
+        report["totals"] = {"migrated": self._state["migrated"], "skipped": self._state["skipped"]}
+        report["verification"] = self.verify(check_ids=check_ids)
+        report["status"] = "ok" if report["verification"]["ok"] else "verification_failed"
+        return report
+
+    def _put(self, work: "queue.Queue", item) -> bool:
+        """Blocking put that gives up once a worker has failed"""
+        while self._error is None:
+            try:
+                work.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _worker(self, work: "queue.Queue"):
+        while True:
+            item = work.get()
+            if item is None:
+                return
+            if self._error is not None:
+                continue
+            seq, last_rowid, entries = item
+            try:
+                migrated, skipped = self._write_batch(entries)
+            except BaseException as e:
+                with self._lock:
+                    if self._error is None:
+                        self._error = e
+                continue
+            self._complete(seq, last_rowid, migrated, skipped)
+
+    def _write_batch(self, entries: List[MemoryEntry]) -> tuple:
+        memories = [self._store_kwargs(e) for e in entries if e.domain in self.domains]
+        skipped = len(entries) - len(memories)
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.target.store_memories(memories, batch_size=self.batch_size, upsert=self.upsert)
+                return len(memories), skipped
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise MigrationError(f"Batch failed after {attempt + 1} attempts: {e}") from e
+                with self._lock:
+                    self.stats["retries"] += 1
+                delay = 0.5 * 2 ** attempt
+                logger.warning(f"Migration batch failed ({e}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    @staticmethod
+    def _store_kwargs(entry: MemoryEntry) -> Dict[str, Any]:
+        return {
+            "memory_id": entry.id,
+            "domain": entry.domain,
+            "content_data": entry.content_data,
+            "metadata": entry.metadata,
+            "tags": entry.tags,
+            "timestamp": entry.timestamp,
+            "source": entry.source,
+            "confidence": entry.confidence,
+            "context": entry.context,
+            "subdomain": entry.subdomain,
+            "content_type": entry.content_type,
+        }
+
+    def _complete(self, seq: int, last_rowid: int, migrated: int, skipped: int):
+        """Record a finished batch and advance the checkpoint over the contiguous prefix"""
+        with self._lock:
+            self.stats["batches"] += 1
+            self.stats["migrated"] += migrated
+            self.stats["skipped"] += skipped
+            self._finished[seq] = (last_rowid, migrated, skipped)
+
+            advanced = False
+            while self._next_seq in self._finished:
+                rowid, done, ignored = self._finished.pop(self._next_seq)
+                self._state["after_rowid"] = rowid
+                self._state["migrated"] += done
+                self._state["skipped"] += ignored
+                self._next_seq += 1
+                advanced = True
+            if advanced:
+                self.checkpoint.save(self._state)
+
+            now = time.perf_counter()
+            if now - self._last_progress >= PROGRESS_INTERVAL:
+                self._last_progress = now
+                logger.info(
+                    f"Migrated {self.stats['migrated']} memories "
+                    f"(checkpoint at rowid {self._state['after_rowid']})"
+                )
+
+    # -- verification --------------------------------------------------------
+
+    def verify(self, check_ids: bool = False) -> Dict[str, Any]:
+        """
+        Compare per-domain source counts with the target collections.
+
+        A target may hold more memories than the source (other writers), so
+        a domain passes when the target count is at least the source count.
+        check_ids additionally confirms every source id with id-only /get
+        calls.
+        """
+        source_counts = self.source.count_by_domain()
+        domains = {}
+        ok = True
+        for domain in self.domains:
+            expected = source_counts.get(domain, 0)
+            found = self.target.count_memories(domain)
+            domains[domain] = {"source": expected, "target": found, "ok": found >= expected}
+            ok = ok and found >= expected
+
+        if check_ids:
+            missing = self._missing_ids()
+            for domain, count in missing.items():
+                domains[domain]["missing_ids"] = count
+                domains[domain]["ok"] = domains[domain]["ok"] and count == 0
+                ok = ok and count == 0
+
+        return {"ok": ok, "domains": domains}
+
+    def _missing_ids(self) -> Dict[str, int]:
+        missing = {domain: 0 for domain in self.domains}
+        for _, entries in self.source.iter_memory_batches(self.batch_size, domains=self.domains):
+            by_domain: Dict[str, List[str]] = {}
+            for entry in entries:
+                by_domain.setdefault(entry.domain, []).append(entry.id)
+            for domain, ids in by_domain.items():
+                missing[domain] += len(set(ids) - self.target.existing_ids(domain, ids))
+        return missing
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Migrate a SQLite memory database into ChromaDB")
+    parser.add_argument(
+        "--source",
+        default=os.environ.get("MCP_MEMORY_DB_PATH", "memory_system.db"),
+        help="SQLite memory database (default: env MCP_MEMORY_DB_PATH or memory_system.db)",
+    )
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <source>.migration.json)")
+    parser.add_argument("--batch-size", type=int, default=ADD_BATCH_SIZE, help="Rows per /add call")
+    parser.add_argument("--workers", type=int, default=4, help="Writer threads")
+    parser.add_argument("--queue-depth", type=int, help="Batches buffered ahead of the writers")
+    parser.add_argument("--domain", action="append", help="Only migrate this domain (repeatable)")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint")
+    parser.add_argument("--upsert", action="store_true", help="Overwrite memories that already exist")
+    parser.add_argument("--verify-ids", action="store_true", help="Confirm every id after migrating")
+    parser.add_argument(
+        "--upgrade-metadata",
+        action="store_true",
+        help="Rewrite memories already in the target to the current metadata layout and exit",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=("chromadb", "local"),
+        default=os.environ.get("MEMORY_VECTOR_BACKEND", "chromadb"),
+        help="Target vector backend (default: env MEMORY_VECTOR_BACKEND or chromadb)",
+    )
+    args = parser.parse_args(argv)
+
+    if not args.upgrade_metadata and not os.path.exists(args.source):
+        parser.error(f"Source database not found: {args.source}")
+
+    if args.backend == "local":
+        try:
+            from .local_vector_storage import get_local_vector_storage
+        except ImportError:
+            from local_vector_storage import get_local_vector_storage
+        target = get_local_vector_storage()
+    else:
+        target = get_chromadb_storage()
+
+    if args.upgrade_metadata:
+        domains = [d for d in (args.domain or target.domains) if d in target.domains]
+        print(json.dumps({"upgraded": target.migrate_metadata(domains=domains)}, indent=2))
+        return 0
+
+    migration = SQLiteToChromaMigration(
+        source=MemoryStorage(args.source),
+        target=target,
+        checkpoint_path=args.checkpoint or f"{args.source}.migration.json",
+        batch_size=args.batch_size,
+        workers=args.workers,
+        queue_depth=args.queue_depth,
+        domains=args.domain,
+        upsert=args.upsert,
+    )
+    try:
+        report = migration.run(restart=args.restart, check_ids=args.verify_ids)
+    except ValueError as e:
+        parser.error(str(e))
+    print(json.dumps(report, indent=2))
+    return 0 if report["status"] == "ok" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,16 +17,19 @@ import time
 import logging
 import threading
 from typing import Dict, List, Any, Optional, Union
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import hashlib
 import re
 from contextlib import contextmanager
 import sqlite3
 import os
+import sys
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured by the entry point (MCP server, CLI), not at import
 logger = logging.getLogger(__name__)
 
 # Try to import ChromaDB storage
@@ -41,10 +44,79 @@ except ImportError:
         CHROMADB_AVAILABLE = False
         logger.warning("ChromaDB storage not available, using SQLite fallback")
 
+try:
+    from .analytics_cache import TREND_WINDOWS, AnalyticsCache, normalize_query
+    from .filters import in_date_range
+    from .fusion import DEFAULT_RRF_K, reciprocal_rank_fusion
+    from .singleflight import SingleFlight, coalescing_enabled, make_key
+    from .compression import PayloadCompressor
+    from .dedup import CONFIDENCE_STEP, DEDUP_POLICIES, ContentHashIndex, content_hash
+    from .id_index import default_cache_dir
+    from .invalidation import ChangeCounter
+    from .metrics import TOOL_DURATION, TOOL_ERRORS, metrics
+    from .projection import needs_content, resolve_fields, shape_memories, vector_include
+    from .sqlite_config import connect
+    from .tool_schema import compile_validator
+except ImportError:
+    from analytics_cache import TREND_WINDOWS, AnalyticsCache, normalize_query
+    from filters import in_date_range
+    from fusion import DEFAULT_RRF_K, reciprocal_rank_fusion
+    from singleflight import SingleFlight, coalescing_enabled, make_key
+    from compression import PayloadCompressor
+    from dedup import CONFIDENCE_STEP, DEDUP_POLICIES, ContentHashIndex, content_hash
+    from id_index import default_cache_dir
+    from invalidation import ChangeCounter
+    from metrics import TOOL_DURATION, TOOL_ERRORS, metrics
+    from projection import needs_content, resolve_fields, shape_memories, vector_include
+    from sqlite_config import connect
+    from tool_schema import compile_validator
+
+
+
+def get_local_vector_storage():
+    """Local vector backend instance (numpy is only imported once this backend is used)"""
+    try:
+        from .local_vector_storage import get_local_vector_storage as get_storage
+    except ImportError:
+        from local_vector_storage import get_local_vector_storage as get_storage
+    return get_storage()
+
+
+def _async_storage_class():
+    """AsyncChromaDBStorage, imported on first use (it pulls in httpx), or None"""
+    try:
+        from .async_chromadb_storage import AsyncChromaDBStorage
+    except ImportError:
+        try:
+            from async_chromadb_storage import AsyncChromaDBStorage
+        except ImportError:
+            return None
+    return AsyncChromaDBStorage
+
+# Retrieval modes for MemoryManager.retrieve_conversations
+SEARCH_MODES = ("auto", "hybrid")
+
+# Vector backends: a ChromaDB server, or the in-process index (local_vector_storage.py)
+VECTOR_BACKENDS = ("chromadb", "local")
+
+# Default cap on the items of one batch call (store_conversations, get_memories_by_ids)
+DEFAULT_MAX_BATCH_SIZE = 100
 
-@dataclass
+# RRF weight of expanded keywords relative to the original query (expand_and_search)
+EXPANSION_WEIGHT = 0.5
+
+# Memories analysed per keyword trend window
+TREND_FETCH_LIMIT = 1000
+
+
+@dataclass(slots=True)
 class MemoryEntry:
-    """Represents a memory entry in the multi-domain system"""
+    """
+    Represents a memory entry in the multi-domain system.
+
+    Slotted to keep large result sets compact; the low-cardinality domain,
+    source and content_type strings are interned so entries share one copy.
+    """
 
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     domain: str = ""
@@ -60,9 +132,37 @@ class MemoryEntry:
     relevance_score: float = field(default=0.0, repr=False)
     similarity_score: float = field(default=0.0, repr=False)
 
+    def __post_init__(self):
+        if type(self.domain) is str:
+            self.domain = sys.intern(self.domain)
+        if type(self.source) is str:
+            self.source = sys.intern(self.source)
+        if type(self.content_type) is str:
+            self.content_type = sys.intern(self.content_type)
+
     def to_dict(self) -> Dict[str, Any]:
-        """Convert memory entry to dictionary"""
-        return asdict(self)
+        """
+        Convert memory entry to dictionary.
+
+        Same keys as dataclasses.asdict, but nested content_data, metadata,
+        tags and context are shared with the entry rather than deep-copied;
+        copy them before mutating.
+        """
+        return {
+            "id": self.id,
+            "domain": self.domain,
+            "subdomain": self.subdomain,
+            "content_type": self.content_type,
+            "content_data": self.content_data,
+            "metadata": self.metadata,
+            "tags": self.tags,
+            "timestamp": self.timestamp,
+            "source": self.source,
+            "confidence": self.confidence,
+            "context": self.context,
+            "relevance_score": self.relevance_score,
+            "similarity_score": self.similarity_score,
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "MemoryEntry":
@@ -73,16 +173,21 @@ class MemoryEntry:
 class MemoryStorage:
     """Core memory storage system with SQLite backend"""
 
-    def __init__(self, db_path: str = "memory_system.db"):
+    def __init__(self, db_path: str = "memory_system.db", compressor: Optional[PayloadCompressor] = None):
         self.db_path = db_path
         self.lock = threading.RLock()
+        self._local = threading.local()
+        # Large content_data/context values are stored compressed; the FTS index keeps raw text
+        self.compressor = compressor or PayloadCompressor()
+        # Content-hash dedup index told about deletions (set by MemoryManager)
+        self.content_index = None
         self._initialize_database()
 
     def _initialize_database(self):
         """Initialize SQLite database with proper schema"""
         with self.lock:
             try:
-                with sqlite3.connect(self.db_path) as conn:
+                with connect(self.db_path, wal=True) as conn:
                     cursor = conn.cursor()
 
                     # Create memory entries table
@@ -131,60 +236,26 @@ class MemoryStorage:
 
     @contextmanager
     def _get_cursor(self):
-        """Context manager for database cursor"""
-        conn = sqlite3.connect(self.db_path)
+        """Context manager for a database cursor, one transaction per use"""
+        # One connection per thread: opening a WAL database maps its shared
+        # memory file, which costs more than the typical query
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.db_path)
         try:
             yield conn.cursor()
             conn.commit()
         except Exception as e:
             conn.rollback()
             raise e
-        finally:
-            conn.close()
 
+    @metrics.timed("sqlite")
     def store_memory(self, memory_entry: MemoryEntry) -> str:
         """Store a memory entry in the database"""
         with self.lock:
             try:
                 with self._get_cursor() as cursor:
-                    cursor.execute(
-                        """
-                        INSERT INTO memory_entries 
-                        (id, domain, subdomain, content_type, content_data, metadata, tags, timestamp, source, confidence, context)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                        (
-                            memory_entry.id,
-                            memory_entry.domain,
-                            memory_entry.subdomain,
-                            memory_entry.content_type,
-                            json.dumps(memory_entry.content_data),
-                            json.dumps(memory_entry.metadata),
-                            json.dumps(memory_entry.tags),
-                            memory_entry.timestamp,
-                            memory_entry.source,
-                            memory_entry.confidence,
-                            json.dumps(memory_entry.context),
-                        ),
-                    )
-
-                    # Update search index
-                    cursor.execute(
-                        """
-                        INSERT INTO memory_search (rowid, content_data, metadata, tags)
-                        VALUES (
-                            (SELECT rowid FROM memory_entries WHERE id = ?),
-                            ?, ?, ?
-                        )
-                    """,
-                        (
-                            memory_entry.id,
-                            json.dumps(memory_entry.content_data),
-                            json.dumps(memory_entry.metadata),
-                            json.dumps(memory_entry.tags),
-                        ),
-                    )
-
+                    self._insert_entry(cursor, memory_entry)
                     logger.info(f"Stored memory entry: {memory_entry.id}")
                     return memory_entry.id
 
@@ -192,6 +263,62 @@ class MemoryStorage:
                 logger.error(f"Failed to store memory entry: {e}")
                 raise
 
+    @metrics.timed("sqlite")
+    def store_memories(self, memory_entries: List[MemoryEntry]) -> List[str]:
+        """Store several memory entries in one transaction (all or none)"""
+        with self.lock:
+            try:
+                with self._get_cursor() as cursor:
+                    for memory_entry in memory_entries:
+                        self._insert_entry(cursor, memory_entry)
+                    logger.info(f"Stored {len(memory_entries)} memory entries")
+                    return [memory_entry.id for memory_entry in memory_entries]
+
+            except sqlite3.Error as e:
+                logger.error(f"Failed to store memory entries: {e}")
+                raise
+
+    def _insert_entry(self, cursor, memory_entry: MemoryEntry):
+        """Insert one entry and its FTS row (caller holds the lock and cursor)"""
+        cursor.execute(
+            """
+            INSERT INTO memory_entries 
+            (id, domain, subdomain, content_type, content_data, metadata, tags, timestamp, source, confidence, context)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+            (
+                memory_entry.id,
+                memory_entry.domain,
+                memory_entry.subdomain,
+                memory_entry.content_type,
+                self.compressor.compress(json.dumps(memory_entry.content_data), memory_entry.domain),
+                json.dumps(memory_entry.metadata),
+                json.dumps(memory_entry.tags),
+                memory_entry.timestamp,
+                memory_entry.source,
+                memory_entry.confidence,
+                self.compressor.compress(json.dumps(memory_entry.context), memory_entry.domain),
+            ),
+        )
+
+        # Update search index
+        cursor.execute(
+            """
+            INSERT INTO memory_search (rowid, content_data, metadata, tags)
+            VALUES (
+                (SELECT rowid FROM memory_entries WHERE id = ?),
+                ?, ?, ?
+            )
+        """,
+            (
+                memory_entry.id,
+                json.dumps(memory_entry.content_data),
+                json.dumps(memory_entry.metadata),
+                json.dumps(memory_entry.tags),
+            ),
+        )
+
+    @metrics.timed("sqlite")
     def retrieve_memory(self, memory_id: str) -> Optional[MemoryEntry]:
         """Retrieve a specific memory entry by ID"""
         with self.lock:
@@ -214,6 +341,31 @@ class MemoryStorage:
                 logger.error(f"Failed to retrieve memory entry: {e}")
                 raise
 
+    @metrics.timed("sqlite")
+    def retrieve_memories(self, memory_ids: List[str], decode_content: bool = True) -> List[MemoryEntry]:
+        """Retrieve several memory entries by ID; unknown ids are omitted"""
+        rows = {}
+        with self.lock:
+            try:
+                with self._get_cursor() as cursor:
+                    for start in range(0, len(memory_ids), 900):
+                        chunk = memory_ids[start:start + 900]
+                        cursor.execute(
+                            f"""
+                            SELECT id, domain, subdomain, content_type, content_data, metadata, tags, timestamp, source, confidence, context
+                            FROM memory_entries WHERE id IN ({','.join('?' for _ in chunk)})
+                        """,
+                            chunk,
+                        )
+                        rows.update((row[0], row) for row in cursor.fetchall())
+
+            except sqlite3.Error as e:
+                logger.error(f"Failed to retrieve memory entries: {e}")
+                raise
+
+        return [self._row_to_memory_entry(rows[i], decode_content) for i in memory_ids if i in rows]
+
+    @metrics.timed("sqlite")
     def search_memories(
         self,
         domain: Optional[str] = None,
@@ -223,8 +375,14 @@ class MemoryStorage:
         keyword: Optional[str] = None,
         limit: int = 100,
         offset: int = 0,
+        decode_content: bool = True,
     ) -> List[MemoryEntry]:
-        """Search memories with various filters"""
+        """
+        Search memories with various filters.
+
+        decode_content=False leaves content_data/context empty (they are still
+        decoded when a keyword has to be matched against them).
+        """
         with self.lock:
             try:
                 with self._get_cursor() as cursor:
@@ -279,7 +437,8 @@ class MemoryStorage:
                     cursor.execute(query, params)
                     rows = cursor.fetchall()
 
-                    memories = [self._row_to_memory_entry(row) for row in rows]
+                    decode_content = decode_content or bool(keyword)
+                    memories = [self._row_to_memory_entry(row, decode_content) for row in rows]
 
                     # Apply keyword search if specified
                     if keyword:
@@ -293,6 +452,7 @@ class MemoryStorage:
                 logger.error(f"Failed to search memories: {e}")
                 raise
 
+    @metrics.timed("sqlite")
     def update_memory(self, memory_id: str, updates: Dict[str, Any]) -> bool:
         """Update an existing memory entry"""
         with self.lock:
@@ -309,6 +469,7 @@ class MemoryStorage:
 
                 # Store updated memory
                 with self._get_cursor() as cursor:
+                    self._delete_search_row(cursor, memory_id)
                     cursor.execute(
                         """
                         UPDATE memory_entries 
@@ -319,16 +480,28 @@ class MemoryStorage:
                             existing.domain,
                             existing.subdomain,
                             existing.content_type,
-                            json.dumps(existing.content_data),
+                            self.compressor.compress(json.dumps(existing.content_data), existing.domain),
                             json.dumps(existing.metadata),
                             json.dumps(existing.tags),
                             existing.timestamp,
                             existing.source,
                             existing.confidence,
-                            json.dumps(existing.context),
+                            self.compressor.compress(json.dumps(existing.context), existing.domain),
                             memory_id,
                         ),
                     )
+                    cursor.execute(
+                        """
+                        INSERT INTO memory_search (rowid, content_data, metadata, tags)
+                        VALUES ((SELECT rowid FROM memory_entries WHERE id = ?), ?, ?, ?)
+                    """,
+                        (
+                            memory_id,
+                            json.dumps(existing.content_data),
+                            json.dumps(existing.metadata),
+                            json.dumps(existing.tags),
+                        ),
+                    )
 
                 logger.info(f"Updated memory entry: {memory_id}")
                 return True
@@ -337,29 +510,119 @@ class MemoryStorage:
                 logger.error(f"Failed to update memory entry: {e}")
                 raise
 
+    @metrics.timed("sqlite")
     def delete_memory(self, memory_id: str) -> bool:
         """Delete a memory entry"""
+        return self.delete_memories([memory_id]) > 0
+
+    def delete_memories(self, memory_ids: List[str]) -> int:
+        """Delete several memory entries in one transaction; returns how many existed"""
         with self.lock:
             try:
+                deleted = []
                 with self._get_cursor() as cursor:
-                    cursor.execute(
-                        "DELETE FROM memory_entries WHERE id = ?", (memory_id,)
-                    )
-                    cursor.execute(
-                        "DELETE FROM memory_search WHERE rowid = (SELECT rowid FROM memory_entries WHERE id = ?)",
-                        (memory_id,),
-                    )
-                    deleted = cursor.rowcount > 0
+                    for memory_id in memory_ids:
+                        # External-content FTS rows must be removed while the source row still exists
+                        self._delete_search_row(cursor, memory_id)
+                        cursor.execute(
+                            "DELETE FROM memory_entries WHERE id = ?", (memory_id,)
+                        )
+                        if cursor.rowcount > 0:
+                            deleted.append(memory_id)
 
-                    if deleted:
-                        logger.info(f"Deleted memory entry: {memory_id}")
+                for memory_id in deleted:
+                    logger.info(f"Deleted memory entry: {memory_id}")
+                if deleted and self.content_index is not None:
+                    self.content_index.remove_memories(deleted)
 
-                    return deleted
+                return len(deleted)
 
             except sqlite3.Error as e:
                 logger.error(f"Failed to delete memory entry: {e}")
                 raise
 
+    def _delete_search_row(self, cursor, memory_id: str):
+        """Remove a memory from the FTS index (uses the indexed values, as FTS5 requires)"""
+        cursor.execute(
+            "SELECT rowid, domain, content_data, metadata, tags FROM memory_entries WHERE id = ?",
+            (memory_id,),
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return
+        rowid, domain, content_data, metadata, tags = row
+        # The index holds the raw JSON, not the (possibly compressed) stored value
+        cursor.execute(
+            """
+            INSERT INTO memory_search (memory_search, rowid, content_data, metadata, tags)
+            VALUES ('delete', ?, ?, ?, ?)
+        """,
+            (rowid, self.compressor.decompress(content_data, domain), metadata, tags),
+        )
+
+    @metrics.timed("sqlite")
+    def search_fts(
+        self,
+        query: str,
+        domain: Optional[str] = None,
+        content_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        source: Optional[str] = None,
+        limit: int = 100,
+        decode_content: bool = True,
+    ) -> List[MemoryEntry]:
+        """
+        Full-text search ranked by FTS5 BM25, best match first.
+
+        Each whitespace-separated query term is matched as a phrase, so exact
+        identifiers such as function names or part numbers keep their token
+        order. relevance_score holds the (positive) BM25 score.
+        """
+        terms = [term.replace('"', '""') for term in query.split() if term.strip()]
+        if not terms:
+            return []
+        match_expr = " OR ".join(f'"{term}"' for term in terms)
+
+        conditions = ["memory_search MATCH ?"]
+        params: List[Any] = [match_expr]
+        for column, value in (("domain", domain), ("content_type", content_type), ("source", source)):
+            if value:
+                conditions.append(f"e.{column} = ?")
+                params.append(value)
+        if tags:
+            conditions.append("(" + " OR ".join("e.tags LIKE ?" for _ in tags) + ")")
+            params.extend(f"%{tag}%" for tag in tags)
+        params.append(limit)
+
+        with self.lock:
+            try:
+                with self._get_cursor() as cursor:
+                    cursor.execute(
+                        f"""
+                        SELECT e.id, e.domain, e.subdomain, e.content_type, e.content_data, e.metadata,
+                               e.tags, e.timestamp, e.source, e.confidence, e.context,
+                               bm25(memory_search) AS rank
+                        FROM memory_search
+                        JOIN memory_entries e ON e.rowid = memory_search.rowid
+                        WHERE {" AND ".join(conditions)}
+                        ORDER BY rank
+                        LIMIT ?
+                    """,
+                        params,
+                    )
+                    memories = []
+                    for row in cursor.fetchall():
+                        memory = self._row_to_memory_entry(row, decode_content)
+                        # bm25() is lower-is-better; flip so larger means more relevant
+                        memory.relevance_score = -row[11]
+                        memories.append(memory)
+                    return memories
+
+            except sqlite3.Error as e:
+                logger.error(f"Full-text search failed: {e}")
+                raise
+
+    @metrics.timed("sqlite")
     def get_memory_stats(self) -> Dict[str, Any]:
         """Get memory system statistics"""
         with self.lock:
@@ -395,26 +658,73 @@ class MemoryStorage:
                             "earliest": date_range[0],
                             "latest": date_range[1],
                         },
+                        "compression": self.compressor.get_statistics(),
                     }
 
             except sqlite3.Error as e:
                 logger.error(f"Failed to get memory stats: {e}")
                 raise
 
-    def _row_to_memory_entry(self, row) -> MemoryEntry:
-        """Convert database row to MemoryEntry"""
+    def iter_memory_batches(
+        self,
+        batch_size: int = 500,
+        after_rowid: int = 0,
+        domains: Optional[List[str]] = None,
+    ):
+        """
+        Stream all memories in rowid order as (last_rowid, [MemoryEntry]) batches.
+
+        Keyset pagination (rowid > last seen) keeps every page an index range
+        scan, so the cost per batch stays flat however deep the stream gets,
+        and after_rowid lets an interrupted scan resume where it stopped.
+        """
+        domain_filter = ""
+        domain_params: List[Any] = []
+        if domains:
+            domain_filter = f"AND domain IN ({','.join('?' for _ in domains)})"
+            domain_params = list(domains)
+
+        while True:
+            with self.lock:
+                with self._get_cursor() as cursor:
+                    cursor.execute(
+                        f"""
+                        SELECT rowid, id, domain, subdomain, content_type, content_data, metadata,
+                               tags, timestamp, source, confidence, context
+                        FROM memory_entries
+                        WHERE rowid > ? {domain_filter}
+                        ORDER BY rowid
+                        LIMIT ?
+                    """,
+                        [after_rowid, *domain_params, batch_size],
+                    )
+                    rows = cursor.fetchall()
+            if not rows:
+                return
+            after_rowid = rows[-1][0]
+            yield after_rowid, [self._row_to_memory_entry(row[1:]) for row in rows]
+
+    def count_by_domain(self) -> Dict[str, int]:
+        """Number of memories per domain"""
+        with self.lock:
+            with self._get_cursor() as cursor:
+                cursor.execute("SELECT domain, COUNT(*) FROM memory_entries GROUP BY domain")
+                return dict(cursor.fetchall())
+
+    def _row_to_memory_entry(self, row, decode_content: bool = True) -> MemoryEntry:
+        """Convert database row to MemoryEntry (content_data/context left empty unless decode_content)"""
         return MemoryEntry(
             id=row[0],
             domain=row[1],
             subdomain=row[2],
             content_type=row[3],
-            content_data=json.loads(row[4]),
+            content_data=json.loads(self.compressor.decompress(row[4], row[1])) if decode_content else {},
             metadata=json.loads(row[5]),
             tags=json.loads(row[6]),
             timestamp=row[7],
             source=row[8],
             confidence=row[9],
-            context=json.loads(row[10]),
+            context=json.loads(self.compressor.decompress(row[10], row[1])) if decode_content else {},
         )
 
     def _contains_keyword(self, memory: MemoryEntry, keyword: str) -> bool:
@@ -447,7 +757,23 @@ class MemoryStorage:
 class MemoryManager:
     """High-level memory management system with ChromaDB backend (required by default)"""
 
-    def __init__(self, storage_path: str = None, use_chromadb: bool = True, allow_fallback: bool = False):
+    def __init__(
+        self,
+        storage_path: str = None,
+        use_chromadb: bool = True,
+        allow_fallback: bool = False,
+        search_mode: str = None,
+        lexical_index_path: str = None,
+        hybrid_weights: Optional[Dict[str, float]] = None,
+        rrf_k: int = DEFAULT_RRF_K,
+        vector_backend: str = None,
+        coalesce_retrievals: Optional[bool] = None,
+        dedup_policy: str = None,
+        dedup_index_path: str = None,
+        max_batch_size: int = None,
+        change_counter_path: str = None,
+        precompute_trends: Optional[bool] = None,
+    ):
         """
         Initialize memory manager.
 
@@ -457,7 +783,40 @@ class MemoryManager:
             allow_fallback: If False (default), raises error when ChromaDB unavailable.
                            This prevents silent data loss from storing in wrong backend.
                            Set to True only for local development/testing.
+            search_mode: Default keyword retrieval mode, "auto" (vector search with ChromaDB,
+                         keyword filtering with SQLite) or "hybrid" (FTS5 BM25 and vector
+                         search fused with reciprocal-rank fusion). Default: env
+                         MCP_MEMORY_SEARCH_MODE or "auto".
+            lexical_index_path: SQLite FTS5 index mirrored on writes in ChromaDB mode, used by
+                                hybrid search (default: env MCP_MEMORY_LEXICAL_INDEX, unset
+                                disables it). SQLite mode always uses the primary store.
+            hybrid_weights: RRF weights per source, keys "lexical" and "vector" (default 1.0 each)
+            rrf_k: Reciprocal-rank fusion damping constant
+            vector_backend: "chromadb" (remote server) or "local" (in-process IVF index, no
+                            server needed). Default: env MEMORY_VECTOR_BACKEND or "chromadb".
+            coalesce_retrievals: Let concurrent identical retrieve_conversations calls share
+                                 one backend call (default: env MCP_MEMORY_COALESCE, on)
+            dedup_policy: What storing already-stored content does: "skip" (return the
+                          existing id), "merge_tags", "bump_confidence" or "off".
+                          Default: env MCP_MEMORY_DEDUP_POLICY or "skip".
+            dedup_index_path: SQLite file of the content-hash index (default: env
+                              MCP_MEMORY_DEDUP_INDEX, else next to the SQLite store or
+                              the vector storage id index)
+            max_batch_size: Largest number of items accepted by store_conversations and
+                            get_memories_by_ids (default: env MCP_MEMORY_MAX_BATCH_SIZE or 100)
+            change_counter_path: SQLite file of the per-domain write generations that
+                                 server processes use to invalidate their caches
+                                 (default: env MCP_MEMORY_CHANGE_COUNTER, else next to
+                                 the SQLite store or the vector storage id index)
+            precompute_trends: Keep get_keyword_trends results for the standard windows
+                               (7, 30, 90 days) of every domain warm from a background
+                               thread (default: env MCP_MEMORY_PRECOMPUTE_TRENDS, off).
+                               Analytic results are cached for MCP_MEMORY_ANALYTICS_TTL
+                               seconds and dropped on any write to their domain.
         """
+        self.vector_backend = vector_backend or os.environ.get("MEMORY_VECTOR_BACKEND", "chromadb")
+        if self.vector_backend not in VECTOR_BACKENDS:
+            raise ValueError(f"Invalid vector backend: {self.vector_backend}")
         self.use_chromadb = use_chromadb and CHROMADB_AVAILABLE
         self.allow_fallback = allow_fallback
         self._chromadb_storage = None
@@ -466,8 +825,11 @@ class MemoryManager:
         # Try to initialize ChromaDB
         if self.use_chromadb:
             try:
-                self._chromadb_storage = get_chromadb_storage()
-                logger.info("Using ChromaDB storage backend")
+                if self.vector_backend == "local":
+                    self._chromadb_storage = get_local_vector_storage()
+                else:
+                    self._chromadb_storage = get_chromadb_storage()
+                logger.info(f"Using {self.vector_backend} vector storage backend")
             except Exception as e:
                 if not self.allow_fallback:
                     # Fail explicitly to prevent data loss
@@ -501,6 +863,55 @@ class MemoryManager:
         # For backward compatibility
         self.storage = self._sqlite_storage if self._sqlite_storage else None
 
+        # Retrieval configuration
+        self.search_mode = search_mode or os.environ.get("MCP_MEMORY_SEARCH_MODE", "auto")
+        if self.search_mode not in SEARCH_MODES:
+            raise ValueError(f"Invalid search mode: {self.search_mode}")
+        self.hybrid_weights = {"lexical": 1.0, "vector": 1.0}
+        self.hybrid_weights.update(hybrid_weights or {})
+        self.rrf_k = rrf_k
+        self._search_executor = None
+        self._expansion_executor = None
+        self._retrieval_flight = (
+            SingleFlight("memory.retrieve_conversations")
+            if coalescing_enabled(coalesce_retrievals) else None
+        )
+
+        # Asyncio path (a*) methods: pooled async HTTP, SQLite work on a dedicated executor
+        self._async_storage = None
+        self._sqlite_executor = None
+
+        self._lexical_storage = self._sqlite_storage
+        lexical_index_path = lexical_index_path or os.environ.get("MCP_MEMORY_LEXICAL_INDEX")
+        if self._lexical_storage is None and lexical_index_path:
+            self._lexical_storage = MemoryStorage(lexical_index_path)
+            logger.info(f"Lexical index for hybrid search: {lexical_index_path}")
+        if self._chromadb_storage is not None and self._lexical_storage is not self._sqlite_storage:
+            self._chromadb_storage.lexical_index = self._lexical_storage
+
+        self.dedup_policy = dedup_policy or os.environ.get("MCP_MEMORY_DEDUP_POLICY", "skip")
+        if self.dedup_policy not in DEDUP_POLICIES:
+            raise ValueError(f"Invalid dedup policy: {self.dedup_policy}")
+        self._dedup_index = self._open_dedup_index(dedup_index_path)
+        for storage in (self._sqlite_storage, self._chromadb_storage):
+            if storage is not None:
+                storage.content_index = self._dedup_index
+        # Ids whose content claim is held but whose memory is not written yet
+        self._inflight_claims: set = set()
+        self._claims_lock = threading.Lock()
+        self._changes = ChangeCounter(
+            change_counter_path
+            or os.environ.get("MCP_MEMORY_CHANGE_COUNTER")
+            or self._local_index_path("change_counters.db")
+        )
+        self.dedup_stats = {"skipped": 0, "merged_tags": 0, "bumped_confidence": 0, "stale": 0}
+        self._analytics_cache = AnalyticsCache(self.write_generation)
+        self._precompute_stop = threading.Event()
+        self._precompute_thread = None
+        self.max_batch_size = int(
+            max_batch_size or os.environ.get("MCP_MEMORY_MAX_BATCH_SIZE", DEFAULT_MAX_BATCH_SIZE)
+        )
+
         self.domain_validators = {
             "bmad_code": self._validate_bmad_code,
             "website_info": self._validate_website_info,
@@ -508,6 +919,11 @@ class MemoryManager:
             "electronics_maker": self._validate_electronics_maker,
         }
 
+        if precompute_trends is None:
+            precompute_trends = os.environ.get("MCP_MEMORY_PRECOMPUTE_TRENDS", "").lower() in ("1", "true", "yes")
+        if precompute_trends:
+            self.start_trend_precompute()
+
     def store_conversation(
         self,
         domain: str,
@@ -518,7 +934,224 @@ class MemoryManager:
         tags: Optional[List[str]] = None,
         confidence: float = 1.0,
     ) -> str:
-        """Store a conversation in memory using ChromaDB or SQLite"""
+        """
+        Store a conversation in memory using ChromaDB or SQLite.
+
+        Content already stored in the domain is detected by its content hash
+        before validation or embedding and handled by the dedup policy; the
+        existing memory's id is returned.
+        """
+        memory_id = str(uuid.uuid4())
+        digest, duplicate_id = self._claim_content(
+            domain, conversation_data, content_type, subdomain, memory_id
+        )
+        if duplicate_id is not None:
+            return self._handle_duplicate(duplicate_id, domain, tags, confidence)
+
+        memory_entry = self._build_entry(
+            domain, conversation_data, source, content_type, subdomain, tags, confidence,
+            memory_id=memory_id,
+        )
+
+        try:
+            if self.use_chromadb and self._chromadb_storage:
+                # Use ChromaDB storage
+                stored_id = self._chromadb_storage.store_memory(**self._vector_store_kwargs(memory_entry))
+                self._mirror_to_lexical_index(memory_entry)
+            else:
+                # Fall back to SQLite
+                stored_id = self._sqlite_storage.store_memory(memory_entry)
+        except Exception:
+            self._release_content(domain, digest, memory_id)
+            raise
+        self._settle_claims([memory_id])
+        self._record_write(domain)
+        return stored_id
+
+    def _open_dedup_index(self, path: Optional[str]) -> Optional[ContentHashIndex]:
+        if self.dedup_policy == "off":
+            return None
+        return ContentHashIndex(
+            path or os.environ.get("MCP_MEMORY_DEDUP_INDEX") or self._local_index_path("content_hashes.db")
+        )
+
+    def _local_index_path(self, filename: str) -> str:
+        """SQLite file for a local index: the SQLite store, the id index, or filename in the cache dir"""
+        id_index = getattr(self._chromadb_storage, "_id_index", None)
+        if self._sqlite_storage is not None:
+            return self._sqlite_storage.db_path
+        if id_index is not None:
+            return id_index.db_path
+        return os.path.join(default_cache_dir(), filename)
+
+    def _record_write(self, *domains: str):
+        """Bump the write generation of the changed domains"""
+        for domain in dict.fromkeys(domains):
+            self._changes.bump(domain)
+
+    def write_generation(self, domain: Optional[str] = None) -> int:
+        """
+        Write generation of a domain, or of all domains when domain is None.
+
+        The generation moves on whenever any process sharing the change
+        counter stores or updates memories in the domain, so a cache entry
+        tagged with the generation it was computed at is valid while the
+        generation is unchanged.
+        """
+        if domain is not None:
+            return self._changes.generation(domain)
+        return sum(self._changes.generation(d) for d in self.domain_validators)
+
+    def _claim_content(
+        self,
+        domain: str,
+        conversation_data: Dict[str, Any],
+        content_type: str,
+        subdomain: Optional[str],
+        memory_id: str,
+    ) -> tuple:
+        """
+        Claim the content hash for memory_id; returns (hash, id of an existing duplicate).
+
+        A successful claim stays in flight until _settle_claims or
+        _release_content; a claim held by an in-flight store is a duplicate
+        even though that memory does not exist yet.
+        """
+        digest, existing, unverified = self._claim_hash(
+            domain, conversation_data, content_type, subdomain, memory_id
+        )
+        if unverified and not self._memory_exists(existing, domain):
+            if not self._replace_stale(domain, digest, memory_id, existing):
+                return self._claim_content(domain, conversation_data, content_type, subdomain, memory_id)
+            existing = None
+        return digest, existing
+
+    def _claim_hash(
+        self,
+        domain: str,
+        conversation_data: Dict[str, Any],
+        content_type: str,
+        subdomain: Optional[str],
+        memory_id: str,
+    ) -> tuple:
+        """
+        Local half of _claim_content: returns (hash, existing id, whether the
+        existing memory still has to be checked for deletion).
+        """
+        if self._dedup_index is None or domain not in self.domain_validators:
+            return None, None, False
+        digest = content_hash(domain, conversation_data, content_type, subdomain)
+        with self._claims_lock:
+            existing = self._dedup_index.claim(domain, digest, memory_id)
+            if existing is None:
+                self._inflight_claims.add(memory_id)
+            return digest, existing, existing is not None and existing not in self._inflight_claims
+
+    def _replace_stale(self, domain: str, digest: str, memory_id: str, stale_id: str) -> bool:
+        """Take over the claim of a deleted memory unless another store did first"""
+        with self._claims_lock:
+            if not self._dedup_index.replace(domain, digest, memory_id, stale_id):
+                return False
+            self._inflight_claims.add(memory_id)
+            self.dedup_stats["stale"] += 1
+            return True
+
+    def _settle_claims(self, memory_ids):
+        """Mark claims as written (or abandoned): their memories now answer for them"""
+        with self._claims_lock:
+            self._inflight_claims.difference_update(memory_ids)
+
+    def _release_content(self, domain: str, digest: Optional[str], memory_id: str):
+        if digest is not None:
+            self._dedup_index.release(domain, digest, memory_id)
+            self._settle_claims([memory_id])
+
+    def _memory_exists(self, memory_id: str, domain: str) -> bool:
+        """
+        Check that a memory has not been deleted.
+
+        Answered locally by the id index when there is one; otherwise with an
+        id-only /get. If that fails the memory is assumed to exist, which at
+        worst returns its id instead of storing a second copy.
+        """
+        if self.use_chromadb and self._chromadb_storage:
+            known = self._chromadb_storage.is_known(memory_id)
+            if known is not None:
+                return known
+            try:
+                return memory_id in self._chromadb_storage.existing_ids(domain, [memory_id])
+            except Exception as e:
+                logger.warning(f"Could not check whether memory {memory_id} exists: {e}")
+                return True
+        return self._sqlite_storage.retrieve_memory(memory_id) is not None
+
+    def _handle_duplicate(
+        self, memory_id: str, domain: str, tags: Optional[List[str]], confidence: float
+    ) -> str:
+        """Apply the dedup policy to the existing memory and return its id"""
+        if self.dedup_policy == "skip":
+            self.dedup_stats["skipped"] += 1
+            return memory_id
+
+        if self.use_chromadb and self._chromadb_storage:
+            existing = self._chromadb_storage.get_memory(domain, memory_id, include=["metadatas"])
+        else:
+            existing = self._sqlite_storage.retrieve_memory(memory_id)
+        updates = self._duplicate_updates(existing, tags, confidence)
+
+        if updates:
+            if self.use_chromadb and self._chromadb_storage:
+                self._chromadb_storage.update_memory(domain, memory_id, **updates)
+                self._update_lexical_index(memory_id, updates)
+            else:
+                self._sqlite_storage.update_memory(memory_id, updates)
+            self._record_write(domain)
+        return memory_id
+
+    def _duplicate_updates(self, existing: Any, tags: Optional[List[str]], confidence: float) -> Dict[str, Any]:
+        """Changes the dedup policy makes to an existing memory (a result dict or MemoryEntry)"""
+        if existing is None:
+            self.dedup_stats["skipped"] += 1
+            return {}
+        if isinstance(existing, dict):
+            current_tags, current_confidence = existing["tags"], existing["confidence"]
+        else:
+            current_tags, current_confidence = existing.tags, existing.confidence
+
+        updates = {}
+        if self.dedup_policy == "merge_tags":
+            merged = current_tags + [tag for tag in tags or [] if tag not in current_tags]
+            if merged != current_tags:
+                updates["tags"] = merged
+            self.dedup_stats["merged_tags"] += 1
+        elif self.dedup_policy == "bump_confidence":
+            bumped = min(1.0, max(current_confidence, confidence) + CONFIDENCE_STEP)
+            if bumped != current_confidence:
+                updates["confidence"] = bumped
+            self.dedup_stats["bumped_confidence"] += 1
+        return updates
+
+    def _update_lexical_index(self, memory_id: str, updates: Dict[str, Any]):
+        """Apply a ChromaDB update to the hybrid-search FTS index (best effort)"""
+        if self._lexical_storage is None:
+            return
+        try:
+            self._lexical_storage.update_memory(memory_id, updates)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to update lexical index for {memory_id}: {e}")
+
+    def _build_entry(
+        self,
+        domain: str,
+        conversation_data: Dict[str, Any],
+        source: str,
+        content_type: str = "conversation",
+        subdomain: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        confidence: float = 1.0,
+        memory_id: Optional[str] = None,
+    ) -> MemoryEntry:
+        """Validate a conversation and build the MemoryEntry to store"""
         # Validate domain
         if domain not in self.domain_validators:
             raise ValueError(f"Invalid domain: {domain}")
@@ -530,43 +1163,146 @@ class MemoryManager:
         except ValueError as e:
             logger.warning(f"Validation warning for {domain}: {e} - storing anyway")
 
-        memory_id = str(uuid.uuid4())
+        memory_id = memory_id or str(uuid.uuid4())
         timestamp = datetime.utcnow().isoformat()
         metadata = {
             "stored_by": "multi_domain_memory_system",
             "validation_passed": True,
         }
+        memory_entry = MemoryEntry(
+            id=memory_id,
+            domain=domain,
+            subdomain=subdomain,
+            content_type=content_type,
+            content_data=conversation_data,
+            source=source,
+            confidence=confidence,
+            tags=tags or [],
+            metadata=metadata,
+            timestamp=timestamp,
+        )
+        return memory_entry
+
+    @staticmethod
+    def _vector_store_kwargs(memory_entry: MemoryEntry) -> Dict[str, Any]:
+        """Arguments of the vector storage store_memory call for an entry"""
+        return dict(
+            domain=memory_entry.domain,
+            memory_id=memory_entry.id,
+            content_data=memory_entry.content_data,
+            metadata=memory_entry.metadata,
+            tags=memory_entry.tags,
+            timestamp=memory_entry.timestamp,
+            source=memory_entry.source,
+            confidence=memory_entry.confidence,
+            context={},
+            subdomain=memory_entry.subdomain,
+            content_type=memory_entry.content_type,
+        )
+
+    def _mirror_to_lexical_index(self, memory_entry: MemoryEntry):
+        """Keep the hybrid-search FTS index in step with ChromaDB writes (best effort)"""
+        if self._lexical_storage is None or self._lexical_storage is self._sqlite_storage:
+            return
+        try:
+            self._lexical_storage.store_memory(memory_entry)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to update lexical index for {memory_entry.id}: {e}")
+
+    def _check_batch_size(self, size: int):
+        if size > self.max_batch_size:
+            raise ValueError(f"Batch of {size} items exceeds the maximum of {self.max_batch_size}")
+
+    def store_conversations(self, conversations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Store several conversations with one bulk backend write.
+
+        Each item holds store_conversation arguments (domain, conversation_data,
+        source, ...). Items are validated and deduplicated one by one; the
+        valid, new ones are then written together (one chunked /add per domain
+        in ChromaDB mode, one transaction in SQLite mode). Returns one status
+        dict per item, in input order: "success", "duplicate" (memory_id is the
+        existing memory) or "error".
+        """
+        self._check_batch_size(len(conversations))
+        results, entries, claims = self._prepare_batch(conversations)
+        if entries:
+            self._store_batch(entries, claims, results)
+        return results
+
+    def _prepare_batch(self, conversations: List[Dict[str, Any]]) -> tuple:
+        """Validate, deduplicate and build the entries of a batch (no backend writes)"""
+        results: List[Dict[str, Any]] = []
+        entries: List[MemoryEntry] = []
+        claims: Dict[str, tuple] = {}
+        for index, item in enumerate(conversations):
+            memory_id = str(uuid.uuid4())
+            digest = None
+            try:
+                digest, duplicate_id = self._claim_content(
+                    item.get("domain"),
+                    item.get("conversation_data"),
+                    item.get("content_type", "conversation"),
+                    item.get("subdomain"),
+                    memory_id,
+                )
+                if duplicate_id is not None:
+                    if duplicate_id not in claims:
+                        self._handle_duplicate(
+                            duplicate_id, item["domain"], item.get("tags"), item.get("confidence", 1.0)
+                        )
+                    results.append({"index": index, "status": "duplicate", "memory_id": duplicate_id})
+                    continue
+                entries.append(self._build_entry(**item, memory_id=memory_id))
+                claims[memory_id] = (item["domain"], digest)
+                results.append({"index": index, "status": "success", "memory_id": memory_id})
+            except Exception as e:
+                self._release_content(item.get("domain"), digest, memory_id)
+                results.append({"index": index, "status": "error", "error": str(e)})
+        return results, entries, claims
+
+    def _store_batch(
+        self, entries: List[MemoryEntry], claims: Dict[str, tuple], results: List[Dict[str, Any]]
+    ):
+        """Write a prepared batch; on failure its claims are released and its items marked failed"""
+        try:
+            if self.use_chromadb and self._chromadb_storage:
+                self._chromadb_storage.store_memories(
+                    [self._vector_store_kwargs(entry) for entry in entries]
+                )
+                if self._lexical_storage is not None and self._lexical_storage is not self._sqlite_storage:
+                    try:
+                        self._lexical_storage.store_memories(entries)
+                    except sqlite3.Error as e:
+                        logger.warning(f"Failed to update lexical index for a batch of {len(entries)}: {e}")
+            else:
+                self._sqlite_storage.store_memories(entries)
+        except Exception as e:
+            logger.error(f"Batch store of {len(entries)} memories failed: {e}")
+            for memory_id, (domain, digest) in claims.items():
+                self._release_content(domain, digest, memory_id)
+            for result in results:
+                if result["status"] == "success":
+                    result.update(status="error", error=str(e))
+                    result.pop("memory_id")
+            return
+        self._settle_claims(claims)
+        self._record_write(*(entry.domain for entry in entries))
+
+    def get_memories_by_ids(
+        self, memory_ids: List[str], fields: Optional[List[str]] = None
+    ) -> List[MemoryEntry]:
+        """
+        Fetch several memories by id in bulk; unknown ids are omitted, order is kept.
 
+        fields projects the fetch as in retrieve_conversations.
+        """
+        self._check_batch_size(len(memory_ids))
+        memory_ids = list(dict.fromkeys(memory_ids))
         if self.use_chromadb and self._chromadb_storage:
-            # Use ChromaDB storage
-            return self._chromadb_storage.store_memory(
-                domain=domain,
-                memory_id=memory_id,
-                content_data=conversation_data,
-                metadata=metadata,
-                tags=tags or [],
-                timestamp=timestamp,
-                source=source,
-                confidence=confidence,
-                context={},
-                subdomain=subdomain,
-                content_type=content_type,
-            )
-        else:
-            # Fall back to SQLite
-            memory_entry = MemoryEntry(
-                id=memory_id,
-                domain=domain,
-                subdomain=subdomain,
-                content_type=content_type,
-                content_data=conversation_data,
-                source=source,
-                confidence=confidence,
-                tags=tags or [],
-                metadata=metadata,
-                timestamp=timestamp,
-            )
-            return self._sqlite_storage.store_memory(memory_entry)
+            results = self._chromadb_storage.get_memories(memory_ids, include=vector_include(fields))
+            return self._entries_from_results(results)
+        return self._sqlite_storage.retrieve_memories(memory_ids, decode_content=needs_content(fields))
 
     def retrieve_conversations(
         self,
@@ -582,9 +1318,81 @@ class MemoryManager:
         min_confidence: float = 0.0,
         max_confidence: float = 1.0,
         date_range: Optional[tuple] = None,
+        search_mode: Optional[str] = None,
+        fields: Optional[List[str]] = None,
     ) -> List[MemoryEntry]:
-        """Retrieve conversations with enhanced filtering and sorting"""
-        if self.use_chromadb and self._chromadb_storage:
+        """
+        Retrieve conversations with enhanced filtering and sorting.
+
+        search_mode overrides the manager default for this call; in "hybrid"
+        mode a keyword query returns the top `limit` memories by fused
+        lexical/vector rank, which sort_by then orders.
+
+        fields names the MemoryEntry fields the caller will use (see
+        projection.MEMORY_FIELDS); when it leaves out content_data and context
+        the backends skip fetching/decoding them and return them empty.
+
+        Concurrent calls with identical arguments share one retrieval.
+        """
+        search_mode = search_mode or self.search_mode
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(f"Invalid search mode: {search_mode}")
+
+        params = dict(
+            domain=domain,
+            content_type=content_type,
+            tags=tags,
+            source=source,
+            keyword=keyword,
+            limit=limit,
+            offset=offset,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            min_confidence=min_confidence,
+            max_confidence=max_confidence,
+            date_range=date_range,
+            search_mode=search_mode,
+            fields=list(fields) if fields is not None else None,
+        )
+        if self._retrieval_flight is None:
+            return self._retrieve_conversations(**params)
+        return self._retrieval_flight.do(
+            make_key("retrieve_conversations", **params),
+            lambda: self._retrieve_conversations(**params),
+        )
+
+    def _retrieve_conversations(
+        self,
+        domain: Optional[str],
+        content_type: Optional[str],
+        tags: Optional[List[str]],
+        source: Optional[str],
+        keyword: Optional[str],
+        limit: int,
+        offset: int,
+        sort_by: str,
+        sort_order: str,
+        min_confidence: float,
+        max_confidence: float,
+        date_range: Optional[tuple],
+        search_mode: str,
+        fields: Optional[List[str]],
+    ) -> List[MemoryEntry]:
+        if search_mode == "hybrid" and keyword:
+            memories = self._hybrid_search(
+                keyword=keyword,
+                domain=domain,
+                content_type=content_type,
+                tags=tags,
+                source=source,
+                limit=limit,
+                min_confidence=min_confidence,
+                max_confidence=max_confidence,
+                date_range=date_range,
+                fields=fields,
+            )
+
+        elif self.use_chromadb and self._chromadb_storage:
             # Use ChromaDB with semantic search
             results = self._chromadb_storage.search_memories(
                 query=keyword,
@@ -594,26 +1402,15 @@ class MemoryManager:
                 source=source,
                 limit=limit,
                 min_confidence=min_confidence,
+                max_confidence=max_confidence,
+                date_range=date_range,
+                include=vector_include(fields),
             )
 
             # Convert dicts to MemoryEntry objects
-            memories = []
-            for r in results:
-                entry = MemoryEntry(
-                    id=r.get("id", ""),
-                    domain=r.get("domain", ""),
-                    subdomain=r.get("subdomain"),
-                    content_type=r.get("content_type", "conversation"),
-                    content_data=r.get("content_data", {}),
-                    metadata=r.get("metadata", {}),
-                    tags=r.get("tags", []),
-                    timestamp=r.get("timestamp", ""),
-                    source=r.get("source", ""),
-                    confidence=r.get("confidence", 1.0),
-                    context=r.get("context", {}),
-                    similarity_score=r.get("similarity_score", 0.0),
-                )
-                memories.append(entry)
+            memories = self._entries_from_results(results)
+            # The where clause already applied the date range
+            date_range = None
 
         else:
             # Use SQLite storage
@@ -625,21 +1422,38 @@ class MemoryManager:
                 keyword=keyword,
                 limit=limit,
                 offset=offset,
+                decode_content=needs_content(fields),
             )
 
+        return self._finish_retrieval(
+            memories, keyword, search_mode, min_confidence, max_confidence,
+            date_range, sort_by, sort_order,
+        )
+
+    def _finish_retrieval(
+        self,
+        memories: List[MemoryEntry],
+        keyword: Optional[str],
+        search_mode: str,
+        min_confidence: float,
+        max_confidence: float,
+        date_range: Optional[tuple],
+        sort_by: str,
+        sort_order: str,
+    ) -> List[MemoryEntry]:
+        """Backend-independent filtering, scoring and sorting of retrieved memories"""
         # Apply confidence filter
         if min_confidence > 0.0 or max_confidence < 1.0:
             memories = [
                 m for m in memories if min_confidence <= m.confidence <= max_confidence
             ]
 
-        # Apply date range filter
+        # Apply date range filter (None bounds are open)
         if date_range:
-            start_date, end_date = date_range
-            memories = [m for m in memories if start_date <= m.timestamp <= end_date]
+            memories = [m for m in memories if in_date_range(m.timestamp, date_range)]
 
-        # Apply relevance scoring for keyword searches (SQLite only, ChromaDB handles this)
-        if keyword and not self.use_chromadb:
+        # Apply relevance scoring for keyword searches (SQLite only, ChromaDB and hybrid fusion handle this)
+        if keyword and not self.use_chromadb and search_mode != "hybrid":
             memories = self._score_and_sort_relevance(memories, keyword)
 
         # Apply sorting
@@ -658,6 +1472,500 @@ class MemoryManager:
 
         return memories
 
+    @staticmethod
+    def _entries_from_results(results: List[Dict[str, Any]]) -> List[MemoryEntry]:
+        """Convert storage backend result dicts into MemoryEntry objects"""
+        return [
+            MemoryEntry(
+                id=r.get("id", ""),
+                domain=r.get("domain", ""),
+                subdomain=r.get("subdomain"),
+                content_type=r.get("content_type", "conversation"),
+                content_data=r.get("content_data", {}),
+                metadata=r.get("metadata", {}),
+                tags=r.get("tags", []),
+                timestamp=r.get("timestamp", ""),
+                source=r.get("source", ""),
+                confidence=r.get("confidence", 1.0),
+                context=r.get("context", {}),
+                similarity_score=r.get("similarity_score", 0.0),
+            )
+            for r in results
+        ]
+
+    def _get_search_executor(self) -> ThreadPoolExecutor:
+        """Thread pool used to run independent retrieval legs concurrently"""
+        if self._search_executor is None:
+            self._search_executor = ThreadPoolExecutor(
+                max_workers=4, thread_name_prefix="memory-search"
+            )
+        return self._search_executor
+
+    def _get_expansion_executor(self) -> ThreadPoolExecutor:
+        """
+        Thread pool for the sub-queries of expand_and_search.
+
+        Separate from the search pool: a hybrid sub-query submits its own
+        legs there and would deadlock waiting on a pool its siblings fill.
+        """
+        if self._expansion_executor is None:
+            self._expansion_executor = ThreadPoolExecutor(
+                max_workers=int(os.environ.get("MCP_MEMORY_EXPAND_WORKERS", "4")),
+                thread_name_prefix="memory-expand",
+            )
+        return self._expansion_executor
+
+    def _hybrid_search(
+        self,
+        keyword: str,
+        domain: Optional[str] = None,
+        content_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        source: Optional[str] = None,
+        limit: int = 100,
+        min_confidence: float = 0.0,
+        max_confidence: float = 1.0,
+        date_range: Optional[tuple] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[MemoryEntry]:
+        """Run FTS5 BM25 and vector retrieval concurrently and fuse them with weighted RRF"""
+        executor = self._get_search_executor()
+        legs = {}
+
+        if self._lexical_storage is not None and self.hybrid_weights.get("lexical"):
+            legs["lexical"] = executor.submit(
+                self._lexical_storage.search_fts,
+                keyword,
+                domain=domain,
+                content_type=content_type,
+                tags=tags,
+                source=source,
+                limit=limit,
+                decode_content=needs_content(fields),
+            )
+
+        if self.use_chromadb and self._chromadb_storage and self.hybrid_weights.get("vector"):
+            legs["vector"] = executor.submit(
+                self._chromadb_storage.search_memories,
+                query=keyword,
+                domain=domain,
+                content_type=content_type,
+                tags=tags,
+                source=source,
+                limit=limit,
+                min_confidence=min_confidence,
+                max_confidence=max_confidence,
+                date_range=date_range,
+                include=vector_include(fields),
+            )
+
+        rankings = {}
+        for name, future in legs.items():
+            try:
+                rankings[name] = future.result()
+            except Exception as e:
+                logger.warning(f"Hybrid search: {name} retrieval failed: {e}")
+        return self._fuse_rankings(rankings, limit)
+
+    def _fuse_rankings(self, rankings: Dict[str, List[Any]], limit: int) -> List[MemoryEntry]:
+        """Fuse the lexical (MemoryEntry) and vector (result dict) legs of a hybrid search"""
+        if "vector" in rankings:
+            entries = self._entries_from_results(rankings["vector"])
+            entries.sort(key=lambda m: m.similarity_score, reverse=True)
+            rankings["vector"] = entries
+
+        if "lexical" in rankings and self.use_chromadb and self._chromadb_storage:
+            # The FTS mirror can lag deletes made by other processes; trust the id index
+            in_vector = {m.id for m in rankings.get("vector", [])}
+            rankings["lexical"] = [
+                m for m in rankings["lexical"]
+                if m.id in in_vector or self._chromadb_storage.is_known(m.id) is not False
+            ]
+
+        # Prefer the vector copy of a memory so its similarity score is kept
+        by_id = {}
+        for name in ("vector", "lexical"):
+            for memory in rankings.get(name, []):
+                by_id.setdefault(memory.id, memory)
+
+        names = list(rankings)
+        fused = reciprocal_rank_fusion(
+            [[m.id for m in rankings[name]] for name in names],
+            [self.hybrid_weights[name] for name in names],
+            k=self.rrf_k,
+        )
+
+        memories = []
+        for memory_id, score in fused[:limit]:
+            memory = by_id[memory_id]
+            memory.relevance_score = score
+            memories.append(memory)
+        return memories
+
+    # Asyncio API: same semantics as the sync methods, for use on an event loop
+
+    def _get_sqlite_executor(self) -> ThreadPoolExecutor:
+        """Dedicated pool for blocking SQLite work issued from async methods"""
+        if self._sqlite_executor is None:
+            self._sqlite_executor = ThreadPoolExecutor(
+                max_workers=int(os.environ.get("MCP_MEMORY_SQLITE_WORKERS", "4")),
+                thread_name_prefix="memory-sqlite",
+            )
+        return self._sqlite_executor
+
+    async def _run_sqlite(self, func, *args, **kwargs):
+        """Run a blocking SQLite call on the dedicated executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_sqlite_executor(), functools.partial(func, *args, **kwargs)
+        )
+
+    def _get_async_storage(self) -> Optional["AsyncChromaDBStorage"]:
+        """Async front end of the vector storage, or None when it has no HTTP transport"""
+        if self._async_storage is None and self.use_chromadb and self._chromadb_storage:
+            storage_class = _async_storage_class()
+            if storage_class is not None and getattr(self._chromadb_storage, "transport", None) == "http":
+                try:
+                    self._async_storage = storage_class(
+                        self._chromadb_storage, executor=self._get_sqlite_executor()
+                    )
+                except ImportError as e:
+                    logger.warning(f"Async ChromaDB path unavailable: {e}")
+        return self._async_storage
+
+    async def _vector_call(self, method: str, **kwargs):
+        """Call a vector storage method natively async when possible, else in a thread"""
+        async_storage = self._get_async_storage()
+        if async_storage is not None and hasattr(async_storage, method):
+            return await getattr(async_storage, method)(**kwargs)
+        return await asyncio.to_thread(getattr(self._chromadb_storage, method), **kwargs)
+
+    async def astore_conversation(
+        self,
+        domain: str,
+        conversation_data: Dict[str, Any],
+        source: str,
+        content_type: str = "conversation",
+        subdomain: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        confidence: float = 1.0,
+    ) -> str:
+        """Async store_conversation"""
+        memory_id = str(uuid.uuid4())
+        digest, duplicate_id = await self._aclaim_content(
+            domain, conversation_data, content_type, subdomain, memory_id
+        )
+        if duplicate_id is not None:
+            return await self._ahandle_duplicate(duplicate_id, domain, tags, confidence)
+
+        memory_entry = self._build_entry(
+            domain, conversation_data, source, content_type, subdomain, tags, confidence,
+            memory_id=memory_id,
+        )
+
+        try:
+            if self.use_chromadb and self._chromadb_storage:
+                stored_id = await self._vector_call("store_memory", **self._vector_store_kwargs(memory_entry))
+                await self._run_sqlite(self._mirror_to_lexical_index, memory_entry)
+            else:
+                stored_id = await self._run_sqlite(self._sqlite_storage.store_memory, memory_entry)
+        except Exception:
+            await self._run_sqlite(self._release_content, domain, digest, memory_id)
+            raise
+        self._settle_claims([memory_id])
+        await self._run_sqlite(self._record_write, domain)
+        return stored_id
+
+    async def _aclaim_content(
+        self,
+        domain: str,
+        conversation_data: Dict[str, Any],
+        content_type: str,
+        subdomain: Optional[str],
+        memory_id: str,
+    ) -> tuple:
+        """Async _claim_content: hash claim on the SQLite executor, existence check over HTTP"""
+        digest, existing, unverified = await self._run_sqlite(
+            self._claim_hash, domain, conversation_data, content_type, subdomain, memory_id
+        )
+        if unverified and not await self._amemory_exists(existing, domain):
+            if not await self._run_sqlite(self._replace_stale, domain, digest, memory_id, existing):
+                return await self._aclaim_content(domain, conversation_data, content_type, subdomain, memory_id)
+            existing = None
+        return digest, existing
+
+    async def _amemory_exists(self, memory_id: str, domain: str) -> bool:
+        """Async _memory_exists"""
+        if not (self.use_chromadb and self._chromadb_storage):
+            return await self._run_sqlite(self._sqlite_storage.retrieve_memory, memory_id) is not None
+        known = await self._run_sqlite(self._chromadb_storage.is_known, memory_id)
+        if known is not None:
+            return known
+        try:
+            return memory_id in await self._vector_call("existing_ids", domain=domain, memory_ids=[memory_id])
+        except Exception as e:
+            logger.warning(f"Could not check whether memory {memory_id} exists: {e}")
+            return True
+
+    async def _ahandle_duplicate(
+        self, memory_id: str, domain: str, tags: Optional[List[str]], confidence: float
+    ) -> str:
+        """Async _handle_duplicate: ChromaDB reads and updates go through _vector_call"""
+        if not (self.use_chromadb and self._chromadb_storage):
+            return await self._run_sqlite(self._handle_duplicate, memory_id, domain, tags, confidence)
+        if self.dedup_policy == "skip":
+            self.dedup_stats["skipped"] += 1
+            return memory_id
+
+        existing = await self._vector_call(
+            "get_memory", domain=domain, memory_id=memory_id, include=["metadatas"]
+        )
+        updates = self._duplicate_updates(existing, tags, confidence)
+        if updates:
+            await self._vector_call("update_memory", domain=domain, memory_id=memory_id, **updates)
+            await self._run_sqlite(self._update_lexical_index, memory_id, updates)
+            await self._run_sqlite(self._record_write, domain)
+        return memory_id
+
+    async def astore_conversations(self, conversations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Async store_conversations"""
+        self._check_batch_size(len(conversations))
+        results, entries, claims = await self._run_sqlite(self._prepare_batch, conversations)
+        if entries:
+            if self.use_chromadb and self._chromadb_storage:
+                await asyncio.to_thread(self._store_batch, entries, claims, results)
+            else:
+                await self._run_sqlite(self._store_batch, entries, claims, results)
+        return results
+
+    async def aget_memories_by_ids(
+        self, memory_ids: List[str], fields: Optional[List[str]] = None
+    ) -> List[MemoryEntry]:
+        """Async get_memories_by_ids"""
+        if self.use_chromadb and self._chromadb_storage:
+            return await asyncio.to_thread(self.get_memories_by_ids, memory_ids, fields)
+        return await self._run_sqlite(self.get_memories_by_ids, memory_ids, fields)
+
+    async def aretrieve_conversations(
+        self,
+        domain: Optional[str] = None,
+        content_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        source: Optional[str] = None,
+        keyword: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+        sort_by: str = "timestamp",
+        sort_order: str = "DESC",
+        min_confidence: float = 0.0,
+        max_confidence: float = 1.0,
+        date_range: Optional[tuple] = None,
+        search_mode: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[MemoryEntry]:
+        """Async retrieve_conversations"""
+        search_mode = search_mode or self.search_mode
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(f"Invalid search mode: {search_mode}")
+
+        params = dict(
+            domain=domain,
+            content_type=content_type,
+            tags=tags,
+            source=source,
+            keyword=keyword,
+            limit=limit,
+            offset=offset,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            min_confidence=min_confidence,
+            max_confidence=max_confidence,
+            date_range=date_range,
+            search_mode=search_mode,
+            fields=list(fields) if fields is not None else None,
+        )
+        if self._retrieval_flight is None:
+            return await self._aretrieve_conversations(**params)
+        return await self._retrieval_flight.ado(
+            make_key("retrieve_conversations", **params),
+            lambda: self._aretrieve_conversations(**params),
+        )
+
+    async def _aretrieve_conversations(
+        self,
+        domain: Optional[str],
+        content_type: Optional[str],
+        tags: Optional[List[str]],
+        source: Optional[str],
+        keyword: Optional[str],
+        limit: int,
+        offset: int,
+        sort_by: str,
+        sort_order: str,
+        min_confidence: float,
+        max_confidence: float,
+        date_range: Optional[tuple],
+        search_mode: str,
+        fields: Optional[List[str]],
+    ) -> List[MemoryEntry]:
+        if search_mode == "hybrid" and keyword:
+            memories = await self._ahybrid_search(
+                keyword=keyword,
+                domain=domain,
+                content_type=content_type,
+                tags=tags,
+                source=source,
+                limit=limit,
+                min_confidence=min_confidence,
+                max_confidence=max_confidence,
+                date_range=date_range,
+                fields=fields,
+            )
+        elif self.use_chromadb and self._chromadb_storage:
+            results = await self._vector_call(
+                "search_memories",
+                query=keyword,
+                domain=domain,
+                content_type=content_type,
+                tags=tags,
+                source=source,
+                limit=limit,
+                min_confidence=min_confidence,
+                max_confidence=max_confidence,
+                date_range=date_range,
+                include=vector_include(fields),
+            )
+            memories = self._entries_from_results(results)
+            # The where clause already applied the date range
+            date_range = None
+        else:
+            memories = await self._run_sqlite(
+                self._sqlite_storage.search_memories,
+                domain=domain,
+                content_type=content_type,
+                tags=tags,
+                source=source,
+                keyword=keyword,
+                limit=limit,
+                offset=offset,
+                decode_content=needs_content(fields),
+            )
+
+        return self._finish_retrieval(
+            memories, keyword, search_mode, min_confidence, max_confidence,
+            date_range, sort_by, sort_order,
+        )
+
+    async def _ahybrid_search(
+        self,
+        keyword: str,
+        domain: Optional[str] = None,
+        content_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        source: Optional[str] = None,
+        limit: int = 100,
+        min_confidence: float = 0.0,
+        max_confidence: float = 1.0,
+        date_range: Optional[tuple] = None,
+        fields: Optional[List[str]] = None,
+    ) -> List[MemoryEntry]:
+        """Async _hybrid_search: both legs run concurrently on the event loop"""
+        legs = {}
+        if self._lexical_storage is not None and self.hybrid_weights.get("lexical"):
+            legs["lexical"] = self._run_sqlite(
+                self._lexical_storage.search_fts,
+                keyword,
+                domain=domain,
+                content_type=content_type,
+                tags=tags,
+                source=source,
+                limit=limit,
+                decode_content=needs_content(fields),
+            )
+        if self.use_chromadb and self._chromadb_storage and self.hybrid_weights.get("vector"):
+            legs["vector"] = self._vector_call(
+                "search_memories",
+                query=keyword,
+                domain=domain,
+                content_type=content_type,
+                tags=tags,
+                source=source,
+                limit=limit,
+                min_confidence=min_confidence,
+                max_confidence=max_confidence,
+                date_range=date_range,
+                include=vector_include(fields),
+            )
+
+        results = await asyncio.gather(*legs.values(), return_exceptions=True)
+        rankings = {}
+        for name, result in zip(legs, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Hybrid search: {name} retrieval failed: {result}")
+                continue
+            rankings[name] = result
+        return self._fuse_rankings(rankings, limit)
+
+    async def aexpand_and_search(
+        self,
+        domain: str,
+        query: str,
+        max_keywords: int = 5,
+        limit: int = 20,
+        content_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        source: Optional[str] = None,
+        search_mode: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Async expand_and_search: the sub-queries run concurrently on the event loop"""
+        keywords = await self._run_sqlite(self.expand_keywords, domain, query, max_keywords=max_keywords)
+        queries = self._sub_queries(query, keywords)
+        outcomes = await asyncio.gather(
+            *(
+                self.aretrieve_conversations(
+                    keyword=sub_query,
+                    **self._sub_query_params(
+                        domain, limit, content_type, tags, source, search_mode, fields
+                    ),
+                )
+                for sub_query in queries
+            ),
+            return_exceptions=True,
+        )
+        return self._fuse_sub_queries(keywords, queries, outcomes, limit)
+
+    async def asearch_memories_advanced(self, **kwargs) -> Dict[str, Any]:
+        """Async search_memories_advanced (SQLite-backed, runs on the SQLite executor)"""
+        return await self._run_sqlite(self.search_memories_advanced, **kwargs)
+
+    async def aget_similar_memories(self, memory_id: str, limit: int = 10) -> List[MemoryEntry]:
+        """Async get_similar_memories"""
+        return await self._run_sqlite(self.get_similar_memories, memory_id, limit)
+
+    async def aget_keyword_trends(self, domain: str, days: int = 30) -> Dict[str, Any]:
+        """Async get_keyword_trends"""
+        return await self._run_sqlite(self.get_keyword_trends, domain, days)
+
+    async def aget_memory_statistics(self) -> Dict[str, Any]:
+        """Async get_memory_statistics"""
+        if self.use_chromadb and self._chromadb_storage:
+            stats = await self._vector_call("get_statistics")
+            stats["storage_backend"] = self.vector_backend
+        else:
+            stats = await self._run_sqlite(self._sqlite_storage.get_memory_stats)
+            stats["storage_backend"] = "sqlite"
+        if self._retrieval_flight:
+            stats["retrieval_coalescing"] = self._retrieval_flight.snapshot()
+        stats["deduplication"] = await self._run_sqlite(self._dedup_statistics)
+        stats["analytics_cache"] = self._analytics_cache.get_statistics()
+        return stats
+
+    async def aclose(self):
+        """Close the async HTTP connection pool bound to the running loop"""
+        if self._async_storage is not None:
+            await self._async_storage.aclose()
+
     def search_memories_advanced(
         self,
         domain: Optional[str] = None,
@@ -675,8 +1983,11 @@ class MemoryManager:
         sort_by: str = "timestamp",
         sort_order: str = "DESC",
         fuzzy_search: bool = False,
+        fields: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """Advanced search with comprehensive filtering and metadata"""
+        # Content is only decoded when the caller or a content filter needs it
+        content_filters = keywords or exclude_keywords or required_fields or fuzzy_search
         # Get base memories
         memories = self.storage.search_memories(
             domain=domain,
@@ -686,6 +1997,7 @@ class MemoryManager:
             keyword=None,  # We'll handle keyword search manually for better control
             limit=limit * 2,  # Get more initially for filtering
             offset=offset,
+            decode_content=bool(content_filters) or needs_content(fields),
         )
 
         # Apply confidence filter
@@ -694,10 +2006,9 @@ class MemoryManager:
                 m for m in memories if min_confidence <= m.confidence <= max_confidence
             ]
 
-        # Apply date range filter
+        # Apply date range filter (None bounds are open)
         if date_range:
-            start_date, end_date = date_range
-            memories = [m for m in memories if start_date <= m.timestamp <= end_date]
+            memories = [m for m in memories if in_date_range(m.timestamp, date_range)]
 
         # Apply keyword search with better control
         if keywords:
@@ -973,7 +2284,23 @@ class MemoryManager:
         use_stored_memories: bool = True,
         max_keywords: int = 15,
     ) -> List[str]:
-        """Expand user query with domain-specific keywords using multiple strategies"""
+        """Expand user query with domain-specific keywords using multiple strategies (cached)"""
+        return self._analytics_cache.get_or_compute(
+            "expand_keywords",
+            domain,
+            lambda: self._expand_keywords(domain, user_query, use_stored_memories, max_keywords),
+            query=normalize_query(user_query),
+            use_stored_memories=use_stored_memories,
+            max_keywords=max_keywords,
+        )
+
+    def _expand_keywords(
+        self,
+        domain: str,
+        user_query: str,
+        use_stored_memories: bool,
+        max_keywords: int,
+    ) -> List[str]:
         if domain not in self.domain_validators:
             return []
 
@@ -1023,24 +2350,187 @@ class MemoryManager:
 
         return all_keywords[:max_keywords]
 
+    def expand_and_search(
+        self,
+        domain: str,
+        query: str,
+        max_keywords: int = 5,
+        limit: int = 20,
+        content_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        source: Optional[str] = None,
+        search_mode: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Expand a query and search for it and its expansions in one call.
+
+        The query and up to max_keywords expanded keywords are retrieved as
+        concurrent sub-queries (each up to `limit` memories, ranked by
+        relevance) and fused with reciprocal-rank fusion; the expansions
+        weigh EXPANSION_WEIGHT against the query's 1.0. Returns the top
+        `limit` memories (relevance_score is the fused score), the keywords
+        and the hit count of each sub-query. A failed sub-query is logged
+        and left out of the fusion.
+        """
+        keywords = self.expand_keywords(domain, query, max_keywords=max_keywords)
+        queries = self._sub_queries(query, keywords)
+        params = self._sub_query_params(domain, limit, content_type, tags, source, search_mode, fields)
+        executor = self._get_expansion_executor()
+        futures = [
+            executor.submit(self.retrieve_conversations, keyword=sub_query, **params)
+            for sub_query in queries
+        ]
+        outcomes = []
+        for future in futures:
+            try:
+                outcomes.append(future.result())
+            except Exception as e:
+                outcomes.append(e)
+        return self._fuse_sub_queries(keywords, queries, outcomes, limit)
+
+    @staticmethod
+    def _sub_queries(query: str, keywords: List[str]) -> List[str]:
+        """The query followed by the expansions it does not already contain"""
+        queries = [query]
+        seen = {query.lower()}
+        for keyword in keywords:
+            if keyword.lower() not in seen:
+                seen.add(keyword.lower())
+                queries.append(keyword)
+        return queries
+
+    def _sub_query_params(
+        self,
+        domain: str,
+        limit: int,
+        content_type: Optional[str],
+        tags: Optional[List[str]],
+        source: Optional[str],
+        search_mode: Optional[str],
+        fields: Optional[List[str]],
+    ) -> Dict[str, Any]:
+        """retrieve_conversations arguments shared by the sub-queries of expand_and_search"""
+        if domain not in self.domain_validators:
+            raise ValueError(f"Invalid domain: {domain}")
+        search_mode = search_mode or self.search_mode
+        # Vector search scores similarity; keyword scoring and hybrid fusion set relevance
+        by_similarity = self.use_chromadb and self._chromadb_storage and search_mode != "hybrid"
+        return dict(
+            domain=domain,
+            content_type=content_type,
+            tags=tags,
+            source=source,
+            limit=limit,
+            sort_by="similarity" if by_similarity else "relevance",
+            sort_order="DESC",
+            search_mode=search_mode,
+            fields=fields,
+        )
+
+    def _fuse_sub_queries(
+        self, keywords: List[str], queries: List[str], outcomes: List[Any], limit: int
+    ) -> Dict[str, Any]:
+        rankings, weights, sub_queries = [], [], []
+        by_id: Dict[str, MemoryEntry] = {}
+        for index, (sub_query, outcome) in enumerate(zip(queries, outcomes)):
+            if isinstance(outcome, BaseException):
+                logger.warning(f"Expanded search: sub-query {sub_query!r} failed: {outcome}")
+                sub_queries.append({"query": sub_query, "error": str(outcome)})
+                continue
+            sub_queries.append({"query": sub_query, "count": len(outcome)})
+            rankings.append([m.id for m in outcome])
+            weights.append(1.0 if index == 0 else EXPANSION_WEIGHT)
+            for memory in outcome:
+                by_id.setdefault(memory.id, memory)
+
+        memories = []
+        for memory_id, score in reciprocal_rank_fusion(rankings, weights, k=self.rrf_k)[:limit]:
+            memory = by_id[memory_id]
+            memory.relevance_score = score
+            memories.append(memory)
+        return {"keywords": keywords, "sub_queries": sub_queries, "memories": memories}
+
     def get_keyword_trends(self, domain: str, days: int = 30) -> Dict[str, Any]:
-        """Analyze keyword trends in a domain over specified days"""
-        from datetime import timedelta
+        """Analyze keyword trends in a domain over specified days (cached)"""
+        return self._analytics_cache.get_or_compute(
+            "get_keyword_trends", domain, lambda: self._get_keyword_trends(domain, days), days=days
+        )
+
+    def start_trend_precompute(self, interval: Optional[float] = None) -> threading.Thread:
+        """
+        Refresh cached keyword trends for TREND_WINDOWS of every domain in the background.
+
+        Every interval seconds (default: env MCP_MEMORY_PRECOMPUTE_INTERVAL or
+        60) trends that were invalidated by a write, or expire before the next
+        round, are recomputed, so agents asking for a standard window get a
+        cache hit.
+        """
+        if self._precompute_thread is not None and self._precompute_thread.is_alive():
+            return self._precompute_thread
+        interval = float(interval or os.environ.get("MCP_MEMORY_PRECOMPUTE_INTERVAL", "60"))
+        if not self._analytics_cache.enabled:
+            logger.warning("Trend precompute requested but the analytics cache is disabled (TTL 0)")
+        self._precompute_stop.clear()
+        self._precompute_thread = threading.Thread(
+            target=self._precompute_trends, args=(interval,), name="memory-trends", daemon=True
+        )
+        self._precompute_thread.start()
+        return self._precompute_thread
+
+    def stop_trend_precompute(self):
+        self._precompute_stop.set()
+        if self._precompute_thread is not None:
+            self._precompute_thread.join()
+            self._precompute_thread = None
+
+    def _precompute_trends(self, interval: float):
+        while not self._precompute_stop.is_set():
+            for domain in self.domain_validators:
+                widest = {}
+                for days in TREND_WINDOWS:
+                    if self._precompute_stop.is_set():
+                        return
+                    try:
+                        self._analytics_cache.get_or_compute(
+                            "get_keyword_trends",
+                            domain,
+                            lambda: self._get_keyword_trends(domain, days, self._widest_window(domain, widest)),
+                            refresh_ahead=interval,
+                            days=days,
+                        )
+                    except Exception as e:
+                        logger.warning(f"Trend precompute failed for {domain} ({days} days): {e}")
+            self._precompute_stop.wait(interval)
+
+    def _widest_window(self, domain: str, fetched: Dict[str, Any]) -> Optional[List[MemoryEntry]]:
+        """
+        Memories of the widest TREND_WINDOWS window, fetched once per precompute round.
+
+        None when the fetch hit TREND_FETCH_LIMIT: a shorter window cut from an
+        incomplete set would miss memories, so it is fetched on its own.
+        """
+        if "memories" not in fetched:
+            cutoff_date = datetime.utcnow() - timedelta(days=max(TREND_WINDOWS))
+            memories = self.retrieve_conversations(
+                domain=domain, limit=TREND_FETCH_LIMIT, date_range=(cutoff_date.isoformat(), None)
+            )
+            fetched["memories"] = memories if len(memories) < TREND_FETCH_LIMIT else None
+        return fetched["memories"]
 
+    def _get_keyword_trends(
+        self, domain: str, days: int, memories: Optional[List[MemoryEntry]] = None
+    ) -> Dict[str, Any]:
+        """memories: an already fetched superset of the window (see _widest_window)"""
         cutoff_date = datetime.utcnow() - timedelta(days=days)
 
-        # Get memories from the specified time period
-        memories = self.storage.search_memories(domain=domain, limit=1000)
-
-        # Filter memories by date
-        recent_memories = []
-        for memory in memories:
-            try:
-                memory_date = datetime.fromisoformat(memory.timestamp)
-                if memory_date >= cutoff_date:
-                    recent_memories.append(memory)
-            except:
-                continue
+        if memories is None:
+            # The window is selected by the backend (timestamp_epoch where clause
+            # in ChromaDB mode); self.storage is SQLite only
+            memories = self.retrieve_conversations(
+                domain=domain, limit=TREND_FETCH_LIMIT, date_range=(cutoff_date.isoformat(), None)
+            )
+        recent_memories = [m for m in memories if in_date_range(m.timestamp, (cutoff_date, None))]
 
         # Analyze keyword frequency
         keyword_frequency = {}
@@ -1135,7 +2625,8 @@ class MemoryManager:
         self, domain: str, query_words: set
     ) -> List[str]:
         """Extract keywords from stored memories in the domain"""
-        memories = self.storage.search_memories(domain=domain, limit=100)
+        # Through retrieve_conversations so both backends work (self.storage is SQLite only)
+        memories = self.retrieve_conversations(domain=domain, limit=100)
 
         extracted_keywords = []
         keyword_scores = {}
@@ -1273,12 +2764,21 @@ class MemoryManager:
         """Get comprehensive memory system statistics"""
         if self.use_chromadb and self._chromadb_storage:
             stats = self._chromadb_storage.get_statistics()
-            stats["storage_backend"] = "chromadb"
-            return stats
+            stats["storage_backend"] = self.vector_backend
         else:
             stats = self._sqlite_storage.get_memory_stats()
             stats["storage_backend"] = "sqlite"
-            return stats
+        if self._retrieval_flight:
+            stats["retrieval_coalescing"] = self._retrieval_flight.snapshot()
+        stats["deduplication"] = self._dedup_statistics()
+        stats["analytics_cache"] = self._analytics_cache.get_statistics()
+        return stats
+
+    def _dedup_statistics(self) -> Dict[str, Any]:
+        stats = {"policy": self.dedup_policy, **self.dedup_stats}
+        if self._dedup_index is not None:
+            stats.update(self._dedup_index.get_statistics())
+        return stats
 
     def _validate_bmad_code(self, data: Dict[str, Any]):
         """Validate BMAD code memory content with comprehensive checks"""
@@ -1785,12 +3285,20 @@ class MemoryManager:
         with self.storage.lock:
             try:
                 with self.storage._get_cursor() as cursor:
+                    cursor.execute(
+                        "SELECT id FROM memory_entries WHERE timestamp < ?", (cutoff_str,)
+                    )
+                    expired = [row[0] for row in cursor.fetchall()]
                     cursor.execute(
                         "DELETE FROM memory_entries WHERE timestamp < ?", (cutoff_str,)
                     )
                     deleted = cursor.rowcount
-                    logger.info(f"Cleaned up {deleted} old memories")
-                    return deleted
+                logger.info(f"Cleaned up {deleted} old memories")
+                if deleted:
+                    if self._dedup_index is not None:
+                        self._dedup_index.remove_memories(expired)
+                    self._record_write(*self.domain_validators)
+                return deleted
             except Exception as e:
                 logger.error(f"Failed to cleanup expired memories: {e}")
                 raise
@@ -1845,9 +3353,21 @@ class MCPMemoryInterface:
         keyword: Optional[str] = None,
         limit: int = 100,
         offset: int = 0,
-    ) -> List[Dict[str, Any]]:
-        """MCP tool to retrieve memories with filtering"""
+        fields: Optional[List[str]] = None,
+        summary: bool = False,
+        max_bytes: Optional[int] = None,
+        max_chars_per_field: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        MCP tool to retrieve memories with filtering.
+
+        fields/summary project each memory, max_chars_per_field truncates long
+        strings and max_bytes caps the serialized list (see projection.py).
+        Returns {"memories": [...]} with the budget's "truncated",
+        "truncated_fields" and "omitted" counts alongside.
+        """
         try:
+            fields = resolve_fields(fields, summary)
             memories = self.memory_manager.retrieve_conversations(
                 domain=domain,
                 content_type=content_type,
@@ -1856,16 +3376,15 @@ class MCPMemoryInterface:
                 keyword=keyword,
                 limit=limit,
                 offset=offset,
+                fields=fields,
             )
-            return [memory.to_dict() for memory in memories]
+            return self._list_response(memories, fields, max_bytes, max_chars_per_field)
         except Exception as e:
-            return [
-                {
-                    "status": "error",
-                    "error": str(e),
-                    "message": "Failed to retrieve memories",
-                }
-            ]
+            return {
+                "status": "error",
+                "error": str(e),
+                "message": "Failed to retrieve memories",
+            }
 
     def mcp_search_memories_advanced(
         self,
@@ -1878,9 +3397,14 @@ class MCPMemoryInterface:
         min_confidence: float = 0.0,
         max_confidence: float = 1.0,
         limit: int = 100,
+        fields: Optional[List[str]] = None,
+        summary: bool = False,
+        max_bytes: Optional[int] = None,
+        max_chars_per_field: Optional[int] = None,
     ) -> Dict[str, Any]:
-        """MCP tool for advanced memory search"""
+        """MCP tool for advanced memory search (projection and budgets as in mcp_retrieve_memories)"""
         try:
+            fields = resolve_fields(fields, summary)
             result = self.memory_manager.search_memories_advanced(
                 domain=domain,
                 content_type=content_type,
@@ -1891,12 +3415,15 @@ class MCPMemoryInterface:
                 min_confidence=min_confidence,
                 max_confidence=max_confidence,
                 limit=limit,
+                fields=fields,
             )
+            memories, budget = shape_memories(result["memories"], fields, max_chars_per_field, max_bytes)
             return {
                 "status": "success",
-                "memories": [memory.to_dict() for memory in result["memories"]],
+                "memories": memories,
                 "total_count": result["total_count"],
                 "has_more": result["has_more"],
+                **budget,
             }
         except Exception as e:
             return {
@@ -1926,6 +3453,62 @@ class MCPMemoryInterface:
                 "message": "Failed to expand keywords",
             }
 
+    def mcp_expand_and_search(
+        self,
+        domain: str,
+        query: str,
+        max_keywords: int = 5,
+        limit: int = 20,
+        content_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        fields: Optional[List[str]] = None,
+        summary: bool = False,
+        max_bytes: Optional[int] = None,
+        max_chars_per_field: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        MCP tool expanding a query and searching all its keywords in one call
+        (replaces expand_keywords followed by one retrieve_memories per keyword)
+        """
+        try:
+            fields = resolve_fields(fields, summary)
+            result = self.memory_manager.expand_and_search(
+                domain=domain,
+                query=query,
+                max_keywords=max_keywords,
+                limit=limit,
+                content_type=content_type,
+                tags=tags,
+                fields=fields,
+            )
+            return self._expanded_search_response(domain, query, result, fields, max_bytes, max_chars_per_field)
+        except Exception as e:
+            return {
+                "status": "error",
+                "error": str(e),
+                "message": "Failed to expand and search",
+            }
+
+    @staticmethod
+    def _expanded_search_response(
+        domain: str,
+        query: str,
+        result: Dict[str, Any],
+        fields: Optional[List[str]],
+        max_bytes: Optional[int],
+        max_chars_per_field: Optional[int],
+    ) -> Dict[str, Any]:
+        memories, budget = shape_memories(result["memories"], fields, max_chars_per_field, max_bytes)
+        return {
+            "status": "success",
+            "domain": domain,
+            "query": query,
+            "keywords": result["keywords"],
+            "sub_queries": result["sub_queries"],
+            "memories": memories,
+            **budget,
+        }
+
     def mcp_get_memory_statistics(self) -> Dict[str, Any]:
         """MCP tool to get memory system statistics"""
         try:
@@ -1938,6 +3521,10 @@ class MCPMemoryInterface:
                 "message": "Failed to get memory statistics",
             }
 
+    def mcp_get_performance_metrics(self) -> Dict[str, Any]:
+        """MCP tool to get latency percentiles per tool and backend operation, and error/cache counters"""
+        return {"status": "success", "metrics": metrics.snapshot()}
+
     def mcp_get_similar_memories(
         self, memory_id: str, limit: int = 10
     ) -> Dict[str, Any]:
@@ -1975,6 +3562,284 @@ class MCPMemoryInterface:
                 "message": "Failed to analyze keyword trends",
             }
 
+    @staticmethod
+    def _batch_items(memories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Map store_memory style items to store_conversation arguments"""
+        items = []
+        for memory in memories:
+            item = dict(memory)
+            if "content_data" in item:
+                item["conversation_data"] = item.pop("content_data")
+            items.append(item)
+        return items
+
+    @staticmethod
+    def _batch_response(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        counts = {"success": 0, "duplicate": 0, "error": 0}
+        for result in results:
+            counts[result["status"]] += 1
+        if counts["error"] == 0:
+            status = "success"
+        elif counts["error"] == len(results):
+            status = "error"
+        else:
+            status = "partial"
+        return {
+            "status": status,
+            "results": results,
+            "stored": counts["success"],
+            "duplicates": counts["duplicate"],
+            "failed": counts["error"],
+        }
+
+    def mcp_store_memories_batch(self, memories: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """MCP tool to store several memories with one bulk write"""
+        try:
+            results = self.memory_manager.store_conversations(self._batch_items(memories))
+            return self._batch_response(results)
+        except Exception as e:
+            return {
+                "status": "error",
+                "error": str(e),
+                "message": "Failed to store memory batch",
+            }
+
+    @staticmethod
+    def _by_ids_response(
+        memory_ids: List[str], memories: List[MemoryEntry], fields, max_bytes, max_chars_per_field
+    ) -> Dict[str, Any]:
+        found = {memory.id for memory in memories}
+        shaped, budget = shape_memories(memories, fields, max_chars_per_field, max_bytes)
+        return {
+            "status": "success",
+            "memories": shaped,
+            "missing": [memory_id for memory_id in dict.fromkeys(memory_ids) if memory_id not in found],
+            **budget,
+        }
+
+    def mcp_retrieve_by_ids(
+        self,
+        memory_ids: List[str],
+        fields: Optional[List[str]] = None,
+        summary: bool = False,
+        max_bytes: Optional[int] = None,
+        max_chars_per_field: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """MCP tool to fetch several memories by id (projection and budgets as in mcp_retrieve_memories)"""
+        try:
+            fields = resolve_fields(fields, summary)
+            memories = self.memory_manager.get_memories_by_ids(memory_ids, fields)
+            return self._by_ids_response(memory_ids, memories, fields, max_bytes, max_chars_per_field)
+        except Exception as e:
+            return {
+                "status": "error",
+                "error": str(e),
+                "message": "Failed to retrieve memories by id",
+            }
+
+    @staticmethod
+    def _list_response(memories, fields, max_bytes, max_chars_per_field) -> Dict[str, Any]:
+        shaped, budget = shape_memories(memories, fields, max_chars_per_field, max_bytes)
+        return {"status": "success", "memories": shaped, **budget}
+
+    # Async counterparts used by the FastMCP server; responses match the sync tools
+
+    async def amcp_store_memory(
+        self,
+        domain: str,
+        content_data: Dict[str, Any],
+        source: str,
+        content_type: str = "conversation",
+        subdomain: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        confidence: float = 1.0,
+    ) -> Dict[str, Any]:
+        """Async mcp_store_memory"""
+        try:
+            memory_id = await self.memory_manager.astore_conversation(
+                domain=domain,
+                conversation_data=content_data,
+                source=source,
+                content_type=content_type,
+                subdomain=subdomain,
+                tags=tags,
+                confidence=confidence,
+            )
+            return {
+                "status": "success",
+                "memory_id": memory_id,
+                "message": f"Memory stored successfully in {domain} domain",
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "error": str(e),
+                "message": f"Failed to store memory in {domain} domain",
+            }
+
+    async def amcp_retrieve_memories(
+        self,
+        domain: Optional[str] = None,
+        content_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        source: Optional[str] = None,
+        keyword: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+        fields: Optional[List[str]] = None,
+        summary: bool = False,
+        max_bytes: Optional[int] = None,
+        max_chars_per_field: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Async mcp_retrieve_memories"""
+        try:
+            fields = resolve_fields(fields, summary)
+            memories = await self.memory_manager.aretrieve_conversations(
+                domain=domain,
+                content_type=content_type,
+                tags=tags,
+                source=source,
+                keyword=keyword,
+                limit=limit,
+                offset=offset,
+                fields=fields,
+            )
+            return self._list_response(memories, fields, max_bytes, max_chars_per_field)
+        except Exception as e:
+            return {
+                "status": "error",
+                "error": str(e),
+                "message": "Failed to retrieve memories",
+            }
+
+    async def amcp_store_memories_batch(self, memories: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Async mcp_store_memories_batch"""
+        try:
+            results = await self.memory_manager.astore_conversations(self._batch_items(memories))
+            return self._batch_response(results)
+        except Exception as e:
+            return {
+                "status": "error",
+                "error": str(e),
+                "message": "Failed to store memory batch",
+            }
+
+    async def amcp_retrieve_by_ids(
+        self,
+        memory_ids: List[str],
+        fields: Optional[List[str]] = None,
+        summary: bool = False,
+        max_bytes: Optional[int] = None,
+        max_chars_per_field: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Async mcp_retrieve_by_ids"""
+        try:
+            fields = resolve_fields(fields, summary)
+            memories = await self.memory_manager.aget_memories_by_ids(memory_ids, fields)
+            return self._by_ids_response(memory_ids, memories, fields, max_bytes, max_chars_per_field)
+        except Exception as e:
+            return {
+                "status": "error",
+                "error": str(e),
+                "message": "Failed to retrieve memories by id",
+            }
+
+    async def amcp_search_memories_advanced(self, **kwargs) -> Dict[str, Any]:
+        """Async mcp_search_memories_advanced"""
+        return await self.memory_manager._run_sqlite(self.mcp_search_memories_advanced, **kwargs)
+
+    async def amcp_expand_keywords(
+        self, domain: str, user_query: str, max_keywords: int = 15
+    ) -> Dict[str, Any]:
+        """Async mcp_expand_keywords"""
+        return await self.memory_manager._run_sqlite(
+            self.mcp_expand_keywords, domain, user_query, max_keywords
+        )
+
+    async def amcp_expand_and_search(
+        self,
+        domain: str,
+        query: str,
+        max_keywords: int = 5,
+        limit: int = 20,
+        content_type: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        fields: Optional[List[str]] = None,
+        summary: bool = False,
+        max_bytes: Optional[int] = None,
+        max_chars_per_field: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Async mcp_expand_and_search"""
+        try:
+            fields = resolve_fields(fields, summary)
+            result = await self.memory_manager.aexpand_and_search(
+                domain=domain,
+                query=query,
+                max_keywords=max_keywords,
+                limit=limit,
+                content_type=content_type,
+                tags=tags,
+                fields=fields,
+            )
+            return self._expanded_search_response(domain, query, result, fields, max_bytes, max_chars_per_field)
+        except Exception as e:
+            return {
+                "status": "error",
+                "error": str(e),
+                "message": "Failed to expand and search",
+            }
+
+    async def amcp_get_memory_statistics(self) -> Dict[str, Any]:
+        """Async mcp_get_memory_statistics"""
+        try:
+            stats = await self.memory_manager.aget_memory_statistics()
+            return {"status": "success", "statistics": stats}
+        except Exception as e:
+            return {
+                "status": "error",
+                "error": str(e),
+                "message": "Failed to get memory statistics",
+            }
+
+    async def amcp_get_similar_memories(self, memory_id: str, limit: int = 10) -> Dict[str, Any]:
+        """Async mcp_get_similar_memories"""
+        return await self.memory_manager._run_sqlite(self.mcp_get_similar_memories, memory_id, limit)
+
+    async def amcp_get_keyword_trends(self, domain: str, days: int = 30) -> Dict[str, Any]:
+        """Async mcp_get_keyword_trends"""
+        return await self.memory_manager._run_sqlite(self.mcp_get_keyword_trends, domain, days)
+
+
+# Projection and budget parameters shared by the retrieval tools (see projection.py)
+RESPONSE_SHAPING_PROPERTIES = {
+    "fields": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "Memory fields to return (id is always included)",
+    },
+    "summary": {
+        "type": "boolean",
+        "description": "Return only cheap metadata fields, no content",
+        "default": False,
+    },
+    "max_bytes": {
+        "type": "integer",
+        "description": "Cap on the serialized memories; memories past it are omitted",
+    },
+    "max_chars_per_field": {
+        "type": "integer",
+        "description": "Truncate longer strings, with a truncation marker",
+    },
+}
+
+# Tools that change stored memories; everything else is safe to run concurrently
+WRITE_TOOLS = frozenset({"store_memory", "store_memories_batch"})
+
+# JSON-RPC 2.0 error codes
+JSONRPC_INVALID_REQUEST = -32600
+JSONRPC_METHOD_NOT_FOUND = -32601
+JSONRPC_INVALID_PARAMS = -32602
+
 
 # MCP Server Implementation
 class MCPMemoryServer:
@@ -2024,6 +3889,37 @@ class MCPMemoryServer:
                     "required": ["domain", "content_data", "source"],
                 },
             },
+            "store_memories_batch": {
+                "name": "store_memories_batch",
+                "description": "Store several memory entries with one bulk write; returns a status per item",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "memories": {
+                            "type": "array",
+                            "items": {"type": "object"},
+                            "description": "Memories, each with the store_memory arguments",
+                        },
+                    },
+                    "required": ["memories"],
+                },
+            },
+            "retrieve_by_ids": {
+                "name": "retrieve_by_ids",
+                "description": "Fetch several memories by id",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "memory_ids": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Memory ids",
+                        },
+                        **RESPONSE_SHAPING_PROPERTIES,
+                    },
+                    "required": ["memory_ids"],
+                },
+            },
             "retrieve_memories": {
                 "name": "retrieve_memories",
                 "description": "Retrieve memories with filtering options",
@@ -2055,6 +3951,7 @@ class MCPMemoryServer:
                             "description": "Offset for pagination",
                             "default": 0,
                         },
+                        **RESPONSE_SHAPING_PROPERTIES,
                     },
                 },
             },
@@ -2100,6 +3997,7 @@ class MCPMemoryServer:
                             "description": "Maximum results",
                             "default": 100,
                         },
+                        **RESPONSE_SHAPING_PROPERTIES,
                     },
                 },
             },
@@ -2126,11 +4024,54 @@ class MCPMemoryServer:
                     "required": ["domain", "user_query"],
                 },
             },
+            "expand_and_search": {
+                "name": "expand_and_search",
+                "description": "Expand a query with related keywords and search them all concurrently, returning one fused, de-duplicated top-k list",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "domain": {
+                            "type": "string",
+                            "description": "Domain to search",
+                        },
+                        "query": {
+                            "type": "string",
+                            "description": "Search query to expand",
+                        },
+                        "max_keywords": {
+                            "type": "integer",
+                            "description": "Expanded keywords searched besides the query",
+                            "default": 5,
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Maximum results",
+                            "default": 20,
+                        },
+                        "content_type": {
+                            "type": "string",
+                            "description": "Filter by content type",
+                        },
+                        "tags": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Filter by tags",
+                        },
+                        **RESPONSE_SHAPING_PROPERTIES,
+                    },
+                    "required": ["domain", "query"],
+                },
+            },
             "get_memory_statistics": {
                 "name": "get_memory_statistics",
                 "description": "Get memory system statistics",
                 "parameters": {"type": "object", "properties": {}, "required": []},
             },
+            "get_performance_metrics": {
+                "name": "get_performance_metrics",
+                "description": "Get latency percentiles per tool and backend operation (SQLite, ChromaDB, embedding, serialization) and error/cache counters",
+                "parameters": {"type": "object", "properties": {}, "required": []},
+            },
             "get_similar_memories": {
                 "name": "get_similar_memories",
                 "description": "Find memories similar to a specific memory",
@@ -2171,6 +4112,25 @@ class MCPMemoryServer:
             },
         }
 
+        # Built once: tool name -> interface method, and compiled argument validators
+        self._dispatch = {
+            "store_memory": self.memory_interface.mcp_store_memory,
+            "store_memories_batch": self.memory_interface.mcp_store_memories_batch,
+            "retrieve_by_ids": self.memory_interface.mcp_retrieve_by_ids,
+            "retrieve_memories": self.memory_interface.mcp_retrieve_memories,
+            "search_memories_advanced": self.memory_interface.mcp_search_memories_advanced,
+            "expand_keywords": self.memory_interface.mcp_expand_keywords,
+            "expand_and_search": self.memory_interface.mcp_expand_and_search,
+            "get_memory_statistics": self.memory_interface.mcp_get_memory_statistics,
+            "get_performance_metrics": self.memory_interface.mcp_get_performance_metrics,
+            "get_similar_memories": self.memory_interface.mcp_get_similar_memories,
+            "get_keyword_trends": self.memory_interface.mcp_get_keyword_trends,
+        }
+        self._validators = {
+            name: compile_validator(tool["parameters"]) for name, tool in self.tools.items()
+        }
+        self._batch_executor = None
+
     def handle_mcp_request(
         self, tool_name: str, arguments: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -2182,20 +4142,21 @@ class MCPMemoryServer:
                 "message": f"Available tools: {list(self.tools.keys())}",
             }
 
-        try:
-            # Map tool names to methods
-            tool_methods = {
-                "store_memory": self.memory_interface.mcp_store_memory,
-                "retrieve_memories": self.memory_interface.mcp_retrieve_memories,
-                "search_memories_advanced": self.memory_interface.mcp_search_memories_advanced,
-                "expand_keywords": self.memory_interface.mcp_expand_keywords,
-                "get_memory_statistics": self.memory_interface.mcp_get_memory_statistics,
-                "get_similar_memories": self.memory_interface.mcp_get_similar_memories,
-                "get_keyword_trends": self.memory_interface.mcp_get_keyword_trends,
+        problems = self._validators[tool_name](arguments)
+        if problems:
+            return {
+                "status": "error",
+                "error": f"Invalid arguments: {'; '.join(problems)}",
+                "message": f"Tool {tool_name} rejected its arguments",
             }
 
-            method = tool_methods[tool_name]
-            result = method(**arguments)
+        try:
+            method = self._dispatch[tool_name]
+            started = time.perf_counter()
+            try:
+                result = method(**(arguments or {}))
+            finally:
+                metrics.observe(TOOL_DURATION, time.perf_counter() - started, tool=tool_name)
 
             return (
                 result
@@ -2204,6 +4165,7 @@ class MCPMemoryServer:
             )
 
         except Exception as e:
+            metrics.increment(TOOL_ERRORS, tool=tool_name)
             logger.error(f"MCP tool {tool_name} failed: {e}")
             return {
                 "status": "error",
@@ -2211,6 +4173,134 @@ class MCPMemoryServer:
                 "message": f"Tool {tool_name} execution failed",
             }
 
+    def _get_batch_executor(self) -> ThreadPoolExecutor:
+        """Thread pool running the read-only calls of a batch concurrently"""
+        if self._batch_executor is None:
+            self._batch_executor = ThreadPoolExecutor(
+                max_workers=int(os.environ.get("MCP_MEMORY_BATCH_WORKERS", "4")),
+                thread_name_prefix="mcp-batch",
+            )
+        return self._batch_executor
+
+    def handle_mcp_batch(self, calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Handle several tool calls ({"name": ..., "arguments": {...}}) in one request.
+
+        Results are returned in call order, one handle_mcp_request result per
+        call. Consecutive read-only calls run concurrently; a write waits for
+        the calls before it and runs on its own, so the batch behaves as if
+        its calls ran one after another. At most max_batch_size calls.
+        """
+        self.memory_interface.memory_manager._check_batch_size(len(calls))
+        results: List[Optional[Dict[str, Any]]] = [None] * len(calls)
+        reads: List[int] = []
+
+        def run(index: int):
+            call = calls[index]
+            if not isinstance(call, dict) or not isinstance(call.get("name"), str):
+                return {
+                    "status": "error",
+                    "error": "Invalid call, expected {\"name\": ..., \"arguments\": {...}}",
+                    "message": "Batch item rejected",
+                }
+            return self.handle_mcp_request(call["name"], call.get("arguments") or {})
+
+        def flush_reads():
+            if len(reads) == 1:
+                results[reads[0]] = run(reads[0])
+            elif reads:
+                executor = self._get_batch_executor()
+                for index, result in zip(reads, executor.map(run, reads)):
+                    results[index] = result
+            reads.clear()
+
+        for index, call in enumerate(calls):
+            if isinstance(call, dict) and call.get("name") in WRITE_TOOLS:
+                flush_reads()
+                results[index] = run(index)
+            else:
+                reads.append(index)
+        flush_reads()
+        return results
+
+    def handle_jsonrpc(self, message: Any) -> Any:
+        """
+        Handle a JSON-RPC 2.0 request object or batch (list) of them.
+
+        Supports the MCP methods tools/list and tools/call. A batch's
+        tools/call requests run through handle_mcp_batch. Returns the
+        response (a list for a batch), or None when there is nothing to
+        answer (notifications only).
+        """
+        if not isinstance(message, list):
+            return self._jsonrpc_responses([message])[0]
+        if not message:
+            return self._jsonrpc_error(None, JSONRPC_INVALID_REQUEST, "Empty batch")
+        return [response for response in self._jsonrpc_responses(message) if response is not None] or None
+
+    def _jsonrpc_responses(self, requests: List[Any]) -> List[Optional[Dict[str, Any]]]:
+        responses: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+        calls, call_positions = [], []
+
+        for position, request in enumerate(requests):
+            if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" or "method" not in request:
+                responses[position] = self._jsonrpc_error(None, JSONRPC_INVALID_REQUEST, "Invalid request")
+                continue
+            request_id = request.get("id")
+            params = request.get("params") or {}
+            if request["method"] == "tools/list":
+                responses[position] = self._jsonrpc_result(request_id, {"tools": self._mcp_tool_list()})
+            elif request["method"] == "tools/call":
+                name = params.get("name") if isinstance(params, dict) else None
+                if name not in self.tools:
+                    responses[position] = self._jsonrpc_error(
+                        request_id, JSONRPC_INVALID_PARAMS, f"Unknown tool: {name}"
+                    )
+                    continue
+                calls.append({"name": params["name"], "arguments": params.get("arguments") or {}})
+                call_positions.append(position)
+            else:
+                responses[position] = self._jsonrpc_error(
+                    request_id, JSONRPC_METHOD_NOT_FOUND, f"Method not found: {request['method']}"
+                )
+
+        if calls:
+            try:
+                results = self.handle_mcp_batch(calls)
+            except ValueError as e:
+                for position in call_positions:
+                    responses[position] = self._jsonrpc_error(
+                        requests[position].get("id"), JSONRPC_INVALID_REQUEST, str(e)
+                    )
+            else:
+                for position, result in zip(call_positions, results):
+                    responses[position] = self._jsonrpc_result(requests[position].get("id"), {
+                        "content": [{"type": "text", "text": json.dumps(result, default=str)}],
+                        "structuredContent": result,
+                        "isError": result.get("status") == "error",
+                    })
+
+        # Notifications (valid requests without an id) are never answered
+        return [
+            None if isinstance(request, dict) and request.get("jsonrpc") == "2.0" and "id" not in request
+            else response
+            for request, response in zip(requests, responses)
+        ]
+
+    @staticmethod
+    def _jsonrpc_result(request_id: Any, result: Any) -> Dict[str, Any]:
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    @staticmethod
+    def _jsonrpc_error(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+    def _mcp_tool_list(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": tool["name"], "description": tool["description"], "inputSchema": tool["parameters"]}
+            for tool in self.tools.values()
+        ]
+
     def get_toolspec(self) -> Dict[str, Any]:
         """Get MCP tools specification"""
         return {
@@ -2238,6 +4328,8 @@ def get_mcp_server() -> MCPMemoryServer:
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
     # Test the memory system
     manager = get_memory_manager()
 
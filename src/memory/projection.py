@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Field Projection and Response Budgets for Retrieval Tools
+MCP retrieval responses can be cut down to the fields an agent asks for, to
+a cheap summary, and to a size budget. Storage backends are told which
+fields are needed so content that is projected away is never decoded.
+"""
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .metrics import metrics
+except ImportError:
+    from metrics import metrics
+
+# Fields of a MemoryEntry as returned by the MCP tools
+MEMORY_FIELDS = (
+    "id",
+    "domain",
+    "subdomain",
+    "content_type",
+    "content_data",
+    "metadata",
+    "tags",
+    "timestamp",
+    "source",
+    "confidence",
+    "context",
+    "relevance_score",
+    "similarity_score",
+)
+
+# Fields held in the ChromaDB document / compressed SQLite columns
+CONTENT_FIELDS = ("content_data", "context")
+
+# Free-form fields cut by max_chars_per_field (ids, timestamps and tags are never cut)
+TRUNCATABLE_FIELDS = ("content_data", "metadata", "context")
+
+# Summary mode: everything that can be answered without decoding content
+SUMMARY_FIELDS = (
+    "id",
+    "domain",
+    "subdomain",
+    "content_type",
+    "tags",
+    "timestamp",
+    "source",
+    "confidence",
+    "relevance_score",
+    "similarity_score",
+)
+
+TRUNCATION_MARKER = "...[truncated {omitted} chars]"
+
+
+def resolve_fields(fields: Optional[Iterable[str]] = None, summary: bool = False) -> Optional[Tuple[str, ...]]:
+    """
+    Validate a projection; None means every field.
+
+    summary selects SUMMARY_FIELDS (narrowed further by fields if both are
+    given). id is always returned.
+    """
+    if fields is None and not summary:
+        return None
+    selected = list(fields) if fields is not None else list(SUMMARY_FIELDS)
+    unknown = [name for name in selected if name not in MEMORY_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {unknown}; available: {list(MEMORY_FIELDS)}")
+    if summary:
+        selected = [name for name in selected if name in SUMMARY_FIELDS]
+    return tuple(name for name in MEMORY_FIELDS if name == "id" or name in selected)
+
+
+def needs_content(fields: Optional[Iterable[str]]) -> bool:
+    """Whether a projection needs the (possibly compressed) content to be decoded"""
+    return fields is None or any(name in CONTENT_FIELDS for name in fields)
+
+
+def vector_include(fields: Optional[Iterable[str]]) -> Optional[List[str]]:
+    """ChromaDB include list for a projection (None fetches the defaults)"""
+    if needs_content(fields):
+        return None
+    return ["metadatas", "distances"]
+
+
+def project(memory: Any, fields: Optional[Iterable[str]]) -> Dict[str, Any]:
+    """Dict of the projected fields of a MemoryEntry (or memory dict)"""
+    if isinstance(memory, dict):
+        if fields is None:
+            return dict(memory)
+        return {name: memory[name] for name in fields if name in memory}
+    if fields is None:
+        return memory.to_dict()
+    return {name: getattr(memory, name) for name in fields}
+
+
+def truncate_strings(value: Any, max_chars: int) -> Tuple[Any, int]:
+    """Cut every string longer than max_chars (recursively); returns (value, strings cut)"""
+    if isinstance(value, str):
+        if len(value) <= max_chars:
+            return value, 0
+        return value[:max_chars] + TRUNCATION_MARKER.format(omitted=len(value) - max_chars), 1
+    if isinstance(value, dict):
+        cut = 0
+        result = {}
+        for key, item in value.items():
+            result[key], item_cut = truncate_strings(item, max_chars)
+            cut += item_cut
+        return result, cut
+    if isinstance(value, list):
+        cut = 0
+        result = []
+        for item in value:
+            item, item_cut = truncate_strings(item, max_chars)
+            result.append(item)
+            cut += item_cut
+        return result, cut
+    return value, 0
+
+
+@metrics.timed("serialization", "shape_memories")
+def shape_memories(
+    memories: Iterable[Any],
+    fields: Optional[Iterable[str]] = None,
+    max_chars_per_field: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Project, truncate and budget memories for a response.
+
+    max_chars_per_field cuts the strings inside TRUNCATABLE_FIELDS. Memories
+    are kept in order until the next one would take the serialized
+    list past max_bytes; the rest are omitted. Returns (memories, budget)
+    where budget reports "truncated" (anything cut or omitted),
+    "truncated_fields" and "omitted".
+    """
+    shaped = []
+    truncated_fields = 0
+    omitted = 0
+    size = 2  # the enclosing "[]"
+    for memory in memories:
+        if omitted:
+            omitted += 1
+            continue
+        item = project(memory, fields)
+        if max_chars_per_field is not None:
+            for name in TRUNCATABLE_FIELDS:
+                if name in item:
+                    item[name], cut = truncate_strings(item[name], max_chars_per_field)
+                    truncated_fields += cut
+        if max_bytes is not None:
+            item_size = len(json.dumps(item, default=str).encode("utf-8")) + (1 if shaped else 0)
+            if size + item_size > max_bytes:
+                omitted = 1
+                continue
+            size += item_size
+        shaped.append(item)
+
+    budget = {
+        "truncated": bool(truncated_fields or omitted),
+        "truncated_fields": truncated_fields,
+        "omitted": omitted,
+    }
+    return shaped, budget
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Local Read Replica of ChromaDB Memory Rows
+SQLite copy of memory documents and metadata (never vectors) so that id
+lookups and metadata-filtered listings can be answered without a network
+round trip. Only vector similarity queries need to reach ChromaDB.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .filters import REVISION_KEY, match_where
+    from .sqlite_config import connect
+except ImportError:
+    from filters import REVISION_KEY, match_where
+    from sqlite_config import connect
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of bound parameters per statement
+_MAX_SQL_PARAMS = 900
+
+# Rows served without revalidation for this long (seconds)
+DEFAULT_ROW_TTL = 300.0
+
+# A fully synced domain answers listings locally for this long (seconds)
+DEFAULT_SYNC_TTL = 300.0
+
+
+class MemoryReplica:
+    """
+    SQLite-backed read-through replica of memory rows.
+
+    Rows are added when written through this process and when fetched after
+    a miss. A row older than row_ttl is revalidated by comparing its
+    revision with a metadata-only read before being served. A domain whose
+    rows were all copied by a full sync is "complete" for sync_ttl seconds,
+    during which filter-only listings are evaluated locally; writes made
+    through this process keep it complete, writes by other processes become
+    visible once the sync expires.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        row_ttl: float = DEFAULT_ROW_TTL,
+        sync_ttl: float = DEFAULT_SYNC_TTL,
+    ):
+        self.db_path = db_path
+        self.row_ttl = row_ttl
+        self.sync_ttl = sync_ttl
+        self.lock = threading.RLock()
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "refreshed": 0, "local_listings": 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = connect(db_path, check_same_thread=False, wal=True)
+        with self.lock:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS replica_rows (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id TEXT UNIQUE NOT NULL,
+                    domain TEXT NOT NULL,
+                    document TEXT,
+                    metadata TEXT NOT NULL,
+                    revision TEXT,
+                    cached_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_replica_domain ON replica_rows(domain, seq);
+                CREATE TABLE IF NOT EXISTS replica_domains (
+                    domain TEXT PRIMARY KEY,
+                    complete INTEGER NOT NULL,
+                    synced_at REAL NOT NULL
+                );
+            """)
+            self._conn.commit()
+
+    def put_many(
+        self,
+        domain: str,
+        ids: List[str],
+        documents: List[Optional[str]],
+        metadatas: List[Dict[str, Any]],
+    ):
+        """Insert or refresh full rows (document and metadata) of one domain"""
+        now = time.time()
+        records = [
+            (memory_id, domain, document, json.dumps(metadata or {}), (metadata or {}).get(REVISION_KEY), now)
+            for memory_id, document, metadata in zip(ids, documents, metadatas)
+        ]
+        if not records:
+            return
+        with self.lock:
+            self._conn.executemany(
+                """
+                INSERT INTO replica_rows (id, domain, document, metadata, revision, cached_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    domain = excluded.domain, document = excluded.document,
+                    metadata = excluded.metadata, revision = excluded.revision,
+                    cached_at = excluded.cached_at
+                """,
+                records,
+            )
+            self._conn.commit()
+
+    def lookup(self, memory_ids: List[str]) -> Dict[str, Tuple[str, Optional[str], Dict[str, Any], bool]]:
+        """Return id -> (domain, document, metadata, fresh) for every replicated id"""
+        found = {}
+        cutoff = time.time() - self.row_ttl
+        with self.lock:
+            for chunk in _chunks(memory_ids):
+                placeholders = ",".join("?" for _ in chunk)
+                cursor = self._conn.execute(
+                    f"SELECT id, domain, document, metadata, cached_at FROM replica_rows "
+                    f"WHERE id IN ({placeholders})",
+                    chunk,
+                )
+                for memory_id, domain, document, metadata, cached_at in cursor:
+                    found[memory_id] = (domain, document, json.loads(metadata), cached_at >= cutoff)
+        return found
+
+    def touch(self, memory_ids: List[str]):
+        """Mark rows as freshly validated"""
+        now = time.time()
+        with self.lock:
+            for chunk in _chunks(memory_ids):
+                placeholders = ",".join("?" for _ in chunk)
+                self._conn.execute(
+                    f"UPDATE replica_rows SET cached_at = ? WHERE id IN ({placeholders})", [now, *chunk]
+                )
+            self._conn.commit()
+
+    def remove(self, memory_ids: Iterable[str]):
+        memory_ids = list(memory_ids)
+        with self.lock:
+            for chunk in _chunks(memory_ids):
+                placeholders = ",".join("?" for _ in chunk)
+                self._conn.execute(f"DELETE FROM replica_rows WHERE id IN ({placeholders})", chunk)
+            self._conn.commit()
+
+    def is_complete(self, domain: str) -> bool:
+        """Whether the domain was fully synced within sync_ttl"""
+        with self.lock:
+            row = self._conn.execute(
+                "SELECT complete, synced_at FROM replica_domains WHERE domain = ?", (domain,)
+            ).fetchone()
+        return bool(row and row[0] and row[1] >= time.time() - self.sync_ttl)
+
+    def needs_sync(self, domain: str) -> bool:
+        """Whether a sync of the domain is due (never attempted, or the last one expired)"""
+        with self.lock:
+            row = self._conn.execute(
+                "SELECT synced_at FROM replica_domains WHERE domain = ?", (domain,)
+            ).fetchone()
+        return not row or row[0] < time.time() - self.sync_ttl
+
+    def mark_synced(self, domain: str, complete: bool):
+        with self.lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO replica_domains (domain, complete, synced_at) VALUES (?, ?, ?)",
+                (domain, int(complete), time.time()),
+            )
+            self._conn.commit()
+
+    def invalidate_domain(self, domain: str):
+        """Stop serving listings for a domain until it is synced again"""
+        with self.lock:
+            self._conn.execute("DELETE FROM replica_domains WHERE domain = ?", (domain,))
+            self._conn.commit()
+
+    def replace_domain(
+        self,
+        domain: str,
+        ids: List[str],
+        documents: List[Optional[str]],
+        metadatas: List[Dict[str, Any]],
+    ):
+        """Replace every row of a domain with a full snapshot and mark it complete"""
+        with self.lock:
+            self._conn.execute("DELETE FROM replica_rows WHERE domain = ?", (domain,))
+            self.put_many(domain, ids, documents, metadatas)
+            self.mark_synced(domain, complete=True)
+
+    def list_domain(
+        self,
+        domain: str,
+        where: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Dict[str, List[Any]]:
+        """Evaluate a filter-only listing locally, returning ChromaDB /get columns"""
+        result = {"ids": [], "documents": [], "metadatas": []}
+        skipped = 0
+        with self.lock:
+            cursor = self._conn.execute(
+                "SELECT id, document, metadata FROM replica_rows WHERE domain = ? ORDER BY seq", (domain,)
+            )
+            for memory_id, document, metadata in cursor:
+                metadata = json.loads(metadata)
+                if not match_where(metadata, where):
+                    continue
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                result["ids"].append(memory_id)
+                result["documents"].append(document)
+                result["metadatas"].append(metadata)
+                if limit is not None and len(result["ids"]) >= limit:
+                    break
+            self.stats["local_listings"] += 1
+        return result
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self.lock:
+            rows = self._conn.execute("SELECT COUNT(*) FROM replica_rows").fetchone()[0]
+            complete = [
+                domain for domain, in self._conn.execute(
+                    "SELECT domain FROM replica_domains WHERE complete = 1 AND synced_at >= ?",
+                    (time.time() - self.sync_ttl,),
+                )
+            ]
+            return {"rows": rows, "complete_domains": complete, **self.stats}
+
+    def close(self):
+        with self.lock:
+            self._conn.close()
+
+
+def _chunks(items: List[str]):
+    for start in range(0, len(items), _MAX_SQL_PARAMS):
+        yield items[start:start + _MAX_SQL_PARAMS]
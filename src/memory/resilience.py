@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Resilience Primitives for Remote Storage Calls
+Circuit breakers, latency tracking for hedged reads, and deadlines, so a
+degraded ChromaDB host produces fast failures or partial results instead of
+requests piling up behind long timeouts.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised when a call is rejected because its circuit breaker is open"""
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call's deadline has passed before it could be issued"""
+
+
+class Deadline:
+    """Absolute point in time by which a call chain must finish"""
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def cap(self, timeout: float) -> float:
+        """Shorten a per-call timeout to what is left of the deadline"""
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded("Deadline exceeded")
+        return min(timeout, remaining)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker with a half-open probe.
+
+    After failure_threshold consecutive failures the circuit opens and calls
+    are rejected for reset_timeout seconds. The first call after that is let
+    through as a probe (half-open): success closes the circuit, failure
+    re-opens it for another reset_timeout.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may proceed now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def record_neutral(self):
+        """A call the caller gave up on says nothing about the server; just free a half-open probe"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self.state, "failures": self.failures, "rejected": self.rejected}
+
+
+class LatencyTracker:
+    """Sliding window of recent call latencies used to pick hedge delays"""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Latency at the given percentile (0-100), or None without samples"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, max(0, int(round(pct / 100.0 * len(samples))) - 1))
+        return samples[index]
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Single-Flight Request Coalescing
+Concurrent identical requests share one in-flight backend call: the first
+caller runs it, callers arriving while it is running wait for and receive
+the same result (or exception). Nothing is cached once the call finishes.
+"""
+
+import asyncio
+import copy
+import json
+import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+try:
+    from .metrics import metrics
+except ImportError:
+    from metrics import metrics
+
+
+def coalescing_enabled(enabled: Optional[bool] = None) -> bool:
+    """Resolve an explicit setting or env MCP_MEMORY_COALESCE (default on)"""
+    if enabled is not None:
+        return enabled
+    return os.environ.get("MCP_MEMORY_COALESCE", "1").lower() not in ("0", "false", "no")
+
+
+# Parameters whose values are sets in effect: order and duplicates within
+# them cannot change the result
+UNORDERED_PARAMS = frozenset({"tags", "include", "fields"})
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return sorted((_normalize(item) for item in value), key=repr)
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    return value
+
+
+def _normalize_unordered(value: Any) -> Any:
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = {repr(item): item for item in map(_normalize, value)}
+        return [items[r] for r in sorted(items)]
+    return _normalize(value)
+
+
+def make_key(operation: str, **params) -> str:
+    """
+    Normalized key for a call.
+
+    Only differences that cannot change the result are normalized away:
+    keyword order, tuple vs list, and order/duplicates within the
+    parameters listed in UNORDERED_PARAMS (tags, include fields). Every
+    other sequence, date_range bounds included, is compared in order, and
+    query text verbatim since it feeds the embedding.
+    """
+    normalized = {
+        name: _normalize_unordered(value) if name in UNORDERED_PARAMS else _normalize(value)
+        for name, value in params.items()
+    }
+    return json.dumps(
+        [operation, normalized], sort_keys=True, separators=(",", ":"), default=str
+    )
+
+
+def clone_list(result: Any) -> Any:
+    """Default result copy: a new list with shallow copies of its items"""
+    if isinstance(result, list):
+        return [copy.copy(item) for item in result]
+    return copy.copy(result)
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Per-key coalescing of concurrent calls.
+
+    do() coalesces calls from threads, ado() coalesces coroutines on the same
+    event loop. Every caller, the one that ran the call included, receives
+    its own copy of the result (see clone) so callers can mutate what they
+    get back without affecting each other.
+    """
+
+    def __init__(self, name: str, clone: Callable[[Any], Any] = clone_list):
+        self.name = name
+        self.clone = clone
+        self._calls: Dict[str, _Call] = {}
+        self._async_calls: Dict[Any, "asyncio.Future"] = {}
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "executions": 0, "coalesced": 0, "errors": 0}
+
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        """Run func, or wait for the identical call already in flight"""
+        with self._lock:
+            self.stats["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats["executions"] += 1
+            else:
+                self.stats["coalesced"] += 1
+        metrics.cache_lookup(f"coalesce:{self.name}", hits=0 if leader else 1, misses=1 if leader else 0)
+
+        if leader:
+            try:
+                call.result = func()
+            except BaseException as e:
+                call.error = e
+                with self._lock:
+                    self.stats["errors"] += 1
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.event.set()
+        else:
+            call.event.wait()
+
+        if call.error is not None:
+            raise call.error
+        return self.clone(call.result)
+
+    async def ado(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Await func(), or the identical call already in flight on this loop"""
+        loop = asyncio.get_running_loop()
+        loop_key = (loop, key)
+        with self._lock:
+            self.stats["calls"] += 1
+            task = self._async_calls.get(loop_key)
+            leader = task is None
+            if leader:
+                task = loop.create_task(func())
+                self._async_calls[loop_key] = task
+                self.stats["executions"] += 1
+                task.add_done_callback(lambda t: self._async_done(loop_key, t))
+            else:
+                self.stats["coalesced"] += 1
+        metrics.cache_lookup(f"coalesce:{self.name}", hits=0 if leader else 1, misses=1 if leader else 0)
+
+        # A cancelled waiter must not cancel the call the others are waiting on
+        result = await asyncio.shield(task)
+        return self.clone(result)
+
+    def _async_done(self, loop_key, task: "asyncio.Task"):
+        with self._lock:
+            self._async_calls.pop(loop_key, None)
+            if task.cancelled() or task.exception() is not None:
+                self.stats["errors"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["in_flight"] = len(self._calls) + len(self._async_calls)
+        calls = stats["calls"]
+        stats["coalesced_ratio"] = stats["coalesced"] / calls if calls else 0.0
+        return stats
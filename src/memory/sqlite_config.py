@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Shared SQLite Connection Settings
+The memory system's SQLite files (fallback store, content-hash index, id
+index, read replica, change counters) may be opened by several MCP server
+worker processes at once. Files are switched to WAL so readers never block
+the writer, and connections wait for a busy timeout instead of failing with
+"database is locked" while another process holds the write lock.
+"""
+
+import os
+import sqlite3
+
+# Seconds a connection waits for another process's write lock
+DEFAULT_BUSY_TIMEOUT = 5.0
+
+
+def busy_timeout() -> float:
+    """Busy timeout in seconds (env MCP_MEMORY_SQLITE_BUSY_TIMEOUT, default 5)"""
+    return float(os.environ.get("MCP_MEMORY_SQLITE_BUSY_TIMEOUT", DEFAULT_BUSY_TIMEOUT))
+
+
+def connect(db_path: str, check_same_thread: bool = True, wal: bool = False) -> sqlite3.Connection:
+    """
+    Open a connection with the busy timeout applied.
+
+    wal=True switches the file to write-ahead logging; the mode is stored in
+    the file, so doing it once when the file is opened by a component is
+    enough and later short-lived connections can skip it. Connections use
+    synchronous=NORMAL, which is safe in WAL mode: a crash cannot corrupt
+    the file, only the last transactions before a power loss may roll back.
+    """
+    conn = sqlite3.connect(db_path, timeout=busy_timeout(), check_same_thread=check_same_thread)
+    if db_path != ":memory:":
+        if wal:
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tool Argument Validation
+Compiles the JSON-schema subset used by the MCP tool specs (type,
+properties, required, items, enum) into plain closures once, so each call
+is checked with a few isinstance tests instead of walking the schema.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+# A validator returns the problems found in a value ([] when valid)
+Validator = Callable[[Any, str], List[str]]
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+}
+
+
+def _compile(schema: Dict[str, Any]) -> Validator:
+    checks: List[Validator] = []
+
+    expected = schema.get("type")
+    if expected is not None:
+        if expected not in _TYPE_CHECKS:
+            raise ValueError(f"Unsupported schema type: {expected}")
+        type_check = _TYPE_CHECKS[expected]
+
+        def check_type(value, path):
+            return [] if type_check(value) else [f"{path or 'arguments'} must be of type {expected}"]
+
+        checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+
+        def check_enum(value, path):
+            return [] if value in allowed else [f"{path} must be one of {allowed}"]
+
+        checks.append(check_enum)
+
+    if "items" in schema:
+        item_validator = _compile(schema["items"])
+
+        def check_items(value, path):
+            if not isinstance(value, list):
+                return []
+            problems = []
+            for index, item in enumerate(value):
+                problems.extend(item_validator(item, f"{path}[{index}]"))
+            return problems
+
+        checks.append(check_items)
+
+    if "properties" in schema:
+        properties = {name: _compile(spec) for name, spec in schema["properties"].items()}
+        required = tuple(schema.get("required", ()))
+
+        def check_object(value, path):
+            if not isinstance(value, dict):
+                return []
+            prefix = f"{path}." if path else ""
+            problems = [f"missing required argument {prefix}{name}" for name in required if name not in value]
+            for name, item in value.items():
+                validator = properties.get(name)
+                if validator is None:
+                    problems.append(f"unknown argument {prefix}{name}")
+                elif item is not None or name in required:
+                    # None stands for "not given" on optional arguments
+                    problems.extend(validator(item, f"{prefix}{name}"))
+            return problems
+
+        checks.append(check_object)
+
+    if len(checks) == 1:
+        return checks[0]
+
+    def validate(value, path):
+        for check in checks:
+            problems = check(value, path)
+            if problems:
+                # Later checks assume the type check passed
+                return problems
+        return []
+
+    return validate
+
+
+def compile_validator(schema: Dict[str, Any]) -> Callable[[Optional[Dict[str, Any]]], List[str]]:
+    """
+    Compile a tool's parameters schema.
+
+    The returned function takes the call's arguments and returns a list of
+    problems, empty when the arguments are valid.
+    """
+    validator = _compile(schema)
+    return lambda arguments: validator({} if arguments is None else arguments, "")
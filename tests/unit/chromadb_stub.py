@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+In-process ChromaDB HTTP API stub used by the memory system unit tests.
+
+Implements the subset of the ChromaDB v1 REST API used by ChromaDBStorage
+(heartbeat, collections, add/upsert/update/get/query/delete/count) on top of
+plain dictionaries, records every request, and supports fault injection per
+endpoint action (artificial latency, error status codes).
+"""
+
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+
+def _match_condition(value: Any, condition: Any) -> bool:
+    """Evaluate a single ChromaDB metadata condition against a value"""
+    if not isinstance(condition, dict):
+        return value == condition
+
+    for op, operand in condition.items():
+        if op == "$eq" and not value == operand:
+            return False
+        if op == "$ne" and not value != operand:
+            return False
+        if op in ("$gt", "$gte", "$lt", "$lte"):
+            if value is None or isinstance(value, bool):
+                return False
+            if op == "$gt" and not value > operand:
+                return False
+            if op == "$gte" and not value >= operand:
+                return False
+            if op == "$lt" and not value < operand:
+                return False
+            if op == "$lte" and not value <= operand:
+                return False
+        if op == "$in" and value not in operand:
+            return False
+        if op == "$nin" and value in operand:
+            return False
+    return True
+
+
+def match_where(metadata: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    """Evaluate a ChromaDB where filter against a metadata dictionary"""
+    if not where:
+        return True
+    if len(where) > 1:
+        # Mirrors ChromaDB >= 0.4.x which rejects implicit AND across keys
+        raise ValueError(f"Expected where to have exactly one operator, got {where}")
+
+    key, condition = next(iter(where.items()))
+    if key == "$and":
+        return all(match_where(metadata, clause) for clause in condition)
+    if key == "$or":
+        return any(match_where(metadata, clause) for clause in condition)
+    if key not in metadata:
+        return False
+    return _match_condition(metadata[key], condition)
+
+
+class ChromaDBStub:
+    """Minimal in-memory ChromaDB server"""
+
+    def __init__(self):
+        self.collections: Dict[str, Dict[str, Any]] = {}
+        self.requests: List[Dict[str, Any]] = []
+        self.faults: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.RLock()
+        self._server = None
+        self._thread = None
+
+    # Lifecycle ---------------------------------------------------------
+
+    def start(self) -> "ChromaDBStub":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                stub._dispatch(self, "GET")
+
+            def do_POST(self):
+                stub._dispatch(self, "POST")
+
+        class Server(ThreadingHTTPServer):
+            # The async client opens many connections at once
+            request_queue_size = 128
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    # Introspection helpers ---------------------------------------------
+
+    def reset_requests(self):
+        with self.lock:
+            self.requests = []
+
+    def actions(self) -> List[str]:
+        with self.lock:
+            return [r["action"] for r in self.requests]
+
+    def collection_id(self, name: str) -> Optional[str]:
+        with self.lock:
+            for collection_id, col in self.collections.items():
+                if col["name"] == name:
+                    return collection_id
+        return None
+
+    def rows(self, name: str) -> Dict[str, Dict[str, Any]]:
+        return self.collections[self.collection_id(name)]["rows"]
+
+    # Request handling --------------------------------------------------
+
+    def _dispatch(self, handler: BaseHTTPRequestHandler, method: str):
+        length = int(handler.headers.get("Content-Length") or 0)
+        raw = handler.rfile.read(length) if length else b""
+        payload = json.loads(raw) if raw else {}
+
+        path = handler.path
+        match = re.match(r"^/api/v1/collections/([^/]+)/(\w+)$", path)
+        if path == "/api/v1/heartbeat":
+            action = "heartbeat"
+        elif path == "/api/v1/collections":
+            action = "list_collections" if method == "GET" else "create_collection"
+        elif match:
+            action = match.group(2)
+        else:
+            action = "unknown"
+
+        with self.lock:
+            self.requests.append({"method": method, "path": path, "action": action, "payload": payload})
+            fault = self.faults.get(action) or self.faults.get("*")
+            # A fault may be scoped to one collection by name
+            if fault and fault.get("collection"):
+                target = self.collections.get(match.group(1), {}) if match else {}
+                if target.get("name") != fault["collection"]:
+                    fault = None
+            if fault and fault.get("count") is not None:
+                if fault["count"] <= 0:
+                    fault = None
+                else:
+                    fault["count"] -= 1
+
+        if fault and fault.get("delay"):
+            time.sleep(fault["delay"])
+        if fault and fault.get("status"):
+            self._respond(handler, fault["status"], {"error": "InjectedFault"})
+            return
+
+        try:
+            if action == "heartbeat":
+                status, body = 200, {"nanosecond heartbeat": time.time_ns()}
+            elif action == "list_collections":
+                status, body = 200, self._list_collections()
+            elif action == "create_collection":
+                status, body = self._create_collection(payload)
+            elif match:
+                status, body = self._collection_action(match.group(1), action, payload)
+            else:
+                status, body = 404, {"error": "NotFound"}
+        except ValueError as e:
+            status, body = 500, {"error": "ValueError", "message": str(e)}
+
+        self._respond(handler, status, body)
+
+    def _respond(self, handler: BaseHTTPRequestHandler, status: int, body: Any):
+        data = json.dumps(body).encode()
+        try:
+            handler.send_response(status)
+            handler.send_header("Content-Type", "application/json")
+            handler.send_header("Content-Length", str(len(data)))
+            handler.end_headers()
+            handler.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _list_collections(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return [
+                {"id": cid, "name": col["name"], "metadata": col["metadata"]}
+                for cid, col in self.collections.items()
+            ]
+
+    def _create_collection(self, payload: Dict[str, Any]):
+        with self.lock:
+            existing = self.collection_id(payload["name"])
+            if existing:
+                if payload.get("get_or_create"):
+                    col = self.collections[existing]
+                    return 200, {"id": existing, "name": col["name"], "metadata": col["metadata"]}
+                return 500, {"error": "UniqueConstraintError"}
+            cid = str(uuid.uuid4())
+            self.collections[cid] = {
+                "name": payload["name"],
+                "metadata": payload.get("metadata") or {},
+                "rows": {},
+            }
+            return 200, {"id": cid, "name": payload["name"], "metadata": payload.get("metadata")}
+
+    def _collection_action(self, cid: str, action: str, payload: Dict[str, Any]):
+        with self.lock:
+            col = self.collections.get(cid)
+            if col is None:
+                return 404, {"error": "InvalidCollection", "message": f"Collection {cid} does not exist."}
+            rows = col["rows"]
+
+            if action in ("add", "upsert", "update"):
+                ids = payload["ids"]
+                for i, memory_id in enumerate(ids):
+                    if action == "add" and memory_id in rows:
+                        continue
+                    if action == "update" and memory_id not in rows:
+                        continue
+                    row = rows.setdefault(memory_id, {"embedding": None, "document": None, "metadata": {}})
+                    if payload.get("embeddings"):
+                        row["embedding"] = payload["embeddings"][i]
+                    if payload.get("documents"):
+                        row["document"] = payload["documents"][i]
+                    if payload.get("metadatas"):
+                        if action == "update":
+                            row["metadata"].update(payload["metadatas"][i])
+                        else:
+                            row["metadata"] = dict(payload["metadatas"][i])
+                return 200, True
+
+            if action == "count":
+                return 200, len(rows)
+
+            if action == "delete":
+                ids = payload.get("ids")
+                where = payload.get("where")
+                targets = [
+                    memory_id for memory_id, row in rows.items()
+                    if (ids is None or memory_id in ids) and match_where(row["metadata"], where)
+                ]
+                for memory_id in targets:
+                    del rows[memory_id]
+                return 200, targets
+
+            if action == "get":
+                include = payload.get("include", ["metadatas", "documents"])
+                ids = payload.get("ids")
+                where = payload.get("where")
+                selected = [
+                    (memory_id, row) for memory_id, row in rows.items()
+                    if (ids is None or memory_id in ids) and match_where(row["metadata"], where)
+                ]
+                offset = payload.get("offset") or 0
+                limit = payload.get("limit")
+                selected = selected[offset:offset + limit if limit is not None else None]
+                return 200, self._format(selected, include)
+
+            if action == "query":
+                include = payload.get("include", ["metadatas", "documents", "distances"])
+                where = payload.get("where")
+                n_results = payload.get("n_results", 10)
+                candidates = [
+                    (memory_id, row) for memory_id, row in rows.items()
+                    if match_where(row["metadata"], where)
+                ]
+                result: Dict[str, List[Any]] = {
+                    "ids": [], "documents": [], "metadatas": [], "distances": [], "embeddings": [],
+                }
+                for embedding in payload["query_embeddings"]:
+                    scored = sorted(
+                        (
+                            (sum((a - b) ** 2 for a, b in zip(row["embedding"], embedding)), memory_id, row)
+                            for memory_id, row in candidates
+                        ),
+                        key=lambda item: item[0],
+                    )[:n_results]
+                    formatted = self._format([(m, r) for _, m, r in scored], include)
+                    for key in result:
+                        result[key].append(formatted.get(key))
+                    result["distances"][-1] = (
+                        [d for d, _, _ in scored] if "distances" in include else None
+                    )
+                return 200, {key: (value if any(v is not None for v in value) else None) for key, value in result.items()}
+
+            return 404, {"error": "NotFound"}
+
+    @staticmethod
+    def _format(selected, include) -> Dict[str, Any]:
+        return {
+            "ids": [memory_id for memory_id, _ in selected],
+            "documents": [row["document"] for _, row in selected] if "documents" in include else None,
+            "metadatas": [row["metadata"] for _, row in selected] if "metadatas" in include else None,
+            "embeddings": [row["embedding"] for _, row in selected] if "embeddings" in include else None,
+        }
@@ -0,0 +1,148 @@
+# Test Suite for MCP tool admission control
+
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.memory.admission import READ, WRITE, AdmissionController, Overloaded, parse_tool_limits
+
+
+class TestAdmissionController(unittest.TestCase):
+    """Test lanes, per-tool limits, bounded queues and metrics"""
+
+    def controller(self, **kwargs):
+        settings = {"read_concurrency": 2, "write_concurrency": 1, "read_queue": 1, "write_queue": 1, "tool_limits": {}}
+        settings.update(kwargs)
+        return AdmissionController(**settings)
+
+    def test_rejects_when_lane_and_queue_are_full(self):
+        async def scenario():
+            admission = self.controller()
+            release = asyncio.Event()
+
+            async def ingest():
+                await release.wait()
+                return "stored"
+
+            running = asyncio.create_task(admission.run("store_memory", WRITE, ingest))
+            queued = asyncio.create_task(admission.run("store_memory", WRITE, ingest))
+            await asyncio.sleep(0.01)
+
+            with self.assertRaises(Overloaded) as raised:
+                await admission.run("store_memory", WRITE, ingest)
+            self.assertGreaterEqual(raised.exception.retry_after, 1)
+
+            release.set()
+            self.assertEqual(await asyncio.gather(running, queued), ["stored", "stored"])
+            return admission.get_statistics()
+
+        stats = asyncio.run(scenario())
+        self.assertEqual(stats["lanes"]["write"]["rejected"], 1)
+        self.assertEqual(stats["tools"]["store_memory"]["calls"], 2)
+        self.assertEqual(stats["tools"]["store_memory"]["rejected"], 1)
+        # The queued call waited for the first one to finish
+        self.assertGreater(stats["tools"]["store_memory"]["queue_wait_ms"]["max"], 5)
+
+    def test_saturated_writes_do_not_block_reads(self):
+        async def scenario():
+            admission = self.controller()
+            release = asyncio.Event()
+
+            async def ingest():
+                await release.wait()
+
+            async def lookup():
+                return "found"
+
+            writes = [asyncio.create_task(admission.run("store_memory", WRITE, ingest)) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            result = await asyncio.wait_for(admission.run("retrieve_memories", READ, lookup), timeout=1)
+            release.set()
+            await asyncio.gather(*writes)
+            return result
+
+        self.assertEqual(asyncio.run(scenario()), "found")
+
+    def test_tool_limit_below_lane(self):
+        async def scenario():
+            admission = self.controller(read_concurrency=4, read_queue=4, tool_limits={"get_keyword_trends": 1})
+            active = 0
+            peak = 0
+
+            async def trends():
+                nonlocal active, peak
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.02)
+                active -= 1
+
+            await asyncio.gather(*(admission.run("get_keyword_trends", READ, trends) for _ in range(3)))
+            return peak
+
+        self.assertEqual(asyncio.run(scenario()), 1)
+
+    def test_cancelled_waiter_releases_nothing_it_did_not_hold(self):
+        async def scenario():
+            admission = self.controller()
+            release = asyncio.Event()
+
+            async def ingest():
+                await release.wait()
+
+            running = asyncio.create_task(admission.run("store_memory", WRITE, ingest))
+            queued = asyncio.create_task(admission.run("store_memory", WRITE, ingest))
+            await asyncio.sleep(0.01)
+            queued.cancel()
+            await asyncio.gather(queued, return_exceptions=True)
+            release.set()
+            await running
+
+            # The lane is back to one free slot and an empty queue
+            await admission.run("store_memory", WRITE, ingest)
+            return admission.get_statistics()["lanes"]["write"]
+
+        lane = asyncio.run(scenario())
+        self.assertEqual((lane["active"], lane["waiting"], lane["rejected"]), (0, 0, 0))
+
+    def test_tool_decorator_returns_retry_after(self):
+        async def scenario():
+            admission = self.controller(write_queue=0)
+            release = asyncio.Event()
+
+            @admission.tool(WRITE)
+            async def store_memory(domain):
+                await release.wait()
+                return {"status": "success", "domain": domain}
+
+            running = asyncio.create_task(store_memory(domain="bmad_code"))
+            await asyncio.sleep(0.01)
+            rejected = await store_memory(domain="bmad_code")
+            release.set()
+            return await running, rejected
+
+        stored, rejected = asyncio.run(scenario())
+        self.assertEqual(stored["status"], "success")
+        self.assertEqual(rejected["error"], "overloaded")
+        self.assertGreaterEqual(rejected["retry_after"], 1)
+
+    def test_errors_are_counted(self):
+        async def failing():
+            raise RuntimeError("backend down")
+
+        admission = self.controller()
+        with self.assertRaises(RuntimeError):
+            asyncio.run(admission.run("retrieve_memories", READ, failing))
+        self.assertEqual(admission.get_statistics()["tools"]["retrieve_memories"]["errors"], 1)
+
+    def test_parse_tool_limits(self):
+        self.assertEqual(parse_tool_limits("store_memory=3, get_keyword_trends=1"), {"store_memory": 3, "get_keyword_trends": 1})
+        self.assertEqual(parse_tool_limits(""), {})
+        with self.assertRaises(ValueError):
+            parse_tool_limits("store_memory")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+# Test Suite for the analytics result cache
+
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.memory import analytics_cache
+from src.memory.analytics_cache import AnalyticsCache, normalize_query
+
+
+class TestAnalyticsCache(unittest.TestCase):
+    """Test keying, TTL, write-generation invalidation and eviction"""
+
+    def setUp(self):
+        self.generations = {}
+        self.calls = []
+        self.cache = AnalyticsCache(lambda domain: self.generations.get(domain, 0), ttl=60, max_entries=2)
+
+    def compute(self, value):
+        def run():
+            self.calls.append(value)
+            return {"keywords": [value]}
+        return run
+
+    def get(self, domain="bmad_code", value="a", **params):
+        return self.cache.get_or_compute("expand_keywords", domain, self.compute(value), **params)
+
+    def test_hits_are_copies_keyed_by_parameters(self):
+        first = self.get(query="python api")
+        first["keywords"].append("mutated")
+        self.assertEqual(self.get(query="python api"), {"keywords": ["a"]})
+        self.get(query="python api", max_keywords=5)
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(self.cache.get_statistics()["hits"], 1)
+
+    def test_domain_write_invalidates_only_that_domain(self):
+        self.get("bmad_code")
+        self.get("website_info")
+        self.generations["bmad_code"] = 1
+        self.get("bmad_code")
+        self.get("website_info")
+        self.assertEqual(len(self.calls), 3)
+        self.assertEqual(self.cache.get_statistics()["invalidated"], 1)
+
+    def test_ttl_refresh_ahead_and_eviction(self):
+        with patch.object(analytics_cache.time, "monotonic", return_value=1000.0):
+            self.get(query="x")
+        with patch.object(analytics_cache.time, "monotonic", return_value=1030.0):
+            self.get(query="x")
+            self.assertEqual(len(self.calls), 1)
+            # Expires within the next 45s: a background refresh recomputes it
+            self.cache.get_or_compute("expand_keywords", "bmad_code", self.compute("b"), refresh_ahead=45, query="x")
+            self.assertEqual(self.calls, ["a", "b"])
+        with patch.object(analytics_cache.time, "monotonic", return_value=1200.0):
+            self.get(query="x")
+            self.assertEqual(len(self.calls), 3)
+
+            self.get(query="y")
+            self.get(query="z")
+        self.assertEqual(self.cache.get_statistics()["entries"], 2)
+        self.assertEqual(self.cache.get_statistics()["evicted"], 1)
+
+    def test_zero_ttl_disables_caching(self):
+        self.cache.ttl = 0
+        self.get()
+        self.get()
+        self.assertEqual(len(self.calls), 2)
+
+    def test_normalize_query(self):
+        self.assertEqual(normalize_query("Python  API, python!"), normalize_query("api python"))
+
+
+if __name__ == "__main__":
+    unittest.main()
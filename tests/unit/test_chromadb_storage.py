@@ -0,0 +1,473 @@
+# Test Suite for the ChromaDB storage backend
+# Runs ChromaDBStorage against the in-process ChromaDB stub server
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from chromadb_stub import ChromaDBStub
+from src.memory import chromadb_storage
+from src.memory.async_chromadb_storage import AsyncChromaDBStorage
+from src.memory.chromadb_storage import ChromaDBStorage
+from src.memory.resilience import CircuitOpenError
+
+
+class ChromaDBStorageTestCase(unittest.TestCase):
+    """Base fixture: a fresh stub server and storage per test"""
+
+    def setUp(self):
+        self.stub = ChromaDBStub().start()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.storage = self.make_storage()
+
+    def tearDown(self):
+        self.stub.stop()
+        self.tmpdir.cleanup()
+
+    def make_storage(self, **kwargs) -> ChromaDBStorage:
+        kwargs.setdefault("id_index_path", os.path.join(self.tmpdir.name, "ids.db"))
+        kwargs.setdefault("collection_cache_path", os.path.join(self.tmpdir.name, "collections.json"))
+        return ChromaDBStorage(host="127.0.0.1", port=self.stub.port, **kwargs)
+
+    def store(self, domain, memory_id, text="hello", tags=None, **kwargs):
+        params = dict(
+            domain=domain,
+            memory_id=memory_id,
+            content_data={"text": text},
+            metadata={},
+            tags=tags or [],
+            timestamp="2025-01-01T00:00:00",
+            source="unit_test",
+            confidence=1.0,
+            context={},
+        )
+        params.update(kwargs)
+        return self.storage.store_memory(**params)
+
+
+class TestStartup(ChromaDBStorageTestCase):
+    """Test lazy collection resolution and the on-disk collection cache"""
+
+    def test_construction_only_checks_heartbeat(self):
+        """Collections are not listed or created until a domain is used"""
+        self.stub.reset_requests()
+        storage = self.make_storage(collection_cache_path=os.path.join(self.tmpdir.name, "none.json"))
+
+        self.assertEqual(self.stub.actions(), ["heartbeat"])
+        self.assertGreater(storage.startup_time_ms, 0)
+
+    def test_single_list_call_shared_by_domains(self):
+        """One list call resolves all domains; missing ones are created on demand"""
+        self.stub.reset_requests()
+        for domain in self.storage.domains:
+            self.storage.get_memory(domain, "nothing")
+
+        actions = self.stub.actions()
+        self.assertEqual(actions.count("list_collections"), 1)
+        self.assertEqual(actions.count("create_collection"), len(self.storage.domains))
+
+    def test_cached_collection_ids_skip_resolution(self):
+        """A second process reuses the cached ids without listing collections"""
+        self.store("bmad_code", "m1")
+        self.stub.reset_requests()
+
+        storage = self.make_storage(background_heartbeat=True)
+        self.assertEqual(storage.get_memory("bmad_code", "m1")["id"], "m1")
+        self.assertNotIn("list_collections", self.stub.actions())
+
+    def test_stale_cached_collection_is_re_resolved(self):
+        """A cached id the server no longer knows is dropped and resolved again"""
+        self.store("bmad_code", "m1")
+        with self.stub.lock:
+            cid = self.stub.collection_id("memory_bmad_code")
+            self.stub.collections["replacement"] = self.stub.collections.pop(cid)
+
+        storage = self.make_storage()
+        self.assertEqual(storage.get_memory("bmad_code", "m1")["id"], "m1")
+        self.assertEqual(storage._collections["bmad_code"]["id"], "replacement")
+
+
+class TestBatchedIdOperations(ChromaDBStorageTestCase):
+    """Test get_memories / delete_memories routing"""
+
+    def setUp(self):
+        super().setUp()
+        self.store("bmad_code", "a1", "alpha")
+        self.store("bmad_code", "a2", "beta")
+        self.store("electronics_maker", "e1", "gamma")
+        self.stub.reset_requests()
+
+    def test_get_memories_one_request_per_domain(self):
+        """Indexed ids are fetched with a single /get per collection"""
+        memories = self.storage.get_memories(["e1", "a1", "a2", "missing"])
+
+        self.assertEqual([m["id"] for m in memories], ["e1", "a1", "a2"])
+        self.assertEqual(memories[0]["domain"], "electronics_maker")
+        # One request per domain: missing id is tried everywhere in the same calls
+        self.assertEqual(self.stub.actions().count("get"), len(self.storage.domains))
+
+    def test_get_memories_learns_unindexed_routes(self):
+        """Ids missing from the index are resolved and recorded"""
+        storage = self.make_storage(id_index_path=os.path.join(self.tmpdir.name, "fresh.db"))
+        self.stub.reset_requests()
+
+        memories = storage.get_memories(["a1", "e1"])
+        self.assertEqual({m["id"] for m in memories}, {"a1", "e1"})
+        self.assertEqual(storage._id_index.lookup(["a1", "e1"]), {"a1": "bmad_code", "e1": "electronics_maker"})
+
+        self.stub.reset_requests()
+        storage.get_memories(["a1", "e1"])
+        self.assertEqual(self.stub.actions().count("get"), 2)
+
+    def test_delete_memories(self):
+        """Deletes are grouped into one multi-id /delete per collection"""
+        status = self.storage.delete_memories(["a1", "a2", "e1", "missing"])
+
+        self.assertEqual(status, {"a1": True, "a2": True, "e1": True, "missing": False})
+        self.assertEqual(self.stub.actions().count("delete"), 2)
+        self.assertEqual(self.stub.rows("memory_bmad_code"), {})
+        self.assertEqual(self.storage._id_index.lookup(["a1", "e1"]), {})
+
+
+    def test_delete_memories_with_stale_routes(self):
+        """Indexed ids are confirmed before counting as deleted; stale routes fall back to probing"""
+        self.storage._id_index.record_many([("a1", "electronics_maker"), ("ghost", "bmad_code")])
+
+        status = self.storage.delete_memories(["a1", "ghost"])
+
+        self.assertEqual(status, {"a1": True, "ghost": False})
+        self.assertNotIn("a1", self.stub.rows("memory_bmad_code"))
+        self.assertEqual(self.storage._id_index.lookup(["a1", "ghost"]), {})
+
+class TestProjectionAndDecoding(ChromaDBStorageTestCase):
+    """Test include projections, deferred document decoding and large responses"""
+
+    def setUp(self):
+        super().setUp()
+        self.store("bmad_code", "m1", "x" * 300_000, tags=["big"])
+        self.store("bmad_code", "m2", "small", tags=["small"])
+
+    def test_ids_only_projection(self):
+        """include=[] returns ids without metadata or documents"""
+        memories = self.storage.search_memories(domain="bmad_code", include=[])
+
+        self.assertEqual(sorted(m["id"] for m in memories), ["m1", "m2"])
+        self.assertNotIn("content_data", memories[0])
+        self.assertNotIn("tags", memories[0])
+        self.assertEqual(self.stub.requests[-1]["payload"]["include"], [])
+
+    def test_metadata_only_projection(self):
+        """Metadata-only scans skip documents entirely"""
+        memories = self.storage.get_memories(["m1", "m2"], include=["metadatas"])
+
+        self.assertEqual([m["tags"] for m in memories], [["big"], ["small"]])
+        self.assertTrue(all("content_data" not in m and "_document" not in m for m in memories))
+
+    def test_unknown_include_field_rejected(self):
+        with self.assertRaises(ValueError):
+            self.storage.get_memories(["m1"], include=["bogus"])
+
+    def test_search_results_are_decoded(self):
+        """Deferred documents are decoded before search results are returned"""
+        memories = self.storage.search_memories(domain="bmad_code", limit=1)
+
+        self.assertEqual(len(memories), 1)
+        self.assertNotIn("_document", memories[0])
+        self.assertIn("text", memories[0]["content_data"])
+
+    def test_large_response_decoding(self):
+        """Large bodies decode identically via ijson and the buffered fallback"""
+        streamed = self.storage.get_memory("bmad_code", "m1")
+        with patch.object(chromadb_storage, "ijson", None):
+            buffered = self.storage.get_memory("bmad_code", "m1")
+
+        self.assertEqual(streamed, buffered)
+        self.assertEqual(len(streamed["content_data"]["text"]), 300_000)
+
+
+class TestServerSideFilters(ChromaDBStorageTestCase):
+    """Test where-clause compilation and the metadata migration"""
+
+    def test_tag_filter_returns_full_page(self):
+        """Tag filters are applied by ChromaDB, not after the page is fetched"""
+        for i in range(10):
+            self.store("bmad_code", f"u{i}", f"untagged {i}")
+        for i in range(3):
+            self.store("bmad_code", f"t{i}", f"tagged {i}", tags=["python", "rare"])
+
+        memories = self.storage.search_memories(domain="bmad_code", tags=["rare", "missing"], limit=3)
+
+        self.assertEqual(sorted(m["id"] for m in memories), ["t0", "t1", "t2"])
+        where = self.stub.requests[-1]["payload"]["where"]
+        self.assertEqual(where, {"$or": [{"tag:rare": True}, {"tag:missing": True}]})
+
+    def test_multiple_filters_use_and(self):
+        self.store("bmad_code", "m1", source="a", tags=["x"])
+        self.store("bmad_code", "m2", source="b", tags=["x"])
+
+        memories = self.storage.search_memories(domain="bmad_code", source="a", tags=["x"])
+
+        self.assertEqual([m["id"] for m in memories], ["m1"])
+        self.assertIn("$and", self.stub.requests[-1]["payload"]["where"])
+
+    def test_date_range_and_confidence_bounds(self):
+        """Time windows and confidence bounds are pushed into the where clause"""
+        self.store("bmad_code", "jan", timestamp="2025-01-15T12:00:00", confidence=0.5)
+        self.store("bmad_code", "feb", timestamp="2025-02-15T12:00:00", confidence=0.5)
+        self.store("bmad_code", "feb_sure", timestamp="2025-02-20T12:00:00", confidence=1.0)
+
+        memories = self.storage.search_memories(
+            domain="bmad_code",
+            date_range=("2025-02-01T00:00:00", "2025-02-28T23:59:59"),
+            max_confidence=0.9,
+        )
+
+        self.assertEqual([m["id"] for m in memories], ["feb"])
+        self.assertEqual(len(self.stub.requests[-1]["payload"]["where"]["$and"]), 3)
+
+    def test_migrate_metadata_adds_tag_keys(self):
+        """Legacy rows are rewritten in batches and become tag- and date-searchable"""
+        self.store("bmad_code", "new", tags=["python"])
+        rows = self.stub.rows("memory_bmad_code")
+        for i in range(5):
+            rows[f"old{i}"] = {
+                "embedding": rows["new"]["embedding"],
+                "document": rows["new"]["document"],
+                "metadata": {"tags": '["python"]', "timestamp": "2024-01-01T00:00:00", "confidence": 1.0},
+            }
+        self.stub.reset_requests()
+
+        migrated = self.storage.migrate_metadata(batch_size=2, domains=["bmad_code"])
+
+        self.assertEqual(migrated, {"bmad_code": 5})
+        self.assertEqual(self.stub.actions().count("update"), 3)
+        memories = self.storage.search_memories(domain="bmad_code", tags=["python"])
+        self.assertEqual(len(memories), 6)
+        memories = self.storage.search_memories(
+            domain="bmad_code", date_range=("2024-01-01T00:00:00", "2024-01-02T00:00:00")
+        )
+        self.assertEqual(len(memories), 5)
+        self.assertEqual(self.storage.migrate_metadata(domains=["bmad_code"]), {"bmad_code": 0})
+
+
+class TestReadReplica(ChromaDBStorageTestCase):
+    """Test the local read-through replica"""
+
+    def setUp(self):
+        super().setUp()
+        self.storage = self.make_storage(replica_path=os.path.join(self.tmpdir.name, "replica.db"))
+        self.store("bmad_code", "m1", "alpha", tags=["x"])
+        self.store("bmad_code", "m2", "beta")
+        self.stub.reset_requests()
+
+    def test_id_lookups_are_served_locally(self):
+        self.assertEqual(self.storage.get_memory("bmad_code", "m1")["content_data"], {"text": "alpha"})
+        self.assertEqual([m["id"] for m in self.storage.get_memories(["m2", "m1"])], ["m2", "m1"])
+        self.assertEqual(self.stub.actions(), [])
+
+        # A replicated id looked up under another domain is not served from the replica
+        self.assertIsNone(self.storage.get_memory("website_info", "m1"))
+        self.assertIn("get", self.stub.actions())
+
+    def test_stale_rows_are_revalidated_by_revision(self):
+        self.storage._replica.row_ttl = 0
+        self.assertEqual(self.storage.get_memory("bmad_code", "m1")["content_data"], {"text": "alpha"})
+        self.assertEqual(self.stub.requests[-1]["payload"]["include"], ["metadatas"])
+
+        # Another writer replaces the row: the revision changes and the row is refetched
+        row = self.stub.rows("memory_bmad_code")["m1"]
+        row["document"] = row["document"].replace("alpha", "gamma")
+        row["metadata"]["revision"] = "other-writer"
+        self.assertEqual(self.storage.get_memory("bmad_code", "m1")["content_data"], {"text": "gamma"})
+
+        del self.stub.rows("memory_bmad_code")["m1"]
+        self.assertIsNone(self.storage.get_memory("bmad_code", "m1"))
+
+    def test_listing_keeps_memories_updated_in_place(self):
+        self.assertEqual(len(self.storage.search_memories(domain="bmad_code")), 2)
+        self.storage.update_memory("bmad_code", "m2", tags=["y"])
+
+        memories = self.storage.search_memories(domain="bmad_code")
+        self.assertEqual(sorted(m["id"] for m in memories), ["m1", "m2"])
+        self.assertEqual(next(m for m in memories if m["id"] == "m2")["tags"], ["y"])
+
+    def test_filter_only_listing_after_sync(self):
+        """The first listing syncs the domain; later listings and own writes stay local"""
+        memories = self.storage.search_memories(domain="bmad_code", tags=["x"])
+        self.assertEqual([m["id"] for m in memories], ["m1"])
+
+        self.store("bmad_code", "m3", "gamma", tags=["x"])
+        self.stub.reset_requests()
+        memories = self.storage.search_memories(domain="bmad_code", tags=["x"])
+        self.assertEqual(sorted(m["id"] for m in memories), ["m1", "m3"])
+        self.assertEqual(self.stub.actions(), [])
+
+        # Vector similarity still goes to ChromaDB
+        self.storage.search_memories(query="alpha", domain="bmad_code")
+        self.assertEqual(self.stub.actions(), ["query"])
+
+    def test_sync_overlapping_another_process_write_is_incomplete(self):
+        """Write generations live in the replica file, so other server processes see them"""
+        writer = self.make_storage(replica_path=os.path.join(self.tmpdir.name, "replica.db"))
+        sync_page = self.storage._collection_request
+
+        def page_then_foreign_write(domain, action, payload, *args, **kwargs):
+            result = sync_page(domain, action, payload, *args, **kwargs)
+            writer._replica_written(domain)
+            return result
+
+        with patch.object(self.storage, "_collection_request", side_effect=page_then_foreign_write):
+            self.assertFalse(self.storage.sync_replica("bmad_code"))
+        self.assertFalse(self.storage._replica.is_complete("bmad_code"))
+
+
+class TestResilience(ChromaDBStorageTestCase):
+    """Test circuit breakers, hedged reads and search deadlines against injected faults"""
+
+    def test_breaker_opens_and_recovers_through_probe(self):
+        self.store("bmad_code", "m1")
+        with patch.dict(os.environ, {"CHROMADB_BREAKER_FAILURES": "2", "CHROMADB_BREAKER_RESET": "0.2"}):
+            storage = self.make_storage()
+        self.stub.faults["get"] = {"status": 500}
+
+        for _ in range(2):
+            self.assertIsNone(storage.get_memory("bmad_code", "m1"))
+        self.stub.reset_requests()
+        with self.assertRaises(CircuitOpenError):
+            storage._collection_request("bmad_code", "get", {"ids": ["m1"]})
+        self.assertEqual(self.stub.actions(), [])
+        self.assertEqual(storage.get_resilience_status()["breakers"]["get"]["state"], "open")
+
+        # After the reset timeout a single probe goes through and closes the circuit
+        del self.stub.faults["get"]
+        time.sleep(0.25)
+        self.assertEqual(storage.get_memory("bmad_code", "m1")["id"], "m1")
+        self.assertEqual(storage._breakers["get"].state, "closed")
+
+    def test_slow_read_is_hedged(self):
+        storage = self.make_storage(hedge_percentile=50)
+        for _ in range(25):
+            storage._get_count_http("bmad_code")
+
+        self.stub.faults["count"] = {"delay": 0.8, "count": 1}
+        started = time.perf_counter()
+        self.assertEqual(storage._get_count_http("bmad_code"), 0)
+
+        self.assertLess(time.perf_counter() - started, 0.6)
+        self.assertEqual(storage.resilience_stats["hedge_wins"], 1)
+
+    def test_deadline_returns_partial_results(self):
+        """A stalled domain is dropped at the deadline instead of blocking the search"""
+        self.store("bmad_code", "slow")
+        self.store("website_info", "fast")
+        self.stub.faults["query"] = {"delay": 1.0, "collection": "memory_bmad_code"}
+
+        started = time.perf_counter()
+        memories = self.storage.search_memories(query="hello", timeout=0.3)
+
+        self.assertLess(time.perf_counter() - started, 0.8)
+        self.assertEqual([m["id"] for m in memories], ["fast"])
+        self.assertEqual(self.storage.resilience_stats["partial_results"], 1)
+
+    def test_deadline_timeouts_do_not_open_the_breaker(self):
+        """A search that gives up on a slow domain is not evidence the server is down"""
+        with patch.dict(os.environ, {"CHROMADB_BREAKER_FAILURES": "2"}):
+            storage = self.make_storage()
+        self.stub.faults["query"] = {"delay": 0.6}
+
+        for _ in range(3):
+            self.assertEqual(storage.search_memories(query="hello", domain="bmad_code", timeout=0.2), [])
+        time.sleep(0.3)
+        self.assertEqual(storage._breakers["query"].snapshot()["failures"], 0)
+
+        async def search():
+            async_storage = AsyncChromaDBStorage(storage)
+            try:
+                for _ in range(3):
+                    await async_storage.search_memories(query="hello", domain="bmad_code", timeout=0.2)
+            finally:
+                await async_storage.aclose()
+
+        asyncio.run(search())
+        self.assertEqual(storage._breakers["query"].snapshot(), {"state": "closed", "failures": 0, "rejected": 0})
+
+
+
+class TestSearchCoalescing(ChromaDBStorageTestCase):
+    """Test single-flight coalescing of identical concurrent searches"""
+
+    def search_concurrently(self, n, **kwargs):
+        barrier = threading.Barrier(n)
+        results = [None] * n
+
+        def worker(i):
+            barrier.wait()
+            results[i] = self.storage.search_memories(**kwargs)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_identical_searches_share_one_query(self):
+        self.store("bmad_code", "m1", "alpha", tags=["a", "b"])
+        self.stub.reset_requests()
+        self.stub.faults["query"] = {"delay": 0.3}
+
+        results = self.search_concurrently(6, query="alpha", domain="bmad_code", tags=["b", "a"])
+
+        self.assertEqual(self.stub.actions().count("query"), 1)
+        self.assertTrue(all([m["id"] for m in r] == ["m1"] for r in results))
+        self.assertIsNot(results[0][0], results[1][0])
+        self.assertEqual(self.storage.get_statistics()["search_coalescing"]["coalesced"], 5)
+
+    def test_coalescing_can_be_disabled(self):
+        self.storage = self.make_storage(coalesce_searches=False)
+        self.store("bmad_code", "m1", "alpha")
+        self.stub.reset_requests()
+        self.stub.faults["query"] = {"delay": 0.2}
+
+        self.search_concurrently(3, query="alpha", domain="bmad_code")
+
+        self.assertEqual(self.stub.actions().count("query"), 3)
+        self.assertNotIn("search_coalescing", self.storage.get_statistics())
+
+
+
+class TestDocumentCompression(ChromaDBStorageTestCase):
+    """Test that large documents are stored compressed and read back transparently"""
+
+    def test_large_document_round_trip(self):
+        snippet = "for pin in range(8):\n    gpio.write(pin, HIGH)\n" * 500
+        self.store("bmad_code", "big", snippet)
+        self.store("bmad_code", "small", "tiny")
+
+        rows = self.stub.rows("memory_bmad_code")
+        self.assertTrue(rows["big"]["document"].startswith("@cz1:zlib:"))
+        self.assertLess(len(rows["big"]["document"]), len(snippet) / 5)
+        self.assertTrue(rows["small"]["document"].startswith("{"))
+
+        self.assertEqual(self.storage.get_memory("bmad_code", "big")["content_data"], {"text": snippet})
+        memories = self.storage.search_memories(query=snippet, domain="bmad_code", limit=1)
+        self.assertEqual(memories[0]["content_data"], {"text": snippet})
+
+        # Listings that do not read the document never decompress it
+        before = self.storage.get_statistics()["compression"]["domains"]["bmad_code"]["decompressed"]
+        self.storage.search_memories(domain="bmad_code", include=["metadatas"])
+        stats = self.storage.get_statistics()["compression"]["domains"]["bmad_code"]
+        self.assertEqual(stats["decompressed"], before)
+        self.assertGreater(stats["ratio"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
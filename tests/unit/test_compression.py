@@ -0,0 +1,52 @@
+# Test Suite for transparent payload compression
+
+import bz2
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.memory.compression import PayloadCompressor, is_compressed, register_codec
+
+LARGE = json.dumps({"code_snippet": "def handler(request):\n    return request.json()\n" * 400})
+
+
+class TestPayloadCompressor(unittest.TestCase):
+    """Test the codec header, threshold and statistics"""
+
+    def test_round_trip_above_threshold(self):
+        compressor = PayloadCompressor(threshold=1024)
+        stored = compressor.compress(LARGE, "bmad_code")
+
+        self.assertTrue(stored.startswith("@cz1:zlib:"))
+        self.assertLess(len(stored), len(LARGE) / 5)
+        self.assertEqual(compressor.decompress(stored, "bmad_code"), LARGE)
+
+        stats = compressor.get_statistics()["domains"]["bmad_code"]
+        self.assertEqual((stats["compressed"], stats["decompressed"]), (1, 1))
+        self.assertGreater(stats["ratio"], 5)
+
+    def test_small_and_legacy_values_pass_through(self):
+        compressor = PayloadCompressor(threshold=1024)
+        self.assertEqual(compressor.compress('{"a": 1}'), '{"a": 1}')
+        self.assertEqual(compressor.decompress('{"a": 1}'), '{"a": 1}')
+        self.assertIsNone(compressor.decompress(None))
+        self.assertFalse(is_compressed(PayloadCompressor(codec="none").compress(LARGE)))
+
+    def test_pluggable_codec(self):
+        register_codec("bz2", bz2.compress, bz2.decompress)
+        stored = PayloadCompressor(codec="bz2", threshold=0).compress(LARGE)
+
+        self.assertTrue(stored.startswith("@cz1:bz2:"))
+        # Any compressor can read any registered codec's header
+        self.assertEqual(PayloadCompressor().decompress(stored), LARGE)
+
+    def test_corrupt_payload_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            PayloadCompressor().decompress("@cz1:zlib:bm90IHpsaWI=")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+# Test Suite for multi-process SQLite settings and cross-process cache invalidation
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.memory.invalidation import ChangeCounter
+from src.memory.multi_domain_memory_system import MemoryManager
+from src.memory.sqlite_config import connect
+
+
+class TestSQLiteConfig(unittest.TestCase):
+    """Test the shared connection settings"""
+
+    def test_wal_and_busy_timeout(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "store.db")
+            conn = connect(path, wal=True)
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            conn.close()
+
+            # The journal mode is kept in the file
+            with patch.dict(os.environ, {"MCP_MEMORY_SQLITE_BUSY_TIMEOUT": "0.25"}):
+                conn = connect(path)
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(conn.execute("PRAGMA busy_timeout").fetchone()[0], 250)
+            conn.close()
+
+
+class TestChangeCounter(unittest.TestCase):
+    """Test write generations shared through one SQLite file"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmpdir.name, "changes.db")
+        # Two counters on one file stand in for two server processes
+        self.writer = ChangeCounter(path)
+        self.reader = ChangeCounter(path)
+
+    def tearDown(self):
+        self.writer.close()
+        self.reader.close()
+        self.tmpdir.cleanup()
+
+    def test_bumps_are_seen_by_other_connections(self):
+        self.assertEqual(self.reader.generation("bmad_code"), 0)
+        self.assertEqual(self.writer.bump("bmad_code"), 1)
+        self.assertEqual(self.writer.bump("bmad_code"), 2)
+        self.assertEqual(self.writer.generation("bmad_code"), 2)
+        self.assertEqual(self.reader.generation("bmad_code"), 2)
+        self.assertEqual(self.reader.generation("website_info"), 0)
+
+        self.reader.bump("website_info")
+        self.assertEqual(self.writer.snapshot(), {"bmad_code": 2, "website_info": 1})
+
+
+class TestManagerWriteGeneration(unittest.TestCase):
+    """Test that manager writes move the domain's write generation"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.manager = MemoryManager(
+            storage_path=os.path.join(self.tmpdir.name, "memory.db"),
+            use_chromadb=False,
+            allow_fallback=True,
+            dedup_policy="merge_tags",
+        )
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def store(self, text, tags=None):
+        return self.manager.store_conversation(
+            "website_info", {"url": "https://example.com", "text": text}, "unit_test", tags=tags
+        )
+
+    def test_stores_and_dedup_updates_bump_the_domain(self):
+        self.assertEqual(self.manager.write_generation("website_info"), 0)
+        self.store("first")
+        self.manager.store_conversations([
+            {"domain": "website_info", "conversation_data": {"url": "https://a.example", "text": "a"},
+             "source": "unit_test"},
+            {"domain": "bmad_code", "conversation_data": {"code_snippet": "x = 1"}, "source": "unit_test"},
+        ])
+        self.assertEqual(self.manager.write_generation("website_info"), 2)
+        self.assertEqual(self.manager.write_generation("bmad_code"), 1)
+
+        # A duplicate that changes nothing is not a write; one that merges tags is
+        self.store("first")
+        self.assertEqual(self.manager.write_generation("website_info"), 2)
+        self.store("first", tags=["new"])
+        self.assertEqual(self.manager.write_generation("website_info"), 3)
+        self.assertEqual(self.manager.write_generation(), 4)
+
+    def test_generation_is_shared_with_other_managers(self):
+        other = ChangeCounter(self.manager._changes.db_path)
+        self.store("first")
+        self.assertEqual(other.generation("website_info"), 1)
+        other.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+# Test Suite for the local vector storage backend
+# Runs LocalVectorStorage / LocalVectorIndex against temporary directories
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.memory import multi_domain_memory_system as mdms
+from src.memory.local_vector_storage import LocalVectorIndex, LocalVectorStorage
+from src.memory.multi_domain_memory_system import MemoryManager
+
+
+class LocalVectorStorageTestCase(unittest.TestCase):
+    """Base fixture: a fresh storage directory per test"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.storage = self.make_storage()
+
+    def tearDown(self):
+        self.storage.close()
+        self.tmpdir.cleanup()
+
+    def make_storage(self, **kwargs) -> LocalVectorStorage:
+        return LocalVectorStorage(storage_path=os.path.join(self.tmpdir.name, "vectors"), **kwargs)
+
+    def store(self, domain, memory_id, text="hello", tags=None, **kwargs):
+        params = dict(
+            domain=domain,
+            memory_id=memory_id,
+            content_data={"text": text},
+            metadata={},
+            tags=tags or [],
+            timestamp="2025-01-01T00:00:00",
+            source="unit_test",
+            confidence=1.0,
+            context={},
+        )
+        params.update(kwargs)
+        return self.storage.store_memory(**params)
+
+
+class TestLocalVectorStorage(LocalVectorStorageTestCase):
+    """Test the ChromaDBStorage interface on the local backend"""
+
+    def test_round_trip(self):
+        self.store("bmad_code", "m1", "alpha", tags=["python"])
+
+        memory = self.storage.get_memory("bmad_code", "m1")
+        self.assertEqual(memory["content_data"], {"text": "alpha"})
+        self.assertEqual(memory["tags"], ["python"])
+        self.assertTrue(self.storage.delete_memory("bmad_code", "m1"))
+        self.assertIsNone(self.storage.get_memory("bmad_code", "m1"))
+
+    def test_add_keeps_existing_ids_and_upsert_overwrites(self):
+        self.store("bmad_code", "m1", "original")
+
+        def memory(text):
+            return {
+                "memory_id": "m1", "domain": "bmad_code", "content_data": {"text": text}, "metadata": {},
+                "tags": [], "timestamp": "2025-01-01T00:00:00", "source": "unit_test",
+                "confidence": 1.0, "context": {},
+            }
+
+        self.storage.store_memories([memory("replayed")])
+        self.assertEqual(self.storage.get_memory("bmad_code", "m1")["content_data"], {"text": "original"})
+
+        self.storage.store_memories([memory("replaced")], upsert=True)
+        self.assertEqual(self.storage.get_memory("bmad_code", "m1")["content_data"], {"text": "replaced"})
+        self.assertEqual(self.storage.get_statistics()["domain_distribution"]["bmad_code"], 1)
+
+    def test_repeated_id_in_one_write_takes_one_row(self):
+        index = LocalVectorIndex(os.path.join(self.tmpdir.name, "repeated"))
+        index.add(["a", "a"], [[1.0, 0.0], [0.0, 1.0]])
+        self.assertEqual(index.get(ids=["a"], include=["embeddings"])["embeddings"][0], [1.0, 0.0])
+
+        index.upsert(["b", "b"], [[1.0, 0.0], [0.0, 1.0]], metadatas=[{"n": 1}, {"n": 2}])
+        self.assertEqual(index.count(), 2)
+        result = index.query([[0.0, 1.0]], n_results=5, include=["metadatas"])
+        self.assertEqual(sorted(result["ids"][0]), ["a", "b"])
+        self.assertEqual(result["metadatas"][0][result["ids"][0].index("b")], {"n": 2})
+        index.close()
+
+    def test_query_ranks_exact_text_first(self):
+        for i in range(20):
+            self.store("bmad_code", f"m{i}", f"text {i}")
+
+        memories = self.storage.search_memories(query="text 7", domain="bmad_code", limit=3)
+        best = max(memories, key=lambda m: m["similarity_score"])
+        self.assertEqual(best["id"], "m7")
+        self.assertAlmostEqual(best["similarity_score"], 1.0, places=4)
+
+    def test_filters(self):
+        self.store("bmad_code", "jan", tags=["x"], timestamp="2025-01-15T12:00:00")
+        self.store("bmad_code", "feb", tags=["x"], timestamp="2025-02-15T12:00:00")
+        self.store("bmad_code", "feb_other", tags=["y"], timestamp="2025-02-16T12:00:00")
+
+        memories = self.storage.search_memories(
+            query="hello", tags=["x"], date_range=("2025-02-01T00:00:00", None)
+        )
+        self.assertEqual([m["id"] for m in memories], ["feb"])
+
+    def test_persistence_and_slot_reuse(self):
+        self.store("bmad_code", "a", "alpha")
+        self.store("bmad_code", "b", "beta")
+        self.storage.delete_memories(["a"])
+        self.storage.close()
+
+        self.storage = self.make_storage()
+        self.assertEqual(self.storage.get_memory("bmad_code", "b")["content_data"], {"text": "beta"})
+        self.store("bmad_code", "c", "gamma")
+        stats = self.storage.get_statistics()
+        self.assertEqual(stats["domain_distribution"]["bmad_code"], 2)
+        self.assertEqual(self.storage._index("bmad_code")._row_of["c"], 0)
+
+    def test_manager_selects_local_backend(self):
+        with patch.object(mdms, "get_local_vector_storage", return_value=self.storage):
+            manager = MemoryManager(vector_backend="local")
+        memory_id = manager.store_conversation("electronics_maker", {"project_name": "clock"}, "s")
+
+        self.assertEqual(manager.retrieve_conversations(domain="electronics_maker")[0].id, memory_id)
+        self.assertEqual(manager.get_memory_statistics()["storage_backend"], "local")
+
+
+class TestIVFIndex(unittest.TestCase):
+    """Test IVF partitioning of a domain index"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_trained_index_recall(self):
+        """Probed IVF search finds most exact neighbours once the index is trained"""
+        rng = np.random.default_rng(1)
+        centers = rng.normal(size=(32, 16)).astype(np.float32) * 4
+        vectors = (centers[rng.integers(0, 32, 3000)] + rng.normal(size=(3000, 16))).astype(np.float32)
+        index = LocalVectorIndex(self.tmpdir.name, nprobe=6, train_threshold=1000)
+        index.add([f"v{i}" for i in range(len(vectors))], vectors.tolist())
+        self.assertGreater(index.stats()["ivf_lists"], 1)
+
+        queries = vectors[:50] + rng.normal(scale=0.1, size=(50, 16)).astype(np.float32)
+        hits = 0
+        for query in queries:
+            exact = np.argsort(((vectors - query) ** 2).sum(axis=1))[:10]
+            found = index.query([query.tolist()], n_results=10)["ids"][0]
+            hits += len({f"v{i}" for i in exact} & set(found))
+        self.assertGreaterEqual(hits / 500, 0.9)
+
+        # Reopening restores the trained centroids and list assignments
+        index.close()
+        reopened = LocalVectorIndex(self.tmpdir.name, nprobe=6, train_threshold=1000)
+        self.assertEqual(reopened.query([vectors[5].tolist()], n_results=1)["ids"][0], ["v5"])
+        reopened.close()
+
+    def test_quantized_search_reranks_exactly(self):
+        """Quantized first pass plus exact re-rank returns true neighbours and distances"""
+        rng = np.random.default_rng(2)
+        vectors = rng.normal(size=(2000, 32)).astype(np.float32)
+        exact = LocalVectorIndex(os.path.join(self.tmpdir.name, "exact"))
+        exact.add([f"v{i}" for i in range(len(vectors))], vectors)
+
+        for mode, bytes_per_dim in (("float16", 2), ("int8", 1)):
+            index = LocalVectorIndex(os.path.join(self.tmpdir.name, mode), quantization=mode)
+            index.add([f"v{i}" for i in range(len(vectors))], vectors)
+            self.assertLess(index.memory_bytes(), index.capacity * 32 * bytes_per_dim + index.capacity * 8 + 1)
+
+            for query in vectors[:20]:
+                expected = exact.query([query], n_results=5)
+                found = index.query([query], n_results=5)
+                self.assertEqual(found["ids"], expected["ids"])
+                np.testing.assert_allclose(found["distances"], expected["distances"], rtol=1e-5, atol=1e-5)
+
+            index.close()
+
+            # Codes are rebuilt from the float32 file on reopen
+            reopened = LocalVectorIndex(os.path.join(self.tmpdir.name, mode), quantization=mode)
+            self.assertEqual(reopened.query([vectors[7]], n_results=1)["ids"][0], ["v7"])
+            reopened.close()
+        exact.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,791 @@
+# Test Suite for MemoryManager
+# Covers the SQLite fallback backend and ChromaDB mode against the stub server
+
+import asyncio
+import dataclasses
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from chromadb_stub import ChromaDBStub
+from src.memory import multi_domain_memory_system as mdms
+from src.memory.async_chromadb_storage import AsyncChromaDBStorage
+from src.memory.chromadb_storage import ChromaDBStorage
+from src.memory.fusion import reciprocal_rank_fusion
+from src.memory.metrics import metrics
+from src.memory.multi_domain_memory_system import MemoryEntry, MemoryManager
+
+BMAD_CODE = {
+    "code_snippet": "def hello():\n    return 1",
+    "conversation_context": "unit test",
+    "project_id": "proj_1",
+}
+
+
+def bmad(snippet: str) -> dict:
+    data = dict(BMAD_CODE)
+    data["code_snippet"] = snippet
+    return data
+
+
+class SQLiteManagerTestCase(unittest.TestCase):
+    """Base fixture: MemoryManager on the SQLite fallback backend"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.manager = MemoryManager(
+            storage_path=os.path.join(self.tmpdir.name, "memory.db"),
+            use_chromadb=False,
+            allow_fallback=True,
+        )
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+
+class ChromaManagerTestCase(unittest.TestCase):
+    """Base fixture: MemoryManager on ChromaDB (stub server)"""
+
+    def manager_kwargs(self) -> dict:
+        return {}
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.stub = ChromaDBStub().start()
+        self.storage = ChromaDBStorage(
+            host="127.0.0.1",
+            port=self.stub.port,
+            id_index_path=os.path.join(self.tmpdir.name, "ids.db"),
+            collection_cache_path=os.path.join(self.tmpdir.name, "collections.json"),
+        )
+        with patch.object(mdms, "get_chromadb_storage", return_value=self.storage):
+            self.manager = MemoryManager(**self.manager_kwargs())
+
+    def tearDown(self):
+        self.stub.stop()
+        self.tmpdir.cleanup()
+
+
+class TestMemoryEntry(unittest.TestCase):
+    def test_slotted_interned_and_round_trips(self):
+        entry = MemoryEntry(
+            domain="".join(["bmad", "_code"]),
+            source="".join(["session", "_1"]),
+            content_data={"code_snippet": "x"},
+            tags=["a"],
+        )
+        self.assertFalse(hasattr(entry, "__dict__"))
+        self.assertIs(entry.domain, "bmad_code")
+        self.assertIs(entry.source, MemoryEntry(source="session_1").source)
+
+        data = entry.to_dict()
+        self.assertEqual(list(data), [f.name for f in dataclasses.fields(MemoryEntry)])
+        # Nested data is shared, not deep-copied
+        self.assertIs(data["content_data"], entry.content_data)
+        self.assertEqual(MemoryEntry.from_dict(data), entry)
+
+
+class TestReciprocalRankFusion(unittest.TestCase):
+    """Test the RRF helper"""
+
+    def test_items_in_both_lists_rank_first(self):
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "d"]], k=60)
+        self.assertEqual(fused[0][0], "c")
+        self.assertAlmostEqual(fused[0][1], 1 / 63 + 1 / 61)
+
+    def test_weights(self):
+        fused = reciprocal_rank_fusion([["a"], ["b"]], weights=[1.0, 2.0])
+        self.assertEqual([item for item, _ in fused], ["b", "a"])
+
+    def test_weights_must_match(self):
+        with self.assertRaises(ValueError):
+            reciprocal_rank_fusion([["a"]], weights=[1.0, 2.0])
+
+
+class TestSQLiteHybridSearch(SQLiteManagerTestCase):
+    """Test BM25 full-text retrieval on the SQLite backend"""
+
+    def test_exact_identifier_ranks_first(self):
+        self.manager.store_conversation("bmad_code", bmad("def parse_config(): pass"), "s")
+        target = self.manager.store_conversation("bmad_code", bmad("def get_user_id(user): pass"), "s")
+        self.manager.store_conversation("bmad_code", bmad("def get_name(user): pass"), "s")
+
+        memories = self.manager.retrieve_conversations(
+            keyword="get_user_id", search_mode="hybrid", sort_by="relevance"
+        )
+
+        self.assertEqual(memories[0].id, target)
+        self.assertGreater(memories[0].relevance_score, 0)
+
+    def test_deleted_memories_leave_the_index(self):
+        memory_id = self.manager.store_conversation("bmad_code", bmad("unique_token_xyz"), "s")
+        self.manager.storage.delete_memory(memory_id)
+
+        self.assertEqual(self.manager.storage.search_fts("unique_token_xyz"), [])
+
+    def test_invalid_search_mode(self):
+        with self.assertRaises(ValueError):
+            self.manager.retrieve_conversations(keyword="x", search_mode="bogus")
+
+    def test_large_content_is_compressed_but_searchable(self):
+        snippet = "def get_sensor_reading(channel):\n    return adc.read(channel)\n" * 300
+        memory_id = self.manager.store_conversation("bmad_code", bmad(snippet), "s")
+
+        with sqlite3.connect(self.manager.storage.db_path) as conn:
+            stored = conn.execute(
+                "SELECT content_data FROM memory_entries WHERE id = ?", (memory_id,)
+            ).fetchone()[0]
+        self.assertTrue(stored.startswith("@cz1:"))
+        self.assertEqual(self.manager.storage.retrieve_memory(memory_id).content_data["code_snippet"], snippet)
+        self.assertEqual(self.manager.storage.search_fts("get_sensor_reading")[0].id, memory_id)
+
+        self.manager.storage.delete_memory(memory_id)
+        self.assertEqual(self.manager.storage.search_fts("get_sensor_reading"), [])
+
+
+class TestPerformanceMetrics(SQLiteManagerTestCase):
+    """Test tool and backend operation instrumentation"""
+
+    def setUp(self):
+        super().setUp()
+        metrics.reset()
+
+    def test_tool_and_sqlite_latencies_are_reported(self):
+        server = mdms.MCPMemoryServer(self.manager)
+        server.handle_mcp_request("store_memory", {
+            "domain": "bmad_code", "content_data": BMAD_CODE, "source": "s",
+        })
+        server.handle_mcp_request("retrieve_memories", {"domain": "bmad_code", "summary": True})
+
+        response = server.handle_mcp_request("get_performance_metrics", {})
+        self.assertEqual(response["status"], "success")
+        histograms = response["metrics"]["histograms"]
+        tools = {s["labels"]["tool"] for s in histograms["mcp_tool_duration_seconds"]}
+        self.assertTrue({"store_memory", "retrieve_memories"} <= tools)
+        operations = {
+            (s["labels"]["component"], s["labels"]["operation"])
+            for s in histograms["memory_operation_duration_seconds"]
+        }
+        self.assertIn(("sqlite", "store_memory"), operations)
+        self.assertIn(("serialization", "shape_memories"), operations)
+
+
+class TestMCPServerDispatch(SQLiteManagerTestCase):
+    """Test argument validation, batch calls and the JSON-RPC entry point"""
+
+    def setUp(self):
+        super().setUp()
+        self.server = mdms.MCPMemoryServer(self.manager)
+
+    def test_arguments_are_validated_before_dispatch(self):
+        response = self.server.handle_mcp_request("retrieve_memories", {"limit": "10", "colour": "red"})
+        self.assertEqual(response["status"], "error")
+        self.assertIn("limit must be of type integer", response["error"])
+        self.assertIn("unknown argument colour", response["error"])
+
+    def test_batch_runs_reads_concurrently_and_keeps_order(self):
+        events = []
+
+        def slow_read(**kwargs):
+            time.sleep(0.2)
+            events.append("read")
+            return {"status": "success"}
+
+        def write(**kwargs):
+            events.append("write")
+            return {"status": "success", "memory_id": "m1"}
+
+        self.server._dispatch["get_memory_statistics"] = slow_read
+        self.server._dispatch["store_memory"] = write
+        store = {"domain": "bmad_code", "content_data": BMAD_CODE, "source": "s"}
+
+        started = time.perf_counter()
+        results = self.server.handle_mcp_batch(
+            [{"name": "get_memory_statistics"}] * 3
+            + [{"name": "store_memory", "arguments": store}]
+            + [{"name": "get_memory_statistics"}, {"name": "no_such_tool"}]
+        )
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual([r["status"] for r in results], ["success"] * 5 + ["error"])
+        self.assertEqual(results[3]["memory_id"], "m1")
+        # The write waited for the reads before it and ran before the read after it
+        self.assertEqual(events, ["read"] * 3 + ["write", "read"])
+        self.assertLess(elapsed, 0.55)
+
+    def test_batch_size_is_limited(self):
+        self.manager.max_batch_size = 2
+        with self.assertRaises(ValueError):
+            self.server.handle_mcp_batch([{"name": "get_memory_statistics"}] * 3)
+
+    def test_jsonrpc_batch(self):
+        responses = self.server.handle_jsonrpc([
+            {"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {
+                "name": "store_memory",
+                "arguments": {"domain": "bmad_code", "content_data": BMAD_CODE, "source": "s"},
+            }},
+            {"jsonrpc": "2.0", "method": "notifications/initialized"},
+            {"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {
+                "name": "retrieve_by_ids", "arguments": {"memory_ids": []},
+            }},
+            {"jsonrpc": "2.0", "id": 3, "method": "tools/list"},
+            {"jsonrpc": "2.0", "id": 4, "method": "resources/list"},
+        ])
+
+        self.assertEqual([r["id"] for r in responses], [1, 2, 3, 4])
+        self.assertFalse(responses[0]["result"]["isError"])
+        self.assertEqual(responses[0]["result"]["structuredContent"]["status"], "success")
+        self.assertIn("retrieve_by_ids", [t["name"] for t in responses[2]["result"]["tools"]])
+        self.assertEqual(responses[3]["error"]["code"], mdms.JSONRPC_METHOD_NOT_FOUND)
+        self.assertIsNone(self.server.handle_jsonrpc({"jsonrpc": "2.0", "method": "notifications/initialized"}))
+        self.assertEqual(self.server.handle_jsonrpc([])["error"]["code"], mdms.JSONRPC_INVALID_REQUEST)
+
+
+class TestExpandAndSearch(SQLiteManagerTestCase):
+    """Test the one-call expanded search: concurrent sub-queries fused with RRF"""
+
+    def setUp(self):
+        super().setUp()
+        self.both = self.manager.store_conversation("bmad_code", bmad("alpha and beta together"), "s")
+        self.beta = self.manager.store_conversation("bmad_code", bmad("only beta here"), "s")
+        self.gamma = self.manager.store_conversation("bmad_code", bmad("gamma stands alone"), "s")
+        self.manager.store_conversation("bmad_code", bmad("nothing relevant"), "s")
+        # Deterministic expansion; "Alpha" repeats the query and is not searched twice
+        patcher = patch.object(self.manager, "expand_keywords", return_value=["beta", "gamma", "Alpha"])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_sub_queries_are_fused_and_deduplicated(self):
+        result = self.manager.expand_and_search("bmad_code", "alpha")
+
+        self.assertEqual(
+            result["sub_queries"],
+            [{"query": "alpha", "count": 1}, {"query": "beta", "count": 2}, {"query": "gamma", "count": 1}],
+        )
+        ids = [m.id for m in result["memories"]]
+        self.assertEqual(ids[0], self.both)
+        self.assertEqual(sorted(ids[1:]), sorted([self.beta, self.gamma]))
+        self.assertGreater(result["memories"][0].relevance_score, result["memories"][1].relevance_score)
+
+    def test_failed_sub_query_is_reported_and_skipped(self):
+        retrieve = self.manager.retrieve_conversations
+
+        def flaky(**kwargs):
+            if kwargs["keyword"] == "gamma":
+                raise sqlite3.OperationalError("database is locked")
+            return retrieve(**kwargs)
+
+        with patch.object(self.manager, "retrieve_conversations", side_effect=flaky):
+            result = self.manager.expand_and_search("bmad_code", "alpha")
+        self.assertEqual(result["sub_queries"][2], {"query": "gamma", "error": "database is locked"})
+        self.assertNotIn(self.gamma, [m.id for m in result["memories"]])
+
+    def test_async_and_tool_responses_match(self):
+        expected = [m.id for m in self.manager.expand_and_search("bmad_code", "alpha")["memories"]]
+        result = asyncio.run(self.manager.aexpand_and_search("bmad_code", "alpha"))
+        self.assertEqual([m.id for m in result["memories"]], expected)
+
+        response = mdms.MCPMemoryServer(self.manager).handle_mcp_request(
+            "expand_and_search", {"domain": "bmad_code", "query": "alpha", "fields": ["id"]}
+        )
+        self.assertEqual(response["status"], "success")
+        self.assertEqual(response["keywords"], ["beta", "gamma", "Alpha"])
+        self.assertEqual([m["id"] for m in response["memories"]], expected)
+
+
+class TestAnalyticsCaching(SQLiteManagerTestCase):
+    """Test cached expand_keywords/get_keyword_trends and the trend precompute"""
+
+    def test_results_are_cached_until_the_domain_is_written(self):
+        self.manager.store_conversation("bmad_code", bmad("def render_template(): pass"), "s")
+        with patch.object(self.manager, "_get_keyword_trends", wraps=self.manager._get_keyword_trends) as trends:
+            first = self.manager.get_keyword_trends("bmad_code", 7)
+            self.assertEqual(self.manager.get_keyword_trends("bmad_code", 7), first)
+            self.manager.get_keyword_trends("website_info", 7)
+            self.assertEqual(trends.call_count, 2)
+
+            self.manager.store_conversation("bmad_code", bmad("def parse_sensor_frame(): pass"), "s")
+            self.assertIn("parse_sensor_frame", self.manager.get_keyword_trends("bmad_code", 7)["top_keywords"])
+            self.assertEqual(trends.call_count, 3)
+
+        with patch.object(self.manager, "_expand_keywords", wraps=self.manager._expand_keywords) as expand:
+            self.manager.expand_keywords("bmad_code", "Template rendering")
+            self.manager.expand_keywords("bmad_code", "rendering template")
+            self.assertEqual(expand.call_count, 1)
+
+    def test_precompute_fills_the_standard_windows(self):
+        self.manager.start_trend_precompute(interval=60)
+        self.addCleanup(self.manager.stop_trend_precompute)
+        deadline = time.monotonic() + 5
+        while self.manager._analytics_cache.get_statistics()["entries"] < 12 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        with patch.object(self.manager, "_get_keyword_trends") as trends:
+            self.manager.get_keyword_trends("electronics_maker", 90)
+            trends.assert_not_called()
+
+
+class TestDateRangeRetrieval(SQLiteManagerTestCase):
+    """Test half-open date ranges on the SQLite fallback"""
+
+    def test_open_bounds(self):
+        self.manager.store_conversation("bmad_code", bmad("def a(): pass"), "s")
+        yesterday = (datetime.utcnow() - timedelta(days=1)).isoformat()
+        self.assertEqual(len(self.manager.retrieve_conversations(domain="bmad_code", date_range=(yesterday, None))), 1)
+        self.assertEqual(self.manager.retrieve_conversations(domain="bmad_code", date_range=(None, yesterday)), [])
+
+
+class TestChromaDateRange(ChromaManagerTestCase):
+    """Test date ranges applied by the where clause in ChromaDB mode"""
+
+    def test_open_bounds(self):
+        self.manager.store_conversation("bmad_code", bmad("def a(): pass"), "s")
+        yesterday = (datetime.utcnow() - timedelta(days=1)).isoformat()
+        self.assertEqual(len(self.manager.retrieve_conversations(domain="bmad_code", date_range=(yesterday, None))), 1)
+        self.assertEqual(self.manager.retrieve_conversations(domain="bmad_code", date_range=(None, yesterday)), [])
+        self.assertEqual(
+            len(asyncio.run(self.manager.aretrieve_conversations(domain="bmad_code", date_range=(yesterday, None)))), 1
+        )
+
+
+class TestChromaExpandAndSearch(ChromaManagerTestCase):
+    """Test keyword expansion and expanded search against the vector backend"""
+
+    def test_expansion_reads_memories_through_the_vector_backend(self):
+        self.manager.store_conversation("bmad_code", bmad("def render_template(): pass"), "s")
+        self.assertIn("render_template", self.manager.expand_keywords("bmad_code", "templates"))
+
+        result = self.manager.expand_and_search("bmad_code", "render_template", max_keywords=2)
+        self.assertEqual(result["sub_queries"][0]["query"], "render_template")
+        self.assertEqual(len(result["memories"]), 1)
+
+
+class TestChromaKeywordTrends(ChromaManagerTestCase):
+    """Test that trend windows are selected server-side on large collections"""
+
+    def setUp(self):
+        super().setUp()
+        old = (datetime.utcnow() - timedelta(days=200)).isoformat()
+        self.storage.store_memories([
+            {
+                "memory_id": f"old-{i}",
+                "domain": "bmad_code",
+                "content_data": bmad(f"def legacy_{i}(): pass"),
+                "metadata": {},
+                "tags": [],
+                "timestamp": old,
+                "source": "s",
+                "confidence": 1.0,
+                "context": {},
+            }
+            for i in range(1100)
+        ])
+        self.manager.store_conversation("bmad_code", bmad("def render_template(): pass"), "s")
+
+    def test_recent_window_survives_older_rows(self):
+        trends = self.manager.get_keyword_trends("bmad_code", 7)
+        self.assertEqual(trends["total_memories"], 1)
+        self.assertIn("render_template", trends["top_keywords"])
+
+    def test_precompute_fetches_each_domain_once_per_round(self):
+        with patch.object(
+            self.manager, "retrieve_conversations", wraps=self.manager.retrieve_conversations
+        ) as retrieve, patch.object(self.manager._precompute_stop, "wait", side_effect=lambda interval: self.manager._precompute_stop.set()):
+            self.manager._precompute_trends(interval=60)
+
+        domains = [call.kwargs["domain"] for call in retrieve.call_args_list]
+        self.assertEqual(domains.count("bmad_code"), 1)
+        self.assertEqual(self.manager.get_keyword_trends("bmad_code", 7)["total_memories"], 1)
+        self.assertEqual(self.manager.get_keyword_trends("bmad_code", 90)["total_memories"], 1)
+
+
+class TestChromaHybridSearch(ChromaManagerTestCase):
+    """Test lexical + vector fusion in ChromaDB mode"""
+
+    def manager_kwargs(self) -> dict:
+        return {
+            "search_mode": "hybrid",
+            "lexical_index_path": os.path.join(self.tmpdir.name, "lexical.db"),
+        }
+
+    def test_hybrid_recovers_exact_identifier(self):
+        """An exact part number is found even when the vector leg misses it"""
+        for i in range(20):
+            self.manager.store_conversation("electronics_maker", {"project_name": f"board {i}"}, "s")
+        target = self.manager.store_conversation(
+            "electronics_maker", {"project_name": "regulator", "part": "LM7805CT"}, "s"
+        )
+
+        memories = self.manager.retrieve_conversations(
+            domain="electronics_maker", keyword="LM7805CT", limit=3, sort_by="relevance"
+        )
+
+        self.assertEqual(memories[0].id, target)
+        self.assertEqual(len(memories), 3)
+        self.assertIn("query", self.stub.actions())
+
+    def test_deleted_memories_leave_hybrid_results(self):
+        first = self.manager.store_conversation("electronics_maker", {"part": "NE555P"}, "s")
+        second = self.manager.store_conversation("electronics_maker", {"part": "NE555P", "rev": 2}, "s")
+
+        self.storage.delete_memory("electronics_maker", first)
+        self.assertIsNone(self.manager._lexical_storage.retrieve_memory(first))
+        # Deleted by a writer that does not share the lexical index
+        self.storage.lexical_index = None
+        self.storage.delete_memory("electronics_maker", second)
+
+        memories = self.manager.retrieve_conversations(domain="electronics_maker", keyword="NE555P")
+        self.assertEqual(memories, [])
+
+
+
+class TestIngestDeduplication(ChromaManagerTestCase):
+    """Test content-hash deduplication in store_conversation"""
+
+    def test_duplicate_is_skipped_before_embedding(self):
+        first = self.manager.store_conversation("bmad_code", bmad("def a(): pass"), "s1")
+        adds = self.stub.actions().count("add")
+        # Same content modulo key order and trailing whitespace
+        data = dict(reversed(list(bmad("def a(): pass  \r\n").items())))
+        second = self.manager.store_conversation("bmad_code", data, "s2")
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.stub.actions().count("add"), adds)
+        stats = self.manager.get_memory_statistics()["deduplication"]
+        self.assertEqual(stats["skipped"], 1)
+        self.assertEqual(stats["entries"], 1)
+
+    def test_merge_tags_and_bump_confidence(self):
+        self.manager.dedup_policy = "merge_tags"
+        memory_id = self.manager.store_conversation(
+            "bmad_code", bmad("def b(): pass"), "s", tags=["a"], confidence=0.5
+        )
+        self.manager.store_conversation("bmad_code", bmad("def b(): pass"), "s", tags=["b", "a"])
+        self.assertEqual(self.storage.get_memory("bmad_code", memory_id)["tags"], ["a", "b"])
+
+        self.manager.dedup_policy = "bump_confidence"
+        self.manager.store_conversation("bmad_code", bmad("def b(): pass"), "s", confidence=0.5)
+        self.assertAlmostEqual(self.storage.get_memory("bmad_code", memory_id)["confidence"], 0.55)
+
+    def test_deleted_memory_is_stored_again(self):
+        first = self.manager.store_conversation("bmad_code", bmad("def c(): pass"), "s")
+        self.storage.delete_memory("bmad_code", first)
+        self.assertEqual(self.manager.get_memory_statistics()["deduplication"]["entries"], 0)
+        second = self.manager.store_conversation("bmad_code", bmad("def c(): pass"), "s")
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.manager.get_memory_statistics()["deduplication"]["stale"], 0)
+
+    def test_memory_deleted_elsewhere_is_detected_without_id_index(self):
+        self.storage._id_index = None
+        first = self.manager.store_conversation("bmad_code", bmad("def e(): pass"), "s")
+        # Deleted by another writer: the hash row is left behind
+        self.storage._collection_request("bmad_code", "delete", {"ids": [first]})
+        second = self.manager.store_conversation("bmad_code", bmad("def e(): pass"), "s")
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.manager.get_memory_statistics()["deduplication"]["stale"], 1)
+        self.assertEqual(self.manager.store_conversation("bmad_code", bmad("def e(): pass"), "s"), second)
+
+    def test_local_state_files_without_id_index(self):
+        self.storage._id_index = None
+        with patch.dict(os.environ, {"MEMORY_CACHE_DIR": self.tmpdir.name}), \
+                patch.object(mdms, "get_chromadb_storage", return_value=self.storage):
+            manager = MemoryManager()
+        self.assertEqual(manager._changes.db_path, os.path.join(self.tmpdir.name, "change_counters.db"))
+        self.assertEqual(manager._dedup_index.db_path, os.path.join(self.tmpdir.name, "content_hashes.db"))
+
+    def test_sqlite_delete_forgets_content(self):
+        manager = MemoryManager(
+            storage_path=os.path.join(self.tmpdir.name, "memory.db"), use_chromadb=False, allow_fallback=True,
+        )
+        first = manager.store_conversation("bmad_code", bmad("def f(): pass"), "s")
+        self.assertTrue(manager.storage.delete_memory(first))
+        self.assertEqual(manager._dedup_index.get_statistics()["entries"], 0)
+
+    def test_concurrent_stores_of_the_same_content(self):
+        manager = MemoryManager(
+            storage_path=os.path.join(self.tmpdir.name, "memory.db"), use_chromadb=False, allow_fallback=True,
+        )
+        store = manager._sqlite_storage.store_memory
+
+        def slow_store(entry):
+            time.sleep(0.3)
+            return store(entry)
+
+        ids = []
+        with patch.object(manager._sqlite_storage, "store_memory", side_effect=slow_store):
+            threads = [
+                threading.Thread(
+                    target=lambda: ids.append(manager.store_conversation("bmad_code", bmad("def g(): pass"), "s"))
+                )
+                for _ in range(3)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(set(ids)), 1)
+        self.assertEqual(len(manager.retrieve_conversations(domain="bmad_code")), 1)
+        self.assertEqual(manager._inflight_claims, set())
+
+    def test_policy_off(self):
+        self.manager = MemoryManager(
+            storage_path=os.path.join(self.tmpdir.name, "memory.db"),
+            use_chromadb=False,
+            allow_fallback=True,
+            dedup_policy="off",
+        )
+        first = self.manager.store_conversation("bmad_code", bmad("def d(): pass"), "s")
+        second = self.manager.store_conversation("bmad_code", bmad("def d(): pass"), "s")
+        self.assertNotEqual(first, second)
+
+
+class TestBatchTools(ChromaManagerTestCase):
+    """Test store_memories_batch and retrieve_by_ids"""
+
+    def manager_kwargs(self) -> dict:
+        return {"max_batch_size": 5}
+
+    def test_batch_store_is_one_write_with_per_item_status(self):
+        server = mdms.MCPMemoryServer(self.manager)
+        existing = self.manager.store_conversation("bmad_code", bmad("def old(): pass"), "s")
+        adds = self.stub.actions().count("add")
+
+        response = server.handle_mcp_request("store_memories_batch", {"memories": [
+            {"domain": "bmad_code", "content_data": bmad("def x(): pass"), "source": "s"},
+            {"domain": "bmad_code", "content_data": bmad("def old(): pass"), "source": "s"},
+            {"domain": "no_such_domain", "content_data": {}, "source": "s"},
+            {"domain": "bmad_code", "content_data": bmad("def y(): pass"), "source": "s"},
+            {"domain": "bmad_code", "content_data": bmad("def x(): pass"), "source": "s"},
+        ]})
+
+        self.assertEqual(response["status"], "partial")
+        self.assertEqual(
+            [r["status"] for r in response["results"]],
+            ["success", "duplicate", "error", "success", "duplicate"],
+        )
+        results = response["results"]
+        self.assertEqual(results[1]["memory_id"], existing)
+        self.assertEqual(results[4]["memory_id"], results[0]["memory_id"])
+        self.assertEqual((response["stored"], response["duplicates"], response["failed"]), (2, 2, 1))
+        self.assertEqual(self.stub.actions().count("add"), adds + 1)
+
+        fetched = server.handle_mcp_request("retrieve_by_ids", {
+            "memory_ids": [results[3]["memory_id"], "missing", results[0]["memory_id"]]
+        })
+        self.assertEqual(
+            [m["id"] for m in fetched["memories"]], [results[3]["memory_id"], results[0]["memory_id"]]
+        )
+        self.assertEqual(fetched["missing"], ["missing"])
+
+    def test_batch_size_limit(self):
+        interface = mdms.MCPMemoryInterface(self.manager)
+        response = interface.mcp_retrieve_by_ids([str(i) for i in range(6)])
+        self.assertEqual(response["status"], "error")
+        self.assertIn("maximum of 5", response["error"])
+
+    def test_sqlite_batch(self):
+        manager = MemoryManager(
+            storage_path=os.path.join(self.tmpdir.name, "memory.db"),
+            use_chromadb=False,
+            allow_fallback=True,
+        )
+        interface = mdms.MCPMemoryInterface(manager)
+
+        async def scenario():
+            stored = await interface.amcp_store_memories_batch([
+                {"domain": "electronics_maker", "content_data": {"project_name": f"p{i}"}, "source": "s"}
+                for i in range(3)
+            ])
+            ids = [r["memory_id"] for r in stored["results"]]
+            return ids, await interface.amcp_retrieve_by_ids(ids[::-1])
+
+        ids, fetched = asyncio.run(scenario())
+
+        self.assertEqual([m["id"] for m in fetched["memories"]], ids[::-1])
+        self.assertEqual(fetched["memories"][0]["content_data"], {"project_name": "p2"})
+
+
+class TestResponseShaping(ChromaManagerTestCase):
+    """Test fields/summary/budget parameters of the MCP retrieval tools"""
+
+    def test_summary_skips_documents(self):
+        interface = mdms.MCPMemoryInterface(self.manager)
+        memory_id = self.manager.store_conversation("bmad_code", bmad("x = 1\n" * 500), "s")
+        self.stub.reset_requests()
+
+        memories = interface.mcp_retrieve_memories(domain="bmad_code", summary=True)["memories"]
+
+        self.assertEqual(memories[0]["id"], memory_id)
+        self.assertNotIn("content_data", memories[0])
+        gets = [r["payload"] for r in self.stub.requests if r["action"] == "get"]
+        self.assertTrue(gets)
+        self.assertTrue(all("documents" not in payload.get("include", ["documents"]) for payload in gets))
+
+    def test_budget_on_search_and_by_ids(self):
+        interface = mdms.MCPMemoryInterface(self.manager)
+        ids = [
+            self.manager.store_conversation("bmad_code", bmad(f"def f{i}(): return '{'x' * 2000}'"), "s")
+            for i in range(3)
+        ]
+
+        by_ids = interface.mcp_retrieve_by_ids(ids, max_bytes=5000)
+        self.assertEqual([m["id"] for m in by_ids["memories"]], ids[:2])
+        self.assertEqual(by_ids["omitted"], 1)
+
+        listed = interface.mcp_retrieve_memories(domain="bmad_code", max_bytes=5000)
+        self.assertEqual(len(listed["memories"]), 2)
+        self.assertTrue(all("id" in m for m in listed["memories"]))
+        self.assertEqual((listed["truncated"], listed["omitted"]), (True, 1))
+
+        truncated = interface.mcp_retrieve_by_ids(ids, fields=["content_data"], max_chars_per_field=20)
+        self.assertEqual(truncated["truncated_fields"], 3)
+        self.assertLess(len(str(truncated["memories"])), 1000)
+
+        bad = interface.mcp_retrieve_by_ids(ids, fields=["bogus"])
+        self.assertEqual(bad["status"], "error")
+
+
+class TestAsyncAPI(ChromaManagerTestCase):
+    """Test the asyncio-native MemoryManager methods"""
+
+    def manager_kwargs(self) -> dict:
+        return {
+            "search_mode": "hybrid",
+            "lexical_index_path": os.path.join(self.tmpdir.name, "lexical.db"),
+        }
+
+    def run_async(self, coro_func):
+        async def runner():
+            try:
+                return await coro_func()
+            finally:
+                await self.manager.aclose()
+
+        return asyncio.run(runner())
+
+    def test_store_and_retrieve(self):
+        async def scenario():
+            memory_id = await self.manager.astore_conversation(
+                "electronics_maker", {"project_name": "regulator", "part": "LM317T"}, "s"
+            )
+            memories = await self.manager.aretrieve_conversations(
+                domain="electronics_maker", keyword="LM317T", sort_by="relevance"
+            )
+            stats = await self.manager.aget_memory_statistics()
+            return memory_id, memories, stats
+
+        memory_id, memories, stats = self.run_async(scenario)
+
+        self.assertEqual(memories[0].id, memory_id)
+        self.assertEqual(stats["domain_distribution"]["electronics_maker"], 1)
+        self.assertIsNotNone(self.manager._async_storage)
+        # The sync API sees the same data
+        self.assertEqual(self.manager.retrieve_conversations(keyword="LM317T")[0].id, memory_id)
+
+    def test_concurrent_retrievals_share_one_loop(self):
+        for i in range(10):
+            self.manager.store_conversation("electronics_maker", {"project_name": f"board {i}"}, "s")
+
+        async def scenario():
+            return await asyncio.gather(*(
+                self.manager.aretrieve_conversations(keyword=f"board {i % 10}", limit=5)
+                for i in range(50)
+            ))
+
+        results = self.run_async(scenario)
+
+        self.assertEqual(len(results), 50)
+        self.assertTrue(all(len(memories) == 5 for memories in results))
+        self.assertEqual(
+            [m.id for m in results[3]], [m.id for m in results[13]]
+        )
+
+    def test_cpu_work_runs_off_the_event_loop(self):
+        storage = AsyncChromaDBStorage(self.storage)
+        threads = {}
+
+        def recorded(name):
+            original = getattr(self.storage, name)
+
+            def wrapper(*args, **kwargs):
+                threads.setdefault(name, set()).add(threading.current_thread())
+                return original(*args, **kwargs)
+            return wrapper
+
+        async def scenario():
+            try:
+                with patch.multiple(self.storage, **{
+                    name: recorded(name)
+                    for name in ("_prepare_memory", "_search_payload", "_parse_chroma_results", "_finish_search")
+                }):
+                    await storage.store_memory(
+                        "bmad_code", "m1", bmad("x = 1\n" * 5000), {}, [], "2025-01-01T00:00:00", "s", 1.0, {}
+                    )
+                    await storage.search_memories(query="x", domain="bmad_code")
+                    await storage.get_memory("bmad_code", "m1")
+                return await storage.get_statistics(), threading.current_thread()
+            finally:
+                await storage.aclose()
+
+        stats, loop_thread = asyncio.run(scenario())
+
+        self.assertEqual(len(threads), 4)
+        self.assertTrue(all(loop_thread not in used for used in threads.values()))
+        self.assertEqual(set(stats), set(self.storage.get_statistics()))
+        self.assertEqual(stats["domain_distribution"]["bmad_code"], 1)
+
+    def test_duplicate_store_keeps_http_off_the_sqlite_executor(self):
+        self.manager.dedup_policy = "merge_tags"
+        first = self.manager.store_conversation("bmad_code", bmad("def h(): pass"), "s", tags=["a"])
+        # Without an id index the existence check is a /get
+        self.storage._id_index = None
+        threads = []
+        request_json = self.storage._request_json
+
+        def recorded(*args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return request_json(*args, **kwargs)
+
+        self.stub.reset_requests()
+        with patch.object(self.storage, "_request_json", side_effect=recorded):
+            second = self.run_async(lambda: self.manager.astore_conversation(
+                "bmad_code", bmad("def h(): pass"), "s", tags=["b"]
+            ))
+
+        self.assertEqual(second, first)
+        self.assertEqual(self.storage.get_memory("bmad_code", first)["tags"], ["a", "b"])
+        self.assertIn("get", self.stub.actions())
+        self.assertFalse([name for name in threads if name.startswith("memory-sqlite")])
+
+    def test_mcp_interface_async_tools(self):
+        interface = mdms.MCPMemoryInterface(self.manager)
+
+        async def scenario():
+            stored = await interface.amcp_store_memory(
+                "bmad_code", bmad("def ping(): pass"), "s", tags=["net"]
+            )
+            failed = await interface.amcp_store_memory("no_such_domain", {}, "s")
+            retrieved = await interface.amcp_retrieve_memories(domain="bmad_code")
+            return stored, failed, retrieved
+
+        stored, failed, retrieved = self.run_async(scenario)
+
+        self.assertEqual(stored["status"], "success")
+        self.assertEqual(failed["status"], "error")
+        self.assertEqual(retrieved["memories"][0]["id"], stored["memory_id"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+# Test Suite for in-process performance metrics
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.memory.metrics import (
+    CACHE_REQUESTS,
+    OPERATION_DURATION,
+    OPERATION_ERRORS,
+    LatencyHistogram,
+    MetricsRegistry,
+)
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Test percentile accuracy of the log-linear buckets"""
+
+    def test_percentiles_within_relative_error(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 10001):
+            histogram.record(ms / 1000)
+
+        for pct, expected in ((50, 5.0), (90, 9.0), (99, 9.9)):
+            self.assertAlmostEqual(histogram.percentile(pct), expected, delta=expected * 0.04)
+        self.assertEqual(histogram.percentile(100), 10.0)
+        self.assertEqual(histogram.count, 10000)
+
+    def test_microsecond_values_are_exact(self):
+        histogram = LatencyHistogram()
+        for us in (3, 7, 40):
+            histogram.record(us / 1_000_000)
+        self.assertAlmostEqual(histogram.percentile(50), 7e-6)
+
+    def test_empty(self):
+        self.assertEqual(LatencyHistogram().percentile(99), 0.0)
+
+    def test_cumulative_buckets(self):
+        histogram = LatencyHistogram()
+        for seconds in (0.0004, 0.003, 0.2, 4.0):
+            histogram.record(seconds)
+        self.assertEqual(histogram.cumulative((0.001, 0.01, 1.0, 10.0)), [1, 2, 3, 4])
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test labelled series, timers and the Prometheus rendering"""
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_timer_records_duration_and_errors(self):
+        with self.registry.timer("sqlite", "search_fts"):
+            pass
+        with self.assertRaises(KeyError):
+            with self.registry.timer("sqlite", "search_fts"):
+                raise KeyError("boom")
+
+        histogram = self.registry.histogram(OPERATION_DURATION, component="sqlite", operation="search_fts")
+        self.assertEqual(histogram.count, 2)
+        self.assertEqual(self.registry.counter(OPERATION_ERRORS, component="sqlite", operation="search_fts"), 1)
+
+    def test_timed_decorator_uses_function_name(self):
+        @self.registry.timed("embedding")
+        def embed(text):
+            return [len(text)]
+
+        self.assertEqual(embed("abc"), [3])
+        snapshot = self.registry.snapshot()
+        (series,) = snapshot["histograms"][OPERATION_DURATION]
+        self.assertEqual(series["labels"], {"component": "embedding", "operation": "embed"})
+        self.assertEqual(series["count"], 1)
+
+    def test_cache_lookup_counts_hits_and_misses(self):
+        self.registry.cache_lookup("replica", hits=3, misses=1)
+        self.registry.cache_lookup("replica", hits=2)
+        self.assertEqual(self.registry.counter(CACHE_REQUESTS, cache="replica", result="hit"), 5)
+        self.assertEqual(self.registry.counter(CACHE_REQUESTS, cache="replica", result="miss"), 1)
+
+    def test_prometheus_text(self):
+        self.registry.observe("mcp_tool_duration_seconds", 0.003, tool="retrieve_memories")
+        self.registry.observe("mcp_tool_duration_seconds", 2.0, tool="retrieve_memories")
+        self.registry.increment("mcp_tool_errors_total", tool='odd"name')
+
+        lines = self.registry.render_prometheus().splitlines()
+        self.assertIn("# TYPE mcp_tool_duration_seconds histogram", lines)
+        self.assertIn('mcp_tool_duration_seconds_bucket{tool="retrieve_memories",le="0.005"} 1', lines)
+        self.assertIn('mcp_tool_duration_seconds_bucket{tool="retrieve_memories",le="+Inf"} 2', lines)
+        self.assertIn('mcp_tool_duration_seconds_count{tool="retrieve_memories"} 2', lines)
+        self.assertIn("# TYPE mcp_tool_errors_total counter", lines)
+        self.assertIn('mcp_tool_errors_total{tool="odd\\"name"} 1', lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+# Test Suite for the SQLite -> ChromaDB migration
+# Migrates a temporary SQLite database into the in-process ChromaDB stub
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from chromadb_stub import ChromaDBStub
+from src.memory.chromadb_storage import ChromaDBStorage
+from src.memory.migration import SQLiteToChromaMigration
+from src.memory.multi_domain_memory_system import MemoryEntry, MemoryStorage
+
+DOMAINS = ["bmad_code", "website_info", "electronics_maker"]
+
+
+class MigrationTestCase(unittest.TestCase):
+    """Base fixture: a populated SQLite source and a ChromaDB stub target"""
+
+    rows = 650
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.stub = ChromaDBStub().start()
+        self.source = MemoryStorage(os.path.join(self.tmpdir.name, "memory_system.db"))
+        for i in range(self.rows):
+            self.source.store_memory(MemoryEntry(
+                id=f"m{i:04d}",
+                domain=DOMAINS[i % len(DOMAINS)],
+                content_data={"text": f"memory {i}"},
+                tags=["migrated"],
+                source="fallback",
+            ))
+        # Rows from retired domains are skipped, not fatal
+        self.source.store_memory(MemoryEntry(id="legacy", domain="retired_domain"))
+        self.target = ChromaDBStorage(
+            host="127.0.0.1",
+            port=self.stub.port,
+            id_index_path=os.path.join(self.tmpdir.name, "ids.db"),
+            collection_cache_path=os.path.join(self.tmpdir.name, "collections.json"),
+        )
+        self.checkpoint_path = os.path.join(self.tmpdir.name, "migration.json")
+
+    def tearDown(self):
+        self.stub.stop()
+        self.tmpdir.cleanup()
+
+    def make_migration(self, **kwargs) -> SQLiteToChromaMigration:
+        kwargs.setdefault("batch_size", 50)
+        kwargs.setdefault("workers", 3)
+        return SQLiteToChromaMigration(self.source, self.target, self.checkpoint_path, **kwargs)
+
+
+class TestMigration(MigrationTestCase):
+    """Test streaming, batching, checkpointing and verification"""
+
+    def test_full_migration(self):
+        report = self.make_migration().run(check_ids=True)
+
+        self.assertEqual(report["status"], "ok")
+        self.assertEqual((report["migrated"], report["skipped"]), (self.rows, 1))
+        self.assertEqual(report["verification"]["domains"]["bmad_code"]["missing_ids"], 0)
+        # Chunked multi-id writes, not one request per memory
+        self.assertLessEqual(self.stub.actions().count("add"), self.rows // 50 * 3)
+        memory = self.target.get_memory("website_info", "m0001")
+        self.assertEqual(memory["content_data"], {"text": "memory 1"})
+        self.assertEqual(memory["tags"], ["migrated"])
+
+    def test_resume_after_interruption(self):
+        calls = {"n": 0}
+        store_memories = self.target.store_memories
+
+        def flaky(memories, **kwargs):
+            calls["n"] += 1
+            if calls["n"] > 4:
+                raise ConnectionError("ChromaDB went away")
+            return store_memories(memories, **kwargs)
+
+        with patch.object(self.target, "store_memories", side_effect=flaky):
+            report = self.make_migration(workers=1, max_retries=0).run()
+        self.assertEqual(report["status"], "failed")
+        self.assertEqual(report["after_rowid"], 200)
+
+        self.stub.reset_requests()
+        report = self.make_migration().run(check_ids=True)
+
+        self.assertEqual(report["status"], "ok")
+        self.assertEqual(report["read"], self.rows + 1 - 200)
+        self.assertEqual(report["totals"]["migrated"], self.rows)
+        self.assertEqual(sum(self.target.count_memories(d) for d in DOMAINS), self.rows)
+
+    def test_resume_requires_the_same_domains(self):
+        report = self.make_migration(domains=["bmad_code"]).run()
+        self.assertEqual(report["status"], "ok")
+
+        with self.assertRaises(ValueError):
+            self.make_migration().run()
+
+        report = self.make_migration().run(restart=True)
+        self.assertEqual(report["totals"]["migrated"], self.rows)
+        self.assertEqual(sum(self.target.count_memories(d) for d in DOMAINS), self.rows)
+
+    def test_verification_detects_missing_rows(self):
+        self.make_migration().run()
+        self.target.delete_memories(["m0000", "m0003"])
+
+        verification = self.make_migration().verify(check_ids=True)
+
+        self.assertFalse(verification["ok"])
+        self.assertEqual(verification["domains"]["bmad_code"]["missing_ids"], 2)
+        self.assertTrue(verification["domains"]["website_info"]["ok"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+# Test Suite for retrieval field projection and response budgets
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.memory.multi_domain_memory_system import MemoryEntry
+from src.memory.projection import (
+    SUMMARY_FIELDS,
+    needs_content,
+    resolve_fields,
+    shape_memories,
+    truncate_strings,
+    vector_include,
+)
+
+
+class TestResolveFields(unittest.TestCase):
+    def test_projection(self):
+        self.assertIsNone(resolve_fields())
+        self.assertEqual(resolve_fields(["tags"]), ("id", "tags"))
+        self.assertEqual(resolve_fields(summary=True), SUMMARY_FIELDS)
+        # summary narrows an explicit projection to the cheap fields
+        self.assertEqual(resolve_fields(["content_data", "source"], summary=True), ("id", "source"))
+        with self.assertRaises(ValueError):
+            resolve_fields(["no_such_field"])
+
+    def test_pushdown(self):
+        self.assertTrue(needs_content(None))
+        self.assertTrue(needs_content(("id", "context")))
+        self.assertFalse(needs_content(SUMMARY_FIELDS))
+        self.assertIsNone(vector_include(None))
+        self.assertNotIn("documents", vector_include(SUMMARY_FIELDS))
+
+
+class TestShapeMemories(unittest.TestCase):
+    def setUp(self):
+        self.memories = [
+            MemoryEntry(id=f"m{i}", domain="bmad_code", content_data={"code_snippet": "x" * 1000})
+            for i in range(5)
+        ]
+
+    def test_truncate_strings(self):
+        value, cut = truncate_strings({"a": "abcdef", "b": ["abc", 1]}, 3)
+        self.assertEqual(cut, 1)
+        self.assertEqual(value, {"a": "abc...[truncated 3 chars]", "b": ["abc", 1]})
+
+    def test_fields_and_chars_per_field(self):
+        shaped, budget = shape_memories(self.memories, ("id", "content_data"), max_chars_per_field=10)
+        self.assertEqual(set(shaped[0]), {"id", "content_data"})
+        self.assertTrue(shaped[0]["content_data"]["code_snippet"].endswith("[truncated 990 chars]"))
+        self.assertEqual(budget, {"truncated": True, "truncated_fields": 5, "omitted": 0})
+
+    def test_max_bytes_keeps_whole_memories_in_order(self):
+        shaped, budget = shape_memories(self.memories, max_bytes=3000)
+        self.assertEqual([m["id"] for m in shaped], ["m0", "m1"])
+        self.assertEqual(budget["omitted"], 3)
+
+        shaped, budget = shape_memories(self.memories, fields=SUMMARY_FIELDS, max_bytes=2500)
+        self.assertEqual(len(shaped), 5)
+        self.assertFalse(budget["truncated"])
+
+
+if __name__ == "__main__":
+    unittest.main()
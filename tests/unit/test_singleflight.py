@@ -0,0 +1,111 @@
+# Test Suite for single-flight request coalescing
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.memory.singleflight import SingleFlight, make_key
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test coalescing of concurrent identical calls"""
+
+    def setUp(self):
+        self.flight = SingleFlight("test")
+        self.executions = 0
+
+    def slow_call(self, result=None, error=None):
+        def call():
+            self.executions += 1
+            time.sleep(0.2)
+            if error:
+                raise error
+            return result
+
+        return call
+
+    def run_threads(self, n, func):
+        barrier = threading.Barrier(n)
+        outcomes = [None] * n
+
+        def worker(i):
+            barrier.wait()
+            try:
+                outcomes[i] = func()
+            except Exception as e:
+                outcomes[i] = e
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def test_concurrent_calls_share_one_execution(self):
+        call = self.slow_call([{"id": "a"}])
+        results = self.run_threads(8, lambda: self.flight.do("k", call))
+
+        self.assertEqual(self.executions, 1)
+        self.assertTrue(all(r == [{"id": "a"}] for r in results))
+        # Every caller gets its own copy
+        self.assertEqual(len({id(r) for r in results}), 8)
+        self.assertEqual(len({id(r[0]) for r in results}), 8)
+        stats = self.flight.snapshot()
+        self.assertEqual((stats["calls"], stats["executions"], stats["coalesced"]), (8, 1, 7))
+        self.assertEqual(stats["in_flight"], 0)
+
+    def test_errors_reach_every_waiter_and_are_not_cached(self):
+        call = self.slow_call(error=ValueError("boom"))
+        results = self.run_threads(4, lambda: self.flight.do("k", call))
+
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+        self.assertEqual(self.flight.do("k", lambda: [1]), [1])
+
+    def test_async_calls_share_one_task(self):
+        async def call():
+            self.executions += 1
+            await asyncio.sleep(0.1)
+            return ["x"]
+
+        async def scenario():
+            waiters = [asyncio.ensure_future(self.flight.ado("k", call)) for _ in range(5)]
+            await asyncio.sleep(0.01)
+            # Cancelling one waiter leaves the shared call running for the rest
+            waiters[0].cancel()
+            return await asyncio.gather(*waiters[1:])
+
+        results = asyncio.run(scenario())
+
+        self.assertEqual(self.executions, 1)
+        self.assertEqual(results, [["x"]] * 4)
+
+    def test_key_normalization(self):
+        self.assertEqual(
+            make_key("search", query="q", tags=["b", "a", "a"], date_range=("x", None)),
+            make_key("search", date_range=["x", None], tags=["a", "b"], query="q"),
+        )
+        self.assertNotEqual(make_key("search", query="q "), make_key("search", query="q"))
+
+    def test_key_keeps_date_range_order(self):
+        self.assertNotEqual(
+            make_key("retrieve", date_range=("2024-01-01", "2024-06-01")),
+            make_key("retrieve", date_range=("2024-06-01", "2024-01-01")),
+        )
+        self.assertNotEqual(
+            make_key("retrieve", date_range=("2024-01-01", "2024-01-01")),
+            make_key("retrieve", date_range=("2024-01-01",)),
+        )
+        self.assertEqual(
+            make_key("retrieve", include=["metadatas", "documents"], fields=("b", "a", "b")),
+            make_key("retrieve", include=["documents", "metadatas"], fields=["a", "b"]),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+# Test Suite for compiled tool argument validators
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.memory.tool_schema import compile_validator
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "domain": {"type": "string", "enum": ["bmad_code", "website_info"]},
+        "limit": {"type": "integer", "default": 10},
+        "confidence": {"type": "number"},
+        "summary": {"type": "boolean"},
+        "tags": {"type": "array", "items": {"type": "string"}},
+        "content_data": {"type": "object"},
+    },
+    "required": ["domain"],
+}
+
+
+class TestCompileValidator(unittest.TestCase):
+    """Test the JSON-schema subset used by the MCP tool specs"""
+
+    def setUp(self):
+        self.validate = compile_validator(SCHEMA)
+
+    def test_valid_arguments(self):
+        self.assertEqual(self.validate({
+            "domain": "bmad_code", "limit": 5, "confidence": 1, "summary": False,
+            "tags": ["a", "b"], "content_data": {"x": 1},
+        }), [])
+
+    def test_optional_arguments_may_be_none(self):
+        self.assertEqual(self.validate({"domain": "website_info", "tags": None, "limit": None}), [])
+
+    def test_problems_are_collected(self):
+        problems = self.validate({"limit": True, "tags": ["a", 3], "extra": 1, "confidence": "high"})
+        self.assertEqual(sorted(problems), sorted([
+            "missing required argument domain",
+            "limit must be of type integer",
+            "tags[1] must be of type string",
+            "unknown argument extra",
+            "confidence must be of type number",
+        ]))
+
+    def test_enum(self):
+        self.assertEqual(self.validate({"domain": "other"}), ["domain must be one of ['bmad_code', 'website_info']"])
+
+    def test_arguments_must_be_an_object(self):
+        self.assertEqual(self.validate(["bmad_code"]), ["arguments must be of type object"])
+        self.assertEqual(self.validate(None), ["missing required argument domain"])
+
+
+if __name__ == "__main__":
+    unittest.main()